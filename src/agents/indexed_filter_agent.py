@@ -0,0 +1,180 @@
+"""
+MessageFilterAgent backed by a per-source index of the team's message thread.
+
+`MessageFilterAgent` scans every message it receives once per `PerSourceFilter` and copies the
+matches into new lists. In a looping GraphFlow a node's input keeps growing, so each activation
+costs more than the last. `IndexedMessageLog` mirrors the team's thread (fed by the flow's manager
+as messages arrive) and keeps, per source, the sorted thread positions of its messages.
+`IndexedMessageFilterAgent` locates its input in the log in O(1) by message id, answers first/last-N
+per source with a binary search (O(log n + k)), and hands the inner agent a `MessageView` over the
+shared log instead of a copied list.
+
+Results are identical to MessageFilterAgent's: when the input cannot be located in the log (the
+agent is called outside a flow, or its input is not a contiguous window of the thread), the agent
+falls back to MessageFilterAgent's scan.
+"""
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterator, List, Sequence, overload
+
+from autogen_agentchat.agents import BaseChatAgent, MessageFilterAgent, MessageFilterConfig
+from autogen_agentchat.base import ChatAgent
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
+
+from src.utils.autogen_internals import wrapped_agent
+
+logger = logging.getLogger(__name__)
+
+
+class MessageView(Sequence[BaseChatMessage]):
+    """Read-only sequence of selected positions of a message log; nothing is copied."""
+
+    def __init__(self, messages: List[BaseChatMessage], positions: Sequence[int]) -> None:
+        self._messages = messages
+        self._positions = positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    @overload
+    def __getitem__(self, index: int) -> BaseChatMessage: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> MessageView: ...
+
+    def __getitem__(self, index: int | slice) -> BaseChatMessage | MessageView:
+        if isinstance(index, slice):
+            return MessageView(self._messages, self._positions[index])
+        return self._messages[self._positions[index]]
+
+    def __iter__(self) -> Iterator[BaseChatMessage]:
+        messages = self._messages
+        return (messages[position] for position in self._positions)
+
+    def __repr__(self) -> str:
+        return f"MessageView({list(self)!r})"
+
+
+class IndexedMessageLog:
+    """Append-only log of a team's chat messages, indexed by source and by message id."""
+
+    def __init__(self) -> None:
+        self._messages: List[BaseChatMessage] = []
+        self._by_source: Dict[str, List[int]] = defaultdict(list)  # Source -> sorted positions
+        self._by_id: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def extend(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> None:
+        """Append the chat messages of a thread delta (events are not delivered to agents, so skipped)."""
+        for message in messages:
+            if isinstance(message, BaseChatMessage):
+                self._by_source[message.source].append(len(self._messages))
+                self._by_id[message.id] = len(self._messages)
+                self._messages.append(message)
+
+    def clear(self) -> None:
+        self._messages.clear()
+        self._by_source.clear()
+        self._by_id.clear()
+
+    def position(self, message: BaseChatMessage) -> int | None:
+        """Thread position of `message`, or None if it is not in the log."""
+        return self._by_id.get(message.id)
+
+    def count(self, source: str, start: int, end: int) -> int:
+        """Number of messages from `source` in positions [start, end)."""
+        positions = self._by_source.get(source, [])
+        return bisect_left(positions, end) - bisect_left(positions, start)
+
+    def select(self, source: str, start: int, end: int, position: str | None, count: int | None) -> List[int]:
+        """Positions of `source`'s messages in [start, end), limited to the first or last `count`."""
+        positions = self._by_source.get(source)
+        if not positions:
+            return []
+        low, high = bisect_left(positions, start), bisect_left(positions, end)
+        if position == "first" and count:
+            high = min(high, low + count)
+        elif position == "last" and count:
+            low = max(low, high - count)
+        return positions[low:high]
+
+    def view(self, positions: Sequence[int]) -> MessageView:
+        return MessageView(self._messages, positions)
+
+
+class IndexedMessageFilterAgent(MessageFilterAgent):
+    """Drop-in MessageFilterAgent that filters through a shared :class:`IndexedMessageLog`.
+
+    The log is attached by the flow (:class:`~src.teams.scheduled_graph_flow.ScheduledGraphFlow` and
+    its subclasses attach one to every IndexedMessageFilterAgent among their participants, also when
+    wrapped in MemoizedAgent or similar wrappers).
+
+    Args:
+        name: The agent's name.
+        wrapped_agent: The agent receiving the filtered messages.
+        filter: Which messages to pass on, as for MessageFilterAgent.
+        message_log: The log to filter through; usually attached by the flow instead.
+    """
+
+    component_provider_override = "src.agents.indexed_filter_agent.IndexedMessageFilterAgent"
+
+    def __init__(
+        self,
+        name: str,
+        wrapped_agent: BaseChatAgent,
+        filter: MessageFilterConfig,
+        message_log: IndexedMessageLog | None = None,
+    ) -> None:
+        super().__init__(name=name, wrapped_agent=wrapped_agent, filter=filter)
+        self.message_log = message_log
+
+    def _apply_filter(self, messages: Sequence[BaseChatMessage]) -> Sequence[BaseChatMessage]:
+        window = self._window(messages)
+        if window is None:
+            return super()._apply_filter(messages)
+        start, end = window
+        assert self.message_log is not None
+        positions: List[int] = []
+        for source_filter in self._filter.per_source:
+            if source_filter.source == self.name:
+                continue  # The agent's own replies are in the window but never in its input
+            positions.extend(
+                self.message_log.select(source_filter.source, start, end, source_filter.position, source_filter.count)
+            )
+        return self.message_log.view(positions)
+
+    def _window(self, messages: Sequence[BaseChatMessage]) -> tuple[int, int] | None:
+        """Log positions [start, end) of `messages`, if they are the window's messages not sent by this agent."""
+        if self.message_log is None or not messages:
+            return None
+        start, last = self.message_log.position(messages[0]), self.message_log.position(messages[-1])
+        if start is None or last is None or last < start:
+            return None
+        end = last + 1
+        if end - start - self.message_log.count(self.name, start, end) != len(messages):
+            logger.debug(f"Input of {self.name} is not a window of the message log, scanning it instead")
+            return None
+        return start, end
+
+
+def attach_message_log(participants: Sequence[ChatAgent], message_log: IndexedMessageLog) -> int:
+    """Attach `message_log` to the IndexedMessageFilterAgents among `participants`, looking through wrappers.
+
+    Returns:
+        The number of agents the log was attached to.
+    """
+    attached = 0
+    for participant in participants:
+        agent: object = participant
+        while agent is not None:
+            if isinstance(agent, IndexedMessageFilterAgent):
+                agent.message_log = message_log
+                attached += 1
+                break
+            agent = wrapped_agent(agent)
+    return attached
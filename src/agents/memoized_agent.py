@@ -0,0 +1,189 @@
+"""
+Content-addressed memoization of agent turns, for re-running GraphFlow pipelines cheaply.
+
+Re-running a GraphFlow where only a late stage changed recomputes every upstream agent.
+`MemoizedAgent` wraps a participant and keys each turn on:
+
+- the agent's component config (system message, model, tools, ...), so prompt changes invalidate,
+- the agent's state before the turn (its model context),
+- the exact input messages, after MessageFilterAgent filtering when the participant is one.
+
+On a hit the cached response is returned and the cached post-turn state loaded, without invoking
+the agent. Entries live in any ``CacheStore`` (a `DiskCacheStore` by default, so they survive
+restarts).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Dict, Mapping, Sequence
+
+from autogen_agentchat.agents import BaseChatAgent, MessageFilterAgent
+from autogen_agentchat.base import ChatAgent, Response
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, MessageFactory
+from autogen_core import CacheStore, CancellationToken
+from autogen_ext.cache_store.diskcache import DiskCacheStore
+from diskcache import Cache
+
+from src.utils.autogen_internals import filtered_input, wrapped_agent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMO_DIR = ".cache/agent_memo"  # Directory of the default disk-backed store
+VOLATILE_MESSAGE_FIELDS = ("id", "created_at", "models_usage", "metadata")  # Excluded from input keys
+REGENERATED_MESSAGE_FIELDS = ("id", "created_at", "models_usage")  # Dropped from cached replies on reuse
+
+
+def default_memo_store(directory: str = DEFAULT_MEMO_DIR) -> CacheStore[str]:
+    """Disk-backed store for memoized turns."""
+    return DiskCacheStore[str](Cache(directory))
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _message_identity(message: BaseAgentEvent | BaseChatMessage) -> Dict[str, Any]:
+    dumped = message.dump()
+    for field in VOLATILE_MESSAGE_FIELDS:
+        dumped.pop(field, None)
+    return dumped
+
+
+def _config_fingerprint(agent: ChatAgent) -> Any:
+    """The agent's component config; class, name and description when it is not serializable."""
+    try:
+        return agent.dump_component().model_dump(mode="json")
+    except Exception as e:
+        logger.warning(f"Agent {agent.name} config is not serializable, memoizing on its name only: {e}")
+        return {"class": type(agent).__qualname__, "name": agent.name, "description": agent.description}
+
+
+@dataclass
+class MemoStats:
+    """Memoization counters of one agent."""
+
+    hits: int = 0
+    misses: int = 0
+    seconds_saved: float = 0.0  # Original run time of the turns served from the cache
+
+
+class MemoizedAgent(BaseChatAgent):
+    """Serve repeated agent turns from a content-addressed cache.
+
+    Wrap the participant as placed in the graph (a MessageFilterAgent included); the wrapper keeps
+    its name, so the graph can still be built from the original agents. The wrapped agent (or the
+    agent inside a MessageFilterAgent) must capture its turn effects in ``save_state`` (true for
+    AssistantAgent); its model client should be deterministic enough for reuse to be meaningful.
+
+    Example:
+
+        .. code-block:: python
+
+            store = default_memo_store()
+            participants = [MemoizedAgent(agent, store) for agent in builder.get_participants()]
+            flow = GraphFlow(participants, graph=builder.build())
+
+    Args:
+        wrapped_agent: The participant whose turns are memoized.
+        store: Where turns are cached; defaults to :func:`default_memo_store`.
+    """
+
+    def __init__(self, wrapped_agent: BaseChatAgent, store: CacheStore[str] | None = None) -> None:
+        super().__init__(name=wrapped_agent.name, description=wrapped_agent.description)
+        self._wrapped_agent = wrapped_agent
+        self._store = store if store is not None else default_memo_store()
+        self._message_factory = MessageFactory()
+        self._config_hash = hashlib.sha256(_canonical(_config_fingerprint(wrapped_agent)).encode()).hexdigest()
+        self.stats = MemoStats()
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return self._wrapped_agent.produced_message_types
+
+    @property
+    def wrapped_agent(self) -> BaseChatAgent:
+        """The memoized participant."""
+        return self._wrapped_agent
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        response: Response | None = None
+        async for item in self.on_messages_stream(messages, cancellation_token):
+            if isinstance(item, Response):
+                response = item
+        assert response is not None
+        return response
+
+    async def on_messages_stream(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
+        """Return the cached turn for identical config, state and input; otherwise run and cache it."""
+        key = await self._turn_key(messages)
+        cached = self._store.get(key)
+        if cached is not None:
+            entry = json.loads(cached)
+            await self._state_agent.load_state(entry["state"])
+            self.stats.hits += 1
+            self.stats.seconds_saved += entry["seconds"]
+            yield self._cached_response(entry)
+            return
+
+        self.stats.misses += 1
+        started = time.perf_counter()
+        response: Response | None = None
+        async for item in self._wrapped_agent.on_messages_stream(messages, cancellation_token):
+            if isinstance(item, Response):
+                response = item
+            yield item
+        if response is None:
+            return
+        entry = {
+            "chat_message": response.chat_message.dump(),
+            "inner_messages": [message.dump() for message in response.inner_messages or []],
+            "state": await self._state_agent.save_state(),
+            "seconds": time.perf_counter() - started,
+        }
+        self._store.set(key, _canonical(entry))
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        await self._wrapped_agent.on_reset(cancellation_token)
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return await self._wrapped_agent.save_state()
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        await self._wrapped_agent.load_state(state)
+
+    async def close(self) -> None:
+        await self._wrapped_agent.close()
+
+    @property
+    def _state_agent(self) -> ChatAgent:
+        """The agent whose state a turn changes (MessageFilterAgent keeps none of its own)."""
+        if isinstance(self._wrapped_agent, MessageFilterAgent):
+            return wrapped_agent(self._wrapped_agent)
+        return self._wrapped_agent
+
+    async def _turn_key(self, messages: Sequence[BaseChatMessage]) -> str:
+        if isinstance(self._wrapped_agent, MessageFilterAgent):
+            messages = filtered_input(self._wrapped_agent, messages)
+        material = {
+            "config": self._config_hash,
+            "state": await self._state_agent.save_state(),
+            "input": [_message_identity(message) for message in messages],
+        }
+        return f"memo:{self.name}:{hashlib.sha256(_canonical(material).encode()).hexdigest()}"
+
+    def _cached_response(self, entry: Mapping[str, Any]) -> Response:
+        """Rebuild the cached response as fresh messages; usage is cleared because no tokens were spent."""
+        chat_message, *inner_messages = [
+            self._message_factory.create(
+                {key: value for key, value in message.items() if key not in REGENERATED_MESSAGE_FIELDS}
+            )
+            for message in [entry["chat_message"], *entry["inner_messages"]]
+        ]
+        assert isinstance(chat_message, BaseChatMessage)
+        return Response(chat_message=chat_message, inner_messages=inner_messages or None)
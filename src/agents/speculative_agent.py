@@ -0,0 +1,190 @@
+"""
+Agent wrapper that can start a turn early on predicted input and keep it only if the prediction held.
+
+A team (e.g. `SpeculativeGraphFlow`) calls :meth:`SpeculativeAgent.speculate` with the messages it
+expects the agent to receive. The wrapped agent runs on them in the background, after its state is
+snapshotted. When the real turn arrives, the speculative response is used if the real input matches
+the predicted one; otherwise the run is cancelled, the snapshot restored and the turn runs normally.
+A speculative turn therefore never changes what the agent answers, only when.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, List, Mapping, Sequence, Tuple
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
+from autogen_core import CancellationToken
+
+logger = logging.getLogger(__name__)
+
+InputMatcher = Callable[[Sequence[BaseChatMessage], Sequence[BaseChatMessage]], bool]
+
+
+def message_key(message: BaseChatMessage) -> Tuple[str, str, str]:
+    """What makes two messages equivalent as model input: type, source and model text."""
+    return type(message).__name__, message.source, message.to_model_text()
+
+
+def same_input(predicted: Sequence[BaseChatMessage], actual: Sequence[BaseChatMessage]) -> bool:
+    """Default matcher: the same messages, in the same order."""
+    return [message_key(message) for message in predicted] == [message_key(message) for message in actual]
+
+
+def response_tokens(response: Response) -> int:
+    """Prompt plus completion tokens reported by a response and its inner messages."""
+    messages: List[BaseAgentEvent | BaseChatMessage] = [*(response.inner_messages or []), response.chat_message]
+    return sum(
+        message.models_usage.prompt_tokens + message.models_usage.completion_tokens
+        for message in messages
+        if message.models_usage is not None
+    )
+
+
+@dataclass
+class SpeculationStats:
+    """Outcome counters of an agent's speculative turns."""
+
+    started: int = 0
+    hits: int = 0  # Speculative response used for the real turn
+    misses: int = 0  # Real input differed; speculative run discarded
+    cancelled: int = 0  # Discarded before the real turn (e.g. the branch was not taken)
+    seconds_saved: float = 0.0  # Speculative run time overlapped with upstream work, on hits
+    tokens_wasted: int = 0  # Tokens of discarded runs that completed (in-flight runs are not counted)
+    seconds_wasted: float = 0.0  # Run time of discarded runs, including those cancelled in flight
+
+
+@dataclass
+class _Speculation:
+    messages: List[BaseChatMessage]
+    snapshot: Mapping[str, Any]
+    task: asyncio.Task[Response]
+    token: CancellationToken
+    started_at: float
+    finished_at: float | None = None
+
+
+class SpeculativeAgent(BaseChatAgent):
+    """Wrap an agent so its turns can be started before their input is final.
+
+    The wrapped agent's ``save_state``/``load_state`` must capture everything a turn changes (true
+    for AssistantAgent), because a discarded speculative run is rolled back by reloading the state.
+    When used under a MessageFilterAgent, wrap the inner agent, so predicted and real input are
+    compared after filtering.
+
+    Args:
+        wrapped_agent: The agent to run speculatively; the wrapper takes its name.
+        input_matcher: Decides whether a speculative run's input is equivalent to the real input.
+    """
+
+    def __init__(self, wrapped_agent: BaseChatAgent, input_matcher: InputMatcher = same_input) -> None:
+        super().__init__(name=wrapped_agent.name, description=wrapped_agent.description)
+        self._wrapped_agent = wrapped_agent
+        self._input_matcher = input_matcher
+        self._speculation: _Speculation | None = None
+        self.stats = SpeculationStats()
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return self._wrapped_agent.produced_message_types
+
+    @property
+    def wrapped_agent(self) -> BaseChatAgent:
+        """The agent whose turns are speculated."""
+        return self._wrapped_agent
+
+    @property
+    def is_speculating(self) -> bool:
+        """Whether a speculative run is pending."""
+        return self._speculation is not None
+
+    async def speculate(self, messages: Sequence[BaseChatMessage]) -> bool:
+        """Start a background turn on predicted `messages`; returns False if one is already pending."""
+        if self._speculation is not None:
+            return False
+        snapshot = await self._wrapped_agent.save_state()
+        token = CancellationToken()
+        speculation = _Speculation(
+            messages=list(messages),
+            snapshot=snapshot,
+            task=asyncio.create_task(self._wrapped_agent.on_messages(list(messages), token)),
+            token=token,
+            started_at=time.perf_counter(),
+        )
+        speculation.task.add_done_callback(lambda _: setattr(speculation, "finished_at", time.perf_counter()))
+        self._speculation = speculation
+        self.stats.started += 1
+        return True
+
+    async def cancel_speculation(self) -> None:
+        """Discard the pending speculative run (if any) and restore the pre-speculation state."""
+        if await self._discard():
+            self.stats.cancelled += 1
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        response: Response | None = None
+        async for item in self.on_messages_stream(messages, cancellation_token):
+            if isinstance(item, Response):
+                response = item
+        assert response is not None
+        return response
+
+    async def on_messages_stream(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
+        """Use the speculative response if its input matches, otherwise run the turn normally."""
+        speculation = self._speculation
+        if speculation is not None and self._input_matcher(speculation.messages, messages):
+            requested_at = time.perf_counter()
+            cancellation_token.link_future(speculation.task)
+            try:
+                response = await speculation.task
+            except Exception as e:
+                logger.warning(f"Speculative turn of {self.name} failed, running it again: {e}")
+            else:
+                self._speculation = None
+                self.stats.hits += 1
+                self.stats.seconds_saved += (speculation.finished_at or requested_at) - speculation.started_at
+                yield response
+                return
+        if await self._discard():
+            self.stats.misses += 1
+        async for item in self._wrapped_agent.on_messages_stream(messages, cancellation_token):
+            yield item
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        await self.cancel_speculation()
+        await self._wrapped_agent.on_reset(cancellation_token)
+
+    async def save_state(self) -> Mapping[str, Any]:
+        if self._speculation is not None:
+            return self._speculation.snapshot
+        return await self._wrapped_agent.save_state()
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        await self.cancel_speculation()
+        await self._wrapped_agent.load_state(state)
+
+    async def close(self) -> None:
+        await self.cancel_speculation()
+        await self._wrapped_agent.close()
+
+    async def _discard(self) -> bool:
+        """Cancel or drop the pending run, count its wasted tokens, and roll the state back."""
+        speculation, self._speculation = self._speculation, None
+        if speculation is None:
+            return False
+        self.stats.seconds_wasted += (speculation.finished_at or time.perf_counter()) - speculation.started_at
+        if speculation.task.done():
+            if not speculation.task.cancelled() and speculation.task.exception() is None:
+                self.stats.tokens_wasted += response_tokens(speculation.task.result())
+        else:
+            speculation.token.cancel()
+            speculation.task.cancel()
+            await asyncio.gather(speculation.task, return_exceptions=True)
+        await self._wrapped_agent.load_state(speculation.snapshot)
+        return True
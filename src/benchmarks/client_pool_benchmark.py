@@ -0,0 +1,85 @@
+"""
+Benchmark: per-task model clients vs clients shared through ModelClientRegistry.
+
+Runs a batch of tasks (each making ``--calls-per-task`` chat completions) against the local
+`StandInAPI`, which delays the first request on every new connection by ``--setup-ms`` to model
+TCP + TLS setup to a remote endpoint, and counts connections opened:
+
+- `per_task`: each task builds (and closes) its own ``OpenAIChatCompletionClient``, as the examples do,
+- `shared`: each task leases the same pooled client from a warmed-up registry.
+
+Run:
+
+    python -m src.benchmarks.client_pool_benchmark --tasks 30 --calls-per-task 3 --setup-ms 60
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Callable, Dict, List
+
+from autogen_core.models import ChatCompletionClient, UserMessage
+
+from src.benchmarks.metrics import MS_PER_SECOND, latency_summary, write_report
+from src.benchmarks.stand_in_api import StandInAPI
+from src.models.client_registry import ModelClientRegistry
+
+MODEL = "gpt-4o-mini"
+
+
+async def _run_tasks(tasks: int, calls_per_task: int, client_for_task: Callable[[], ChatCompletionClient]) -> List[float]:
+    """Per-task latency, including building and closing the task's client."""
+    samples: List[float] = []
+    for task in range(tasks):
+        started = time.perf_counter()
+        client = client_for_task()
+        for call in range(calls_per_task):
+            await client.create([UserMessage(content=f"task {task} call {call}", source="user")])
+        await client.close()
+        samples.append((time.perf_counter() - started) * MS_PER_SECOND)
+    return samples
+
+
+async def run_benchmark(tasks: int, calls_per_task: int, setup_ms: float) -> Dict[str, Any]:
+    """Run the batch with per-task clients, then with registry-shared clients."""
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+    report: Dict[str, Any] = {"tasks": tasks, "calls_per_task": calls_per_task, "setup_ms": setup_ms}
+    # One untimed call first, so one-off process costs (imports, tokenizer loading) hit neither mode
+    server = StandInAPI()
+    await server.start()
+    await _run_tasks(1, 1, lambda: OpenAIChatCompletionClient(model=MODEL, base_url=server.base_url, api_key="local"))
+    await server.stop()
+    for mode in ("per_task", "shared"):
+        server = StandInAPI(setup_seconds=setup_ms / MS_PER_SECOND)
+        await server.start()
+        config = {"base_url": server.base_url, "api_key": "local"}
+        if mode == "per_task":
+            samples = await _run_tasks(tasks, calls_per_task, lambda: OpenAIChatCompletionClient(model=MODEL, **config))
+        else:
+            registry = ModelClientRegistry()
+            await registry.warm_up(server.base_url)
+            samples = await _run_tasks(tasks, calls_per_task, lambda: registry.get(MODEL, **config))
+            report["registry_stats"] = dict(registry.stats)
+            await registry.aclose()
+        report[mode] = {"task": latency_summary(samples), "connections": server.connections, "requests": server.requests}
+        await server.stop()
+    report["speedup_mean"] = report["per_task"]["task"]["mean_ms"] / report["shared"]["task"]["mean_ms"]
+    return report
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Shared model client pool benchmark")
+    parser.add_argument("--tasks", type=int, default=30)
+    parser.add_argument("--calls-per-task", type=int, default=3)
+    parser.add_argument("--setup-ms", type=float, default=60.0, help="Simulated TCP + TLS setup per new connection")
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    print(write_report(asyncio.run(run_benchmark(args.tasks, args.calls_per_task, args.setup_ms)), args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: round-trips saved by ConvergenceTermination in simulated writer/critic loops.
+
+Each simulated loop has a writer whose revisions rewrite a shrinking share of the draft's words
+(``--initial-edit`` decaying by ``--decay`` per round, down to a small floor of cosmetic edits) and
+a critic that replies with feedback. Without convergence detection the loop runs until
+``MaxMessageTermination``; with it, it stops once the writer's drafts converge. Reported per
+threshold:
+
+- writer rounds run and model round-trips saved per loop,
+- `residual_change`: how much the draft would still have changed had the loop run to the end
+  (the quality given up by stopping early),
+- per-message cost of the convergence check.
+
+Run:
+
+    python -m src.benchmarks.convergence_benchmark --loops 200 --thresholds 0.05 0.1 0.2
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Sequence
+
+from autogen_agentchat.base import TerminationCondition
+from autogen_agentchat.conditions import MaxMessageTermination
+from autogen_agentchat.messages import TextMessage
+
+from src.benchmarks.metrics import MS_PER_SECOND, latency_summary, write_report
+from src.conditions.convergence_termination import ConvergenceTermination, change_ratio, shingles
+
+DRAFT_WORDS = 300  # Words per simulated draft
+EDIT_FLOOR = 0.01  # Share of words a late revision still rewrites (cosmetic churn)
+VOCABULARY = [f"w{i}" for i in range(2000)]
+CRITIQUE = "Consider tightening the second paragraph and adding a concrete example for the main claim."
+
+
+def simulate_drafts(rounds: int, initial_edit: float, decay: float, rng: random.Random) -> List[str]:
+    """Successive drafts of one writer, each rewriting a decaying share of the previous one's words."""
+    words = rng.choices(VOCABULARY, k=DRAFT_WORDS)
+    drafts = [" ".join(words)]
+    for revision in range(1, rounds):
+        edit = max(EDIT_FLOOR, initial_edit * decay ** (revision - 1))
+        for index in rng.sample(range(DRAFT_WORDS), k=max(1, int(edit * DRAFT_WORDS))):
+            words[index] = rng.choice(VOCABULARY)
+        drafts.append(" ".join(words))
+    return drafts
+
+
+async def run_loop(drafts: Sequence[str], condition: TerminationCondition, check_ms: List[float]) -> int:
+    """Feed the writer/critic exchange to `condition`; return the writer rounds run before it stopped."""
+    await condition.reset()
+    for round_index, draft in enumerate(drafts, start=1):
+        for message in (TextMessage(content=draft, source="writer"), TextMessage(content=CRITIQUE, source="critic")):
+            started = time.perf_counter()
+            stop = await condition([message])
+            check_ms.append((time.perf_counter() - started) * MS_PER_SECOND)
+            if stop is not None:
+                return round_index
+    return len(drafts)
+
+
+async def run_benchmark(
+    loops: int, max_rounds: int, initial_edit: float, decay: float, thresholds: Sequence[float], seed: int
+) -> Dict[str, Any]:
+    """Compare MaxMessageTermination alone with ConvergenceTermination at each threshold."""
+    rng = random.Random(seed)
+    loop_drafts = [simulate_drafts(max_rounds, initial_edit, decay, rng) for _ in range(loops)]
+    report: Dict[str, Any] = {
+        "loops": loops,
+        "max_rounds": max_rounds,
+        "initial_edit": initial_edit,
+        "decay": decay,
+        "thresholds": {},
+    }
+    baseline_ms: List[float] = []
+    for drafts in loop_drafts:
+        await run_loop(drafts, MaxMessageTermination(2 * max_rounds), baseline_ms)
+    report["baseline_check"] = latency_summary(baseline_ms)
+
+    for threshold in thresholds:
+        rounds: List[int] = []
+        residual: List[float] = []
+        check_ms: List[float] = []
+        for drafts in loop_drafts:
+            condition = ConvergenceTermination(threshold=threshold, sources=["writer"]) | MaxMessageTermination(2 * max_rounds)
+            ran = await run_loop(drafts, condition, check_ms)
+            rounds.append(ran)
+            residual.append(change_ratio(shingles(drafts[ran - 1]), shingles(drafts[-1])))
+        report["thresholds"][str(threshold)] = {
+            "writer_rounds_mean": statistics.fmean(rounds),
+            "round_trips_saved_per_loop": 2 * (max_rounds - statistics.fmean(rounds)),
+            "round_trips_saved_share": 1 - statistics.fmean(rounds) / max_rounds,
+            "residual_change_mean": statistics.fmean(residual),
+            "check": latency_summary(check_ms),
+        }
+    return report
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Convergence termination benchmark")
+    parser.add_argument("--loops", type=int, default=200)
+    parser.add_argument("--max-rounds", type=int, default=8, help="Writer rounds allowed by MaxMessageTermination")
+    parser.add_argument("--initial-edit", type=float, default=0.5, help="Share of words the first revision rewrites")
+    parser.add_argument("--decay", type=float, default=0.4, help="Factor applied to the edit share per revision")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.05, 0.1, 0.2])
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run_benchmark(args.loops, args.max_rounds, args.initial_edit, args.decay, args.thresholds, args.seed)
+    )
+    print(write_report(report, args.output))
+
+
+if __name__ == "__main__":
+    main()
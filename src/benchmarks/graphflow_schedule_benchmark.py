@@ -0,0 +1,125 @@
+"""
+Benchmark: GraphFlow batch execution vs ScheduledGraphFlow's bounded critical-path scheduler.
+
+Builds a layered DAG of stand-in agents that sleep for a fixed per-node duration (standing in for
+model calls of different lengths), then compares wall-clock time, total work and the critical path:
+
+- `graphflow`: the stock GraphFlow (every ready node at once, batch by batch),
+- `profiled`: ScheduledGraphFlow without a limit (same batches, with timings),
+- `scheduled`: ScheduledGraphFlow with ``--max-concurrency`` and critical-path priorities.
+
+Run:
+
+    python -m src.benchmarks.graphflow_schedule_benchmark --layers 4 --width 6 --max-concurrency 4
+
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Any, Dict, List, Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import BaseChatMessage, TextMessage
+from autogen_agentchat.teams import DiGraphBuilder, GraphFlow
+from autogen_core import CancellationToken
+
+from src.benchmarks.metrics import write_report
+from src.teams.scheduled_graph_flow import ScheduledGraphFlow
+
+MIN_NODE_SECONDS = 0.01  # Shortest simulated node duration
+MAX_NODE_SECONDS = 0.15  # Longest simulated node duration
+
+
+class SleepAgent(BaseChatAgent):
+    """Stand-in node that sleeps for a fixed duration and replies with its name."""
+
+    def __init__(self, name: str, seconds: float) -> None:
+        super().__init__(name, description=f"Sleeps {seconds:.3f}s")
+        self._seconds = seconds
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (TextMessage,)
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        await asyncio.sleep(self._seconds)
+        return Response(chat_message=TextMessage(content=f"{self.name} done", source=self.name))
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        pass
+
+
+def build_layered_graph(layers: int, width: int, seed: int) -> tuple[DiGraphBuilder, List[SleepAgent]]:
+    """A start node, `layers` layers of `width` nodes (each wired to 1-2 nodes of the previous layer), and a join."""
+    rng = random.Random(seed)
+    builder = DiGraphBuilder()
+    start = SleepAgent("start", MIN_NODE_SECONDS)
+    agents = [start]
+    builder.add_node(start)
+    previous = [start]
+    for layer in range(layers):
+        current = [
+            SleepAgent(f"n{layer}_{i}", rng.uniform(MIN_NODE_SECONDS, MAX_NODE_SECONDS)) for i in range(width)
+        ]
+        for agent in current:
+            builder.add_node(agent)
+            for parent in rng.sample(previous, k=min(len(previous), rng.randint(1, 2))):
+                builder.add_edge(parent, agent)
+        agents.extend(current)
+        previous = current
+    join = SleepAgent("join", MIN_NODE_SECONDS)
+    builder.add_node(join)
+    for parent in previous:
+        builder.add_edge(parent, join)
+    agents.append(join)
+    return builder, agents
+
+
+async def _timed_run(flow: GraphFlow) -> Dict[str, Any]:
+    started = time.perf_counter()
+    result = await flow.run(task="Run the graph.")
+    return {
+        "wall_clock_seconds": time.perf_counter() - started,
+        "nodes_run": sum(1 for message in result.messages if isinstance(message, TextMessage)) - 1,
+    }
+
+
+async def run_benchmark(layers: int, width: int, max_concurrency: int, seed: int) -> Dict[str, Any]:
+    """Run the same DAG under each mode and report timings and critical-path statistics."""
+    report: Dict[str, Any] = {"layers": layers, "width": width, "max_concurrency": max_concurrency}
+
+    builder, _ = build_layered_graph(layers, width, seed)
+    report["graphflow"] = await _timed_run(GraphFlow(builder.get_participants(), graph=builder.build()))
+
+    for mode, limit in (("profiled", None), ("scheduled", max_concurrency)):
+        builder, _ = build_layered_graph(layers, width, seed)
+        flow = ScheduledGraphFlow(builder.get_participants(), graph=builder.build(), max_concurrency=limit)
+        await flow.run(task="Warm-up run: measures node durations for the priorities.")
+        report[mode] = await _timed_run(flow)
+        assert flow.last_profile is not None
+        summary = flow.last_profile.summary()
+        summary.pop("nodes")
+        report[mode].update(summary)
+    return report
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="GraphFlow scheduling benchmark")
+    parser.add_argument("--layers", type=int, default=4)
+    parser.add_argument("--width", type=int, default=6)
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args.layers, args.width, args.max_concurrency, args.seed))
+    print(write_report(report, args.output))
+
+
+if __name__ == "__main__":
+    main()
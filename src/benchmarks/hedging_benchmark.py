@@ -0,0 +1,112 @@
+"""
+Benchmark: tail latency of model calls with and without HedgedChatCompletionClient.
+
+A `StandInAPI` serves every request in a log-normal (heavy-tailed) time around a median of
+``--service-ms`` (``--sigma`` sets the spread; 1.0 puts p99 near 10x the median). The workload is
+``--turns`` team turns, each issuing ``--fanout`` concurrent calls and waiting for all of them,
+like parallel agents in a GraphFlow fan-out. After ``--warmup`` untimed calls (connections and the
+latency window), each mode reports:
+
+- call and turn latency (mean, p50, p99),
+- extra requests sent (hedges / calls) and how many the stand-in served after the client had
+  already given up on them (work a real provider would bill),
+- the client's hedge counters.
+
+Mode "off" is the unhedged baseline; the others hedge past the given latency percentile.
+
+Run:
+
+    python -m src.benchmarks.hedging_benchmark --turns 100 --fanout 3 --percentiles 0.9 0.95 0.99
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from autogen_core.models import ChatCompletionClient, UserMessage
+
+from src.benchmarks.metrics import MS_PER_SECOND, latency_summary, write_report
+from src.benchmarks.stand_in_api import StandInAPI
+from src.models.hedged_client import HedgedChatCompletionClient
+
+MODEL = "gpt-4o-mini"
+
+
+async def _call(client: ChatCompletionClient, stream: bool) -> float:
+    """Latency of one call: to the full reply, or to the first chunk when streaming."""
+    messages = [UserMessage(content="Reply briefly.", source="user")]
+    started = time.perf_counter()
+    if not stream:
+        await client.create(messages, extra_create_args={"max_tokens": 5})
+        return time.perf_counter() - started
+    first: float | None = None
+    async for _ in client.create_stream(messages, extra_create_args={"max_tokens": 5}):
+        first = first if first is not None else time.perf_counter() - started
+    return first if first is not None else time.perf_counter() - started
+
+
+async def run_mode(percentile: float | None, args: argparse.Namespace) -> Dict[str, Any]:
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+    async with StandInAPI(service_seconds=args.service_ms / MS_PER_SECOND, service_sigma=args.sigma, seed=args.seed) as api:
+        raw = OpenAIChatCompletionClient(model=MODEL, base_url=api.base_url, api_key="local", max_retries=0)
+        client: ChatCompletionClient = raw
+        if percentile is not None:
+            client = HedgedChatCompletionClient(raw, percentile=percentile, max_extra_fraction=args.max_extra_fraction)
+        for _ in range(args.warmup // args.fanout):
+            await asyncio.gather(*(_call(client, args.stream) for _ in range(args.fanout)))
+        requests_before, abandoned_before = api.requests, api.abandoned
+        calls: List[float] = []
+        turns: List[float] = []
+        for _ in range(args.turns):
+            started = time.perf_counter()
+            calls.extend(await asyncio.gather(*(_call(client, args.stream) for _ in range(args.fanout))))
+            turns.append(time.perf_counter() - started)
+        await asyncio.sleep(args.service_ms * 20 / MS_PER_SECOND)  # Let cancelled requests finish serving
+        report: Dict[str, Any] = {
+            "call_latency": latency_summary([seconds * MS_PER_SECOND for seconds in calls]),
+            "turn_latency": latency_summary([seconds * MS_PER_SECOND for seconds in turns]),
+            "extra_requests": (api.requests - requests_before) / len(calls) - 1,
+            "abandoned_requests": api.abandoned - abandoned_before,
+        }
+        if isinstance(client, HedgedChatCompletionClient):
+            report["hedging"] = client.describe()
+        await raw.close()
+    return report
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    report: Dict[str, Any] = {
+        "turns": args.turns,
+        "fanout": args.fanout,
+        "service": {"median_ms": args.service_ms, "sigma": args.sigma},
+        "streamed": args.stream,
+        "modes": {"off": await run_mode(None, args)},
+    }
+    for percentile in args.percentiles:
+        report["modes"][f"p{percentile * 100:g}"] = await run_mode(percentile, args)
+    return report
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Hedged request benchmark")
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--fanout", type=int, default=3, help="Concurrent calls per turn")
+    parser.add_argument("--warmup", type=int, default=60, help="Untimed calls before measuring")
+    parser.add_argument("--service-ms", type=float, default=50.0, help="Median service time")
+    parser.add_argument("--sigma", type=float, default=1.0, help="Log-normal spread of the service time")
+    parser.add_argument("--percentiles", type=float, nargs="+", default=[0.9, 0.95, 0.99])
+    parser.add_argument("--max-extra-fraction", type=float, default=0.1)
+    parser.add_argument("--stream", action="store_true", help="Stream and hedge on the first chunk")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    print(write_report(asyncio.run(run_benchmark(args)), args.output))
+
+
+if __name__ == "__main__":
+    main()
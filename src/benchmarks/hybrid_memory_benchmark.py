@@ -0,0 +1,104 @@
+"""
+Offline recall/latency benchmark for HybridMemory.
+
+Compares lexical-only (BM25), vector-only (ChromaDBVectorMemory) and hybrid RRF retrieval on a
+synthetic identifier-lookup corpus. Vector retrieval needs the `chromadb` extra
+(`autogen-ext[chromadb]`) and a locally cached embedding model; without it only the lexical
+numbers are reported.
+
+Run:
+
+    python -m src.benchmarks.hybrid_memory_benchmark --docs 2000 --k 3 --output hybrid.json
+
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from autogen_core.memory import Memory, MemoryContent, MemoryMimeType
+
+from src.benchmarks.metrics import MS_PER_SECOND, latency_summary, recall_at_k, write_report
+from src.benchmarks.synthetic_corpus import SyntheticQuery, generate_corpus
+from src.memory.hybrid_memory import HybridMemory
+
+
+def _build_vector_memory(k: int, persistence_path: str) -> Memory | None:
+    """Create a ChromaDB vector memory, or None when the chromadb extra is unavailable."""
+    try:
+        from autogen_ext.memory.chromadb import ChromaDBVectorMemory, PersistentChromaDBVectorMemoryConfig
+    except ImportError:
+        return None
+    return ChromaDBVectorMemory(
+        config=PersistentChromaDBVectorMemoryConfig(
+            collection_name="hybrid_benchmark", persistence_path=persistence_path, k=k, score_threshold=0.4
+        )
+    )
+
+
+async def _timed_queries(
+    queries: List[SyntheticQuery], retrieve: Callable[[str], Awaitable[List[str]]]
+) -> Dict[str, Any]:
+    """Run every query through `retrieve` and collect recall and latency."""
+    latencies_ms: List[float] = []
+    recalls: List[float] = []
+    for query in queries:
+        started = time.perf_counter()
+        retrieved_ids = await retrieve(query.text)
+        latencies_ms.append((time.perf_counter() - started) * MS_PER_SECOND)
+        recalls.append(recall_at_k(retrieved_ids, query))
+    return {"recall_at_k": statistics.fmean(recalls), **latency_summary(latencies_ms)}
+
+
+async def run_benchmark(num_docs: int, k: int) -> Dict[str, Any]:
+    """Index a synthetic corpus and measure each retrieval mode."""
+    documents, queries = generate_corpus(num_docs)
+    report: Dict[str, Any] = {"docs": num_docs, "queries": len(queries), "k": k}
+    with tempfile.TemporaryDirectory() as persistence_path:
+        vector_memory = _build_vector_memory(k, persistence_path)
+        hybrid = HybridMemory(vector_memory=vector_memory, k=k)
+        for document in documents:
+            await hybrid.add(MemoryContent(content=document.text, mime_type=MemoryMimeType.TEXT, metadata=document.metadata))
+
+        async def lexical(text: str) -> List[str]:
+            return _doc_ids(hybrid.lexical_search(text, limit=k))
+
+        report["lexical"] = await _timed_queries(queries, lexical)
+        if vector_memory is None:
+            report["vector"] = report["hybrid"] = "skipped: chromadb is not installed"
+            return report
+
+        async def vector(text: str) -> List[str]:
+            return _doc_ids((await vector_memory.query(text)).results)
+
+        async def fused(text: str) -> List[str]:
+            return _doc_ids((await hybrid.query(text)).results)
+
+        report["vector"] = await _timed_queries(queries, vector)
+        report["hybrid"] = await _timed_queries(queries, fused)
+        await hybrid.close()
+    return report
+
+
+def _doc_ids(items: List[MemoryContent]) -> List[str]:
+    return [str((item.metadata or {}).get("doc_id")) for item in items]
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Offline HybridMemory recall/latency benchmark")
+    parser.add_argument("--docs", type=int, default=2000, help="Number of synthetic documents")
+    parser.add_argument("--k", type=int, default=3, help="Results per query")
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args.docs, args.k))
+    print(write_report(report, args.output))
+
+
+if __name__ == "__main__":
+    main()
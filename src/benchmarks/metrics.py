@@ -0,0 +1,52 @@
+"""
+Shared measurement helpers for the offline benchmarks.
+
+This module provides:
+- percentile / latency_summary: Nearest-rank latency statistics in milliseconds.
+- recall_at_k: Ground-truth recall for labelled synthetic queries.
+- write_report: Stable, diff-friendly JSON output for benchmark results.
+"""
+from __future__ import annotations
+
+import json
+import statistics
+from typing import Any, Dict, Sequence
+
+from src.benchmarks.synthetic_corpus import SyntheticQuery
+
+MS_PER_SECOND = 1000.0
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty sample list (fraction in [0, 1])."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def latency_summary(samples_ms: Sequence[float]) -> Dict[str, float]:
+    """Summarize latency samples (milliseconds) as mean/p50/p99; empty when there are no samples."""
+    if not samples_ms:
+        return {}
+    return {
+        "mean_ms": statistics.fmean(samples_ms),
+        "p50_ms": percentile(samples_ms, 0.50),
+        "p99_ms": percentile(samples_ms, 0.99),
+    }
+
+
+def recall_at_k(retrieved_ids: Sequence[str], query: SyntheticQuery) -> float:
+    """Fraction of the query's relevant documents present in the retrieved ids."""
+    return len(set(retrieved_ids) & set(query.relevant_ids)) / len(query.relevant_ids)
+
+
+def write_report(report: Dict[str, Any], path: str | None) -> str:
+    """Render a report as sorted, indented JSON and optionally write it to `path`.
+
+    Keys are sorted so two reports from different versions can be compared with a plain diff.
+    """
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if path:
+        with open(path, "w", encoding="utf-8") as report_file:
+            report_file.write(rendered + "\n")
+    return rendered
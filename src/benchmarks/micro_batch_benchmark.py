@@ -0,0 +1,154 @@
+"""
+Benchmark: single structured-output calls vs MicroBatcher at several window sizes.
+
+``--requests`` small sentiment classifications arrive as a Poisson stream at ``--rate`` per second
+and go to a simulated model endpoint that serves ``--capacity`` calls at a time. A call costs
+``--overhead-ms`` (round-trip, queueing, prompt framing) plus ``--per-item-ms`` per classified
+input, and a ``--corrupt-rate`` share of batched responses drop one item, exercising the fallback.
+
+Window 0 with ``max_batch=1`` is the unbatched baseline (one call per request). Reported per
+window: throughput, end-to-end latency per request (submit to result), calls made and batch sizes.
+
+Run:
+
+    python -m src.benchmarks.micro_batch_benchmark --requests 1000 --rate 200 --windows 0 5 20 50
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List, Literal, Mapping, Optional, Sequence
+
+from autogen_core import CancellationToken
+from autogen_core.models import CreateResult, LLMMessage, RequestUsage
+from autogen_core.tools import Tool, ToolSchema
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from pydantic import BaseModel
+
+from src.benchmarks.metrics import MS_PER_SECOND, latency_summary, write_report
+from src.models.micro_batcher import MicroBatcher
+from src.models.wrapped_client import WrappedChatCompletionClient
+
+SENTENCES = ["I am happy.", "This is so sad.", "The bus leaves at noon.", "What a great day!", "I lost my keys again."]
+INSTRUCTIONS = "Categorize the input as happy, sad, or neutral following the JSON format."
+
+
+class Sentiment(BaseModel):
+    thoughts: str
+    response: Literal["happy", "sad", "neutral"]
+
+
+def _label(text: str) -> Dict[str, str]:
+    lowered = text.lower()
+    response = "happy" if "happy" in lowered or "great" in lowered else "sad" if "sad" in lowered or "lost" in lowered else "neutral"
+    return {"thoughts": f"The input reads as {response}.", "response": response}
+
+
+class SimulatedClassifierClient(WrappedChatCompletionClient):
+    """Model endpoint stand-in: bounded concurrency, per-call overhead and per-item cost."""
+
+    def __init__(self, capacity: int, overhead_seconds: float, per_item_seconds: float, corrupt_rate: float, seed: int) -> None:
+        super().__init__(ReplayChatCompletionClient(["unused"]))
+        self._slots = asyncio.Semaphore(capacity)
+        self._overhead = overhead_seconds
+        self._per_item = per_item_seconds
+        self._corrupt_rate = corrupt_rate
+        self._rng = random.Random(seed)
+        self.calls = 0
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        text = str(messages[-1].content)
+        batched = isinstance(json_output, type) and "results" in json_output.model_fields
+        items = json.loads(text) if batched else [{"index": 0, "input": text}]
+        async with self._slots:
+            self.calls += 1
+            await asyncio.sleep(self._overhead + self._per_item * len(items))
+        if batched:
+            results = [{"index": item["index"], **_label(item["input"])} for item in items]
+            if len(results) > 1 and self._rng.random() < self._corrupt_rate:
+                results.pop(self._rng.randrange(len(results)))
+            content = json.dumps({"results": results})
+        else:
+            content = json.dumps(_label(text))
+        usage = RequestUsage(prompt_tokens=len(text) // 4, completion_tokens=len(content) // 4)
+        return CreateResult(finish_reason="stop", content=content, usage=usage, cached=False)
+
+
+async def run_window(window_ms: float, args: argparse.Namespace) -> Dict[str, Any]:
+    """Replay the arrival stream through a batcher with `window_ms`."""
+    client = SimulatedClassifierClient(
+        args.capacity, args.overhead_ms / MS_PER_SECOND, args.per_item_ms / MS_PER_SECOND, args.corrupt_rate, args.seed
+    )
+    max_batch = args.max_batch if window_ms > 0 else 1
+    batcher = MicroBatcher(client, Sentiment, INSTRUCTIONS, window_ms=window_ms, max_batch=max_batch)
+    rng = random.Random(args.seed)
+    samples: List[float] = []
+    wrong = 0
+
+    async def request(text: str) -> None:
+        nonlocal wrong
+        started = time.perf_counter()
+        result = await batcher.submit(text)
+        samples.append((time.perf_counter() - started) * MS_PER_SECOND)
+        wrong += result.response != _label(text)["response"]
+
+    started = time.perf_counter()
+    pending = []
+    for _ in range(args.requests):
+        pending.append(asyncio.create_task(request(rng.choice(SENTENCES))))
+        await asyncio.sleep(rng.expovariate(args.rate))
+    await asyncio.gather(*pending)
+    seconds = time.perf_counter() - started
+    return {
+        "requests_per_second": args.requests / seconds,
+        "latency": latency_summary(samples),
+        "model_calls": client.calls,
+        "wrong_results": wrong,
+        "batcher": batcher.describe(),
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    report: Dict[str, Any] = {
+        "requests": args.requests,
+        "arrival_rate": args.rate,
+        "endpoint": {"capacity": args.capacity, "overhead_ms": args.overhead_ms, "per_item_ms": args.per_item_ms},
+        "windows_ms": {},
+    }
+    for window_ms in args.windows:
+        report["windows_ms"][str(window_ms)] = await run_window(window_ms, args)
+    return report
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Structured-output micro-batching benchmark")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=200.0, help="Mean arrivals per second")
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 5, 20, 50], help="Batch windows in ms; 0 = unbatched")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--capacity", type=int, default=16, help="Calls the endpoint serves at once")
+    parser.add_argument("--overhead-ms", type=float, default=200.0, help="Fixed cost per call")
+    parser.add_argument("--per-item-ms", type=float, default=4.0, help="Extra cost per classified input")
+    parser.add_argument("--corrupt-rate", type=float, default=0.05, help="Share of batched responses missing an item")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    print(write_report(asyncio.run(run_benchmark(args)), args.output))
+
+
+if __name__ == "__main__":
+    main()
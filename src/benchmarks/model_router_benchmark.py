@@ -0,0 +1,218 @@
+"""
+Benchmark: strong-only vs cheap-only vs ModelRouter on a mixed multi-agent workload.
+
+``--tasks`` concurrent tasks each run ``--turns`` sequential model calls drawn from the turn mix
+of the product-dev and selector teams: acknowledgements, speaker routing, short summaries, tool
+calls, structured replies and long analyses. Every turn has a hidden difficulty; a simulated model
+answers correctly when the difficulty is within its capability and otherwise fails, a
+``--detectable`` share of the time visibly (empty text, malformed JSON or tool arguments) and
+otherwise with a plausible but wrong answer that no local check can catch.
+
+Reported per mode: mean and p99 task latency, cost per task (list prices of the simulated
+models), share of turns answered correctly, and for the router its per-route report.
+
+Run:
+
+    python -m src.benchmarks.model_router_benchmark --tasks 20 --turns 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Literal, Mapping, Optional, Sequence
+
+from autogen_core import CancellationToken, FunctionCall
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, ModelInfo, RequestUsage, UserMessage
+from autogen_core.tools import Tool, ToolSchema
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from pydantic import BaseModel
+
+from src.benchmarks.metrics import MS_PER_SECOND, latency_summary, write_report
+from src.models.model_router import ModelRouter
+from src.models.usage_accounting import DEFAULT_PRICES
+from src.models.wrapped_client import WrappedChatCompletionClient
+from src.utils.token_utils import count_message_tokens
+
+CHEAP_MODEL = "gpt-4o-mini"
+STRONG_MODEL = "gpt-4o"
+WRONG = "confidently wrong"
+SEARCH_TOOL: ToolSchema = {
+    "name": "search_web",
+    "description": "Search the web.",
+    "parameters": {"type": "object", "properties": {"query": {"type": "string"}}, "required": ["query"]},
+}
+
+
+class Verdict(BaseModel):
+    decision: Literal["approve", "revise"]
+    reason: str
+
+
+@dataclass(frozen=True)
+class TurnKind:
+    """One kind of turn: its newest-message size, reply size, hidden difficulty and what it asks for."""
+
+    name: str
+    message_words: int
+    reply_tokens: int
+    difficulty: float
+    tools: bool = False
+    structured: bool = False
+
+
+TURN_MIX = [
+    TurnKind("acknowledge", 8, 15, 0.10),
+    TurnKind("route", 40, 5, 0.20),
+    TurnKind("summarize", 250, 120, 0.40),
+    TurnKind("tool_call", 60, 30, 0.45, tools=True),
+    TurnKind("structured", 120, 60, 0.55, structured=True),
+    TurnKind("analyze", 700, 400, 0.80),
+]
+TURN_WEIGHTS = [0.25, 0.20, 0.20, 0.15, 0.10, 0.10]
+
+
+class SimulatedModelClient(WrappedChatCompletionClient):
+    """Model stand-in with a latency profile and a capability that decides which turns it gets right."""
+
+    def __init__(
+        self,
+        model: str,
+        overhead_seconds: float,
+        seconds_per_token: float,
+        capability: float,
+        detectable: float,
+        seed: int,
+    ) -> None:
+        super().__init__(ReplayChatCompletionClient(["unused"]))
+        self._create_args = {"model": model}  # Read by client_model_name, as on the OpenAI client
+        self._overhead = overhead_seconds
+        self._per_token = seconds_per_token
+        self._capability = capability
+        self._detectable = detectable
+        self._rng = random.Random(seed)
+        self._usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return ModelInfo(vision=False, function_calling=True, json_output=True, family="unknown", structured_output=True)
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        last = str(messages[-1].content)
+        difficulty = float(re.search(r"difficulty=([0-9.]+)", last).group(1))  # type: ignore[union-attr]
+        reply_tokens = int(re.search(r"reply=([0-9]+)", last).group(1))  # type: ignore[union-attr]
+        correct = difficulty + self._rng.gauss(0.0, 0.05) <= self._capability
+        visible = not correct and self._rng.random() < self._detectable
+        await asyncio.sleep(self._overhead + self._per_token * reply_tokens)
+        content: str | List[FunctionCall]
+        if tools:
+            arguments = "{'query': " if visible else json.dumps({"query": "market size" if correct else WRONG})
+            content = [FunctionCall(id="call-1", name="search_web", arguments=arguments)]
+        elif json_output:
+            reason = "Meets the acceptance criteria." if correct else WRONG
+            content = "{decision: approve" if visible else Verdict(decision="approve", reason=reason).model_dump_json()
+        else:
+            content = "" if visible else "Done: " + ("ok " * reply_tokens if correct else WRONG)
+        usage = RequestUsage(prompt_tokens=sum(count_message_tokens(m) for m in messages), completion_tokens=reply_tokens)
+        self._usage = RequestUsage(
+            prompt_tokens=self._usage.prompt_tokens + usage.prompt_tokens,
+            completion_tokens=self._usage.completion_tokens + usage.completion_tokens,
+        )
+        return CreateResult(finish_reason="stop", content=content, usage=usage, cached=False)
+
+    def total_usage(self) -> RequestUsage:
+        return self._usage
+
+
+def answered_correctly(result: CreateResult) -> bool:
+    if isinstance(result.content, str):
+        return bool(result.content) and WRONG not in result.content and not result.content.startswith("{decision")
+    return all(call.arguments.startswith("{\"") and WRONG not in call.arguments for call in result.content)
+
+
+def make_clients(args: argparse.Namespace, seed: int) -> Dict[str, ChatCompletionClient]:
+    cheap = SimulatedModelClient(CHEAP_MODEL, args.cheap_overhead_ms / MS_PER_SECOND, args.cheap_ms_per_token / MS_PER_SECOND, args.cheap_capability, args.detectable, seed)
+    strong = SimulatedModelClient(STRONG_MODEL, args.strong_overhead_ms / MS_PER_SECOND, args.strong_ms_per_token / MS_PER_SECOND, args.strong_capability, args.detectable, seed + 1)
+    return {"cheap": cheap, "strong": strong}
+
+
+async def run_mode(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    clients = make_clients(args, args.seed)
+    router = ModelRouter(clients["cheap"], clients["strong"], seed=args.seed) if mode == "router" else None
+    client = router if router is not None else clients[mode.replace("_only", "")]
+    rng = random.Random(args.seed)
+    task_seconds: List[float] = []
+    correct = 0
+
+    async def task(index: int) -> None:
+        nonlocal correct
+        history: List[LLMMessage] = [UserMessage(content=f"Task {index}: plan and ship a product feature. " * 20, source="user")]
+        started = time.perf_counter()
+        for _ in range(args.turns):
+            kind = rng.choices(TURN_MIX, TURN_WEIGHTS)[0]
+            text = f"[{kind.name} difficulty={kind.difficulty} reply={kind.reply_tokens}] " + "detail " * kind.message_words
+            history.append(UserMessage(content=text, source="agent"))
+            result = await client.create(
+                history,
+                tools=[SEARCH_TOOL] if kind.tools else [],
+                json_output=Verdict if kind.structured else None,
+            )
+            correct += answered_correctly(result)
+            history.append(UserMessage(content=str(result.content), source="assistant"))
+        task_seconds.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(task(index) for index in range(args.tasks)))
+    cost = DEFAULT_PRICES[CHEAP_MODEL].cost(clients["cheap"].total_usage()) + DEFAULT_PRICES[STRONG_MODEL].cost(
+        clients["strong"].total_usage()
+    )
+    report: Dict[str, Any] = {
+        "task_latency": latency_summary([seconds * MS_PER_SECOND for seconds in task_seconds]),
+        "cost_per_task": cost / args.tasks,
+        "correct_share": correct / (args.tasks * args.turns),
+    }
+    if router is not None:
+        report["router"] = router.report()
+    return report
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"tasks": args.tasks, "turns_per_task": args.turns, "modes": {}}
+    for mode in ("strong_only", "cheap_only", "router"):
+        report["modes"][mode] = await run_mode(mode, args)
+    return report
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Complexity-based model routing benchmark")
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=8, help="Model calls per task")
+    parser.add_argument("--cheap-overhead-ms", type=float, default=150.0)
+    parser.add_argument("--cheap-ms-per-token", type=float, default=2.0)
+    parser.add_argument("--cheap-capability", type=float, default=0.5, help="Hardest turn difficulty the cheap model gets right")
+    parser.add_argument("--strong-overhead-ms", type=float, default=300.0)
+    parser.add_argument("--strong-ms-per-token", type=float, default=6.0)
+    parser.add_argument("--strong-capability", type=float, default=0.95)
+    parser.add_argument("--detectable", type=float, default=0.7, help="Share of wrong answers local checks can catch")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    print(write_report(asyncio.run(run_benchmark(args)), args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+RAG ingestion and retrieval benchmark suite.
+
+Ingests a synthetic (or local) corpus through `SimpleDocumentIndexer` into each registered memory
+backend and measures:
+- ingestion throughput (docs/sec, chunks/sec),
+- `query` latency (mean/p50/p99),
+- Python heap footprint of the ingested backend (tracemalloc; native allocations such as
+  ChromaDB's are not visible to it),
+- recall@k against the corpus ground truth, for ranked backends only: ListMemory returns every
+  item in insertion order, so its "top k" says nothing about retrieval quality and it is reported
+  with ``"ranked": false`` and no recall (it stays in the suite as the latency/footprint baseline).
+
+Ingestion runs with tracemalloc active, so throughput numbers are only comparable between runs of
+this suite, not with production measurements.
+
+Backends whose optional dependencies are missing are reported as skipped. Results are written as
+sorted JSON together with the git commit, so runs from two versions can be diffed directly.
+
+Run:
+
+    python -m src.benchmarks.rag_benchmark --docs 500 --output rag_bench.json
+    python -m src.benchmarks.rag_benchmark --corpus-dir ./docs --backends list_memory hybrid_lexical
+
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from autogen_core.memory import ListMemory, Memory
+
+from src.benchmarks.metrics import MS_PER_SECOND, latency_summary, recall_at_k, write_report
+from src.benchmarks.synthetic_corpus import SyntheticDocument, SyntheticQuery, generate_corpus, load_corpus_dir
+from src.memory.document_indexer import SimpleDocumentIndexer
+from src.memory.hybrid_memory import HybridMemory
+from src.memory.ranked_list_memory import RankedListMemory
+
+DEFAULT_CHUNK_SIZE = 1500  # Characters per chunk, matching SimpleDocumentIndexer's default
+MAX_BENCHMARK_QUERIES = 500  # Caps query phase duration on large corpora
+
+BackendFactory = Callable[[int, str], Memory | None]
+
+
+def _chromadb_memory(k: int, workdir: str) -> Memory | None:
+    try:
+        from autogen_ext.memory.chromadb import ChromaDBVectorMemory, PersistentChromaDBVectorMemoryConfig
+    except ImportError:
+        return None
+    return ChromaDBVectorMemory(
+        config=PersistentChromaDBVectorMemoryConfig(
+            collection_name="rag_benchmark", persistence_path=workdir, k=k, score_threshold=0.4
+        )
+    )
+
+
+def _hybrid_chromadb_memory(k: int, workdir: str) -> Memory | None:
+    vector_memory = _chromadb_memory(k, workdir)
+    return HybridMemory(vector_memory=vector_memory, k=k) if vector_memory is not None else None
+
+
+# Registry of benchmarked backends: name -> factory(k, scratch_dir), returning None when unavailable.
+BACKENDS: Dict[str, BackendFactory] = {
+    "list_memory": lambda k, workdir: ListMemory(),
+    "ranked_list_memory": lambda k, workdir: RankedListMemory(),
+    "chromadb_vector": _chromadb_memory,
+    "hybrid_lexical": lambda k, workdir: HybridMemory(vector_memory=None, k=k),
+    "hybrid_chromadb": _hybrid_chromadb_memory,
+}
+UNRANKED_BACKENDS = {"list_memory"}  # Return all items unordered by relevance; recall@k is not reported
+
+
+def _write_corpus_files(documents: List[SyntheticDocument], directory: Path) -> Dict[str, str]:
+    """Write each document to its own file; returns file path -> doc_id."""
+    source_to_doc: Dict[str, str] = {}
+    for document in documents:
+        path = directory / f"{document.doc_id}.txt"
+        path.write_text(document.text, encoding="utf-8")
+        source_to_doc[str(path)] = document.doc_id
+    return source_to_doc
+
+
+async def _measure_ingestion(memory: Memory, sources: List[str], chunk_size: int) -> Dict[str, Any]:
+    """Index every source and record throughput and retained Python heap."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    chunks = await SimpleDocumentIndexer(memory=memory, chunk_size=chunk_size).index_documents(sources)
+    elapsed = time.perf_counter() - started
+    retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "docs": len(sources),
+        "chunks": chunks,
+        "seconds": elapsed,
+        "docs_per_sec": len(sources) / elapsed,
+        "chunks_per_sec": chunks / elapsed,
+        "heap_retained_bytes": retained_bytes,
+        "heap_peak_bytes": peak_bytes,
+    }
+
+
+async def _measure_queries(
+    memory: Memory, queries: List[SyntheticQuery], source_to_doc: Dict[str, str], k: int, ranked: bool
+) -> Dict[str, Any]:
+    """Run labelled queries and record latency and, for ranked backends, recall@k of the top-k results.
+
+    Recall is left out when there are no queries (an empty corpus, or files without a unique term).
+    """
+    latencies_ms: List[float] = []
+    recalls: List[float] = []
+    for query in queries:
+        started = time.perf_counter()
+        result = await memory.query(query.text)
+        latencies_ms.append((time.perf_counter() - started) * MS_PER_SECOND)
+        if ranked:
+            retrieved_ids = [source_to_doc.get(str((item.metadata or {}).get("source")), "") for item in result.results[:k]]
+            recalls.append(recall_at_k(retrieved_ids, query))
+    report: Dict[str, Any] = {"queries": len(queries), "ranked": ranked, **latency_summary(latencies_ms)}
+    if recalls:
+        report["recall_at_k"] = sum(recalls) / len(recalls)
+    return report
+
+
+async def benchmark_backend(
+    name: str, documents: List[SyntheticDocument], queries: List[SyntheticQuery], k: int, chunk_size: int
+) -> Dict[str, Any]:
+    """Benchmark one registered backend on a fresh scratch directory."""
+    with tempfile.TemporaryDirectory() as workdir:
+        memory = BACKENDS[name](k, workdir)
+        if memory is None:
+            return {"skipped": "optional dependency not installed"}
+        corpus_dir = Path(workdir) / "corpus"
+        corpus_dir.mkdir()
+        source_to_doc = _write_corpus_files(documents, corpus_dir)
+        try:
+            ingestion = await _measure_ingestion(memory, list(source_to_doc), chunk_size)
+            retrieval = await _measure_queries(memory, queries, source_to_doc, k, ranked=name not in UNRANKED_BACKENDS)
+        finally:
+            await memory.close()
+    return {"ingestion": ingestion, "query": retrieval}
+
+
+def _run_metadata(corpus: str, num_docs: int, num_queries: int, k: int) -> Dict[str, Any]:
+    """Describe the environment so reports from different versions can be compared."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "corpus": corpus,
+        "docs": num_docs,
+        "queries": num_queries,
+        "k": k,
+    }
+
+
+async def run_suite(
+    backends: List[str], num_docs: int, corpus_dir: str | None, k: int, chunk_size: int
+) -> Dict[str, Any]:
+    """Benchmark every requested backend on the same corpus and return the report."""
+    if corpus_dir:
+        documents, queries = load_corpus_dir(corpus_dir)
+    else:
+        documents, queries = generate_corpus(num_docs)
+    queries = queries[:MAX_BENCHMARK_QUERIES]
+    report: Dict[str, Any] = {
+        "meta": _run_metadata(corpus_dir or "synthetic", len(documents), len(queries), k),
+        "backends": {},
+    }
+    for name in backends:
+        report["backends"][name] = await benchmark_backend(name, documents, queries, k, chunk_size)
+    return report
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="RAG ingestion and retrieval benchmark suite")
+    parser.add_argument("--docs", type=int, default=500, help="Synthetic corpus size (ignored with --corpus-dir)")
+    parser.add_argument("--corpus-dir", help="Load .txt/.md files from this directory instead of generating")
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS), default=sorted(BACKENDS))
+    parser.add_argument("--k", type=int, default=3, help="Results per query used for recall@k")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Indexer chunk size in characters")
+    parser.add_argument("--output", help="Path for the JSON report")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_suite(args.backends, args.docs, args.corpus_dir, args.k, args.chunk_size))
+    print(write_report(report, args.output))
+
+
+if __name__ == "__main__":
+    main()
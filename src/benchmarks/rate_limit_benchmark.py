@@ -0,0 +1,129 @@
+"""
+Benchmark: unthrottled concurrency vs AdaptiveLimiter against a rate-limited provider.
+
+A batch job fires ``--batch-calls`` completions at once while ``--sessions`` interactive sessions
+make one call every ``--think-ms``. Both go to a `StandInAPI` that serves ``--capacity`` calls at
+a time, answers 503 when its queue is full and 429 past ``--rpm`` / ``--tpm``:
+
+- `unlimited`: every call goes straight to the client, retried by the OpenAI SDK (its defaults),
+- `limited`: calls are admitted by an AdaptiveLimiter configured with the account's limits, the batch
+  at Priority.BATCH, the sessions at Priority.INTERACTIVE, and the SDK's retries are disabled.
+
+Reported per mode: batch wall time and throughput, failed calls, the provider's 429/503 counts and
+interactive call latency.
+
+Run:
+
+    python -m src.benchmarks.rate_limit_benchmark --batch-calls 240 --rpm 1800 --sessions 3
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from autogen_core.models import ChatCompletionClient, UserMessage
+
+from src.benchmarks.metrics import MS_PER_SECOND, latency_summary, write_report
+from src.benchmarks.stand_in_api import StandInAPI
+from src.models.rate_limited_client import AdaptiveLimiter, Priority, RateLimits
+
+MODEL = "gpt-4o-mini"
+MAX_TOKENS = 20  # Completion tokens requested per call
+SESSION_START_SECONDS = 0.5  # Sessions start once the batch is in full swing
+
+
+async def _call(client: ChatCompletionClient, text: str) -> None:
+    await client.create([UserMessage(content=text, source="user")], extra_create_args={"max_tokens": MAX_TOKENS})
+
+
+async def _batch(client: ChatCompletionClient, calls: int) -> Dict[str, Any]:
+    started = time.perf_counter()
+    results = await asyncio.gather(*(_call(client, f"batch item {i}") for i in range(calls)), return_exceptions=True)
+    seconds = time.perf_counter() - started
+    failed = sum(isinstance(result, BaseException) for result in results)
+    return {"seconds": seconds, "failed": failed, "calls_per_second": (calls - failed) / seconds}
+
+
+async def _session(client: ChatCompletionClient, calls: int, think_seconds: float, samples: List[float]) -> int:
+    await asyncio.sleep(SESSION_START_SECONDS)
+    failed = 0
+    for turn in range(calls):
+        started = time.perf_counter()
+        try:
+            await _call(client, f"interactive turn {turn}")
+            samples.append((time.perf_counter() - started) * MS_PER_SECOND)
+        except Exception:
+            failed += 1
+        await asyncio.sleep(think_seconds)
+    return failed
+
+
+async def run_mode(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the mixed workload once in `mode` against a fresh stand-in provider."""
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+    async with StandInAPI(
+        service_seconds=args.service_ms / MS_PER_SECOND,
+        capacity=args.capacity,
+        queue_limit=args.queue_limit,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+    ) as api:
+        report: Dict[str, Any] = {}
+        if mode == "unlimited":
+            raw = OpenAIChatCompletionClient(model=MODEL, base_url=api.base_url, api_key="local")
+            batch_client: ChatCompletionClient = raw
+            session_client: ChatCompletionClient = raw
+        else:
+            raw = OpenAIChatCompletionClient(model=MODEL, base_url=api.base_url, api_key="local", max_retries=0)
+            limiter = AdaptiveLimiter(RateLimits(requests_per_minute=args.rpm, tokens_per_minute=args.tpm))
+            batch_client = limiter.client(raw, priority=Priority.BATCH)
+            session_client = limiter.client(raw)
+        samples: List[float] = []
+        batch, *session_failures = await asyncio.gather(
+            _batch(batch_client, args.batch_calls),
+            *(_session(session_client, args.session_calls, args.think_ms / MS_PER_SECOND, samples) for _ in range(args.sessions)),
+        )
+        report["batch"] = batch
+        report["interactive"] = {"failed": sum(session_failures), **(latency_summary(samples) if samples else {})}
+        report["provider"] = api.counters()
+        if mode == "limited":
+            report["limiter"] = {**dict(limiter.stats), "final_concurrency": limiter.concurrency}
+        await raw.close()
+    return report
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run both modes on the same workload."""
+    report: Dict[str, Any] = {
+        "batch_calls": args.batch_calls,
+        "sessions": args.sessions,
+        "provider_limits": {"rpm": args.rpm, "tpm": args.tpm, "capacity": args.capacity, "queue_limit": args.queue_limit},
+    }
+    for mode in ("unlimited", "limited"):
+        report[mode] = await run_mode(mode, args)
+    return report
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Adaptive rate limiting benchmark")
+    parser.add_argument("--batch-calls", type=int, default=240)
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--session-calls", type=int, default=10)
+    parser.add_argument("--think-ms", type=float, default=300.0, help="Pause between a session's calls")
+    parser.add_argument("--rpm", type=float, default=1800.0, help="Provider requests per minute")
+    parser.add_argument("--tpm", type=float, default=90_000.0, help="Provider tokens per minute")
+    parser.add_argument("--capacity", type=int, default=8, help="Calls the provider serves at once")
+    parser.add_argument("--queue-limit", type=int, default=16, help="Calls the provider queues before 503s")
+    parser.add_argument("--service-ms", type=float, default=50.0, help="Provider time per call")
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    print(write_report(asyncio.run(run_benchmark(args)), args.output))
+
+
+if __name__ == "__main__":
+    main()
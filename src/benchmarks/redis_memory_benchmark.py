@@ -0,0 +1,116 @@
+"""
+Benchmark: per-item vs pipelined bulk writes and filtered reads for PipelinedRedisMemory.
+
+Uses a deterministic local hashing embedder (with optional simulated per-call latency standing
+in for a remote embedding API), so the only external dependency is a local Redis server with
+the Query Engine (Redis 8+ or Redis Stack), e.g. `docker run -d -p 6379:6379 redis:8`.
+
+Run:
+
+    python -m src.benchmarks.redis_memory_benchmark --items 1000 --embed-latency-ms 20
+
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import time
+from typing import Any, Dict, List
+
+from autogen_core.memory import MemoryContent, MemoryMimeType
+
+from src.benchmarks.metrics import MS_PER_SECOND, latency_summary, write_report
+from src.memory.hybrid_memory import tokenize
+from src.memory.redis_bulk_memory import Embedder, PipelinedRedisMemory, PipelinedRedisMemoryConfig
+
+EMBEDDING_DIMENSIONS = 64  # Size of the hashing-trick vectors
+READ_REPETITIONS = 50  # Filtered reads sampled per mode
+PREFERENCE_TYPES = ["units", "dietary", "language", "timezone"]  # Values of the `type` metadata key
+
+
+def hashing_embedder(latency_ms: float = 0.0) -> Embedder:
+    """Build a bag-of-words hashing embedder that sleeps `latency_ms` once per call (i.e. per batch)."""
+
+    async def embed(texts: List[str]) -> List[List[float]]:
+        if latency_ms:
+            await asyncio.sleep(latency_ms / MS_PER_SECOND)
+        vectors: List[List[float]] = []
+        for text in texts:
+            vector = [0.0] * EMBEDDING_DIMENSIONS
+            for token in tokenize(text):
+                vector[int(hashlib.md5(token.encode()).hexdigest(), 16) % EMBEDDING_DIMENSIONS] += 1.0
+            vector[0] += 1e-6  # Avoid zero vectors, which cosine distance cannot handle
+            vectors.append(vector)
+        return vectors
+
+    return embed
+
+
+def _preferences(count: int) -> List[MemoryContent]:
+    return [
+        MemoryContent(
+            content=f"User preference {i}: prefers option {i % 7} for {PREFERENCE_TYPES[i % len(PREFERENCE_TYPES)]}",
+            mime_type=MemoryMimeType.TEXT,
+            metadata={"category": "preferences", "type": PREFERENCE_TYPES[i % len(PREFERENCE_TYPES)]},
+        )
+        for i in range(count)
+    ]
+
+
+async def _timed_reads(read: Any) -> Dict[str, float]:
+    samples_ms: List[float] = []
+    for _ in range(READ_REPETITIONS):
+        started = time.perf_counter()
+        await read()
+        samples_ms.append((time.perf_counter() - started) * MS_PER_SECOND)
+    return latency_summary(samples_ms)
+
+
+async def _measure_writes(memory: PipelinedRedisMemory, items: List[MemoryContent], bulk: bool) -> Dict[str, float]:
+    await memory.clear()
+    started = time.perf_counter()
+    if bulk:
+        await memory.add_many(items)
+    else:
+        for item in items:
+            await memory.add(item)
+    elapsed = time.perf_counter() - started
+    return {"seconds": elapsed, "items_per_sec": len(items) / elapsed}
+
+
+async def run_benchmark(redis_url: str, item_count: int, embed_latency_ms: float) -> Dict[str, Any]:
+    """Measure write throughput and filtered read latency against a local Redis."""
+    config = PipelinedRedisMemoryConfig(redis_url=redis_url, index_name="bench_bulk_memory", prefix="bench_bulk")
+    memory = PipelinedRedisMemory(config=config, embedder=hashing_embedder(embed_latency_ms))
+    items = _preferences(item_count)
+    report: Dict[str, Any] = {"items": item_count, "embed_latency_ms": embed_latency_ms}
+    try:
+        report["per_item_add"] = await _measure_writes(memory, items, bulk=False)
+        report["add_many"] = await _measure_writes(memory, items, bulk=True)
+        report["get_all_filtered"] = await _timed_reads(lambda: memory.get_all({"category": "preferences"}))
+        report["query_filtered"] = await _timed_reads(
+            lambda: memory.query("metric units", metadata_filter={"type": "units"})
+        )
+        report["history_items_loaded"] = len((await memory.get_all({"category": "preferences"})).results)
+        await memory.clear()
+    finally:
+        await memory.close()
+    return report
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="PipelinedRedisMemory write/read benchmark")
+    parser.add_argument("--redis-url", default="redis://localhost:6379")
+    parser.add_argument("--items", type=int, default=1000, help="Preferences written per mode")
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0, help="Simulated latency per embedder call")
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args.redis_url, args.items, args.embed_latency_ms))
+    print(write_report(report, args.output))
+
+
+if __name__ == "__main__":
+    main()
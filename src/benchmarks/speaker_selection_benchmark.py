@@ -0,0 +1,147 @@
+"""
+Benchmark: local speaker selection vs the model selector of SelectorGroupChat.
+
+Replays logged speaker selections (a JSONL log written by `LocalSpeakerSelector`, or a synthetic
+log of Planner / WebSearch / DataAnalyst turns whose labels stand in for the model's choices) and
+reports, per mode, the share of selection calls answered locally and their agreement with the model:
+
+- `router`: the keyword router over agent names and descriptions only,
+- `classifier`: the naive Bayes classifier trained on the first ``--train-fraction`` of the log,
+- `online`: the whole log replayed in order as a live run; the model is called (and learned from)
+  only when the selector defers, including its exploration audits.
+
+Run:
+
+    python -m src.benchmarks.speaker_selection_benchmark --examples 2000
+    python -m src.benchmarks.speaker_selection_benchmark --log .cache/selections.jsonl
+
+"""
+from __future__ import annotations
+
+import argparse
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+from src.benchmarks.metrics import write_report
+from src.teams.local_speaker_selector import (
+    DEFAULT_CONFIDENCE_THRESHOLD,
+    DEFAULT_MIN_TRAINING_EXAMPLES,
+    LocalSpeakerSelector,
+    SelectionExample,
+    load_selection_log,
+    selection_accuracy,
+)
+
+MODEL_NOISE = 0.05  # Share of synthetic labels where the model picks a different candidate
+
+
+@dataclass(frozen=True)
+class StandInAgent:
+    """Name and description of a participant, as the selector sees it."""
+
+    name: str
+    description: str
+
+
+AGENTS = [
+    StandInAgent("Planner", "Frames the user's request and suggests subtasks."),
+    StandInAgent("WebSearch", "Performs web lookups and returns short summaries."),
+    StandInAgent("DataAnalyst", "Analyzes numeric data and reports simple statistics."),
+]
+
+# (speaker, message template, who the model routes to next)
+TURN_TEMPLATES = [
+    ("user", "Investigate recent price movement for {item} and report a short summary.", "Planner"),
+    ("user", "How did {item} sales change over the last {n} quarters?", "Planner"),
+    ("Planner", "WebSearch: look up the latest {item} prices and news.", "WebSearch"),
+    ("Planner", "First find sources on {item} demand in {region}.", "WebSearch"),
+    ("Planner", "DataAnalyst: compute the percentage change for the {item} series.", "DataAnalyst"),
+    ("Planner", "Calculate growth between the first and last {item} figures.", "DataAnalyst"),
+    ("WebSearch", "Result A for '{item} price {region}': {n} units at ${n}.", "DataAnalyst"),
+    ("WebSearch", "Found {n} articles on {item}; prices rose from {n} to {n}.", "DataAnalyst"),
+    ("WebSearch", "No numeric data found for {item} in {region}.", "Planner"),
+    ("DataAnalyst", "The {item} price changed by {n}.5% over the period.", "Planner"),
+    ("DataAnalyst", "Need more data points for {item} before computing a trend.", "WebSearch"),
+    ("DataAnalyst", "Summary statistics for {item}: mean {n}, change {n}%. Done.", "Planner"),
+]
+ITEMS = ["ACME widget", "gadget", "solar panel", "coffee", "lumber", "GPU"]
+REGIONS = ["Europe", "Asia", "the US", "LATAM"]
+
+
+def synthetic_log(count: int, seed: int) -> List[SelectionExample]:
+    """Selections over templated turns, labelled by the template's route with some model noise."""
+    rng = random.Random(seed)
+    names = [agent.name for agent in AGENTS]
+    examples = []
+    for _ in range(count):
+        source, template, route = rng.choice(TURN_TEMPLATES)
+        text = template.format(item=rng.choice(ITEMS), region=rng.choice(REGIONS), n=rng.randint(2, 900))
+        candidates = [name for name in names if name != source]
+        selected = route if rng.random() >= MODEL_NOISE else rng.choice(candidates)
+        examples.append(SelectionExample(text, source, candidates, selected))
+    return examples
+
+
+def _selector(threshold: float, min_training_examples: int) -> LocalSpeakerSelector:
+    return LocalSpeakerSelector(
+        AGENTS,  # type: ignore[arg-type]  # Only names and descriptions are read
+        confidence_threshold=threshold,
+        min_training_examples=min_training_examples,
+        seed=0,
+    )
+
+
+def replay_online(examples: Sequence[SelectionExample], threshold: float, min_training_examples: int) -> Dict[str, Any]:
+    """Replay selections in order as a live run: the model is asked only when the selector defers."""
+    selector = _selector(threshold, min_training_examples)
+    agreed = 0
+    for example in examples:
+        speaker = selector.select(example.text, example.last_source, example.candidates)
+        if speaker is None:
+            selector.record_model_choice(example.selected)
+        else:
+            agreed += speaker == example.selected
+    model_calls = selector.stats["model_fallback"] + selector.stats["explored"]
+    answered = len(examples) - model_calls
+    return {
+        "examples": len(examples),
+        "model_calls": model_calls,
+        "calls_avoided_rate": answered / len(examples) if examples else 0.0,
+        "accuracy_when_answered": agreed / answered if answered else 0.0,
+        "audited_agreement": selector.agreement_rate,
+    }
+
+
+def run_benchmark(examples: Sequence[SelectionExample], train_fraction: float, threshold: float) -> Dict[str, Any]:
+    """Compare the router, the trained classifier and the online replay on the same log."""
+    split = int(len(examples) * train_fraction)
+    train, test = examples[:split], examples[split:]
+    report: Dict[str, Any] = {"train_examples": len(train), "test_examples": len(test), "threshold": threshold}
+
+    report["router"] = selection_accuracy(_selector(threshold, min_training_examples=len(examples) + 1), test)
+    classifier = _selector(threshold, min_training_examples=1)
+    for example in train:
+        classifier.learn(example)
+    report["classifier"] = selection_accuracy(classifier, test)
+    report["online"] = replay_online(examples, threshold, min_training_examples=min(DEFAULT_MIN_TRAINING_EXAMPLES, max(1, split)))
+    return report
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Local speaker selection benchmark")
+    parser.add_argument("--log", help="JSONL selection log; a synthetic log is generated when omitted")
+    parser.add_argument("--examples", type=int, default=2000)
+    parser.add_argument("--train-fraction", type=float, default=0.2)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_CONFIDENCE_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    examples = load_selection_log(args.log) if args.log else synthetic_log(args.examples, args.seed)
+    print(write_report(run_benchmark(examples, args.train_fraction, args.threshold), args.output))
+
+
+if __name__ == "__main__":
+    main()
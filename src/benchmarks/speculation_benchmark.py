@@ -0,0 +1,179 @@
+"""
+Benchmark: latency saved vs tokens wasted by SpeculativeGraphFlow's branch speculation.
+
+A review graph of stand-in agents: writer -> reviewer, then reviewer -> summary on "APPROVE" and
+reviewer -> reviser otherwise. The reviewer streams its reply in chunks (``--first-chunk-ms`` to the
+first one, ``--chunk-ms`` between the others). It approves with probability ``--approve-rate``, and
+``--chatty-rate`` of its approvals add a remark after "APPROVE" ("APPROVE - nice work."), which
+still takes the summary branch but with an input the speculation did not predict. The summary
+takes ``--summary-ms`` and reports ``--summary-tokens`` tokens of model usage.
+
+Both modes replay the same reviewer replies; each reports run latency (mean, p50, p99) and, for the
+speculative mode, hits, misses, cancelled runs, seconds saved, and the tokens and run time of
+discarded speculative runs.
+
+Run:
+
+    python -m src.benchmarks.speculation_benchmark --runs 50 --approve-rate 0.6 --chatty-rate 0.3
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Any, AsyncGenerator, Dict, List, Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, ModelClientStreamingChunkEvent, TextMessage
+from autogen_agentchat.teams import DiGraphBuilder
+from autogen_core import CancellationToken
+from autogen_core.models import RequestUsage
+
+from src.agents.speculative_agent import SpeculativeAgent
+from src.benchmarks.metrics import MS_PER_SECOND, latency_summary, write_report
+from src.teams.speculative_graph_flow import BranchSpeculation, SpeculativeGraphFlow, likely_replies
+
+APPROVAL = "APPROVE"
+CHATTY_APPROVAL = "APPROVE - clear and concise, nice work."
+REJECTION = "Please tighten the second paragraph and add a concrete example."
+CHUNK_CHARS = 4  # Characters per streamed chunk, roughly one token
+
+
+class StreamingReviewer(BaseChatAgent):
+    """Stand-in decider that streams scripted replies chunk by chunk, like a streaming model client."""
+
+    def __init__(self, name: str, replies: Sequence[str], first_chunk_seconds: float, chunk_seconds: float) -> None:
+        super().__init__(name, description="Reviews drafts")
+        self._replies = list(replies)
+        self._turn = 0
+        self._first_chunk_seconds = first_chunk_seconds
+        self._chunk_seconds = chunk_seconds
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (TextMessage,)
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        response: Response | None = None
+        async for item in self.on_messages_stream(messages, cancellation_token):
+            if isinstance(item, Response):
+                response = item
+        assert response is not None
+        return response
+
+    async def on_messages_stream(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
+        reply = self._replies[self._turn % len(self._replies)]
+        self._turn += 1
+        await asyncio.sleep(self._first_chunk_seconds)
+        for start in range(0, len(reply), CHUNK_CHARS):
+            if start:
+                await asyncio.sleep(self._chunk_seconds)
+            yield ModelClientStreamingChunkEvent(content=reply[start : start + CHUNK_CHARS], source=self.name)
+        yield Response(chat_message=TextMessage(content=reply, source=self.name))
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        pass
+
+
+class TimedAgent(BaseChatAgent):
+    """Stand-in node that takes a fixed time and reports the usage of one model call."""
+
+    def __init__(self, name: str, seconds: float, tokens: int = 0) -> None:
+        super().__init__(name, description=f"Takes {seconds:.3f}s")
+        self._seconds = seconds
+        self._tokens = tokens
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (TextMessage,)
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        await asyncio.sleep(self._seconds)
+        usage = RequestUsage(prompt_tokens=self._tokens, completion_tokens=0)
+        return Response(chat_message=TextMessage(content=f"{self.name} done", source=self.name, models_usage=usage))
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        pass
+
+
+def reviewer_replies(runs: int, approve_rate: float, chatty_rate: float, seed: int) -> List[str]:
+    """The reviewer's reply in each run."""
+    rng = random.Random(seed)
+    replies = []
+    for _ in range(runs):
+        if rng.random() >= approve_rate:
+            replies.append(REJECTION)
+        else:
+            replies.append(CHATTY_APPROVAL if rng.random() < chatty_rate else APPROVAL)
+    return replies
+
+
+def build_flow(replies: Sequence[str], speculate: bool, args: argparse.Namespace) -> SpeculativeGraphFlow:
+    """The review graph; without `speculate` it runs like a plain GraphFlow."""
+    writer = TimedAgent("writer", args.node_ms / MS_PER_SECOND)
+    reviewer = StreamingReviewer(
+        "reviewer", replies, args.first_chunk_ms / MS_PER_SECOND, args.chunk_ms / MS_PER_SECOND
+    )
+    summary = SpeculativeAgent(TimedAgent("summary", args.summary_ms / MS_PER_SECOND, args.summary_tokens))
+    reviser = TimedAgent("reviser", args.node_ms / MS_PER_SECOND)
+    builder = DiGraphBuilder()
+    builder.add_node(writer).add_node(reviewer).add_node(summary).add_node(reviser)
+    builder.add_edge(writer, reviewer)
+    builder.add_edge(reviewer, summary, condition=lambda message: APPROVAL in message.to_model_text())
+    builder.add_edge(reviewer, reviser, condition=lambda message: APPROVAL not in message.to_model_text())
+    speculations = [BranchSpeculation("reviewer", likely_replies(APPROVAL))] if speculate else []
+    return SpeculativeGraphFlow(builder.get_participants(), graph=builder.build(), speculations=speculations)
+
+
+async def run_mode(replies: Sequence[str], speculate: bool, args: argparse.Namespace) -> Dict[str, Any]:
+    flow = build_flow(replies, speculate, args)
+    latencies: List[float] = []
+    for _ in replies:
+        started = time.perf_counter()
+        await flow.run(task="Draft a product description.")
+        latencies.append((time.perf_counter() - started) * MS_PER_SECOND)
+    report: Dict[str, Any] = {"run_latency": latency_summary(latencies)}
+    if speculate:
+        report["speculation"] = flow.speculation_report()["total"]
+    return report
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    replies = reviewer_replies(args.runs, args.approve_rate, args.chatty_rate, args.seed)
+    off = await run_mode(replies, speculate=False, args=args)
+    on = await run_mode(replies, speculate=True, args=args)
+    saved_ms = off["run_latency"]["mean_ms"] - on["run_latency"]["mean_ms"]
+    return {
+        "runs": args.runs,
+        "replies": {reply: replies.count(reply) for reply in (APPROVAL, CHATTY_APPROVAL, REJECTION)},
+        "summary_tokens": args.summary_tokens,
+        "modes": {"off": off, "speculative": on},
+        "mean_ms_saved_per_run": saved_ms,
+        "tokens_wasted_per_run": on["speculation"]["tokens_wasted"] / args.runs,
+    }
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Branch speculation benchmark")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--approve-rate", type=float, default=0.6)
+    parser.add_argument("--chatty-rate", type=float, default=0.3, help="Approvals with a trailing remark")
+    parser.add_argument("--first-chunk-ms", type=float, default=40.0, help="Reviewer time to first chunk")
+    parser.add_argument("--chunk-ms", type=float, default=10.0, help="Time between reviewer chunks")
+    parser.add_argument("--summary-ms", type=float, default=30.0)
+    parser.add_argument("--summary-tokens", type=int, default=800)
+    parser.add_argument("--node-ms", type=float, default=5.0, help="Writer and reviser time")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    print(write_report(asyncio.run(run_benchmark(args)), args.output))
+
+
+if __name__ == "__main__":
+    main()
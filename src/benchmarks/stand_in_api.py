@@ -0,0 +1,260 @@
+"""
+Local stand-in for the OpenAI chat completions API, for benchmarks of client-side behaviour.
+
+`StandInAPI` is a minimal keep-alive HTTP/1.1 server that answers every request with a fixed chat
+completion, after modelling what a remote provider costs and enforces:
+
+- connection setup (``setup_seconds`` on the first request of each connection, like TCP + TLS),
+- service time, with at most ``capacity`` requests served at once (more queue, so latency rises
+  with offered concurrency) and 503s once ``queue_limit`` requests are waiting; ``service_sigma``
+  makes it log-normal (heavy-tailed) around a median of ``service_seconds``,
+- request- and token-per-minute limits, answered with 429 and ``retry-after``/``retry-after-ms``
+  headers like the OpenAI API,
+- streaming (``"stream": true``): server-sent chunks, one token each, the first after
+  ``service_seconds`` and the rest every ``chunk_seconds``, with a usage chunk when requested.
+
+Point ``OpenAIChatCompletionClient(base_url=api.base_url, api_key=...)`` at it; its counters say
+how many connections, requests, 429s and 503s the run caused, and how many requests were served
+after the client had hung up (``abandoned``; the provider still did, and bills, that work).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import time
+from typing import Any, Dict
+
+CHARS_PER_TOKEN = 4  # How the stand-in counts prompt tokens
+DEFAULT_COMPLETION_TOKENS = 20  # Completion length when the request sets no max_tokens
+RETRY_AFTER_FLOOR_SECONDS = 0.05  # Smallest retry-after the stand-in sends
+
+
+class StandInAPI:
+    """Chat completions stand-in with connection setup, queueing and rate limits.
+
+    Args:
+        setup_seconds: Delay of the first request on each new connection.
+        service_seconds: Time to serve one request once it has a serving slot.
+        capacity: Requests served concurrently; None for unlimited.
+        queue_limit: Requests allowed to wait for a slot before answering 503; None for unlimited.
+        requests_per_minute: Request limit (token bucket with a one-second burst); None for unlimited.
+        tokens_per_minute: Prompt + completion token limit, same bucket shape; None for unlimited.
+        chunk_seconds: Interval between streamed tokens after the first.
+        service_sigma: Log-space standard deviation of the service time; 0 serves in exactly `service_seconds`.
+        seed: Seed of the service time sampling.
+    """
+
+    def __init__(
+        self,
+        setup_seconds: float = 0.0,
+        service_seconds: float = 0.0,
+        capacity: int | None = None,
+        queue_limit: int | None = None,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        chunk_seconds: float = 0.0,
+        service_sigma: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        self._setup_seconds = setup_seconds
+        self._chunk_seconds = chunk_seconds
+        self._service_seconds = service_seconds
+        self._service_sigma = service_sigma
+        self._rng = random.Random(seed)
+        self._slots = asyncio.Semaphore(capacity) if capacity is not None else None
+        self._queue_limit = queue_limit
+        self._buckets = {
+            name: _Bucket(limit / 60.0) for name, limit in (("requests", requests_per_minute), ("tokens", tokens_per_minute)) if limit
+        }
+        self._server: asyncio.AbstractServer | None = None
+        self._waiting = 0
+        self.connections = 0
+        self.requests = 0
+        self.throttled = 0  # 429 responses
+        self.overloaded = 0  # 503 responses
+        self.completed = 0
+        self.abandoned = 0  # Served after the client closed the connection
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    def counters(self) -> Dict[str, int]:
+        return {
+            "connections": self.connections,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "overloaded": self.overloaded,
+            "completed": self.completed,
+            "abandoned": self.abandoned,
+        }
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> StandInAPI:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        first = True
+        try:
+            while True:
+                header = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in header.decode("latin-1").split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                body = await reader.readexactly(length) if length else b""
+                if first:
+                    await asyncio.sleep(self._setup_seconds)  # Connection setup, paid once per connection
+                    first = False
+                if header.startswith(b"HEAD "):  # Warm-up probe: headers only
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+                else:
+                    self.requests += 1
+                    await self._respond(json.loads(body) if body else {}, reader, writer)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, request: Dict[str, Any], reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        completion_tokens = int(request.get("max_tokens") or DEFAULT_COMPLETION_TOKENS)
+        prompt_tokens = len(json.dumps(request.get("messages", []))) // CHARS_PER_TOKEN
+        amounts = {"requests": 1, "tokens": prompt_tokens + completion_tokens}
+        retry_after = max((bucket.wait(amounts[name]) for name, bucket in self._buckets.items()), default=0.0)
+        if retry_after > 0:
+            self.throttled += 1
+            retry_after = max(retry_after, RETRY_AFTER_FLOOR_SECONDS)
+            headers = {"retry-after": str(math.ceil(retry_after)), "retry-after-ms": str(int(retry_after * 1000))}
+            writer.write(_render(429, headers, _error("Rate limit reached", "rate_limit_exceeded")))
+            return
+        for name, bucket in self._buckets.items():
+            bucket.take(amounts[name])
+        if self._queue_limit is not None and self._waiting >= self._queue_limit:
+            self.overloaded += 1
+            writer.write(_render(503, {}, _error("The server is overloaded", "server_overloaded")))
+            return
+        self._waiting += 1
+        try:
+            if self._slots is not None:
+                await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            service = self._service_seconds
+            if self._service_sigma:
+                service *= self._rng.lognormvariate(0.0, self._service_sigma)
+            await asyncio.sleep(service)
+            if reader.at_eof():  # The client gave up (e.g. a cancelled hedge); the work is done anyway
+                self.abandoned += 1
+                return
+            model = request.get("model", "gpt-4o-mini")
+            if request.get("stream"):
+                include_usage = bool((request.get("stream_options") or {}).get("include_usage"))
+                await self._stream(writer, model, prompt_tokens, completion_tokens, include_usage)
+            else:
+                writer.write(_render(200, {}, _completion(model, prompt_tokens, completion_tokens)))
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+        self.completed += 1
+
+    async def _stream(
+        self, writer: asyncio.StreamWriter, model: str, prompt_tokens: int, completion_tokens: int, include_usage: bool
+    ) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nConnection: keep-alive\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        for index in range(completion_tokens):
+            if index:
+                await asyncio.sleep(self._chunk_seconds)
+            writer.write(_event(_chunk(model, {"content": "tok "}, None)))
+            await writer.drain()
+        writer.write(_event(_chunk(model, {}, "stop")))
+        if include_usage:
+            usage = {**_chunk(model, {}, None), "choices": [], "usage": _usage(prompt_tokens, completion_tokens)}
+            writer.write(_event(usage))
+        writer.write(_http_chunk(b"data: [DONE]\n\n") + b"0\r\n\r\n")
+
+
+class _Bucket:
+    """Token bucket holding one second of its rate."""
+
+    def __init__(self, rate: float) -> None:
+        self._rate = rate
+        self._level = rate
+        self._updated = time.monotonic()
+
+    def wait(self, amount: float) -> float:
+        """Seconds until `amount` can be taken (amounts above the burst need a full bucket)."""
+        now = time.monotonic()
+        self._level = min(self._rate, self._level + (now - self._updated) * self._rate)
+        self._updated = now
+        return max(0.0, (min(amount, self._rate) - self._level) / self._rate)
+
+    def take(self, amount: float) -> None:
+        self._level -= amount
+
+
+def _completion(model: str, prompt_tokens: int, completion_tokens: int) -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-stand-in",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+        "usage": _usage(prompt_tokens, completion_tokens),
+    }
+
+
+def _chunk(model: str, delta: Dict[str, Any], finish_reason: str | None) -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-stand-in",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+def _usage(prompt_tokens: int, completion_tokens: int) -> Dict[str, int]:
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+
+
+def _error(message: str, code: str) -> Dict[str, Any]:
+    return {"error": {"message": message, "type": "requests", "code": code}}
+
+
+def _http_chunk(data: bytes) -> bytes:
+    return f"{len(data):x}\r\n".encode() + data + b"\r\n"
+
+
+def _event(payload: Dict[str, Any]) -> bytes:
+    """One server-sent event as an HTTP chunk."""
+    return _http_chunk(f"data: {json.dumps(payload)}\n\n".encode())
+
+
+def _render(status: int, headers: Dict[str, str], payload: Dict[str, Any]) -> bytes:
+    reason = {200: "OK", 429: "Too Many Requests", 503: "Service Unavailable"}[status]
+    body = json.dumps(payload).encode()
+    lines = [f"HTTP/1.1 {status} {reason}", "Content-Type: application/json", "Connection: keep-alive"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    lines.append(f"Content-Length: {len(body)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
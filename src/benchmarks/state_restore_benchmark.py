@@ -0,0 +1,105 @@
+"""
+Benchmark: restoring long model-context histories eagerly vs from memory-mapped logs.
+
+For each history length, saves a context holding that many messages, then restores it repeatedly
+and reads the model window (`get_messages`), comparing:
+
+- `buffered`: BufferedChatCompletionContext, whose load_state validates every message,
+- `mapped`: MappedHistoryChatCompletionContext, which maps the saved log and decodes only the window.
+
+Run:
+
+    python -m src.benchmarks.state_restore_benchmark --messages 1000 10000 50000
+
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Mapping
+
+from autogen_core.model_context import BufferedChatCompletionContext, ChatCompletionContext
+from autogen_core.models import AssistantMessage, LLMMessage, UserMessage
+
+from src.benchmarks.metrics import MS_PER_SECOND, latency_summary, write_report
+from src.model_context.mapped_history_context import MappedHistoryChatCompletionContext
+
+BUFFER_SIZE = 20  # Messages sent to the model after a restore
+RESTORES_PER_LENGTH = 20  # Restores sampled per history length and context
+BYTES_PER_KIB = 1024
+
+
+def _history(length: int) -> List[LLMMessage]:
+    messages: List[LLMMessage] = []
+    for i in range(length):
+        text = f"Turn {i}: " + "discussion of the refund policy and flight options " * 4
+        messages.append(
+            UserMessage(content=text, source="user") if i % 2 == 0 else AssistantMessage(content=text, source="agent")
+        )
+    return messages
+
+
+async def _saved_state(context: ChatCompletionContext, messages: List[LLMMessage]) -> Mapping[str, Any]:
+    for message in messages:
+        await context.add_message(message)
+    # Round-trip through JSON, as a state persisted to disk or a database would be.
+    return json.loads(json.dumps(await context.save_state()))
+
+
+async def _measure(factory: Callable[[], ChatCompletionContext], messages: List[LLMMessage]) -> Dict[str, Any]:
+    state = await _saved_state(factory(), messages)
+    samples_ms: List[float] = []
+    for _ in range(RESTORES_PER_LENGTH):
+        context = factory()
+        started = time.perf_counter()
+        await context.load_state(state)
+        await context.get_messages()
+        samples_ms.append((time.perf_counter() - started) * MS_PER_SECOND)
+
+    tracemalloc.start()
+    context = factory()
+    await context.load_state(state)
+    window = await context.get_messages()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "restore_ms": latency_summary(samples_ms),
+        "restores_per_sec": MS_PER_SECOND / (sum(samples_ms) / len(samples_ms)),
+        "peak_heap_kib": peak / BYTES_PER_KIB,
+        "window_messages": len(window),
+    }
+
+
+async def run_benchmark(lengths: List[int]) -> Dict[str, Any]:
+    """Compare restore latency and peak heap per history length."""
+    report: Dict[str, Any] = {"buffer_size": BUFFER_SIZE, "results": {}}
+    with tempfile.TemporaryDirectory() as history_dir:
+        factories: Dict[str, Callable[[], ChatCompletionContext]] = {
+            "buffered": lambda: BufferedChatCompletionContext(buffer_size=BUFFER_SIZE),
+            "mapped": lambda: MappedHistoryChatCompletionContext(buffer_size=BUFFER_SIZE, history_dir=history_dir),
+        }
+        for length in lengths:
+            messages = _history(length)
+            report["results"][str(length)] = {
+                name: await _measure(factory, messages) for name, factory in factories.items()
+            }
+    return report
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Model context restore benchmark")
+    parser.add_argument("--messages", type=int, nargs="+", default=[1000, 10000], help="History lengths")
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args.messages))
+    print(write_report(report, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: accuracy and overhead of the streaming metrics of InstrumentedChatCompletionClient.
+
+- `accuracy`: streamed calls to a `StandInAPI` with a known first-token delay (``--ttft-ms``) and
+  chunk interval (``--chunk-ms``), consumed by a callback that spends ``--consumer-ms`` per chunk;
+  the recorded TTFT, gaps and network/consumer split should match the configured values,
+- `overhead`: per-chunk cost of the instrumentation on a local replay stream (no network), next to
+  iterating the raw stream.
+
+Run:
+
+    python -m src.benchmarks.stream_metrics_benchmark --calls 10 --ttft-ms 150 --chunk-ms 10 --consumer-ms 2
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict
+
+from autogen_core.models import ChatCompletionClient, UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from src.benchmarks.metrics import MS_PER_SECOND, write_report
+from src.benchmarks.stand_in_api import StandInAPI
+from src.models.stream_metrics import StreamMetricsRecorder
+
+MODEL = "gpt-4o-mini"
+OVERHEAD_REPLY_WORDS = 2000  # Replay chunks per overhead call
+
+
+async def _consume(client: ChatCompletionClient, max_tokens: int, consumer_seconds: float) -> None:
+    async for _ in client.create_stream(
+        [UserMessage(content="Stream something.", source="user")],
+        extra_create_args={"max_tokens": max_tokens, "stream_options": {"include_usage": True}},
+    ):
+        if consumer_seconds:
+            await asyncio.sleep(consumer_seconds)  # Stands in for rendering and agent callbacks
+
+
+async def run_accuracy(args: argparse.Namespace) -> Dict[str, Any]:
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+    recorder = StreamMetricsRecorder()
+    async with StandInAPI(service_seconds=args.ttft_ms / MS_PER_SECOND, chunk_seconds=args.chunk_ms / MS_PER_SECOND) as api:
+        raw = OpenAIChatCompletionClient(model=MODEL, base_url=api.base_url, api_key="local")
+        await _consume(raw, 1, 0.0)  # Untimed: connection setup and first-call costs
+        client = recorder.instrument(raw, "streamer")
+        token = recorder.begin_run("accuracy")
+        for _ in range(args.calls):
+            await _consume(client, args.tokens, args.consumer_ms / MS_PER_SECOND)
+        report = recorder.end_run(token)
+        await raw.close()
+    return {
+        "configured": {"ttft_ms": args.ttft_ms, "chunk_ms": args.chunk_ms, "consumer_ms_per_chunk": args.consumer_ms, "tokens": args.tokens},
+        "measured": report["total"],
+    }
+
+
+async def run_overhead(chunks: int) -> Dict[str, Any]:
+    reply = " ".join(["word"] * chunks)
+    timings: Dict[str, float] = {}
+    for mode in ("raw", "instrumented"):
+        raw = ReplayChatCompletionClient([reply])
+        client: ChatCompletionClient = raw if mode == "raw" else StreamMetricsRecorder().instrument(raw, "replay")
+        started = time.perf_counter()
+        count = 0
+        async for _ in client.create_stream([UserMessage(content="go", source="user")]):
+            count += 1
+        timings[f"{mode}_us_per_chunk"] = (time.perf_counter() - started) / count * 1e6
+    timings["overhead_us_per_chunk"] = timings["instrumented_us_per_chunk"] - timings["raw_us_per_chunk"]
+    return timings
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    return {"accuracy": await run_accuracy(args), "overhead": await run_overhead(OVERHEAD_REPLY_WORDS)}
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Streaming metrics benchmark")
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--tokens", type=int, default=50, help="Streamed tokens per call")
+    parser.add_argument("--ttft-ms", type=float, default=150.0)
+    parser.add_argument("--chunk-ms", type=float, default=10.0)
+    parser.add_argument("--consumer-ms", type=float, default=2.0, help="Callback time per chunk")
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    print(write_report(asyncio.run(run_benchmark(args)), args.output))
+
+
+if __name__ == "__main__":
+    main()
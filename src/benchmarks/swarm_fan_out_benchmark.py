@@ -0,0 +1,132 @@
+"""
+Benchmark: sequential Swarm handoffs vs FanOutSwarm's concurrent specialists.
+
+A stand-in planner delegates to ``--specialists`` independent specialists, each of which sleeps for
+its own duration (standing in for tool and model calls) and hands back to the planner:
+
+- `swarm`: the stock Swarm, one handoff after another (latency ~ sum of the specialists),
+- `fan_out`: FanOutSwarm with one handoff to a fan-out group (latency ~ the slowest specialist).
+
+Run:
+
+    python -m src.benchmarks.swarm_fan_out_benchmark --specialists 4
+
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Any, Dict, List, Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.conditions import TextMentionTermination
+from autogen_agentchat.messages import BaseChatMessage, HandoffMessage, TextMessage
+from autogen_agentchat.teams import Swarm
+from autogen_core import CancellationToken
+
+from src.benchmarks.metrics import write_report
+from src.teams.fan_out_swarm import FanOutSwarm
+
+MIN_SPECIALIST_SECONDS = 0.05  # Shortest simulated specialist turn
+MAX_SPECIALIST_SECONDS = 0.25  # Longest simulated specialist turn
+FAN_OUT_GROUP = "specialists"  # Fan-out group name used by the planner
+
+
+class ScriptedPlanner(BaseChatAgent):
+    """Stand-in coordinator that hands off to each target of its script in turn, then terminates."""
+
+    def __init__(self, targets: Sequence[str]) -> None:
+        super().__init__("planner", description="Delegates to the specialists.")
+        self._targets = list(targets)
+        self._turn = 0
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (HandoffMessage, TextMessage)
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        if self._turn < len(self._targets):
+            target = self._targets[self._turn]
+            self._turn += 1
+            return Response(chat_message=HandoffMessage(content=f"Over to {target}", target=target, source=self.name))
+        return Response(chat_message=TextMessage(content="Research complete. TERMINATE", source=self.name))
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        self._turn = 0
+
+
+class SleepSpecialist(BaseChatAgent):
+    """Stand-in specialist that works for a fixed duration and hands back to the planner."""
+
+    def __init__(self, name: str, seconds: float) -> None:
+        super().__init__(name, description=f"Works {seconds:.3f}s")
+        self.seconds = seconds
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (HandoffMessage,)
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        await asyncio.sleep(self.seconds)
+        return Response(chat_message=HandoffMessage(content=f"{self.name} findings", target="planner", source=self.name))
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        pass
+
+
+def build_specialists(count: int, seed: int) -> List[SleepSpecialist]:
+    rng = random.Random(seed)
+    return [
+        SleepSpecialist(f"specialist_{i}", rng.uniform(MIN_SPECIALIST_SECONDS, MAX_SPECIALIST_SECONDS))
+        for i in range(count)
+    ]
+
+
+async def _timed_run(team: Swarm) -> Dict[str, Any]:
+    started = time.perf_counter()
+    result = await team.run(task="Conduct market research for TSLA stock")
+    return {
+        "wall_clock_seconds": time.perf_counter() - started,
+        "specialist_replies": sum(1 for message in result.messages if message.source.startswith("specialist_")),
+    }
+
+
+async def run_benchmark(specialists: int, seed: int) -> Dict[str, Any]:
+    """Run the same delegation sequentially and as one fan-out."""
+    agents = build_specialists(specialists, seed)
+    names = [agent.name for agent in agents]
+    durations = [agent.seconds for agent in agents]
+    report: Dict[str, Any] = {
+        "specialists": specialists,
+        "sum_specialist_seconds": sum(durations),
+        "max_specialist_seconds": max(durations),
+    }
+    termination = TextMentionTermination("TERMINATE")
+    report["swarm"] = await _timed_run(Swarm([ScriptedPlanner(names), *agents], termination_condition=termination))
+    report["fan_out"] = await _timed_run(
+        FanOutSwarm(
+            [ScriptedPlanner([FAN_OUT_GROUP]), *build_specialists(specialists, seed)],
+            fan_out={FAN_OUT_GROUP: names},
+            termination_condition=termination,
+        )
+    )
+    report["speedup"] = report["swarm"]["wall_clock_seconds"] / report["fan_out"]["wall_clock_seconds"]
+    return report
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Swarm fan-out benchmark")
+    parser.add_argument("--specialists", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    print(write_report(asyncio.run(run_benchmark(args.specialists, args.seed)), args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Deterministic synthetic corpus for offline retrieval benchmarks.
+
+This module provides:
+- SyntheticDocument / SyntheticQuery: Corpus items and labelled queries.
+- generate_corpus: Builds documents that each mention exact identifiers (API names, ticker
+  symbols, flight numbers) plus topical filler, and one query per identifier.
+- load_corpus_dir: Loads local text files and labels each with a query on a term unique to it.
+
+Every query has exactly one relevant document, so recall@k can be computed without an LLM judge.
+"""
+from __future__ import annotations
+
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from src.memory.hybrid_memory import tokenize
+
+DEFAULT_SEED = 7  # Fixed seed so benchmark runs are comparable across versions
+CORPUS_FILE_PATTERNS = ("*.txt", "*.md")  # Files picked up by load_corpus_dir
+SOURCES = ["api_reference.md", "market_notes.md", "flight_ops.md"]  # Values for the `source` metadata key
+
+_TOPIC_WORDS = [
+    "latency", "throughput", "refund", "booking", "portfolio", "earnings", "schedule", "delay",
+    "request", "response", "customer", "agent", "market", "volume", "pricing", "policy",
+    "handoff", "memory", "context", "workflow", "analysis", "report", "summary", "forecast",
+]
+_API_VERBS = ["get", "list", "create", "update", "cancel", "refund", "search", "compute"]
+_API_NOUNS = ["order", "flight", "quote", "stock_data", "news", "booking", "invoice", "ticket"]
+_AIRLINE_CODES = ["LH", "BA", "AA", "TK", "AF", "UA", "DL", "KL"]
+
+
+@dataclass(frozen=True)
+class SyntheticDocument:
+    """A corpus document with its ground-truth id and metadata."""
+
+    doc_id: str
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class SyntheticQuery:
+    """A query with the ids of the documents considered relevant."""
+
+    text: str
+    relevant_ids: Tuple[str, ...]
+    kind: str
+
+
+def _identifier(rng: random.Random, source: str, index: int) -> Tuple[str, str]:
+    """Return a unique (identifier, query template) pair for the given source."""
+    if source == "api_reference.md":
+        name = f"{rng.choice(_API_VERBS)}_{rng.choice(_API_NOUNS)}_v{index}"
+        return name, f"How do I call {name}?"
+    if source == "market_notes.md":
+        ticker = "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(3)) + str(index)
+        return ticker, f"What is the outlook for {ticker}?"
+    flight = f"{rng.choice(_AIRLINE_CODES)}{1000 + index}"
+    return flight, f"Was flight {flight} delayed?"
+
+
+def generate_corpus(
+    num_docs: int, words_per_doc: int = 120, seed: int = DEFAULT_SEED
+) -> Tuple[List[SyntheticDocument], List[SyntheticQuery]]:
+    """Generate a labelled identifier-lookup corpus.
+
+    Args:
+        num_docs: Number of documents to generate.
+        words_per_doc: Approximate length of each document in words.
+        seed: Random seed.
+
+    Returns:
+        The documents and one identifier query per document.
+    """
+    rng = random.Random(seed)
+    documents: List[SyntheticDocument] = []
+    queries: List[SyntheticQuery] = []
+    for index in range(num_docs):
+        source = SOURCES[index % len(SOURCES)]
+        identifier, query_text = _identifier(rng, source, index)
+        filler = rng.choices(_TOPIC_WORDS, k=words_per_doc)
+        filler.insert(rng.randrange(len(filler) + 1), identifier)
+        doc_id = f"doc-{index}"
+        documents.append(SyntheticDocument(doc_id, " ".join(filler), {"source": source, "doc_id": doc_id}))
+        queries.append(SyntheticQuery(query_text, (doc_id,), kind="identifier"))
+    return documents, queries
+
+
+def load_corpus_dir(directory: str) -> Tuple[List[SyntheticDocument], List[SyntheticQuery]]:
+    """Load `.txt`/`.md` files from a directory as a benchmark corpus.
+
+    Each file becomes one document. Its query is a term that occurs in no other file, which makes the
+    file the single relevant answer without manual labelling. Files with no unique term get no query.
+
+    Args:
+        directory: Directory searched recursively for corpus files.
+
+    Returns:
+        The documents and their auto-labelled queries.
+    """
+    paths = sorted(path for pattern in CORPUS_FILE_PATTERNS for path in Path(directory).rglob(pattern))
+    documents = [
+        SyntheticDocument(f"doc-{index}", path.read_text(encoding="utf-8"), {"source": path.name, "doc_id": f"doc-{index}"})
+        for index, path in enumerate(paths)
+    ]
+    document_terms = [set(tokenize(document.text)) for document in documents]
+    document_frequency = Counter(term for terms in document_terms for term in terms)
+    queries: List[SyntheticQuery] = []
+    for document, terms in zip(documents, document_terms):
+        unique_terms = sorted(term for term in terms if document_frequency[term] == 1)
+        if unique_terms:
+            queries.append(SyntheticQuery(unique_terms[0], (document.doc_id,), kind="rare_term"))
+    return documents, queries
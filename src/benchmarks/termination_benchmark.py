@@ -0,0 +1,117 @@
+"""
+Benchmark: OrTerminationCondition of separate conditions vs CompiledTermination.
+
+Evaluates a high-volume stream of messages (none of which mentions a stop word, the common case)
+under ``TextMentionTermination`` x ``--patterns`` | ``MaxMessageTermination`` | ``HandoffTermination``:
+
+- `messages`: per-delta latency of the original ``|`` combination and of its compiled form,
+- `chunks`: per-chunk cost of `CompiledTermination.scan_chunk` on streamed output, next to the
+  cost of just iterating the chunks (the overhead a stream consumer sees).
+
+Run:
+
+    python -m src.benchmarks.termination_benchmark --messages 20000 --patterns 2 8
+
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Any, Dict, List, Sequence
+
+from autogen_agentchat.base import TerminationCondition
+from autogen_agentchat.conditions import HandoffTermination, MaxMessageTermination, TextMentionTermination
+from autogen_agentchat.messages import ModelClientStreamingChunkEvent, TextMessage
+
+from src.benchmarks.metrics import MS_PER_SECOND, latency_summary, write_report
+from src.conditions.compiled_termination import compile_termination
+
+MESSAGE_WORDS = 200  # Words per simulated message
+CHUNK_CHARS = 12  # Characters per simulated streamed chunk
+STOP_WORDS = ["TERMINATE", "APPROVE", "DONE_ALL", "ESCALATE", "HANDBACK", "STOP_NOW", "FINAL_ANSWER", "ABORT_RUN"]
+VOCABULARY = ["the", "model", "review", "approved", "terminal", "data", "plan", "stop", "answer", "final", "run"]
+
+
+def build_condition(patterns: int, max_messages: int) -> TerminationCondition:
+    condition: TerminationCondition = MaxMessageTermination(max_messages) | HandoffTermination(target="user")
+    for word in STOP_WORDS[:patterns]:
+        condition = condition | TextMentionTermination(word)
+    return condition
+
+
+def build_messages(count: int, seed: int) -> List[TextMessage]:
+    rng = random.Random(seed)
+    return [
+        TextMessage(content=" ".join(rng.choices(VOCABULARY, k=MESSAGE_WORDS)), source=rng.choice(["a", "b", "c"]))
+        for _ in range(count)
+    ]
+
+
+async def _time_messages(condition: TerminationCondition, messages: Sequence[TextMessage]) -> Dict[str, float]:
+    samples: List[float] = []
+    for message in messages:
+        started = time.perf_counter()
+        stop = await condition([message])
+        samples.append((time.perf_counter() - started) * MS_PER_SECOND)
+        assert stop is None
+    return latency_summary(samples)
+
+
+def _time_chunks(messages: Sequence[TextMessage], patterns: int) -> Dict[str, float]:
+    compiled = compile_termination(build_condition(patterns, max_messages=len(messages) + 1))
+    chunks = [
+        ModelClientStreamingChunkEvent(content=message.content[i : i + CHUNK_CHARS], source=message.source)
+        for message in messages
+        for i in range(0, len(message.content), CHUNK_CHARS)
+    ]
+    started = time.perf_counter()
+    for chunk in chunks:
+        pass
+    iterate_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    for chunk in chunks:
+        compiled.scan_chunk(chunk)
+    scan_seconds = time.perf_counter() - started
+    characters = sum(len(chunk.content) for chunk in chunks)
+    return {
+        "chunks": len(chunks),
+        "iterate_us_per_chunk": iterate_seconds / len(chunks) * 1e6,
+        "scan_us_per_chunk": scan_seconds / len(chunks) * 1e6,
+        "scan_mb_per_second": characters / scan_seconds / 1e6,
+    }
+
+
+async def run_benchmark(message_count: int, pattern_counts: Sequence[int], seed: int) -> Dict[str, Any]:
+    """Time both forms for each number of text-mention conditions."""
+    messages = build_messages(message_count, seed)
+    report: Dict[str, Any] = {"messages": message_count, "message_words": MESSAGE_WORDS, "patterns": {}}
+    for patterns in pattern_counts:
+        original = await _time_messages(build_condition(patterns, message_count + 1), messages)
+        compiled = await _time_messages(compile_termination(build_condition(patterns, message_count + 1)), messages)
+        report["patterns"][str(patterns)] = {
+            "messages": {
+                "original": original,
+                "compiled": compiled,
+                "speedup_mean": original["mean_ms"] / compiled["mean_ms"],
+            },
+            "chunks": _time_chunks(messages, patterns),
+        }
+    return report
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Termination condition benchmark")
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--patterns", type=int, nargs="+", default=[2, 8])
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    print(write_report(asyncio.run(run_benchmark(args.messages, args.patterns, args.seed)), args.output))
+
+
+if __name__ == "__main__":
+    main()
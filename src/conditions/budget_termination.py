@@ -0,0 +1,64 @@
+"""
+Termination condition that stops a run when its token, cost or wall-clock budget is spent.
+
+`BudgetTermination` checks a :class:`~src.models.usage_accounting.UsageAccountant` after every turn,
+so spend from calls that produce no message (selectors, orchestrators, summarizers) counts too. The
+stop message says which limit was reached and where the budget went; the full breakdown of each
+finished run is kept in ``last_report``.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Sequence
+
+from autogen_agentchat.base import TerminatedException, TerminationCondition
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, StopMessage
+
+from src.models.usage_accounting import UsageAccountant
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetTermination(TerminationCondition):
+    """Stop the run when the accountant's budget is exceeded.
+
+    Teams reset their termination condition when a run ends; with ``per_run`` (the default) that
+    also snapshots the run's spend into ``last_report`` and starts a fresh budget for the next run.
+
+    Args:
+        accountant: The accountant metering the team's model clients, holding the budget.
+        per_run: Reset the accountant when the condition is reset, so each run gets the full budget.
+    """
+
+    def __init__(self, accountant: UsageAccountant, per_run: bool = True) -> None:
+        self._accountant = accountant
+        self._per_run = per_run
+        self._terminated = False
+        self.last_report: Dict[str, Any] | None = None
+
+    @property
+    def terminated(self) -> bool:
+        return self._terminated
+
+    @property
+    def accountant(self) -> UsageAccountant:
+        return self._accountant
+
+    async def __call__(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> StopMessage | None:
+        if self._terminated:
+            raise TerminatedException("Termination condition has already been reached")
+        reason = self._accountant.exceeded()
+        if reason is None:
+            return None
+        self._terminated = True
+        logger.info(f"Stopping run: {reason}; spent {self._accountant.summary()}")
+        return StopMessage(
+            content=f"Budget exceeded: {reason}. Spent {self._accountant.summary()}", source="BudgetTermination"
+        )
+
+    async def reset(self) -> None:
+        self._terminated = False
+        if self._per_run:
+            if self._accountant.total.calls:
+                self.last_report = self._accountant.report()
+            self._accountant.reset()
@@ -0,0 +1,258 @@
+"""
+Termination condition that evaluates all text mentions of a combined condition in one pass.
+
+Teams combine ``TextMentionTermination("TERMINATE") | TextMentionTermination("APPROVE") |
+MaxMessageTermination(...) | HandoffTermination(...)``; the resulting OrTerminationCondition calls
+every condition on every delta, and each text condition converts and scans each message again.
+`compile_termination` flattens such a combination into a `CompiledTermination`:
+
+- text mentions are merged into one compiled multi-pattern matcher per ``sources`` filter, so each
+  message's text is produced once (and cached by message id) and scanned once,
+- the other conditions are kept and evaluated as before,
+- `CompiledTermination.scan_chunk` scans streamed chunks incrementally (a pattern split across
+  chunks is still found), which `stop_on_stream` uses to stop a run as soon as a stop word streams.
+
+The multi-pattern matcher is a single regex alternation: CPython's regex engine scans it in one C
+pass, which is faster than an Aho-Corasick automaton stepped in Python for the handful of stop
+words teams use. Stop messages and ``terminated`` behave as with the original condition.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncGenerator, Dict, FrozenSet, List, Sequence, Tuple
+
+from autogen_agentchat.base import OrTerminationCondition, TaskResult, TerminatedException, TerminationCondition
+from autogen_agentchat.conditions import TextMentionTermination
+from autogen_agentchat.messages import (
+    BaseAgentEvent,
+    BaseChatMessage,
+    ModelClientStreamingChunkEvent,
+    StopMessage,
+)
+from autogen_core import CancellationToken, Component, ComponentModel
+from pydantic import BaseModel
+from typing_extensions import Self
+
+logger = logging.getLogger(__name__)
+
+TEXT_CACHE_SIZE = 256  # Message texts kept for re-evaluation (e.g. the same delta checked twice)
+TEXT_MENTION_SOURCE = "TextMentionTermination"  # StopMessage source used by TextMentionTermination
+
+SourceFilter = FrozenSet[str] | None  # None: messages of every source
+
+
+@dataclass(frozen=True)
+class TextMention:
+    """A text mention to stop on, with the sources it applies to."""
+
+    text: str
+    sources: SourceFilter = None
+
+    def applies_to(self, source: str) -> bool:
+        return self.sources is None or source in self.sources
+
+
+class MultiPatternMatcher:
+    """Finds whether any of several literal patterns occurs in a text, in one scan."""
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        unique = list(dict.fromkeys(patterns))
+        self._regex = re.compile("|".join(re.escape(pattern) for pattern in unique))
+        self.max_length = max((len(pattern) for pattern in unique), default=0)
+
+    def search(self, text: str) -> bool:
+        return self._regex.search(text) is not None
+
+
+class _TextCache:
+    """Bounded cache of message texts by message id."""
+
+    def __init__(self, size: int = TEXT_CACHE_SIZE) -> None:
+        self._size = size
+        self._texts: OrderedDict[str, str] = OrderedDict()
+
+    def text(self, message: BaseAgentEvent | BaseChatMessage) -> str:
+        cached = self._texts.get(message.id)
+        if cached is not None:
+            self._texts.move_to_end(message.id)
+            return cached
+        text = message.to_text()
+        self._texts[message.id] = text
+        if len(self._texts) > self._size:
+            self._texts.popitem(last=False)
+        return text
+
+    def clear(self) -> None:
+        self._texts.clear()
+
+
+class CompiledTerminationConfig(BaseModel):
+    """The declarative configuration for CompiledTermination (the conditions it was compiled from)."""
+
+    conditions: List[ComponentModel]
+
+
+class CompiledTermination(TerminationCondition, Component[CompiledTerminationConfig]):
+    """Any-of termination with the text mentions merged into compiled multi-pattern matchers.
+
+    Build it with :func:`compile_termination` from the condition a team would otherwise use.
+
+    Args:
+        mentions: Text mentions to stop on.
+        conditions: Other conditions, any of which stops the run.
+        source_conditions: The conditions this one was compiled from, for serialization.
+    """
+
+    component_config_schema = CompiledTerminationConfig
+    component_type = "termination"
+    component_provider_override = "src.conditions.compiled_termination.CompiledTermination"
+
+    def __init__(
+        self,
+        mentions: Sequence[TextMention],
+        conditions: Sequence[TerminationCondition] = (),
+        source_conditions: Sequence[TerminationCondition] | None = None,
+    ) -> None:
+        self._mentions = list(mentions)
+        self._conditions = list(conditions)
+        self._source_conditions = list(source_conditions) if source_conditions is not None else [*conditions]
+        by_filter: Dict[SourceFilter, List[str]] = {}
+        for mention in self._mentions:
+            by_filter.setdefault(mention.sources, []).append(mention.text)
+        self._matchers: List[Tuple[SourceFilter, MultiPatternMatcher]] = [
+            (sources, MultiPatternMatcher(texts)) for sources, texts in by_filter.items()
+        ]
+        self._carry = max((matcher.max_length for _, matcher in self._matchers), default=1) - 1
+        self._texts = _TextCache()
+        self._tails: Dict[str, str] = {}  # Source -> end of its streamed text, for patterns split across chunks
+        self._stream_stop: StopMessage | None = None
+        self._terminated = False
+
+    @property
+    def terminated(self) -> bool:
+        return self._terminated or any(condition.terminated for condition in self._conditions)
+
+    async def __call__(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> StopMessage | None:
+        if self.terminated:
+            raise TerminatedException("Termination condition has already been reached")
+        stop_messages = [stop] if (stop := self._stream_stop) is not None else self._mentioned(messages)
+        if stop_messages:
+            self._terminated = True
+        for condition in self._conditions:
+            # Awaited in turn rather than gathered: the checks are quick and gathering costs a task each.
+            if (result := await condition(messages)) is not None:
+                stop_messages.append(result)
+        if not stop_messages:
+            return None
+        return StopMessage(
+            content=", ".join(stop.content for stop in stop_messages),
+            source=", ".join(stop.source for stop in stop_messages),
+        )
+
+    def scan_chunk(self, chunk: ModelClientStreamingChunkEvent) -> StopMessage | None:
+        """Scan a streamed chunk; on a mention, the next evaluation stops the run with the returned message."""
+        if self._stream_stop is not None or not self._matchers:
+            return self._stream_stop
+        text = self._tails.get(chunk.source, "") + chunk.content
+        for sources, matcher in self._matchers:
+            if (sources is None or chunk.source in sources) and matcher.search(text):
+                mentioned = [mention.text for mention in self._mentions if mention.applies_to(chunk.source) and mention.text in text]
+                self._stream_stop = StopMessage(
+                    content=", ".join(f"Text '{mention}' mentioned" for mention in mentioned), source=TEXT_MENTION_SOURCE
+                )
+                return self._stream_stop
+        self._tails[chunk.source] = text[-self._carry :] if self._carry else ""
+        return None
+
+    async def reset(self) -> None:
+        self._terminated = False
+        self._stream_stop = None
+        self._tails.clear()
+        self._texts.clear()
+        for condition in self._conditions:
+            await condition.reset()
+
+    def _mentioned(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> List[StopMessage]:
+        """Stop messages of the text mentions found in `messages` (one scan per message on the no-match path)."""
+        hit = False
+        for message in messages:
+            if isinstance(message, BaseChatMessage):
+                # A new chat message ends its source's stream; partial text must not join the next one.
+                self._tails.pop(message.source, None)
+            for sources, matcher in self._matchers:
+                if (sources is None or message.source in sources) and matcher.search(self._texts.text(message)):
+                    hit = True
+                    break
+            if hit:
+                break
+        if not hit:
+            return []
+        # Rare path: report every mention that fired, as the separate conditions would.
+        return [
+            StopMessage(content=f"Text '{mention.text}' mentioned", source=TEXT_MENTION_SOURCE)
+            for mention in self._mentions
+            if any(
+                mention.applies_to(message.source) and mention.text in self._texts.text(message)
+                for message in messages
+            )
+        ]
+
+    def _to_config(self) -> CompiledTerminationConfig:
+        return CompiledTerminationConfig(conditions=[condition.dump_component() for condition in self._source_conditions])
+
+    @classmethod
+    def _from_config(cls, config: CompiledTerminationConfig) -> Self:
+        conditions = [TerminationCondition.load_component(condition) for condition in config.conditions]
+        compiled = compile_termination(OrTerminationCondition(*conditions))
+        assert isinstance(compiled, cls)
+        return compiled
+
+
+def _flatten(condition: TerminationCondition) -> List[TerminationCondition]:
+    if isinstance(condition, OrTerminationCondition):
+        return [leaf for child in condition._conditions for leaf in _flatten(child)]
+    return [condition]
+
+
+def compile_termination(condition: TerminationCondition) -> CompiledTermination:
+    """Compile an any-of combination (``a | b | ...``) into a :class:`CompiledTermination`.
+
+    TextMentionTermination leaves are merged into multi-pattern matchers; every other leaf
+    (including And-combinations) is kept as is.
+    """
+    leaves = _flatten(condition)
+    mentions: List[TextMention] = []
+    others: List[TerminationCondition] = []
+    for leaf in leaves:
+        if type(leaf) is TextMentionTermination:
+            sources = frozenset(leaf._sources) if leaf._sources is not None else None
+            mentions.append(TextMention(leaf._termination_text, sources))
+        else:
+            others.append(leaf)
+    return CompiledTermination(mentions, others, source_conditions=leaves)
+
+
+async def stop_on_stream(
+    stream: AsyncGenerator[BaseAgentEvent | BaseChatMessage | TaskResult, None],
+    termination: CompiledTermination,
+    cancellation_token: CancellationToken,
+) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | TaskResult, None]:
+    """Relay a team's ``run_stream`` and cancel the run as soon as a streamed chunk mentions a stop text.
+
+    Agents must stream (``model_client_stream=True``) and the run must use `cancellation_token`. On an
+    early stop the StopMessage is yielded last instead of a TaskResult; as with any cancelled run,
+    reset the team or reload its state before running it again.
+    """
+    try:
+        async for item in stream:
+            yield item
+            if isinstance(item, ModelClientStreamingChunkEvent) and (stop := termination.scan_chunk(item)) is not None:
+                logger.info(f"Stopping early on streamed output of {item.source}: {stop.content}")
+                cancellation_token.cancel()
+                yield stop
+                return
+    finally:
+        await stream.aclose()
@@ -0,0 +1,229 @@
+"""
+Termination condition that stops a writer/critic loop once its drafts stop changing.
+
+Critique loops often keep iterating with near-identical drafts until a MaxMessageTermination
+fires, paying for redundant round-trips. `ConvergenceTermination` compares each chat message with
+the previous one from the same source using word shingling (the share of word n-grams that
+changed, see :func:`change_ratio`) and stops once a source's successive outputs change less than
+``threshold`` for ``patience`` revisions in a row. The comparison is local and linear in the
+message length, so it costs nothing next to a model call.
+
+Shingling amplifies edits: with 3-word shingles, rewriting 1% of a draft's words changes about 6%
+of its shingles, so the default threshold of 0.1 stops on revisions that touch under ~2% of words.
+Run ``python -m src.benchmarks.convergence_benchmark`` to see how thresholds trade saved
+round-trips against the change still to come.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from typing import Dict, FrozenSet, List, Sequence, Tuple
+
+from autogen_agentchat.base import TerminatedException, TerminationCondition
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, StopMessage
+from autogen_core import Component
+from pydantic import BaseModel
+from typing_extensions import Self
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANGE_THRESHOLD = 0.1  # Share of shingles that may change between converged drafts
+DEFAULT_SHINGLE_SIZE = 3  # Words per shingle; 1 ignores word order
+MIN_COMPARED_WORDS = 20  # Shorter outputs (acks, "APPROVE") never count as converged drafts
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = DEFAULT_SHINGLE_SIZE) -> FrozenSet[str]:
+    """The set of `size`-word shingles of `text` (case- and punctuation-insensitive)."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return frozenset([" ".join(words)]) if words else frozenset()
+    return frozenset(" ".join(words[i : i + size]) for i in range(len(words) - size + 1))
+
+
+def change_ratio(previous: FrozenSet[str], current: FrozenSet[str]) -> float:
+    """Share of shingles not common to both drafts (1 - Jaccard similarity): 0.0 is identical."""
+    if not previous and not current:
+        return 0.0
+    return 1.0 - len(previous & current) / len(previous | current)
+
+
+class ConvergenceTerminationConfig(BaseModel):
+    """The declarative configuration for ConvergenceTermination."""
+
+    threshold: float = DEFAULT_CHANGE_THRESHOLD
+    patience: int = 1
+    sources: List[str] | None = None
+    shingle_size: int = DEFAULT_SHINGLE_SIZE
+    min_words: int = MIN_COMPARED_WORDS
+
+
+class ConvergenceTracker:
+    """Per-source convergence state: the previous draft's shingles and the run of converged revisions.
+
+    Also usable as a GraphFlow edge condition, to route a converged draft onward instead of stopping
+    the whole flow: ``builder.add_edge(writer, summary, condition=tracker)`` and
+    ``builder.add_edge(writer, reviewer, condition=lambda message: not tracker(message))``. Both
+    edges see the same message; it is compared only once.
+
+    Args:
+        threshold: Converged when the change ratio between successive outputs is at most this (0.0-1.0).
+        patience: Number of consecutive converged revisions required.
+        shingle_size: Words per shingle.
+        min_words: Outputs with fewer words are neither compared nor kept as the previous draft.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_CHANGE_THRESHOLD,
+        patience: int = 1,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        min_words: int = MIN_COMPARED_WORDS,
+    ) -> None:
+        if not 0.0 <= threshold <= 1.0:
+            raise ValueError("threshold must be between 0.0 and 1.0")
+        if patience < 1 or shingle_size < 1:
+            raise ValueError("patience and shingle_size must be at least 1")
+        self.threshold = threshold
+        self.patience = patience
+        self.shingle_size = shingle_size
+        self.min_words = min_words
+        self._previous: Dict[str, FrozenSet[str]] = {}
+        self._streak: Dict[str, int] = {}
+        self._last: Tuple[str, bool] | None = None  # (message id, result) of the last compared message
+        self.changes: Dict[str, List[float]] = {}  # Source -> change ratio of each revision, for tuning
+
+    def __call__(self, message: BaseChatMessage) -> bool:
+        """Whether `message` completes a converged run of its source's drafts."""
+        if self._last is not None and self._last[0] == message.id:
+            return self._last[1]
+        converged = self.observe(message.source, message.to_model_text()) >= self.patience
+        self._last = (message.id, converged)
+        return converged
+
+    def observe(self, source: str, text: str) -> int:
+        """Compare `text` with the previous draft of `source`; returns the run of converged revisions."""
+        if len(_WORD_RE.findall(text)) < self.min_words:
+            return 0
+        current = shingles(text, self.shingle_size)
+        previous = self._previous.get(source)
+        self._previous[source] = current
+        if previous is None:
+            return 0
+        change = change_ratio(previous, current)
+        self.changes.setdefault(source, []).append(change)
+        streak = self._streak.get(source, 0) + 1 if change <= self.threshold else 0
+        self._streak[source] = streak
+        return streak
+
+    def reset(self) -> None:
+        """Forget previous drafts; :attr:`changes` is kept for inspection (see :meth:`clear_changes`)."""
+        self._previous.clear()
+        self._streak.clear()
+        self._last = None
+
+    def clear_changes(self) -> None:
+        self.changes.clear()
+
+
+class ConvergenceTermination(TerminationCondition, Component[ConvergenceTerminationConfig]):
+    """Stop when successive outputs of the same source have converged.
+
+    Example:
+
+        .. code-block:: python
+
+            # Stop once the writer's revisions change less than 10% of their 3-word shingles
+            termination = ConvergenceTermination(threshold=0.1, sources=["primary"]) | MaxMessageTermination(20)
+
+    Restrict ``sources`` to the agents producing the drafts: a critic repeating the same feedback
+    has not converged, it is stuck (which also ends the loop when left unrestricted). In a GraphFlow
+    whose converged draft should still reach later nodes, use a :class:`ConvergenceTracker` edge
+    condition instead: this condition stops the whole team.
+
+    The change ratios of a run stay in :attr:`changes` after the team resets the condition, until
+    the next run's first message.
+
+    Args:
+        threshold: Stop when the change ratio between successive outputs is at most this (0.0-1.0).
+        patience: Number of consecutive converged revisions required.
+        sources: Sources whose outputs are compared; all chat message sources when None.
+        shingle_size: Words per shingle.
+        min_words: Outputs with fewer words are neither compared nor kept as the previous draft.
+    """
+
+    component_config_schema = ConvergenceTerminationConfig
+    component_type = "termination"
+    component_provider_override = "src.conditions.convergence_termination.ConvergenceTermination"
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_CHANGE_THRESHOLD,
+        patience: int = 1,
+        sources: Sequence[str] | None = None,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        min_words: int = MIN_COMPARED_WORDS,
+    ) -> None:
+        self._tracker = ConvergenceTracker(threshold, patience, shingle_size, min_words)
+        self._sources = list(sources) if sources is not None else None
+        self._terminated = False
+        self._new_run = False  # Set by reset(); the next run's first message clears `changes`
+
+    @property
+    def terminated(self) -> bool:
+        return self._terminated
+
+    @property
+    def changes(self) -> Dict[str, List[float]]:
+        """Source -> change ratio of each revision in the current (or last) run, for tuning."""
+        return self._tracker.changes
+
+    async def __call__(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> StopMessage | None:
+        if self._terminated:
+            raise TerminatedException("Termination condition has already been reached")
+        if self._new_run and messages:
+            self._tracker.clear_changes()
+            self._new_run = False
+        for message in messages:
+            if not isinstance(message, BaseChatMessage) or isinstance(message, StopMessage):
+                continue
+            if self._sources is not None and message.source not in self._sources:
+                continue
+            streak = self._tracker.observe(message.source, message.to_model_text())
+            if streak >= self._tracker.patience:
+                self._terminated = True
+                change = self._tracker.changes[message.source][-1]
+                logger.info(f"Output of {message.source} converged: {change:.1%} change")
+                return StopMessage(
+                    content=(
+                        f"Output of '{message.source}' converged: {change:.1%} change "
+                        f"over the last {streak} revision(s) (threshold {self._tracker.threshold:.1%})"
+                    ),
+                    source="ConvergenceTermination",
+                )
+        return None
+
+    async def reset(self) -> None:
+        self._terminated = False
+        self._tracker.reset()
+        self._new_run = True
+
+    def _to_config(self) -> ConvergenceTerminationConfig:
+        return ConvergenceTerminationConfig(
+            threshold=self._tracker.threshold,
+            patience=self._tracker.patience,
+            sources=self._sources,
+            shingle_size=self._tracker.shingle_size,
+            min_words=self._tracker.min_words,
+        )
+
+    @classmethod
+    def _from_config(cls, config: ConvergenceTerminationConfig) -> Self:
+        return cls(
+            threshold=config.threshold,
+            patience=config.patience,
+            sources=config.sources,
+            shingle_size=config.shingle_size,
+            min_words=config.min_words,
+        )
@@ -1,7 +1,10 @@
 """Advanced GraphFlow examples: conditional loop and activation groups.
 
 This module includes the 'Conditional Loop + Filtered Summary' example and
-illustrative activation-group scenarios from the AutoGen docs.
+illustrative activation-group scenarios from the AutoGen docs. The conditional loop runs
+speculatively: the summary starts as soon as the reviewer's streamed reply looks like an
+approval, and is kept only if the reviewer really approved. Once the generator's lists stop
+changing between rounds, the draft goes straight to the summary instead of another review.
 """
 from __future__ import annotations
 
@@ -10,7 +13,6 @@ async def run_graphflow_advanced() -> None:
     from autogen_ext.models.openai import OpenAIChatCompletionClient
     from autogen_agentchat.agents import (
         AssistantAgent,
-        MessageFilterAgent,
         MessageFilterConfig,
         PerSourceFilter,
     )
@@ -18,42 +20,69 @@ async def run_graphflow_advanced() -> None:
     from autogen_agentchat.conditions import MaxMessageTermination
     from autogen_agentchat.ui import Console
 
+    from src.agents.indexed_filter_agent import IndexedMessageFilterAgent
+    from src.conditions.convergence_termination import ConvergenceTracker
+    from src.agents.speculative_agent import SpeculativeAgent
+    from src.model_context.summarizing_context import SummarizingChatCompletionContext
+    from src.teams.speculative_graph_flow import BranchSpeculation, SpeculativeGraphFlow, likely_replies
+
     model_client = OpenAIChatCompletionClient(model="gpt-4o-mini")
 
-    # Conditional loop + filtered summarizer
-    generator = AssistantAgent("generator", model_client=model_client, system_message="Generate a list of creative ideas.")
+    # Conditional loop + filtered summarizer; loop agents fold old rounds into a rolling summary
+    generator = AssistantAgent(
+        "generator",
+        model_client=model_client,
+        system_message="Generate a list of creative ideas.",
+        model_context=SummarizingChatCompletionContext(summarizer_client=model_client, token_budget=3000),
+    )
     reviewer = AssistantAgent(
         "reviewer",
         model_client=model_client,
         system_message="Review ideas and provide feedbacks, or just 'APPROVE' for final approval.",
+        model_context=SummarizingChatCompletionContext(summarizer_client=model_client, token_budget=3000),
+        model_client_stream=True,
     )
     summarizer_core = AssistantAgent("summary", model_client=model_client, system_message="Summarize the user request and the final feedback.")
 
-    filtered_summarizer = MessageFilterAgent(
+    # Filters through the flow's per-source message index, so the loop's growing thread is not rescanned
+    filtered_summarizer = IndexedMessageFilterAgent(
         name="summary",
-        wrapped_agent=summarizer_core,
+        wrapped_agent=SpeculativeAgent(summarizer_core),
         filter=MessageFilterConfig(
             per_source=[
                 PerSourceFilter(source="user", position="first", count=1),
+                PerSourceFilter(source="generator", position="last", count=1),
                 PerSourceFilter(source="reviewer", position="last", count=1),
             ]
         ),
     )
 
+    # A converged draft skips further review rounds and goes to the summary
+    converged = ConvergenceTracker(threshold=0.1)
+
     builder = DiGraphBuilder()
     builder.add_node(generator).add_node(reviewer).add_node(filtered_summarizer)
-    builder.add_edge(generator, reviewer)
+    builder.add_edge(generator, reviewer, condition=lambda msg: not converged(msg))
+    builder.add_edge(generator, filtered_summarizer, condition=converged, activation_condition="any")
     # reviewer -> summary when APPROVE; else reviewer -> generator (loop)
-    builder.add_edge(reviewer, filtered_summarizer, condition=lambda msg: "APPROVE" in msg.to_model_text())
+    builder.add_edge(
+        reviewer, filtered_summarizer, condition=lambda msg: "APPROVE" in msg.to_model_text(), activation_condition="any"
+    )
     builder.add_edge(reviewer, generator, condition=lambda msg: "APPROVE" not in msg.to_model_text())
     builder.set_entry_point(generator)
 
     termination_condition = MaxMessageTermination(10)
 
     graph = builder.build()
-    flow = GraphFlow(participants=builder.get_participants(), graph=graph, termination_condition=termination_condition)
+    flow = SpeculativeGraphFlow(
+        participants=builder.get_participants(),
+        graph=graph,
+        termination_condition=termination_condition,
+        speculations=[BranchSpeculation("reviewer", likely_replies("APPROVE"))],
+    )
 
     await Console(flow.run_stream(task="Brainstorm ways to reduce plastic waste."), output_stats=True)
+    print("Speculation:", flow.speculation_report()["total"])
 
     # Activation-group examples (illustrative build only)
     # Example 1: A -> B -> C -> B with 'all' activation
@@ -1,19 +1,25 @@
 """GraphFlow example demonstrating message filtering.
 
 Builds a flow where `researcher` -> `analyst` -> `presenter`, but wraps agents
-with `MessageFilterAgent` and `MessageFilterConfig` to limit messages seen by
-each agent, per the AutoGen docs.
+with `IndexedMessageFilterAgent` (an indexed `MessageFilterAgent`) and `MessageFilterConfig`
+to limit messages seen by each agent, per the AutoGen docs. Every node is memoized on disk, so
+re-running the flow after changing only the presenter's prompt reuses the researcher's and
+analyst's outputs.
 """
 from __future__ import annotations
 
 async def run_graphflow_filtering() -> None:
     """Run the GraphFlow example with MessageFilterAgent wrappers."""
-    from autogen_ext.models.openai import OpenAIChatCompletionClient
-    from autogen_agentchat.agents import AssistantAgent, MessageFilterAgent, MessageFilterConfig, PerSourceFilter
-    from autogen_agentchat.teams import DiGraphBuilder, GraphFlow
+    from autogen_agentchat.agents import AssistantAgent, MessageFilterConfig, PerSourceFilter
+    from autogen_agentchat.teams import DiGraphBuilder
     from autogen_agentchat.ui import Console
 
-    client = OpenAIChatCompletionClient(model="gpt-4o-mini")
+    from src.agents.indexed_filter_agent import IndexedMessageFilterAgent
+    from src.agents.memoized_agent import MemoizedAgent, default_memo_store
+    from src.models.client_registry import shared_client
+    from src.teams.scheduled_graph_flow import ScheduledGraphFlow
+
+    client = shared_client("gpt-4o-mini")  # Pooled client; close() only releases it
 
     researcher = AssistantAgent(
         "researcher", model_client=client, system_message="Summarize key facts about climate change."
@@ -23,13 +29,13 @@ async def run_graphflow_filtering() -> None:
         "presenter", model_client=client, system_message="Prepare a presentation slide based on the final summary."
     )
 
-    filtered_analyst = MessageFilterAgent(
+    filtered_analyst = IndexedMessageFilterAgent(
         name="analyst",
         wrapped_agent=analyst,
         filter=MessageFilterConfig(per_source=[PerSourceFilter(source="researcher", position="last", count=1)]),
     )
 
-    filtered_presenter = MessageFilterAgent(
+    filtered_presenter = IndexedMessageFilterAgent(
         name="presenter",
         wrapped_agent=presenter,
         filter=MessageFilterConfig(per_source=[PerSourceFilter(source="analyst", position="last", count=1)]),
@@ -39,7 +45,11 @@ async def run_graphflow_filtering() -> None:
     builder.add_node(researcher).add_node(filtered_analyst).add_node(filtered_presenter)
     builder.add_edge(researcher, filtered_analyst).add_edge(filtered_analyst, filtered_presenter)
 
-    flow = GraphFlow(participants=builder.get_participants(), graph=builder.build())
+    memo_store = default_memo_store()
+    participants = [MemoizedAgent(agent, memo_store) for agent in builder.get_participants()]
+    # ScheduledGraphFlow feeds the filters' shared message index
+    flow = ScheduledGraphFlow(participants=participants, graph=builder.build())
 
     await Console(flow.run_stream(task="Summarize key facts about climate change."), output_stats=True)
+    print("Memoized:", {participant.name: vars(participant.stats) for participant in participants})
     await client.close()
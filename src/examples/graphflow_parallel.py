@@ -1,18 +1,31 @@
 """GraphFlow parallel fan-out + join example.
 
 This example follows the AutoGen docs: a writer produces a draft, two editors
-edit in parallel, then a final reviewer consolidates edits.
+edit in parallel, then a final reviewer consolidates edits. The flow records per-node
+timings, so the run ends with a report of whether the editors overlapped and what the
+critical path cost. Model calls go through an adaptive rate limiter, so parallel branches back
+off together instead of tripping the account's rate limits, and a straggling call is hedged with a
+duplicate request (once enough calls have been seen) so one slow editor does not hold up the join.
 """
 from __future__ import annotations
 
+import json
+
 async def run_graphflow_parallel() -> None:
     """Run the parallel fan-out and join GraphFlow example."""
-    from autogen_ext.models.openai import OpenAIChatCompletionClient
     from autogen_agentchat.agents import AssistantAgent
-    from autogen_agentchat.teams import DiGraphBuilder, GraphFlow
+    from autogen_agentchat.teams import DiGraphBuilder
     from autogen_agentchat.ui import Console
 
-    client = OpenAIChatCompletionClient(model="gpt-4o-mini")
+    from src.models.client_registry import shared_client
+    from src.models.hedged_client import HedgedChatCompletionClient
+    from src.models.rate_limited_client import AdaptiveLimiter, RateLimits
+    from src.teams.scheduled_graph_flow import ScheduledGraphFlow
+
+    # Pooled client without SDK retries: 429s reach the limiter, which pauses and retries instead
+    limiter = AdaptiveLimiter(RateLimits(requests_per_minute=500, tokens_per_minute=200_000))
+    # Hedges wrap the limiter, so duplicates are admitted (and rate limited) like any other call
+    client = HedgedChatCompletionClient(limiter.client(shared_client("gpt-4o-mini", max_retries=0)))
 
     writer = AssistantAgent("writer", model_client=client, system_message="Draft a short paragraph on climate change.")
     editor1 = AssistantAgent("editor1", model_client=client, system_message="Edit the paragraph for grammar.")
@@ -33,7 +46,11 @@ async def run_graphflow_parallel() -> None:
 
     graph = builder.build()
 
-    flow = GraphFlow(participants=builder.get_participants(), graph=graph)
+    flow = ScheduledGraphFlow(participants=builder.get_participants(), graph=graph, max_concurrency=2)
 
     await Console(flow.run_stream(task="Write a short paragraph about climate change."), output_stats=True)
+    if flow.last_profile is not None:
+        print(json.dumps(flow.last_profile.summary(), indent=2))
+    print("Limiter:", dict(limiter.stats))
+    print("Hedging:", client.describe())
     await client.close()
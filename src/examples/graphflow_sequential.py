@@ -1,26 +1,42 @@
 """GraphFlow sequential example.
 
 This example mirrors the 'Sequential Flow' example from the AutoGen GraphFlow
-docs: a writer drafts a paragraph and a reviewer provides feedback. Run via
+docs: a writer drafts a paragraph and a reviewer provides feedback. Both agents stream, and
+the run ends with per-agent time-to-first-token and streaming throughput. Run via
 `run_graphflow_sequential()`.
 """
 from __future__ import annotations
 
+import json
+
 async def run_graphflow_sequential() -> None:
     """Run the simple sequential GraphFlow example.
 
     Creates a writer and reviewer agent, builds a DiGraph with an edge from
     writer -> reviewer, and streams execution to the console.
     """
-    from autogen_ext.models.openai import OpenAIChatCompletionClient
     from autogen_agentchat.agents import AssistantAgent
     from autogen_agentchat.teams import DiGraphBuilder, GraphFlow
     from autogen_agentchat.ui import Console
 
-    client = OpenAIChatCompletionClient(model="gpt-4o-mini")
-
-    writer = AssistantAgent("writer", model_client=client, system_message="Draft a short paragraph on climate change.")
-    reviewer = AssistantAgent("reviewer", model_client=client, system_message="Review the draft and suggest improvements.")
+    from src.models.client_registry import shared_client
+    from src.models.stream_metrics import StreamMetricsRecorder, stream_with_metrics
+
+    client = shared_client("gpt-4o-mini")  # Pooled client; close() only releases it
+    recorder = StreamMetricsRecorder()
+
+    writer = AssistantAgent(
+        "writer",
+        model_client=recorder.instrument(client, "writer"),
+        system_message="Draft a short paragraph on climate change.",
+        model_client_stream=True,
+    )
+    reviewer = AssistantAgent(
+        "reviewer",
+        model_client=recorder.instrument(client, "reviewer"),
+        system_message="Review the draft and suggest improvements.",
+        model_client_stream=True,
+    )
 
     builder = DiGraphBuilder()
     builder.add_node(writer).add_node(reviewer)
@@ -30,5 +46,7 @@ async def run_graphflow_sequential() -> None:
 
     flow = GraphFlow([writer, reviewer], graph=graph)
 
-    await Console(flow.run_stream(task="Write a short paragraph about climate change."), output_stats=True)
+    task = "Write a short paragraph about climate change."
+    await Console(stream_with_metrics(flow.run_stream(task=task), recorder, "sequential"), output_stats=True)
+    print(json.dumps(recorder.last_run_report, indent=2))
     await client.close()
@@ -2,7 +2,8 @@
 
 This example shows how to create a simple `MagenticOneGroupChat` with a single
 `AssistantAgent` and run it via the console UI. It mirrors the minimal example
-from the AutoGen Magentic-One docs.
+from the AutoGen Magentic-One docs. The run is capped by a token, cost and time budget that
+covers the orchestrator's own calls as well as the assistant's.
 """
 from __future__ import annotations
 
@@ -20,13 +21,24 @@ async def run_magentic_minimal() -> None:
     from autogen_agentchat.teams import MagenticOneGroupChat
     from autogen_agentchat.ui import Console
 
+    from src.conditions.budget_termination import BudgetTermination
+    from src.models.usage_accounting import Budget, UsageAccountant
+
     model_client = OpenAIChatCompletionClient(model="gpt-4o-mini")
+    # Not enforced: a refused orchestrator ledger call would fail the run instead of stopping it
+    accountant = UsageAccountant(Budget(max_tokens=100_000, max_cost=0.10, max_seconds=300))
 
     assistant = AssistantAgent(
         "Assistant",
-        model_client=model_client,
+        model_client=accountant.meter(model_client, "Assistant"),
     )
 
-    team = MagenticOneGroupChat([assistant], model_client=model_client)
+    budget_termination = BudgetTermination(accountant)
+    team = MagenticOneGroupChat(
+        [assistant],
+        model_client=accountant.meter(model_client, "orchestrator"),
+        termination_condition=budget_termination,
+    )
     await Console(team.run_stream(task="Provide a different proof for Fermat's Last Theorem"), output_stats=True)
+    print("Spend:", budget_termination.last_report)
     await model_client.close()
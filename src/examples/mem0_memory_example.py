@@ -2,7 +2,8 @@
 Mem0Memory Example - Integration with Mem0.ai's memory system.
 
 This example demonstrates how to use Mem0Memory for advanced memory capabilities
-with both cloud-based and local backends.
+with both cloud-based and local backends. The memory is wrapped in a WriteBehindMemory so
+Mem0's LLM-based extraction runs in the background instead of inside the agent's turn.
 """
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.ui import Console
@@ -10,6 +11,8 @@ from autogen_core.memory import MemoryContent, MemoryMimeType
 from autogen_ext.memory.mem0 import Mem0Memory
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 
+from src.memory.write_behind_memory import WriteBehindMemory
+
 
 async def get_weather(city: str, units: str = "imperial") -> str:
     """Get weather information for a city."""
@@ -35,16 +38,18 @@ async def run_mem0_memory_example() -> None:
             is_cloud=True,
             limit=5,  # Maximum number of memories to retrieve
         )
+        # Persist adds in the background; pending items stay visible to queries
+        memory = WriteBehindMemory(mem0_memory)
         
         # Add user preferences to memory
-        await mem0_memory.add(
+        await memory.add(
             MemoryContent(
                 content="The weather should be in metric units",
                 mime_type=MemoryMimeType.TEXT,
                 metadata={"category": "preferences", "type": "units"},
             )
         )
-        await mem0_memory.add(
+        await memory.add(
             MemoryContent(
                 content="Meal recipe must be vegan",
                 mime_type=MemoryMimeType.TEXT,
@@ -59,7 +64,7 @@ async def run_mem0_memory_example() -> None:
                 model="gpt-4o-2024-08-06",
             ),
             tools=[get_weather],
-            memory=[mem0_memory],
+            memory=[memory],
         )
         
         # Ask about the weather
@@ -72,6 +77,9 @@ async def run_mem0_memory_example() -> None:
         config_json = mem0_memory.dump_component().model_dump_json()
         print(f"Memory config JSON: {config_json[:100]}...")
         
+        # Flush queued writes before exiting
+        await memory.close()
+        
         print("\n=== Mem0Memory Example Complete ===\n")
         print("\nMem0Memory is particularly useful for:")
         print("- Long-running agent deployments that need persistent memory")
@@ -2,82 +2,19 @@
 RAG Agent Example - Building a simple RAG agent with ChromaDB.
 
 This example demonstrates how to build a complete RAG (Retrieval-Augmented Generation)
-agent using ChromaDB for vector memory storage and document indexing.
+agent using ChromaDB for vector memory storage and document indexing. The vector memory is
+wrapped in a HybridMemory so exact identifiers (API names, class names) are also matched lexically.
 """
 import os
-import re
 from pathlib import Path
-from typing import List
 
-import aiofiles
-import aiohttp
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.ui import Console
-from autogen_core.memory import Memory, MemoryContent, MemoryMimeType
 from autogen_ext.memory.chromadb import ChromaDBVectorMemory, PersistentChromaDBVectorMemoryConfig
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 
-
-class SimpleDocumentIndexer:
-    """Basic document indexer for AutoGen Memory."""
-    
-    def __init__(self, memory: Memory, chunk_size: int = 1500) -> None:
-        self.memory = memory
-        self.chunk_size = chunk_size
-    
-    async def _fetch_content(self, source: str) -> str:
-        """Fetch content from URL or file."""
-        if source.startswith(("http://", "https://")):
-            async with aiohttp.ClientSession() as session:
-                async with session.get(source) as response:
-                    return await response.text()
-        else:
-            async with aiofiles.open(source, "r", encoding="utf-8") as f:
-                return await f.read()
-    
-    def _strip_html(self, text: str) -> str:
-        """Remove HTML tags and normalize whitespace."""
-        text = re.sub(r"<[^>]*>", " ", text)
-        text = re.sub(r"\s+", " ", text)
-        return text.strip()
-    
-    def _split_text(self, text: str) -> List[str]:
-        """Split text into fixed-size chunks."""
-        chunks: list[str] = []
-        # Just split text into fixed-size chunks
-        for i in range(0, len(text), self.chunk_size):
-            chunk = text[i : i + self.chunk_size]
-            chunks.append(chunk.strip())
-        return chunks
-    
-    async def index_documents(self, sources: List[str]) -> int:
-        """Index documents into memory."""
-        total_chunks = 0
-        for source in sources:
-            try:
-                content = await self._fetch_content(source)
-                
-                # Strip HTML if content appears to be HTML
-                if "<" in content and ">" in content:
-                    content = self._strip_html(content)
-                
-                chunks = self._split_text(content)
-                
-                for i, chunk in enumerate(chunks):
-                    await self.memory.add(
-                        MemoryContent(
-                            content=chunk,
-                            mime_type=MemoryMimeType.TEXT,
-                            metadata={"source": source, "chunk_index": i}
-                        )
-                    )
-                
-                total_chunks += len(chunks)
-                
-            except Exception as e:
-                print(f"Error indexing {source}: {str(e)}")
-        
-        return total_chunks
+from src.memory.document_indexer import SimpleDocumentIndexer
+from src.memory.hybrid_memory import HybridMemory
 
 
 async def run_rag_agent_example() -> None:
@@ -85,7 +22,7 @@ async def run_rag_agent_example() -> None:
     print("\n=== RAG Agent Example ===\n")
     
     # Initialize vector memory
-    rag_memory = ChromaDBVectorMemory(
+    vector_memory = ChromaDBVectorMemory(
         config=PersistentChromaDBVectorMemoryConfig(
             collection_name="autogen_docs",
             persistence_path=os.path.join(str(Path.home()), ".chromadb_autogen"),
@@ -93,6 +30,8 @@ async def run_rag_agent_example() -> None:
             score_threshold=0.4,  # Minimum similarity score
         )
     )
+    # Fuse BM25 lexical hits with the vector hits (reciprocal-rank fusion)
+    rag_memory = HybridMemory(vector_memory=vector_memory, k=3)
     
     # Clear existing memory
     await rag_memory.clear()
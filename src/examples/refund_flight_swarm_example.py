@@ -9,6 +9,10 @@ When an agent needs information from the user, it hands off to the special targe
 `"user"`. The example demonstrates the human-in-the-loop pattern where the program
 prompts the local user for input and resumes the swarm with a `HandoffMessage`.
 
+While waiting for the user, the session is parked in a local SQLite database and the live team is
+released; each reply rebuilds the team from its checkpoint, so a reply hours later (or in another
+process) resumes the same conversation.
+
 Run:
 
     python -m src.examples.refund_flight_swarm_example
@@ -16,13 +20,20 @@ Run:
 """
 from __future__ import annotations
 
+import uuid
+
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.conditions import HandoffTermination, TextMentionTermination
-from autogen_agentchat.messages import HandoffMessage
 from autogen_agentchat.teams import Swarm
 from autogen_agentchat.ui import Console
+from autogen_core.models import ChatCompletionClient
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 
+from src.conditions.compiled_termination import compile_termination
+from src.state.session_store import ParkedSessionManager, SQLiteSessionBackend
+
+SESSION_DB_PATH = ".sessions/refund_flight.sqlite"
+
 
 def refund_flight(flight_id: str) -> str:
     """Mock refund tool.
@@ -32,9 +43,8 @@ def refund_flight(flight_id: str) -> str:
     return f"Flight {flight_id} refunded"
 
 
-async def run_team_stream() -> None:
-    model_client = OpenAIChatCompletionClient(model="gpt-4o-mini")
-
+def build_team(model_client: ChatCompletionClient) -> Swarm:
+    """Build the travel_agent / flights_refunder Swarm."""
     travel_agent = AssistantAgent(
         name="travel_agent",
         model_client=model_client,
@@ -59,24 +69,26 @@ async def run_team_stream() -> None:
         ),
     )
 
-    termination = HandoffTermination(target="user") | TextMentionTermination("TERMINATE")
+    termination = compile_termination(HandoffTermination(target="user") | TextMentionTermination("TERMINATE"))
 
-    team = Swarm([travel_agent, flights_refunder], termination_condition=termination)
+    return Swarm([travel_agent, flights_refunder], termination_condition=termination)
 
-    task = "I need to refund my flight."
 
-    await team.reset()
+async def run_team_stream() -> None:
+    model_client = OpenAIChatCompletionClient(model="gpt-4o-mini")
+    backend = SQLiteSessionBackend(SESSION_DB_PATH)
+    sessions = ParkedSessionManager(lambda: build_team(model_client), backend)
+    session_id = f"refund-{uuid.uuid4().hex[:8]}"
+
+    task = "I need to refund my flight."
 
-    # First run: stream messages until termination or a handoff-to-user occurs.
-    task_result = await Console(team.run_stream(task=task), output_stats=True)
+    # First run: stream messages until termination or a handoff-to-user parks the session.
+    await Console(sessions.run_stream(session_id, task), output_stats=True)
 
-    # If the last message is a handoff to the user, prompt and resume.
-    last_message = task_result.messages[-1]
-    while isinstance(last_message, HandoffMessage) and last_message.target == "user":
+    # While the session is parked, prompt and resume it from its checkpoint.
+    while await sessions.is_parked(session_id):
         user_message = input("User: ")
-        task_result = await Console(
-            team.run_stream(task=HandoffMessage(source="user", target=last_message.source, content=user_message))
-        )
-        last_message = task_result.messages[-1]
+        await Console(sessions.run_stream(session_id, user_message))
 
+    backend.close()
     await model_client.close()
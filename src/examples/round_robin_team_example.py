@@ -2,6 +2,9 @@
 Example: RoundRobinGroupChat with primary and critic agents, and termination on approval.
 
 Demonstrates a multi-agent workflow with a feedback loop and termination condition.
+Both agents use a SummarizingChatCompletionContext so per-turn prompt size stays bounded
+however many critique rounds the loop takes. The loop also stops once the primary agent's drafts
+stop changing, and it is capped by a token, cost and time budget in case the critic never approves.
 """
 import asyncio
 from autogen_agentchat.agents import AssistantAgent
@@ -11,30 +14,58 @@ from autogen_agentchat.ui import Console
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_agentchat.base import TaskResult
 
+from src.conditions.budget_termination import BudgetTermination
+from src.conditions.convergence_termination import ConvergenceTermination
+from src.model_context.summarizing_context import SummarizingChatCompletionContext
+from src.models.model_router import ModelRouter
+from src.models.usage_accounting import Budget, UsageAccountant
+
+LOOP_TOKEN_BUDGET = 3000  # Per-agent prompt budget for the critique loop
+TASK_BUDGET = Budget(max_tokens=40_000, max_cost=0.05, max_seconds=180)  # Ceiling for the whole task
+
 async def run_round_robin_team_example() -> None:
     """Run a team of agents in a round-robin workflow with feedback and approval termination."""
     model_client = OpenAIChatCompletionClient(
         model="gpt-4o-mini",     
     )
+    strong_client = OpenAIChatCompletionClient(model="gpt-4o")
+    # Every call (replies and summarizations) is metered under the role that made it. Not enforced:
+    # a refused summarizer call would fail the run mid-turn, BudgetTermination stops it between turns.
+    accountant = UsageAccountant(TASK_BUDGET)
+    summarizer_client = accountant.meter(model_client, "summarizer")
+
+    def routed(label: str) -> ModelRouter:
+        # Metered below the router, so each call is priced at the model that answered it
+        return ModelRouter(accountant.meter(model_client, label), accountant.meter(strong_client, label))
+
     primary_agent = AssistantAgent(
         name="primary",
-        model_client=model_client,
+        model_client=routed("primary"),
         system_message="You are a helpful AI assistant.",
+        model_context=SummarizingChatCompletionContext(summarizer_client=summarizer_client, token_budget=LOOP_TOKEN_BUDGET),
     )
     critic_agent = AssistantAgent(
         name="critic",
-        model_client=model_client,
+        model_client=routed("critic"),
         system_message="Provide constructive feedback. Respond with 'APPROVE' when your feedbacks are addressed.",
+        model_context=SummarizingChatCompletionContext(summarizer_client=summarizer_client, token_budget=LOOP_TOKEN_BUDGET),
     )
     text_termination = TextMentionTermination("APPROVE")
+    budget_termination = BudgetTermination(accountant)
+    # Near-identical successive drafts mean further critique rounds are not worth paying for
+    convergence_termination = ConvergenceTermination(threshold=0.1, sources=["primary"])
    
-    team = RoundRobinGroupChat([primary_agent, critic_agent], termination_condition=text_termination)
+    team = RoundRobinGroupChat(
+        [primary_agent, critic_agent],
+        termination_condition=text_termination | convergence_termination | budget_termination,
+    )
     
     task = "Draft a short product description for a new AI-powered notebook."
     
     # Start the team conversation
     await team.reset()  # Reset the team for a new task.   
     await Console(team.run_stream(task=task), output_stats=True)  # Stream the messages to the console.
+    print("Spend:", budget_termination.last_report)
 
             
 if __name__ == "__main__":
@@ -6,8 +6,11 @@ This example mirrors the Autogen SelectorGroupChat demo using three agents:
 - WebSearch: performs (mock) web lookups
 - DataAnalyst: computes simple metrics
 
-It uses `SelectorGroupChat` to let a model choose the next speaker. The demo
-also shows a `selector_func` example (commented) for deterministic selection.
+It uses `SelectorGroupChat` with a `LocalSpeakerSelector` as `selector_func`: turns
+the local router/classifier is confident about skip the model's selection call, the
+rest fall back to the model, whose choices are logged to SELECTION_LOG_PATH and train
+the classifier for later runs. Every agent and the selector share a `ModelRouter`:
+short, tool-free turns go to gpt-4o-mini and the rest to gpt-4o, without agent changes.
 
 Run (ensure your environment has OpenAI creds in .env.local or env vars):
 
@@ -26,6 +29,12 @@ from autogen_agentchat.teams import SelectorGroupChat
 from autogen_agentchat.ui import Console
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 
+from src.conditions.compiled_termination import compile_termination
+from src.models.model_router import ModelRouter
+from src.teams.local_speaker_selector import LocalSpeakerSelector
+
+SELECTION_LOG_PATH = ".cache/speaker_selections.jsonl"  # Logged model selections (classifier training data)
+
 
 async def search_web(query: str) -> List[str]:
     """Mock async web search tool.
@@ -65,7 +74,10 @@ async def main() -> None:
     This example uses `OpenAIChatCompletionClient` for speaker selection; provide
     your API key via environment or .env.local as appropriate for this repo.
     """
-    model_client = OpenAIChatCompletionClient(model="gpt-4o-mini")
+    model_client = ModelRouter(
+        cheap_client=OpenAIChatCompletionClient(model="gpt-4o-mini"),
+        strong_client=OpenAIChatCompletionClient(model="gpt-4o"),
+    )
 
     planner = AssistantAgent(
         name="Planner",
@@ -90,14 +102,18 @@ async def main() -> None:
         system_message="You are a Data Analyst. When given numeric lists, compute percentage changes and short insights.",
     )
 
-    # Optional deterministic selector_func example (commented):
-    # async def selector_func(messages):
-    #     # If first message, pick Planner; otherwise let model decide
-    #     if not messages:
-    #         return "Planner"
-    #     return None
+    # Local selection first; None from the selector lets the model decide
+    selector = LocalSpeakerSelector(
+        [planner, web_search, data_analyst],
+        keywords={
+            "WebSearch": ["search", "look", "find", "sources", "news"],
+            "DataAnalyst": ["compute", "calculate", "percentage", "change", "growth"],
+        },
+        log_path=SELECTION_LOG_PATH,
+    )
 
-    termination = MaxMessageTermination(10) | TextMentionTermination("TERMINATE")
+    # Text mentions compiled into one matcher, evaluated once per message
+    termination = compile_termination(MaxMessageTermination(10) | TextMentionTermination("TERMINATE"))
 
     selector_prompt = (
         "You are the selector. Given the roles:\n{roles}\nCandidates: {participants}\n\n{history}\n\n"
@@ -109,6 +125,7 @@ async def main() -> None:
         model_client=model_client,
         termination_condition=termination,
         selector_prompt=selector_prompt,
+        selector_func=selector,
         allow_repeated_speaker=False,
     )
 
@@ -119,6 +136,8 @@ async def main() -> None:
     await team.reset()
     # Stream the run to console so selection decisions and messages are visible.
     await Console(team.run_stream(task=task), output_stats=True)
+    print("Speaker selection:", dict(selector.stats), "agreement with model:", selector.agreement_rate)
+    print("Model routing:", model_client.report()["routes"])
 
     await model_client.close()
 
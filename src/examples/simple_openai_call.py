@@ -1,12 +1,17 @@
 """
 Example: Simple OpenAI call using Autogen AgentChat v0.7.5.
 
-Demonstrates a minimal AssistantAgent interaction with OpenAIChatCompletionClient.
+Demonstrates a minimal AssistantAgent interaction with OpenAIChatCompletionClient. The reply is
+streamed and the call's time to first token and streaming throughput are printed at the end.
 """
+import json
+
 from autogen_agentchat.agents import AssistantAgent
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_agentchat.ui import Console
 
+from src.models.stream_metrics import StreamMetricsRecorder
+
 async def run_simple_openai_example() -> None:
     """Runs a minimal OpenAI agent call using Autogen AgentChat.
 
@@ -16,15 +21,17 @@ async def run_simple_openai_example() -> None:
     model_client = OpenAIChatCompletionClient(
         model="gpt-4o-mini"       
     )
+    recorder = StreamMetricsRecorder()
 
     agent = AssistantAgent(
         name="simple_agent",
-        model_client=model_client,
+        model_client=recorder.instrument(model_client, "simple_agent"),
         system_message="You are a helpful assistant.",
         reflect_on_tool_use=False,
-        model_client_stream=False,
+        model_client_stream=True,
     )
 
     stream = agent.run_stream(task="Hello, what can you do?")
     await Console(stream)
+    print(json.dumps([call.summary() for call in recorder.calls], indent=2))
     await model_client.close()
\ No newline at end of file
@@ -1,15 +1,19 @@
 """
 Example: Saving and using agent team state with MaxMessageTermination.
 
-Demonstrates how to save the state of a team after running a task.
+Demonstrates how to save the state of a team after running a task, persisting it as compact
+delta checkpoints and rebuilding it from the checkpoint chain.
 """
 import asyncio
+import tempfile
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.conditions import MaxMessageTermination
 from autogen_agentchat.teams import RoundRobinGroupChat
 from autogen_agentchat.ui import Console
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 
+from src.state.checkpoint_store import DeltaCheckpointStore
+
 async def run_state_usage_example() -> None:
     """Run a team, stream output, and save state after execution."""
     model_client = OpenAIChatCompletionClient(model="gpt-4o-mini")
@@ -29,18 +33,24 @@ async def run_state_usage_example() -> None:
     stream = agent_team.run_stream(task="Write a beautiful poem 3-line about lake tangayika")
     await Console(stream, output_stats=True)
     
-    # Save team state.
-    team_state = await agent_team.save_state()
+    # Save team state as a checkpoint: only messages not stored before are written.
+    checkpoint_store = DeltaCheckpointStore(tempfile.mkdtemp(prefix="team_state_"))
+    checkpoint = checkpoint_store.save(await agent_team.save_state())
     
-    print("Saved team state:", team_state)
+    print(f"Saved team state checkpoint {checkpoint.index}: {checkpoint.size_bytes} bytes, "
+          f"{checkpoint.new_messages} new messages")
     
-    # Load team state.
-    await agent_team.load_state(team_state)
+    # Load team state, rebuilt from the base checkpoint plus deltas.
+    await agent_team.load_state(checkpoint_store.load())
     
     # Continue the conversation using the loaded state.
     stream = agent_team.run_stream(task="What was the last line of the poem you wrote?")
     await Console(stream, output_stats=True)
     
+    # Checkpoint again: the delta holds only this turn's messages.
+    checkpoint = checkpoint_store.save(await agent_team.save_state())
+    print(f"Saved delta checkpoint {checkpoint.index}: {checkpoint.size_bytes} bytes")
+    
     # Close the model client.
     await model_client.close()
 
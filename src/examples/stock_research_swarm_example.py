@@ -1,8 +1,11 @@
 """
 Stock Research Swarm example.
 
-Implements the Stock Research example from the AutoGen Swarm docs using a
-`Swarm` of four agents: planner, financial_analyst, news_analyst, and writer.
+Implements the Stock Research example from the AutoGen Swarm docs using four
+agents: planner, financial_analyst, news_analyst, and writer. The two analyses are
+independent, so the team is a `FanOutSwarm`: the planner hands off to the
+"analysts" group, both analysts run concurrently, and the planner resumes with
+both results.
 
 Run:
 
@@ -16,10 +19,13 @@ from typing import Any, Dict, List
 
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.conditions import TextMentionTermination
-from autogen_agentchat.teams import Swarm
 from autogen_agentchat.ui import Console
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 
+from src.teams.fan_out_swarm import FanOutSwarm, fan_out_handoff
+
+ANALYSTS = ["financial_analyst", "news_analyst"]  # Independent specialists run as one fan-out group
+
 
 async def get_stock_data(symbol: str) -> Dict[str, Any]:
     """Mock async tool returning stock metrics for a symbol.
@@ -57,11 +63,12 @@ async def run_team_stream() -> None:
     planner = AssistantAgent(
         name="planner",
         model_client=model_client,
-        handoffs=["financial_analyst", "news_analyst", "writer"],
+        handoffs=[fan_out_handoff("analysts", ANALYSTS), *ANALYSTS, "writer"],
         system_message=(
             "You are a research planning coordinator. Coordinate market research by "
             "delegating to specialized agents: Financial Analyst, News Analyst, and Writer. "
-            "Always send your plan first, then handoff to an appropriate agent. Use TERMINATE when research is complete."
+            "Always send your plan first, then handoff to an appropriate agent. When both analyses are needed, "
+            "hand off to analysts to run them in parallel. Use TERMINATE when research is complete."
         ),
     )
 
@@ -99,7 +106,11 @@ async def run_team_stream() -> None:
 
     termination = TextMentionTermination("TERMINATE")
 
-    research_team = Swarm([planner, financial_analyst, news_analyst, writer], termination_condition=termination)
+    research_team = FanOutSwarm(
+        [planner, financial_analyst, news_analyst, writer],
+        fan_out={"analysts": ANALYSTS},
+        termination_condition=termination,
+    )
 
     task = "Conduct market research for TSLA stock"
 
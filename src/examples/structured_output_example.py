@@ -2,6 +2,8 @@
 Example: Structured output with Pydantic model using AssistantAgent
 
 Demonstrates how to enforce structured LLM output using a Pydantic model and output_content_type.
+For many small independent inputs, a MicroBatcher classifies them in a few batched calls instead
+of one call each.
 """
 import asyncio
 from typing import Literal
@@ -11,6 +13,10 @@ from autogen_agentchat.messages import StructuredMessage
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_agentchat.ui import Console
 
+from src.models.micro_batcher import MicroBatcher
+
+INSTRUCTIONS = "Categorize the input as happy, sad, or neutral following the JSON format."
+
 class AgentResponse(BaseModel):
     thoughts: str
     response: Literal["happy", "sad", "neutral"]
@@ -21,7 +27,7 @@ async def run_structured_output_example() -> None:
     agent = AssistantAgent(
         name="assistant",
         model_client=model_client,
-        system_message="Categorize the input as happy, sad, or neutral following the JSON format.",
+        system_message=INSTRUCTIONS,
         output_content_type=AgentResponse,
     )
     result = await Console(agent.run_stream(task="I am happy."), output_stats=True)
@@ -30,6 +36,14 @@ async def run_structured_output_example() -> None:
     assert isinstance(result.messages[-1].content, AgentResponse)
     print("Thought: ", result.messages[-1].content.thoughts)
     print("Response: ", result.messages[-1].content.response)
+
+    # High volume: concurrent requests within the window share one model call
+    batcher = MicroBatcher(model_client, AgentResponse, INSTRUCTIONS, window_ms=20)
+    texts = ["I am happy.", "I lost my keys.", "The meeting is at 3pm.", "What a wonderful surprise!"]
+    labels = await asyncio.gather(*(batcher.submit(text) for text in texts))
+    for text, label in zip(texts, labels):
+        print(f"{label.response:>8}: {text}")
+    print("Batching:", batcher.describe())
     await model_client.close()
 
 if __name__ == "__main__":
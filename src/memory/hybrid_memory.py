@@ -0,0 +1,372 @@
+"""
+Hybrid lexical + vector memory for exact-identifier recall.
+
+This module provides:
+- tokenize: Identifier-preserving tokenizer shared by the lexical index.
+- BM25Index: Incremental inverted index with Okapi BM25 scoring.
+- reciprocal_rank_fusion: Merges several ranked id lists into one.
+- HybridMemory: Memory that fuses BM25 and an existing vector memory (e.g. ChromaDBVectorMemory).
+
+Pure embedding retrieval tends to miss exact identifiers such as API names, ticker symbols
+and flight numbers. The BM25 side answers those lookups in-process, and reciprocal-rank fusion
+(RRF) merges both result lists without having to calibrate their scores against each other.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import uuid
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+from autogen_core import CancellationToken
+from autogen_core.memory import Memory, MemoryContent, MemoryQueryResult, UpdateContextResult
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import SystemMessage
+
+BM25_K1 = 1.2  # Term-frequency saturation; higher values reward repeated terms longer
+BM25_B = 0.75  # Document-length normalization strength (0 disables it)
+RRF_K = 60  # RRF damping constant from Cormack et al.; dampens the weight of top ranks
+LEXICAL_CANDIDATES = 20  # Lexical hits considered for fusion per query
+HYBRID_ID_KEY = "hybrid_id"  # Metadata key linking vector results back to lexical documents
+SCORE_KEY = "score"  # Metadata key vector memories put their similarity in; replaced by the fused score
+
+# Keeps identifiers such as "get_stock_data", "AA1234", "gpt-4o" and "v0.4.1" as single tokens.
+_TOKEN_PATTERN = re.compile(r"[a-z0-9_]+(?:[.\-][a-z0-9_]+)*")
+
+MetadataFilter = Mapping[str, Any]
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase tokens, keeping dotted/dashed identifiers intact.
+
+    Args:
+        text: Raw text to tokenize.
+
+    Returns:
+        List of lowercase tokens in document order.
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def content_to_text(content: str | MemoryContent) -> str:
+    """Return the searchable text of a query string or memory item."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content.content, str):
+        return content.content
+    if isinstance(content.content, dict):
+        return " ".join(str(value) for value in content.content.values())
+    return str(content.content)
+
+
+def matches_filter(metadata: Mapping[str, Any] | None, metadata_filter: MetadataFilter | None) -> bool:
+    """Check whether metadata satisfies every key/value pair of an equality filter."""
+    if not metadata_filter:
+        return True
+    if metadata is None:
+        return False
+    return all(metadata.get(key) == value for key, value in metadata_filter.items())
+
+
+def reciprocal_rank_fusion(ranked_lists: Iterable[List[str]], rrf_k: int = RRF_K) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists with reciprocal-rank fusion.
+
+    Each id scores ``sum(1 / (rrf_k + rank))`` over the lists it appears in (rank starts at 1).
+
+    Args:
+        ranked_lists: Ranked lists of document ids, best first.
+        rrf_k: Damping constant.
+
+    Returns:
+        (doc_id, fused_score) pairs sorted by descending score.
+    """
+    fused_scores: Dict[str, float] = defaultdict(float)
+    for ranked_ids in ranked_lists:
+        for rank, doc_id in enumerate(ranked_ids, 1):
+            fused_scores[doc_id] += 1.0 / (rrf_k + rank)
+    return sorted(fused_scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class BM25Index:
+    """Incremental inverted index with Okapi BM25 scoring.
+
+    Documents can be added and removed one at a time; corpus statistics (document count,
+    average length, document frequencies) are maintained incrementally so no rebuild is needed.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B) -> None:
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._doc_lengths: Dict[str, int] = {}
+        self._doc_terms: Dict[str, List[str]] = {}
+        self._doc_metadata: Dict[str, Mapping[str, Any] | None] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_lengths
+
+    @property
+    def average_length(self) -> float:
+        """Average document length in tokens."""
+        return self._total_length / len(self._doc_lengths) if self._doc_lengths else 0.0
+
+    def add(self, doc_id: str, text: str, metadata: Mapping[str, Any] | None = None) -> None:
+        """Index a document, replacing any previous version with the same id."""
+        if doc_id in self._doc_lengths:
+            self.remove(doc_id)
+        term_counts = Counter(tokenize(text))
+        for term, count in term_counts.items():
+            self._postings[term][doc_id] = count
+        doc_length = sum(term_counts.values())
+        self._doc_lengths[doc_id] = doc_length
+        self._doc_terms[doc_id] = list(term_counts)
+        self._doc_metadata[doc_id] = metadata
+        self._total_length += doc_length
+
+    def remove(self, doc_id: str) -> None:
+        """Remove a document from the index; unknown ids are ignored."""
+        if doc_id not in self._doc_lengths:
+            return
+        for term in self._doc_terms.pop(doc_id):
+            del self._postings[term][doc_id]
+            if not self._postings[term]:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        del self._doc_metadata[doc_id]
+
+    def clear(self) -> None:
+        """Drop every indexed document."""
+        self._postings.clear()
+        self._doc_lengths.clear()
+        self._doc_terms.clear()
+        self._doc_metadata.clear()
+        self._total_length = 0
+
+    def search(
+        self, query: str, limit: int = LEXICAL_CANDIDATES, metadata_filter: MetadataFilter | None = None
+    ) -> List[Tuple[str, float]]:
+        """Score documents against the query and return the best matches.
+
+        Only the posting lists of the query terms are visited, so cost scales with the number of
+        matching documents rather than the corpus size.
+
+        Args:
+            query: Free-text query.
+            limit: Maximum number of hits to return.
+            metadata_filter: Optional equality filter on document metadata.
+
+        Returns:
+            (doc_id, bm25_score) pairs sorted by descending score.
+        """
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf(len(postings))
+            for doc_id, term_frequency in postings.items():
+                if matches_filter(self._doc_metadata[doc_id], metadata_filter):
+                    scores[doc_id] += idf * self._term_weight(term_frequency, self._doc_lengths[doc_id])
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def _idf(self, document_frequency: int) -> float:
+        document_count = len(self._doc_lengths)
+        return math.log(1.0 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def _term_weight(self, term_frequency: int, doc_length: int) -> float:
+        length_ratio = doc_length / self.average_length if self.average_length else 1.0
+        normalizer = self.k1 * (1.0 - self.b + self.b * length_ratio)
+        return term_frequency * (self.k1 + 1.0) / (term_frequency + normalizer)
+
+
+class HybridMemory(Memory):
+    """Memory that fuses BM25 lexical search with an existing vector memory.
+
+    Every added item is indexed in an in-process :class:`BM25Index` and forwarded to the wrapped
+    vector memory with a ``hybrid_id`` metadata key. Queries run both retrievers and merge their
+    rankings with reciprocal-rank fusion, so exact identifiers found lexically are not lost when
+    their embedding similarity falls below the vector memory's ``score_threshold``.
+
+    Metadata filters (e.g. ``{"source": "README.md"}``) are applied to both sides: lexical hits are
+    pre-filtered in the index, and for vector hits the filter is forwarded as a Chroma-style
+    ``where`` clause (when enabled) and re-checked after retrieval.
+
+    The lexical index lives in this process only. Vector hits it does not know, such as items a
+    persistent collection holds from an earlier process, are returned as vector results and then
+    indexed lexically, so the lexical side catches up with the collection as it is queried.
+
+    Args:
+        vector_memory: Memory providing semantic retrieval, typically ``ChromaDBVectorMemory``.
+            When None, the memory runs lexical-only.
+        k: Number of fused results returned per query.
+        lexical_candidates: Number of BM25 hits considered for fusion.
+        rrf_k: Reciprocal-rank fusion damping constant.
+        forward_where_filter: Pass metadata filters to the vector memory as ``where=...``.
+        name: Optional identifier for this memory instance.
+    """
+
+    def __init__(
+        self,
+        vector_memory: Memory | None,
+        k: int = 3,
+        lexical_candidates: int = LEXICAL_CANDIDATES,
+        rrf_k: int = RRF_K,
+        forward_where_filter: bool = True,
+        name: str | None = None,
+    ) -> None:
+        self._vector_memory = vector_memory
+        self._k = k
+        self._lexical_candidates = lexical_candidates
+        self._rrf_k = rrf_k
+        self._forward_where_filter = forward_where_filter
+        self._name = name or "hybrid_memory"
+        self._index = BM25Index()
+        self._documents: Dict[str, MemoryContent] = {}
+        self._ids_by_text: Dict[str, str] = {}
+
+    @property
+    def name(self) -> str:
+        """Memory instance identifier."""
+        return self._name
+
+    async def add(self, content: MemoryContent, cancellation_token: CancellationToken | None = None) -> None:
+        """Index content lexically and forward it to the vector memory."""
+        doc_id = str(uuid.uuid4())
+        metadata = {**(content.metadata or {}), HYBRID_ID_KEY: doc_id}
+        stored = MemoryContent(content=content.content, mime_type=content.mime_type, metadata=metadata)
+        self._remember(doc_id, stored)
+        if self._vector_memory is not None:
+            await self._vector_memory.add(stored.model_copy(deep=True), cancellation_token)
+
+    def lexical_search(
+        self, query: str | MemoryContent, limit: int | None = None, metadata_filter: MetadataFilter | None = None
+    ) -> List[MemoryContent]:
+        """Run a BM25-only lookup without touching the vector memory.
+
+        Args:
+            query: Query text or memory item.
+            limit: Maximum number of hits; defaults to ``k``.
+            metadata_filter: Optional equality filter on item metadata.
+
+        Returns:
+            Matching items with their BM25 score in ``metadata["score"]``.
+        """
+        hits = self._index.search(content_to_text(query), limit or self._k, metadata_filter)
+        return [self._result_item(doc_id, score, True, False) for doc_id, score in hits]
+
+    async def query(
+        self,
+        query: str | MemoryContent = "",
+        cancellation_token: CancellationToken | None = None,
+        metadata_filter: MetadataFilter | None = None,
+        k: int | None = None,
+        **kwargs: Any,
+    ) -> MemoryQueryResult:
+        """Run lexical and vector retrieval and return RRF-fused results.
+
+        Args:
+            query: Query text or memory item.
+            cancellation_token: Optional token to cancel operation.
+            metadata_filter: Optional equality filter such as ``{"source": "README.md"}``.
+            k: Override for the number of fused results.
+            **kwargs: Extra parameters forwarded to the vector memory.
+
+        Returns:
+            MemoryQueryResult whose items carry ``score`` (fused) and ``retrieval`` metadata.
+        """
+        query_text = content_to_text(query)
+        lexical_ids = [doc_id for doc_id, _ in self._index.search(query_text, self._lexical_candidates, metadata_filter)]
+        vector_ids = await self._vector_ids(query_text, cancellation_token, metadata_filter, **kwargs)
+        fused = reciprocal_rank_fusion([lexical_ids, vector_ids], self._rrf_k)[: k or self._k]
+        lexical_hits, vector_hits = set(lexical_ids), set(vector_ids)
+        return MemoryQueryResult(
+            results=[self._result_item(doc_id, score, doc_id in lexical_hits, doc_id in vector_hits) for doc_id, score in fused]
+        )
+
+    async def update_context(self, model_context: ChatCompletionContext) -> UpdateContextResult:
+        """Query with the last message in the context and append the hits as a SystemMessage."""
+        messages = await model_context.get_messages()
+        if not messages:
+            return UpdateContextResult(memories=MemoryQueryResult(results=[]))
+
+        last_message = messages[-1]
+        query_text = last_message.content if isinstance(last_message.content, str) else str(last_message)
+        query_results = await self.query(query_text)
+        if query_results.results:
+            memory_strings = [f"{i}. {str(memory.content)}" for i, memory in enumerate(query_results.results, 1)]
+            await model_context.add_message(SystemMessage(content="\nRelevant memory content:\n" + "\n".join(memory_strings)))
+        return UpdateContextResult(memories=query_results)
+
+    async def clear(self) -> None:
+        """Clear the lexical index and the wrapped vector memory."""
+        self._index.clear()
+        self._documents.clear()
+        self._ids_by_text.clear()
+        if self._vector_memory is not None:
+            await self._vector_memory.clear()
+
+    async def close(self) -> None:
+        """Close the wrapped vector memory."""
+        if self._vector_memory is not None:
+            await self._vector_memory.close()
+
+    async def _vector_ids(
+        self,
+        query_text: str,
+        cancellation_token: CancellationToken | None,
+        metadata_filter: MetadataFilter | None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Query the vector memory and map its hits back to lexical document ids."""
+        if self._vector_memory is None:
+            return []
+        if metadata_filter and self._forward_where_filter:
+            kwargs.setdefault("where", _to_where_clause(metadata_filter))
+        vector_result = await self._vector_memory.query(query_text, cancellation_token, **kwargs)
+        ranked_ids: List[str] = []
+        for item in vector_result.results:
+            doc_id = self._resolve_id(item) or self._adopt(item)
+            if doc_id in ranked_ids:
+                continue
+            if matches_filter(self._documents[doc_id].metadata, metadata_filter):
+                ranked_ids.append(doc_id)
+        return ranked_ids
+
+    def _resolve_id(self, item: MemoryContent) -> str | None:
+        """Find the lexical id of a vector hit via its metadata, falling back to its text."""
+        doc_id = (item.metadata or {}).get(HYBRID_ID_KEY)
+        if doc_id in self._documents:
+            return doc_id
+        return self._ids_by_text.get(content_to_text(item))
+
+    def _adopt(self, item: MemoryContent) -> str:
+        """Index a vector hit added outside this process and return its id."""
+        metadata = {key: value for key, value in (item.metadata or {}).items() if key != SCORE_KEY}
+        doc_id = str(metadata.setdefault(HYBRID_ID_KEY, str(uuid.uuid4())))
+        self._remember(doc_id, MemoryContent(content=item.content, mime_type=item.mime_type, metadata=metadata))
+        return doc_id
+
+    def _remember(self, doc_id: str, stored: MemoryContent) -> None:
+        """Index an item lexically and keep it for building results."""
+        text = content_to_text(stored)
+        self._index.add(doc_id, text, stored.metadata)
+        self._documents[doc_id] = stored
+        self._ids_by_text.setdefault(text, doc_id)
+
+    def _result_item(self, doc_id: str, score: float, is_lexical_hit: bool, is_vector_hit: bool) -> MemoryContent:
+        stored = self._documents[doc_id]
+        retrieval = "hybrid" if is_lexical_hit and is_vector_hit else "lexical" if is_lexical_hit else "vector"
+        metadata = {**(stored.metadata or {}), "score": score, "retrieval": retrieval}
+        return MemoryContent(content=stored.content, mime_type=stored.mime_type, metadata=metadata)
+
+
+def _to_where_clause(metadata_filter: MetadataFilter) -> Dict[str, Any]:
+    """Translate an equality filter into a ChromaDB ``where`` clause."""
+    conditions = [{key: value} for key, value in metadata_filter.items()]
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
@@ -0,0 +1,206 @@
+"""
+Relevance-ranked, token-budgeted drop-in replacement for ListMemory.
+
+`ListMemory.update_context` injects every stored item on every call, so prompt size grows
+linearly with the number of preferences. `RankedListMemory` keeps the ListMemory API (`content`,
+`add`, `query`, `clear`, component config) but indexes each item by its keywords and metadata values
+and, on `update_context`, injects only the best-matching items that fit a token budget.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from autogen_core import CancellationToken
+from autogen_core.memory import ListMemory, MemoryContent, MemoryQueryResult, UpdateContextResult
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import SystemMessage
+from pydantic import BaseModel, Field
+from typing_extensions import Self
+
+from src.memory.hybrid_memory import BM25Index, content_to_text
+from src.utils.token_utils import DEFAULT_TOKEN_MODEL, count_text_tokens
+
+DEFAULT_MAX_TOKENS = 300  # Token budget for injected memories per model call
+PINNED_KEY = "pinned"  # Metadata flag: items with pinned=True are always injected, first
+CONTEXT_HEADER = "\nRelevant memory content (ranked by relevance):\n"
+LIST_MEMORY_HEADER = "\nRelevant memory content (in chronological order):\n"  # What ListMemory injects instead
+
+
+class RankedListMemoryConfig(BaseModel):
+    """Configuration for RankedListMemory component (ListMemoryConfig plus budget settings)."""
+
+    name: str | None = None
+    """Optional identifier for this memory instance."""
+    memory_contents: List[MemoryContent] = Field(default_factory=list)
+    """List of memory contents stored in this memory instance."""
+    max_tokens: int = DEFAULT_MAX_TOKENS
+    """Token budget for memories injected by `update_context`."""
+    token_model: str = DEFAULT_TOKEN_MODEL
+    """Model whose tokenizer is used for budgeting."""
+
+
+class RankedListMemory(ListMemory):
+    """ListMemory variant that injects only the top-ranked items within a token budget.
+
+    Items are indexed with BM25 over their text plus their metadata values, so a preference stored
+    with ``metadata={"type": "dietary"}`` matches queries mentioning "dietary" as well as its own words.
+    Items flagged ``metadata={"pinned": True}`` are always injected, ahead of ranked items, even when
+    they alone exceed ``max_tokens``; ranked items only fill the budget left after them.
+
+    Token savings relative to plain ListMemory are tracked in :attr:`last_tokens_saved` and
+    :attr:`total_tokens_saved`.
+
+    Args:
+        name: Optional identifier for this memory instance.
+        memory_contents: Initial memory contents.
+        max_tokens: Token budget for injected memories.
+        token_model: Model whose tokenizer is used for budgeting.
+    """
+
+    component_provider_override = "src.memory.ranked_list_memory.RankedListMemory"
+    component_config_schema = RankedListMemoryConfig  # type: ignore[assignment]
+
+    def __init__(
+        self,
+        name: str | None = None,
+        memory_contents: List[MemoryContent] | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        token_model: str = DEFAULT_TOKEN_MODEL,
+    ) -> None:
+        super().__init__(name=name or "ranked_list_memory", memory_contents=[])
+        self._max_tokens = max_tokens
+        self._token_model = token_model
+        self._index = BM25Index()
+        self._content_tokens: Dict[int, int] = {}
+        self._pinned: List[int] = []
+        self._total_line_tokens = 0
+        self._header_tokens = count_text_tokens(CONTEXT_HEADER, token_model)
+        self._list_memory_header_tokens = count_text_tokens(LIST_MEMORY_HEADER, token_model)
+        self.last_tokens_used = 0
+        self.last_tokens_saved = 0
+        self.total_tokens_saved = 0
+        for content in memory_contents or []:
+            self._append(content)
+
+    @property
+    def content(self) -> List[MemoryContent]:
+        """Get the current memory contents in insertion order."""
+        return self._contents
+
+    @content.setter
+    def content(self, value: List[MemoryContent]) -> None:
+        """Replace the memory contents and rebuild the index."""
+        self._reset_index()
+        for content in value:
+            self._append(content)
+
+    async def add(self, content: MemoryContent, cancellation_token: CancellationToken | None = None) -> None:
+        """Store and index new content."""
+        self._append(content)
+
+    async def clear(self) -> None:
+        """Clear all memory content and the index."""
+        self._reset_index()
+
+    async def query(
+        self,
+        query: str | MemoryContent = "",
+        cancellation_token: CancellationToken | None = None,
+        **kwargs: Any,
+    ) -> MemoryQueryResult:
+        """Return items ranked by relevance; an empty query returns everything, like ListMemory."""
+        query_text = content_to_text(query)
+        if not query_text.strip():
+            return MemoryQueryResult(results=self._contents)
+        return MemoryQueryResult(results=[self._contents[position] for position in self._rank(query_text)])
+
+    async def update_context(self, model_context: ChatCompletionContext) -> UpdateContextResult:
+        """Inject the best-ranked items that fit the token budget as a SystemMessage.
+
+        The last message in the context is used as the query. Pinned items are always injected;
+        the other items are taken in rank order and skipped when they would exceed the budget, so a
+        long low-value item cannot crowd out several short relevant ones.
+        """
+        messages = await model_context.get_messages()
+        if not self._contents or not messages:
+            return UpdateContextResult(memories=MemoryQueryResult(results=[]))
+
+        last_message = messages[-1]
+        query_text = last_message.content if isinstance(last_message.content, str) else str(last_message)
+        selected = self._fit_budget(self._rank(query_text))
+        if not selected:
+            self._record_savings(0)
+            return UpdateContextResult(memories=MemoryQueryResult(results=[]))
+
+        memory_strings = [f"{i}. {str(self._contents[position].content)}" for i, position in enumerate(selected, 1)]
+        memory_context = CONTEXT_HEADER + "\n".join(memory_strings) + "\n"
+        self._record_savings(count_text_tokens(memory_context, self._token_model))
+        await model_context.add_message(SystemMessage(content=memory_context))
+        return UpdateContextResult(memories=MemoryQueryResult(results=[self._contents[position] for position in selected]))
+
+    def _append(self, content: MemoryContent) -> None:
+        position = len(self._contents)
+        self._contents.append(content)
+        metadata_terms = " ".join(str(value) for value in (content.metadata or {}).values())
+        self._index.add(str(position), f"{content_to_text(content)} {metadata_terms}")
+        self._content_tokens[position] = count_text_tokens(f" {str(content.content)}\n", self._token_model)
+        self._total_line_tokens += count_text_tokens(f"{position + 1}. {str(content.content)}\n", self._token_model)
+        if (content.metadata or {}).get(PINNED_KEY):
+            self._pinned.append(position)
+
+    def _reset_index(self) -> None:
+        self._contents = []
+        self._index.clear()
+        self._content_tokens.clear()
+        self._pinned = []
+        self._total_line_tokens = 0
+
+    def _rank(self, query_text: str) -> List[int]:
+        """Return content positions: pinned items first, then BM25 matches by score."""
+        pinned = set(self._pinned)
+        matched = [int(doc_id) for doc_id, _ in self._index.search(query_text, limit=len(self._contents))]
+        return self._pinned + [position for position in matched if position not in pinned]
+
+    def _line_tokens(self, number: int, position: int) -> int:
+        """Tokens of the item at `position` rendered as line `number` of the injected list."""
+        return _number_tokens(number, self._token_model) + self._content_tokens[position]
+
+    def _fit_budget(self, ranked_positions: List[int]) -> List[int]:
+        """Keep every pinned item, then the ranked items whose lines still fit the budget."""
+        pinned = set(self._pinned)
+        selected: List[int] = []
+        used = self._header_tokens
+        for position in ranked_positions:
+            line_tokens = self._line_tokens(len(selected) + 1, position)
+            if position in pinned or used + line_tokens <= self._max_tokens:
+                selected.append(position)
+                used += line_tokens
+        return selected
+
+    def _record_savings(self, used_tokens: int) -> None:
+        """Compare the injected size with what ListMemory would have injected (counted line by line)."""
+        full_tokens = self._list_memory_header_tokens + self._total_line_tokens
+        self.last_tokens_used = used_tokens
+        self.last_tokens_saved = full_tokens - used_tokens
+        self.total_tokens_saved += self.last_tokens_saved
+
+    @classmethod
+    def _from_config(cls, config: RankedListMemoryConfig) -> Self:  # type: ignore[override]
+        return cls(
+            name=config.name,
+            memory_contents=config.memory_contents,
+            max_tokens=config.max_tokens,
+            token_model=config.token_model,
+        )
+
+    def _to_config(self) -> RankedListMemoryConfig:
+        return RankedListMemoryConfig(
+            name=self.name, memory_contents=self._contents, max_tokens=self._max_tokens, token_model=self._token_model
+        )
+
+
+@lru_cache(maxsize=None)
+def _number_tokens(number: int, model: str) -> int:
+    """Tokens of a list number ("12."); the following space is counted with the item's text."""
+    return count_text_tokens(f"{number}.", model)
@@ -0,0 +1,294 @@
+"""
+Redis memory with pipelined bulk writes and server-side metadata filtering.
+
+`autogen_ext`'s RedisMemory stores each item with a separate embedding call and a separate
+round-trip, and keeps metadata as an opaque JSON string, so it cannot be filtered in Redis.
+`PipelinedRedisMemory` talks to Redis directly through a pooled `redis.asyncio` client:
+
+- `add_many` embeds contents in batches and writes them with one pipeline per batch.
+- Configured metadata keys (e.g. `category`, `type`) are stored as RediSearch TAG fields, so
+  `query(..., metadata_filter=...)` and `get_all(...)` pre-filter on the server.
+- `get_all` loads a user's full (filtered) history in a single FT.SEARCH round-trip.
+
+Requires a Redis server with the Query Engine (Redis 8+ or Redis Stack).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import struct
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Sequence
+
+from autogen_core import CancellationToken
+from autogen_core.memory import Memory, MemoryContent, MemoryMimeType, MemoryQueryResult, UpdateContextResult
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import SystemMessage
+from pydantic import BaseModel, Field
+from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import ResponseError
+
+from src.memory.hybrid_memory import content_to_text
+
+logger = logging.getLogger(__name__)
+
+Embedder = Callable[[List[str]], Awaitable[List[List[float]]]]
+"""Async batch embedder: takes a list of texts and returns one vector per text."""
+
+TAG_FIELD_PREFIX = "tag_"  # Hash field prefix for filterable metadata keys
+MAX_GET_ALL = 10_000  # Upper bound on items returned by a single get_all round-trip
+_TAG_SPECIAL_CHARACTERS = re.compile(r"([,.<>{}\[\]\"':;!@#$%^&*()\-+=~|/\\ ])")
+
+
+class PipelinedRedisMemoryConfig(BaseModel):
+    """Configuration for PipelinedRedisMemory."""
+
+    redis_url: str = Field(default="redis://localhost:6379", description="url of the Redis instance")
+    index_name: str = Field(default="chat_history_bulk", description="Name of the RediSearch index")
+    prefix: str = Field(default="memory_bulk", description="Key prefix of stored memories")
+    filter_fields: List[str] = Field(
+        default_factory=lambda: ["category", "type"], description="Metadata keys indexed as TAG fields"
+    )
+    top_k: int = Field(default=10, description="Number of results to return in queries")
+    distance_threshold: float = Field(default=0.7, description="Maximum cosine distance of a relevant memory")
+    embedding_batch_size: int = Field(default=128, description="Texts per embedder call in add_many")
+    write_batch_size: int = Field(default=500, description="Items per pipeline round-trip in add_many")
+    max_connections: int = Field(default=20, description="Size of the shared async connection pool")
+
+
+class PipelinedRedisMemory(Memory):
+    """Redis-backed memory with batched embeddings, pipelined writes and TAG pre-filtering.
+
+    Without an embedder the memory is sequential: queries return the most recent items that
+    match the metadata filter.
+
+    Args:
+        config: Connection, index and batching settings.
+        embedder: Optional async batch embedder used for semantic queries.
+    """
+
+    def __init__(self, config: PipelinedRedisMemoryConfig | None = None, embedder: Embedder | None = None) -> None:
+        self.config = config or PipelinedRedisMemoryConfig()
+        self._embedder = embedder
+        # RESP2 is pinned because _parse_search expects the flat [total, key, fields, ...] reply.
+        self._pool = ConnectionPool.from_url(
+            self.config.redis_url, max_connections=self.config.max_connections, protocol=2
+        )
+        self._client = Redis(connection_pool=self._pool)
+        self._index_ready = False
+
+    async def add(self, content: MemoryContent, cancellation_token: CancellationToken | None = None) -> None:
+        """Add a single memory item (a one-item `add_many`)."""
+        await self.add_many([content], cancellation_token)
+
+    async def add_many(
+        self, contents: Sequence[MemoryContent], cancellation_token: CancellationToken | None = None
+    ) -> int:
+        """Embed and store many items with one pipeline round-trip per write batch.
+
+        Args:
+            contents: Items to store.
+            cancellation_token: Optional token to cancel operation. Not used.
+
+        Returns:
+            Number of items written.
+        """
+        if not contents:
+            return 0
+        embeddings = await self._embed_all([content_to_text(content) for content in contents])
+        await self._ensure_index(len(embeddings[0]) if embeddings else None)
+        base_timestamp = time.time_ns()
+        batch_size = self.config.write_batch_size
+        for start in range(0, len(contents), batch_size):
+            pipeline = self._client.pipeline(transaction=False)
+            for offset, content in enumerate(contents[start : start + batch_size], start):
+                embedding = embeddings[offset] if embeddings else None
+                pipeline.hset(self._new_key(), mapping=self._to_hash(content, embedding, base_timestamp + offset))
+            await pipeline.execute()
+        return len(contents)
+
+    async def query(
+        self,
+        query: str | MemoryContent = "",
+        cancellation_token: CancellationToken | None = None,
+        metadata_filter: Mapping[str, Any] | None = None,
+        top_k: int | None = None,
+        **kwargs: Any,
+    ) -> MemoryQueryResult:
+        """Return the memories closest to the query among those matching the metadata filter.
+
+        Args:
+            query: Query text or memory item. Ignored when no embedder is configured.
+            cancellation_token: Optional token to cancel operation. Not used.
+            metadata_filter: Equality filter on configured `filter_fields`, e.g. ``{"category": "preferences"}``.
+            top_k: Override for the number of results.
+            **kwargs: ``distance_threshold`` override.
+
+        Returns:
+            MemoryQueryResult with the cosine ``distance`` in each item's metadata for semantic queries.
+        """
+        limit = top_k or self.config.top_k
+        query_text = content_to_text(query)
+        if self._embedder is None or not query_text.strip():
+            return await self.get_all(metadata_filter, limit=limit)
+
+        if not await self._ensure_index(None):
+            return MemoryQueryResult(results=[])
+        vector = (await self._embedder([query_text]))[0]
+        threshold = kwargs.get("distance_threshold", self.config.distance_threshold)
+        search = f"({self._filter_expression(metadata_filter)})=>[KNN {limit} @embedding $vec AS distance]"
+        raw = await self._client.execute_command(
+            "FT.SEARCH", self.config.index_name, search,
+            "PARAMS", "2", "vec", _pack_vector(vector),
+            "SORTBY", "distance", "ASC",
+            "RETURN", "4", "content", "mime_type", "metadata", "distance",
+            "LIMIT", "0", str(limit), "DIALECT", "2",
+        )  # fmt: skip
+        results = [item for item in self._parse_search(raw) if item.metadata["distance"] <= threshold]
+        return MemoryQueryResult(results=results)
+
+    async def get_all(self, metadata_filter: Mapping[str, Any] | None = None, limit: int = MAX_GET_ALL) -> MemoryQueryResult:
+        """Load every matching memory, most recent first, in one round-trip.
+
+        Args:
+            metadata_filter: Equality filter on configured `filter_fields`.
+            limit: Maximum number of items returned.
+
+        Returns:
+            MemoryQueryResult with the matching memories.
+        """
+        if not await self._ensure_index(None):
+            return MemoryQueryResult(results=[])
+        raw = await self._client.execute_command(
+            "FT.SEARCH", self.config.index_name, self._filter_expression(metadata_filter),
+            "SORTBY", "created_at", "DESC",
+            "RETURN", "3", "content", "mime_type", "metadata",
+            "LIMIT", "0", str(limit), "DIALECT", "2",
+        )  # fmt: skip
+        return MemoryQueryResult(results=self._parse_search(raw))
+
+    async def update_context(self, model_context: ChatCompletionContext) -> UpdateContextResult:
+        """Query with the last message in the context and append the hits as a SystemMessage."""
+        messages = await model_context.get_messages()
+        if not messages:
+            return UpdateContextResult(memories=MemoryQueryResult(results=[]))
+
+        last_message = messages[-1]
+        query_text = last_message.content if isinstance(last_message.content, str) else str(last_message)
+        query_results = await self.query(query_text)
+        if query_results.results:
+            memory_strings = [f"{i}. {str(memory.content)}" for i, memory in enumerate(query_results.results, 1)]
+            await model_context.add_message(SystemMessage(content="\nRelevant memory content:\n" + "\n".join(memory_strings)))
+        return UpdateContextResult(memories=query_results)
+
+    async def clear(self) -> None:
+        """Drop the index together with its documents; it is recreated on the next add."""
+        try:
+            await self._client.execute_command("FT.DROPINDEX", self.config.index_name, "DD")
+        except ResponseError as e:
+            logger.debug(f"Nothing to clear for index {self.config.index_name}: {e}")
+        self._index_ready = False
+
+    async def close(self) -> None:
+        """Release the pooled connections. Stored memories are kept."""
+        await self._client.aclose()
+        await self._pool.disconnect()
+
+    async def _embed_all(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in `embedding_batch_size` chunks; empty when no embedder is configured."""
+        if self._embedder is None:
+            return []
+        embeddings: List[List[float]] = []
+        batch_size = self.config.embedding_batch_size
+        for start in range(0, len(texts), batch_size):
+            embeddings.extend(await self._embedder(texts[start : start + batch_size]))
+        return embeddings
+
+    async def _ensure_index(self, dimensions: int | None) -> bool:
+        """Make sure the index exists, creating it when `dimensions` is known.
+
+        Returns:
+            True when the index exists afterwards.
+        """
+        if self._index_ready:
+            return True
+        try:
+            await self._client.execute_command("FT.INFO", self.config.index_name)
+            self._index_ready = True
+            return True
+        except ResponseError:
+            pass
+        if dimensions is None and self._embedder is not None:
+            return False
+        await self._client.execute_command("FT.CREATE", *self._index_schema(dimensions))
+        self._index_ready = True
+        return True
+
+    def _index_schema(self, dimensions: int | None) -> List[str]:
+        schema = [
+            self.config.index_name, "ON", "HASH", "PREFIX", "1", f"{self.config.prefix}:",
+            "SCHEMA", "content", "TEXT", "created_at", "NUMERIC", "SORTABLE",
+        ]  # fmt: skip
+        for field in self.config.filter_fields:
+            schema += [f"{TAG_FIELD_PREFIX}{field}", "AS", field, "TAG"]
+        if dimensions is not None:
+            schema += ["embedding", "VECTOR", "FLAT", "6", "TYPE", "FLOAT32", "DIM", str(dimensions), "DISTANCE_METRIC", "COSINE"]
+        return schema
+
+    def _new_key(self) -> str:
+        return f"{self.config.prefix}:{uuid.uuid4().hex}"
+
+    def _to_hash(self, content: MemoryContent, embedding: List[float] | None, created_at: int) -> Dict[str, Any]:
+        mime_type = content.mime_type.value if isinstance(content.mime_type, MemoryMimeType) else content.mime_type
+        stored_content = json.dumps(content.content) if isinstance(content.content, dict) else content_to_text(content)
+        metadata = content.metadata or {}
+        mapping: Dict[str, Any] = {
+            "content": stored_content,
+            "mime_type": mime_type,
+            "metadata": json.dumps(metadata, default=str),
+            "created_at": created_at,
+        }
+        for field in self.config.filter_fields:
+            if field in metadata:
+                mapping[f"{TAG_FIELD_PREFIX}{field}"] = str(metadata[field])
+        if embedding is not None:
+            mapping["embedding"] = _pack_vector(embedding)
+        return mapping
+
+    def _filter_expression(self, metadata_filter: Mapping[str, Any] | None) -> str:
+        """Build a RediSearch TAG filter such as ``@category:{preferences} @type:{units}``."""
+        if not metadata_filter:
+            return "*"
+        unknown = set(metadata_filter) - set(self.config.filter_fields)
+        if unknown:
+            raise ValueError(f"Metadata keys {sorted(unknown)} are not indexed; add them to filter_fields.")
+        return " ".join(f"@{key}:{{{_escape_tag(str(value))}}}" for key, value in metadata_filter.items())
+
+    def _parse_search(self, raw: List[Any]) -> List[MemoryContent]:
+        """Convert a RESP2 FT.SEARCH reply ``[total, key, [field, value, ...], ...]`` to memories."""
+        memories: List[MemoryContent] = []
+        for fields in raw[2::2]:
+            values = {_decode(fields[i]): _decode(fields[i + 1]) for i in range(0, len(fields), 2)}
+            metadata = json.loads(values.get("metadata") or "{}")
+            if "distance" in values:
+                metadata["distance"] = float(values["distance"])
+            mime_type = values.get("mime_type", MemoryMimeType.TEXT.value)
+            content: Any = values.get("content", "")
+            if mime_type == MemoryMimeType.JSON.value:
+                content = json.loads(content)
+            memories.append(MemoryContent(content=content, mime_type=mime_type, metadata=metadata))
+        return memories
+
+
+def _escape_tag(value: str) -> str:
+    return _TAG_SPECIAL_CHARACTERS.sub(r"\\\1", value)
+
+
+def _pack_vector(vector: Sequence[float]) -> bytes:
+    return struct.pack(f"<{len(vector)}f", *vector)
+
+
+def _decode(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
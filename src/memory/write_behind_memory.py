@@ -0,0 +1,250 @@
+"""
+Write-behind wrapper that takes slow memory persistence off the agent's turn.
+
+`Mem0Memory.add` (and other LLM- or network-backed memories) can take seconds, and it runs inline
+with the conversation. `WriteBehindMemory` wraps any Memory: `add` only enqueues the item, and a
+background task persists queued items in coalesced batches. Pending items stay visible to `query`
+and `update_context` until they are persisted (read-your-writes), and `close()` flushes the queue.
+`clear()` also discards the batch being persisted, so cleared items never come back. Items whose
+write failed stay pending, and `flush()` retries them and raises if they still cannot be written.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Sequence, Tuple
+
+from autogen_core import CancellationToken
+from autogen_core.memory import Memory, MemoryContent, MemoryQueryResult, UpdateContextResult
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import SystemMessage
+
+from src.memory.hybrid_memory import content_to_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PENDING = 1000  # Queue bound; add() waits (backpressure) once this many items are pending
+DEFAULT_BATCH_SIZE = 32  # Maximum items persisted per batch
+DEFAULT_BATCH_WINDOW = 0.05  # Seconds to wait for more items before persisting a partial batch
+PERSISTENCE_ERRORS: Tuple[type[BaseException], ...] = (OSError, asyncio.TimeoutError)  # Network and disk failures
+PENDING_HEADER = "\nRecently added memory content (pending persistence):\n"
+
+
+class WriteBehindError(RuntimeError):
+    """Raised by ``flush()`` and ``close()`` when queued memories could not be persisted."""
+
+
+class WriteBehindMemory(Memory):
+    """Queue `add` calls and persist them to the wrapped memory in the background.
+
+    Identical items (same content, MIME type and metadata) that are already pending are coalesced
+    into one write. Every pending item is returned by ``query`` and ``update_context`` regardless of
+    the query text: there are few of them (at most one batch window's worth in steady state), and a
+    relevance match on text the wrapped memory has not indexed yet would hide the newest facts.
+    Batches go through the wrapped memory's ``add_many`` when it has one (e.g. PipelinedRedisMemory),
+    otherwise through ``add`` in enqueue order.
+
+    A write that fails with one of ``persistence_errors`` is logged and counted in
+    :attr:`failed_count`, and its items stay pending (still returned by ``query``). The next
+    ``flush()`` re-queues them and raises :class:`WriteBehindError` if they fail again, so callers
+    learn that memories were not saved. Any other error stops the background task; its batch stays
+    pending and ``flush()`` raises with that error as the cause.
+
+    Args:
+        memory: The slow memory to persist to, e.g. ``Mem0Memory``.
+        max_pending: Maximum number of queued items before ``add`` applies backpressure.
+        batch_size: Maximum number of items persisted per batch.
+        batch_window: Seconds to wait for more items before persisting a partial batch.
+        persistence_errors: Exception types of the wrapped memory that mean a write failed and can
+            be retried, e.g. ``(redis.exceptions.RedisError,)`` for a Redis-backed memory.
+    """
+
+    def __init__(
+        self,
+        memory: Memory,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        persistence_errors: Sequence[type[BaseException]] = PERSISTENCE_ERRORS,
+    ) -> None:
+        self._memory = memory
+        self._persistence_errors = tuple(persistence_errors)
+        self._batch_size = batch_size
+        self._batch_window = batch_window
+        self._queue: asyncio.Queue[Tuple[int, str, MemoryContent]] = asyncio.Queue(maxsize=max_pending)
+        self._pending: Dict[str, MemoryContent] = {}
+        self._failed: Dict[str, MemoryContent] = {}  # Pending items whose last write failed
+        self._last_error: BaseException | None = None
+        self._generation = 0  # Bumped by clear(); items queued under an older generation are dropped
+        self._persist_lock = asyncio.Lock()  # Held while a batch is written, so clear() can wait it out
+        self._worker: asyncio.Task[None] | None = None
+        self.persisted_count = 0
+        self.coalesced_count = 0
+        self.failed_count = 0
+
+    @property
+    def wrapped_memory(self) -> Memory:
+        """The memory items are persisted to."""
+        return self._memory
+
+    @property
+    def pending_count(self) -> int:
+        """Number of items queued but not yet persisted."""
+        return len(self._pending)
+
+    async def add(self, content: MemoryContent, cancellation_token: CancellationToken | None = None) -> None:
+        """Enqueue content for background persistence; returns as soon as it is queued."""
+        key = _coalesce_key(content)
+        if key in self._pending:
+            self.coalesced_count += 1
+            return
+        self._pending[key] = content
+        self._ensure_worker()
+        await self._queue.put((self._generation, key, content))
+
+    async def query(
+        self,
+        query: str | MemoryContent = "",
+        cancellation_token: CancellationToken | None = None,
+        **kwargs: Any,
+    ) -> MemoryQueryResult:
+        """Query the wrapped memory and prepend the pending items it does not return yet."""
+        persisted = await self._memory.query(query, cancellation_token, **kwargs)
+        return MemoryQueryResult(results=self._unpersisted(persisted.results) + persisted.results)
+
+    async def update_context(self, model_context: ChatCompletionContext) -> UpdateContextResult:
+        """Let the wrapped memory update the context, then add the pending items it did not inject."""
+        result = await self._memory.update_context(model_context)
+        pending = self._unpersisted(result.memories.results)
+        if pending:
+            memory_strings = [f"{i}. {str(memory.content)}" for i, memory in enumerate(pending, 1)]
+            await model_context.add_message(SystemMessage(content=PENDING_HEADER + "\n".join(memory_strings)))
+        return UpdateContextResult(memories=MemoryQueryResult(results=pending + result.memories.results))
+
+    async def flush(self) -> None:
+        """Wait until every queued item has been written, retrying items whose earlier write failed.
+
+        Raises:
+            WriteBehindError: Some items could not be persisted. They stay pending and are retried
+                by the next ``flush()``.
+        """
+        await self._requeue_failed()
+        if self._worker is not None:
+            joined = asyncio.ensure_future(self._queue.join())
+            await asyncio.wait({joined, self._worker}, return_when=asyncio.FIRST_COMPLETED)
+            joined.cancel()
+        self._raise_failures()
+
+    async def clear(self) -> None:
+        """Drop pending items, including a batch being collected, and clear the wrapped memory."""
+        self._generation += 1
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+        self._pending.clear()
+        self._failed.clear()
+        async with self._persist_lock:  # A batch already being written lands before the clear
+            await self._memory.clear()
+
+    async def close(self) -> None:
+        """Flush pending writes, stop the background task and close the wrapped memory.
+
+        Raises:
+            WriteBehindError: Some items could not be persisted; they are lost once closed.
+        """
+        try:
+            await self.flush()
+        finally:
+            if self._worker is not None:
+                self._worker.cancel()
+                await asyncio.gather(self._worker, return_exceptions=True)
+                self._worker = None
+            await self._memory.close()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Background loop: collect a batch, persist it, mark it done."""
+        while True:
+            batch = await self._next_batch()
+            live = [(key, content) for generation, key, content in batch if generation == self._generation]
+            failed = live  # Until the write reports otherwise, e.g. when it raises an unexpected error
+            try:
+                async with self._persist_lock:
+                    failed = await self._persist(live)
+            finally:
+                self._settle(batch, dict(failed))
+
+    async def _next_batch(self) -> List[Tuple[int, str, MemoryContent]]:
+        """Wait for one item, then gather more until the batch is full or the window closes."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._batch_window
+        while len(batch) < self._batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _persist(self, items: List[Tuple[str, MemoryContent]]) -> List[Tuple[str, MemoryContent]]:
+        """Write items in one ``add_many`` call or one ``add`` per item; returns the items not written."""
+        add_many = getattr(self._memory, "add_many", None)
+        groups = [items] if add_many is not None else [[item] for item in items]
+        for index, group in enumerate(groups):
+            contents = [content for _, content in group]
+            try:
+                await (add_many(contents) if add_many is not None else self._memory.add(contents[0]))
+            except self._persistence_errors as e:
+                unwritten = [item for remaining in groups[index:] for item in remaining]
+                logger.exception(f"Write-behind persistence failed, keeping {len(unwritten)} memories pending")
+                self._last_error = e
+                return unwritten
+            self.persisted_count += len(contents)
+        return []
+
+    def _settle(self, batch: List[Tuple[int, str, MemoryContent]], failed: Dict[str, MemoryContent]) -> None:
+        """Mark a batch done; written items stop being pending, failed ones wait for the next flush."""
+        for generation, key, _ in batch:
+            if generation == self._generation and key not in failed:  # Re-added after a clear(): still pending
+                self._pending.pop(key, None)
+            self._queue.task_done()
+        self.failed_count += len(failed)
+        self._failed.update(failed)
+
+    async def _requeue_failed(self) -> None:
+        """Queue items whose last write failed again, restarting the background task if it stopped."""
+        failed, self._failed = self._failed, {}
+        if failed or not self._queue.empty():
+            self._ensure_worker()
+        for key, content in failed.items():
+            await self._queue.put((self._generation, key, content))
+
+    def _raise_failures(self) -> None:
+        """Raise if items failed to persist since the flush started, or the background task died."""
+        worker_error = None
+        if self._worker is not None and self._worker.done() and not self._worker.cancelled():
+            worker_error = self._worker.exception()
+            self._worker = None  # Restarted by the next add() or flush()
+        if not self._failed and worker_error is None:
+            return
+        cause = worker_error or self._last_error
+        raise WriteBehindError(
+            f"{len(self._failed)} memories could not be persisted; they stay pending until the next flush()"
+        ) from cause
+
+    def _unpersisted(self, persisted: List[MemoryContent]) -> List[MemoryContent]:
+        """Pending items not among `persisted` (an item stays pending until its whole batch is written)."""
+        persisted_texts = {content_to_text(item) for item in persisted}
+        return [item for item in self._pending.values() if content_to_text(item) not in persisted_texts]
+
+
+def _coalesce_key(content: MemoryContent) -> str:
+    """Identity of a memory item for coalescing duplicate pending writes."""
+    return json.dumps(content.model_dump(mode="json"), sort_keys=True, default=str)
@@ -0,0 +1,159 @@
+"""
+Buffered model context whose history is persisted to, and restored from, memory-mapped logs.
+
+`BufferedChatCompletionContext` only sends the last `buffer_size` messages to the model, but its
+state still holds (and `load_state` still validates) the whole history. `MappedHistoryChatCompletionContext`
+appends messages to a `MessageLog` when its state is saved, so the state is just a list of
+``(log name, record count)`` segments, with names relative to the history directory. Loading maps those segments and builds pydantic messages only
+for the window that `get_messages` actually returns.
+"""
+from __future__ import annotations
+
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Tuple
+
+from autogen_core import Component
+from autogen_core.model_context import ChatCompletionContext, ChatCompletionContextState
+from autogen_core.models import FunctionExecutionResultMessage, LLMMessage
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import Self
+
+from src.state.message_log import LazySequence, MappedMessageView, MessageLog
+
+DEFAULT_HISTORY_DIR = ".state/history"  # Where message logs are written
+LOG_SUFFIX = ".log"
+
+_llm_message_adapter: TypeAdapter[LLMMessage] = TypeAdapter(LLMMessage)
+
+
+class MappedHistoryChatCompletionContextConfig(BaseModel):
+    """Configuration for MappedHistoryChatCompletionContext component."""
+
+    buffer_size: int
+    history_dir: str = DEFAULT_HISTORY_DIR
+    initial_messages: List[LLMMessage] | None = None
+
+
+class MappedHistoryState(BaseModel):
+    """Persisted state: the log segments holding the history, in order.
+
+    Log names are relative to the context's history directory, so a state stays valid when the
+    process runs from another working directory or the directory is moved along with its state.
+    """
+
+    segments: List[Tuple[str, int]] = Field(default_factory=list)
+
+
+class MappedHistoryChatCompletionContext(ChatCompletionContext, Component[MappedHistoryChatCompletionContextConfig]):
+    """Buffered context that keeps its history in memory-mapped, append-only logs.
+
+    ``save_state`` appends messages added since the last save to the current log and returns only
+    segment references; ``load_state`` maps the segments without decoding them. If the current log
+    was extended by another context restored from the same state, the next save starts a new log
+    instead of appending to it, so saved states never change underneath each other. States saved by
+    the standard contexts (a ``messages`` list) are accepted as well.
+
+    Args:
+        buffer_size: Number of most recent messages returned by :meth:`get_messages`.
+        history_dir: Directory where message logs are written; a relative path is resolved against the
+            working directory once, when the context is created.
+        initial_messages: Initial messages to include in the context.
+    """
+
+    component_config_schema = MappedHistoryChatCompletionContextConfig
+    component_provider_override = "src.model_context.mapped_history_context.MappedHistoryChatCompletionContext"
+
+    def __init__(
+        self,
+        buffer_size: int,
+        history_dir: str = DEFAULT_HISTORY_DIR,
+        initial_messages: List[LLMMessage] | None = None,
+    ) -> None:
+        super().__init__(initial_messages)
+        if buffer_size <= 0:
+            raise ValueError("buffer_size must be greater than 0.")
+        self._buffer_size = buffer_size
+        self._history_dir = history_dir
+        self._history_root = Path(history_dir).resolve()
+        self._segments: List[Tuple[str, int]] = []
+        self._views: Dict[Tuple[str, int], MappedMessageView] = {}
+        self._history: LazySequence[LLMMessage] = LazySequence([], _llm_message_adapter.validate_python)
+
+    @property
+    def message_count(self) -> int:
+        """Total number of messages, persisted and pending."""
+        return len(self._history) + len(self._messages)
+
+    @property
+    def materialized_count(self) -> int:
+        """Number of persisted messages built into pydantic objects since the last load."""
+        return self._history.materialized_count
+
+    async def get_messages(self) -> List[LLMMessage]:
+        """Get at most `buffer_size` recent messages, materializing only those."""
+        pending = self._messages[-self._buffer_size :]
+        from_history = self._buffer_size - len(pending)
+        messages = self._history[max(len(self._history) - from_history, 0) :] + pending if from_history else pending
+        # Handle the first message is a function call result message.
+        if messages and isinstance(messages[0], FunctionExecutionResultMessage):
+            messages = messages[1:]
+        return messages
+
+    async def clear(self) -> None:
+        """Forget the history; existing logs are kept because saved states may reference them."""
+        await super().clear()
+        self._open([])
+
+    async def save_state(self) -> Mapping[str, Any]:
+        """Append pending messages to the log and return the segment references."""
+        if self._messages:
+            name = self._writable_log_name()
+            count = self._log(name).append([message.model_dump(mode="json") for message in self._messages])
+            segments = list(self._segments)
+            if segments and segments[-1][0] == name:
+                segments[-1] = (name, count)
+            else:
+                segments.append((name, count))
+            self._open(segments)
+            self._messages = []
+        return MappedHistoryState(segments=self._segments).model_dump()
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        """Map the saved segments; messages are decoded only when the window reaches them."""
+        if "segments" in state:
+            self._open(MappedHistoryState.model_validate(state).segments)
+            self._messages = []
+            return
+        self._open([])
+        self._messages = ChatCompletionContextState.model_validate(state).messages
+
+    def _open(self, segments: List[Tuple[str, int]]) -> None:
+        """Map `segments`, reusing views of segments that are already mapped."""
+        views = {segment: self._views.pop(segment, None) or self._log(segment[0]).view(segment[1]) for segment in segments}
+        for stale_view in self._views.values():
+            stale_view.close()
+        self._views = views
+        self._segments = list(segments)
+        self._history = LazySequence(list(views.values()), _llm_message_adapter.validate_python)
+
+    def _log(self, name: str) -> MessageLog:
+        """The log of a segment name; absolute names (from older states) are used as they are."""
+        return MessageLog(self._history_root / name)
+
+    def _writable_log_name(self) -> str:
+        """The last segment's log if nobody appended past it, otherwise a new log."""
+        if self._segments:
+            name, count = self._segments[-1]
+            if self._log(name).count == count:
+                return name
+        return f"{uuid.uuid4().hex}{LOG_SUFFIX}"
+
+    def _to_config(self) -> MappedHistoryChatCompletionContextConfig:
+        return MappedHistoryChatCompletionContextConfig(
+            buffer_size=self._buffer_size, history_dir=self._history_dir, initial_messages=self._initial_messages
+        )
+
+    @classmethod
+    def _from_config(cls, config: MappedHistoryChatCompletionContextConfig) -> Self:
+        return cls(**config.model_dump())
@@ -0,0 +1,263 @@
+"""
+Token-budgeted model context with rolling summarisation.
+
+Every AssistantAgent re-sends its whole model context on each turn, so in long team runs
+(critic loops, generator/reviewer cycles, Swarm handoffs) prompt size grows with the transcript.
+`SummarizingChatCompletionContext` keeps the prompt under a fixed token budget:
+
+- the first `pinned_count` messages (typically the original task) are always kept verbatim,
+- the most recent messages are kept verbatim,
+- older messages are folded into a running summary, updated incrementally by a (cheap) model.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, List, Mapping
+
+from autogen_core import Component, ComponentModel
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import (
+    AssistantMessage,
+    ChatCompletionClient,
+    FunctionExecutionResultMessage,
+    LLMMessage,
+    SystemMessage,
+    UserMessage,
+)
+from pydantic import BaseModel, Field
+from typing_extensions import Self
+
+from src.utils.token_utils import (
+    DEFAULT_TOKEN_MODEL,
+    RunningTokenTotal,
+    count_message_tokens,
+    count_text_tokens,
+    message_text,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_BUDGET = 4000  # Maximum prompt tokens returned by get_messages
+DEFAULT_SUMMARY_MAX_TOKENS = 400  # Upper bound on the running summary's length
+RECENT_SHARE = 0.6  # Fraction of the budget the verbatim tail shrinks to after a fold (hysteresis)
+FALLBACK_CHARS_PER_MESSAGE = 160  # Per-message excerpt kept when the summarizer call fails
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+SUMMARIZER_INSTRUCTIONS = (
+    "You maintain a running summary of a multi-agent conversation. Update the summary with the new "
+    "messages. Keep decisions, open questions, facts, and who said what. Reply with the summary only, "
+    "in at most {max_tokens} tokens."
+)
+
+
+class SummarizingChatCompletionContextConfig(BaseModel):
+    """Configuration for SummarizingChatCompletionContext component."""
+
+    summarizer_client: ComponentModel
+    token_budget: int = DEFAULT_TOKEN_BUDGET
+    summary_max_tokens: int = DEFAULT_SUMMARY_MAX_TOKENS
+    pinned_count: int = 1
+    token_model: str = DEFAULT_TOKEN_MODEL
+    initial_messages: List[LLMMessage] | None = None
+
+
+class SummarizingContextState(BaseModel):
+    """Persisted state: the unfolded messages plus the running summary."""
+
+    messages: List[LLMMessage] = Field(default_factory=list)
+    summary: str = ""
+    folded_count: int = 0
+
+
+class SummarizingChatCompletionContext(ChatCompletionContext, Component[SummarizingChatCompletionContextConfig]):
+    """Model context that bounds prompt size by folding old turns into a rolling summary.
+
+    When the pinned messages, the summary and the verbatim tail exceed ``token_budget``, the oldest
+    unpinned messages are folded into the summary until the tail fits ``RECENT_SHARE`` of the
+    remaining budget, so the summarizer runs once every few turns rather than on every turn.
+    Folded messages are dropped from the context, which keeps its memory bounded as well.
+    Token totals are maintained incrementally as messages are added and folded, so the budget
+    check costs O(new messages) per turn.
+
+    Example:
+
+        .. code-block:: python
+
+            agent = AssistantAgent(
+                "critic",
+                model_client=model_client,
+                model_context=SummarizingChatCompletionContext(summarizer_client=model_client, token_budget=3000),
+            )
+
+    Args:
+        summarizer_client: Model client used to update the summary (a cheap model is enough).
+        token_budget: Maximum prompt tokens returned by :meth:`get_messages`.
+        summary_max_tokens: Upper bound on the summary's length.
+        pinned_count: Number of leading messages that are never folded (e.g. the original task).
+        token_model: Model whose tokenizer is used for budgeting.
+        initial_messages: Initial messages to include in the context.
+    """
+
+    component_config_schema = SummarizingChatCompletionContextConfig
+    component_provider_override = "src.model_context.summarizing_context.SummarizingChatCompletionContext"
+
+    def __init__(
+        self,
+        summarizer_client: ChatCompletionClient,
+        *,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        summary_max_tokens: int = DEFAULT_SUMMARY_MAX_TOKENS,
+        pinned_count: int = 1,
+        token_model: str = DEFAULT_TOKEN_MODEL,
+        initial_messages: List[LLMMessage] | None = None,
+    ) -> None:
+        super().__init__(initial_messages)
+        if summary_max_tokens >= token_budget:
+            raise ValueError("summary_max_tokens must be smaller than token_budget.")
+        self._summarizer_client = summarizer_client
+        self._token_budget = token_budget
+        self._summary_max_tokens = summary_max_tokens
+        self._pinned_count = pinned_count
+        self._token_model = token_model
+        self._summary = ""
+        self.folded_count = 0
+        self._pinned_tokens = RunningTokenTotal(token_model)
+        self._tail_tokens = RunningTokenTotal(token_model)
+        self._reset_token_totals()
+
+    @property
+    def summary(self) -> str:
+        """The current running summary of folded messages."""
+        return self._summary
+
+    async def add_message(self, message: LLMMessage) -> None:
+        """Add a message and count its tokens once."""
+        await super().add_message(message)
+        if len(self._messages) <= self._pinned_count:
+            self._pinned_tokens.append(message)
+        else:
+            self._tail_tokens.append(message)
+
+    async def get_messages(self) -> List[LLMMessage]:
+        """Return pinned messages, the summary (if any) and the verbatim recent messages within budget."""
+        pinned, tail = self._split()
+        if self._prompt_tokens() > self._token_budget:
+            tail = await self._fold(pinned, tail)
+        summary_message = [SystemMessage(content=SUMMARY_PREFIX + self._summary)] if self._summary else []
+        return pinned + summary_message + tail
+
+    async def clear(self) -> None:
+        """Clear messages and the summary."""
+        await super().clear()
+        self._summary = ""
+        self.folded_count = 0
+        self._reset_token_totals()
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return SummarizingContextState(
+            messages=self._messages, summary=self._summary, folded_count=self.folded_count
+        ).model_dump()
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        loaded = SummarizingContextState.model_validate(state)
+        self._messages = loaded.messages
+        self._summary = loaded.summary
+        self.folded_count = loaded.folded_count
+        self._reset_token_totals()
+
+    def _split(self) -> tuple[List[LLMMessage], List[LLMMessage]]:
+        return self._messages[: self._pinned_count], self._messages[self._pinned_count :]
+
+    def _reset_token_totals(self) -> None:
+        pinned, tail = self._split()
+        self._pinned_tokens.reset(pinned)
+        self._tail_tokens.reset(tail)
+
+    def _prompt_tokens(self) -> int:
+        summary_message = SystemMessage(content=SUMMARY_PREFIX + self._summary)
+        summary_tokens = count_message_tokens(summary_message, self._token_model) if self._summary else 0
+        return self._pinned_tokens.total + summary_tokens + self._tail_tokens.total
+
+    async def _fold(self, pinned: List[LLMMessage], tail: List[LLMMessage]) -> List[LLMMessage]:
+        """Move the oldest tail messages into the summary until the tail fits its share of the budget."""
+        tail_budget = int((self._token_budget - self._pinned_tokens.total - self._summary_max_tokens) * RECENT_SHARE)
+        fold_until = 0
+        tail_tokens = self._tail_tokens.total
+        while fold_until < len(tail) - 1 and tail_tokens > tail_budget:
+            tail_tokens -= self._tail_tokens.peek_front(fold_until)
+            fold_until += 1
+        fold_until = _tool_safe_boundary(tail, fold_until)
+        if fold_until == 0:
+            return tail
+
+        await self._update_summary(tail[:fold_until])
+        self.folded_count += fold_until
+        self._tail_tokens.pop_front(fold_until)
+        self._messages = pinned + tail[fold_until:]
+        return tail[fold_until:]
+
+    async def _update_summary(self, folded: List[LLMMessage]) -> None:
+        transcript = "\n".join(f"{_speaker(message)}: {message_text(message)}" for message in folded)
+        prompt = f"Current summary:\n{self._summary or '(empty)'}\n\nNew messages:\n{transcript}"
+        try:
+            result = await self._summarizer_client.create(
+                [
+                    SystemMessage(content=SUMMARIZER_INSTRUCTIONS.format(max_tokens=self._summary_max_tokens)),
+                    UserMessage(content=prompt, source="summarizer"),
+                ],
+                extra_create_args={"max_tokens": self._summary_max_tokens},
+            )
+            self._summary = result.content if isinstance(result.content, str) else str(result.content)
+        except Exception as e:
+            logger.warning(f"Summarizer call failed, keeping excerpts of {len(folded)} folded messages: {e}")
+            self._summary = self._fallback_summary(folded)
+
+    def _fallback_summary(self, folded: List[LLMMessage]) -> str:
+        """Append short excerpts and trim from the front so the summary stays within its token cap."""
+        excerpts = [f"{_speaker(message)}: {message_text(message)[:FALLBACK_CHARS_PER_MESSAGE]}" for message in folded]
+        lines = [line for line in self._summary.splitlines() if line] + excerpts
+        while len(lines) > 1 and count_text_tokens("\n".join(lines), self._token_model) > self._summary_max_tokens:
+            lines.pop(0)
+        return "\n".join(lines)
+
+    def _to_config(self) -> SummarizingChatCompletionContextConfig:
+        return SummarizingChatCompletionContextConfig(
+            summarizer_client=self._summarizer_client.dump_component(),
+            token_budget=self._token_budget,
+            summary_max_tokens=self._summary_max_tokens,
+            pinned_count=self._pinned_count,
+            token_model=self._token_model,
+            initial_messages=self._initial_messages,
+        )
+
+    @classmethod
+    def _from_config(cls, config: SummarizingChatCompletionContextConfig) -> Self:
+        return cls(
+            summarizer_client=ChatCompletionClient.load_component(config.summarizer_client),
+            token_budget=config.token_budget,
+            summary_max_tokens=config.summary_max_tokens,
+            pinned_count=config.pinned_count,
+            token_model=config.token_model,
+            initial_messages=config.initial_messages,
+        )
+
+
+def _tool_safe_boundary(tail: List[LLMMessage], fold_until: int) -> int:
+    """Move a fold boundary so that tool results are never kept without the call that produced them.
+
+    The boundary moves past results to the next other message; if only results follow, it moves back
+    so that the call stays in the tail with them.
+    """
+    boundary = fold_until
+    while boundary < len(tail) and isinstance(tail[boundary], FunctionExecutionResultMessage):
+        boundary += 1
+    if boundary < len(tail):
+        return boundary
+    while fold_until > 0 and isinstance(tail[fold_until], FunctionExecutionResultMessage):
+        fold_until -= 1
+    return fold_until
+
+
+def _speaker(message: LLMMessage) -> str:
+    if isinstance(message, (UserMessage, AssistantMessage)):
+        return message.source
+    return "tool" if isinstance(message, FunctionExecutionResultMessage) else "system"
@@ -0,0 +1,298 @@
+"""
+Process-wide registry of shared, pooled model clients.
+
+Building an ``OpenAIChatCompletionClient`` per agent or per task gives each one its own HTTP
+connection pool, so every task pays for fresh TCP connections and TLS handshakes.
+`ModelClientRegistry` hands out clients keyed by model and configuration that share:
+
+- one ``OpenAIChatCompletionClient`` per distinct (model, config), and
+- one tuned ``httpx.AsyncClient`` (keep-alive, connection limits, timeouts) for all of them,
+
+so connections are set up once per process and reused by every task; :meth:`ModelClientRegistry.warm_up`
+opens them before the first task. Callers get a `SharedChatCompletionClient` lease: it reports its
+own usage like a private client would, and its ``close()`` releases the lease without closing the
+shared client or the pool. The registry itself is closed with :meth:`ModelClientRegistry.aclose`
+(usually once, at process exit).
+
+httpx connections belong to the event loop that opened them; when the registry is used from a new
+loop (e.g. examples each started with ``asyncio.run``), it starts a fresh pool for that loop and
+closes the clients left behind by the previous loop once that loop has finished.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Dict, Literal, Mapping, Optional, Sequence, Union
+
+import httpx
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, RequestUsage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from src.models.wrapped_client import WrappedChatCompletionClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WARM_UP_URL = "https://api.openai.com/v1"  # Host whose connections warm_up opens by default
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Connection pool tuning shared by all clients of a registry.
+
+    Keep-alive connections outlive a task so the next one skips connection setup; the expiry
+    should stay below the server's idle timeout (OpenAI closes idle connections after ~60 s).
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 50
+    keepalive_expiry: float = 45.0  # Seconds an idle connection is kept
+    connect_timeout: float = 10.0
+    read_timeout: float = 120.0
+    http2: bool = False  # Needs the `h2` package
+
+    def http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+            http2=self.http2,
+            follow_redirects=True,
+        )
+
+
+def _config_key(model: str, config: Mapping[str, Any]) -> str:
+    """Stable key for a client configuration: the model plus a digest of the config (which may hold secrets)."""
+    rendered = json.dumps(config, sort_keys=True, default=repr)
+    return f"{model}:{hashlib.sha256(rendered.encode()).hexdigest()[:12]}"
+
+
+class SharedChatCompletionClient(WrappedChatCompletionClient):
+    """A lease on a registry-owned client.
+
+    Usage is counted per lease, so ``actual_usage``/``total_usage`` cover only this lease's calls
+    even though the underlying client is shared. ``close()`` ends the lease; the shared client and
+    its connections stay open for other leases.
+    """
+
+    def __init__(self, wrapped_client: ChatCompletionClient, registry: ModelClientRegistry, key: str) -> None:
+        super().__init__(wrapped_client)
+        self._registry = registry
+        self._key = key
+        self._closed = False
+        self._actual_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self._total_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        result = await super().create(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        self._add_usage(result.usage)
+        return result
+
+    async def create_stream(  # type: ignore[override]
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        async for item in super().create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        ):
+            if isinstance(item, CreateResult):
+                self._add_usage(item.usage)
+            yield item
+
+    async def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._registry.release(self._key)
+
+    def actual_usage(self) -> RequestUsage:
+        return self._actual_usage
+
+    def total_usage(self) -> RequestUsage:
+        return self._total_usage
+
+    def _add_usage(self, usage: RequestUsage) -> None:
+        self._actual_usage = usage
+        self._total_usage = RequestUsage(
+            prompt_tokens=self._total_usage.prompt_tokens + usage.prompt_tokens,
+            completion_tokens=self._total_usage.completion_tokens + usage.completion_tokens,
+        )
+
+
+class ModelClientRegistry:
+    """Shares model clients, and one HTTP connection pool, across agents and tasks.
+
+    Example:
+
+        .. code-block:: python
+
+            registry = get_registry()
+            await registry.warm_up()  # Optional: open connections before the first task
+            for task in tasks:
+                model_client = registry.get("gpt-4o-mini")  # Same pooled client for every task
+                await run_task(task, model_client)
+                await model_client.close()  # Ends the lease; connections stay open
+            await registry.aclose()
+
+    Args:
+        pool: Connection pool tuning.
+    """
+
+    def __init__(self, pool: PoolSettings | None = None) -> None:
+        self._pool = pool or PoolSettings()
+        self._http_client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._clients: Dict[str, ChatCompletionClient] = {}
+        self._leases: Counter[str] = Counter()
+        self._closing: set[asyncio.Task[None]] = set()  # Closing the clients of a finished event loop
+        self.stats: Counter[str] = Counter()  # created, reused, pool_resets, dropped_closed
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """The pool shared by the registry's clients (for the current event loop)."""
+        self._bind_loop()
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = self._pool.http_client()
+        return self._http_client
+
+    def get(self, model: str, **config: Any) -> SharedChatCompletionClient:
+        """Lease the shared client for `model` and `config` (OpenAIChatCompletionClient arguments)."""
+        key = _config_key(model, config)
+        self._bind_loop()
+        client = self._clients.get(key)
+        if client is None:
+            client = self._create_client(model, config)
+            self._clients[key] = client
+            self.stats["created"] += 1
+            logger.debug(f"Created shared client for {model} ({len(self._clients)} shared clients)")
+        else:
+            self.stats["reused"] += 1
+        self._leases[key] += 1
+        return SharedChatCompletionClient(client, self, key)
+
+    def release(self, key: str) -> None:
+        """End one lease; the client stays shared until :meth:`aclose`."""
+        if self._leases[key] > 0:
+            self._leases[key] -= 1
+
+    def leases(self) -> Dict[str, int]:
+        """Open leases per client key."""
+        return {key: count for key, count in self._leases.items() if count}
+
+    async def warm_up(self, *urls: str) -> None:
+        """Open pooled connections to `urls` (default: the OpenAI API) so tasks skip connection setup.
+
+        Any response, including an error status, means the connection is established and pooled.
+        """
+        for url in urls or (DEFAULT_WARM_UP_URL,):
+            try:
+                await self.http_client.head(url)
+            except httpx.HTTPError as e:
+                logger.warning(f"Warm-up of {url} failed: {e}")
+
+    async def aclose(self) -> None:
+        """Close every shared client and the connection pool."""
+        if self._closing:
+            await asyncio.gather(*self._closing)
+        if self._leases and any(self._leases.values()):
+            logger.info(f"Closing registry with open leases: {self.leases()}")
+        for client in self._clients.values():
+            await client.close()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        self._clients.clear()
+        self._leases.clear()
+        self._http_client = None
+        self._loop = None
+
+    def _create_client(self, model: str, config: Mapping[str, Any]) -> ChatCompletionClient:
+        from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+        return OpenAIChatCompletionClient(model=model, http_client=self.http_client, **config)  # type: ignore[misc]
+
+    def _bind_loop(self) -> None:
+        """Tie the pool to the running event loop, dropping the clients of a previous loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Outside a loop: clients are created now and used by the loop that runs them
+        if self._loop is None:
+            self._loop = loop
+            return
+        if loop is self._loop:
+            return
+        # Connections of another loop cannot be used from this one; once that loop is closed, nothing
+        # else can close its clients, so they are closed here. A live loop still owns them.
+        logger.debug("Event loop changed; starting a new connection pool")
+        if self._loop.is_closed():
+            task = loop.create_task(self._close_dropped(list(self._clients.values()), self._http_client))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        self._loop = loop
+        self._http_client = None
+        self._clients.clear()
+        self._leases.clear()
+        self.stats["pool_resets"] += 1
+
+    async def _close_dropped(
+        self, clients: Sequence[ChatCompletionClient], http_client: httpx.AsyncClient | None
+    ) -> None:
+        """Close the clients and pool of a closed event loop."""
+        for client in clients:
+            try:
+                await client.close()
+            except RuntimeError as e:  # Its connections' transports cannot be closed without their loop
+                logger.debug(f"Closed a client of a finished event loop: {e}")
+        if http_client is not None and not http_client.is_closed:
+            await http_client.aclose()
+        self.stats["dropped_closed"] += len(clients)
+
+
+_default_registry: ModelClientRegistry | None = None
+
+
+def get_registry() -> ModelClientRegistry:
+    """The process-wide registry."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ModelClientRegistry()
+    return _default_registry
+
+
+def shared_client(model: str, **config: Any) -> SharedChatCompletionClient:
+    """Lease a pooled client for `model` from the process-wide registry."""
+    return get_registry().get(model, **config)
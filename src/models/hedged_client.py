@@ -0,0 +1,299 @@
+"""
+Hedged requests: cut the latency tail of model calls by racing a duplicate against stragglers.
+
+A team turn waits for its slowest model call, so a few stragglers set the p99 of a whole run.
+`HedgedChatCompletionClient` keeps a window of recent call latencies and, once a call has been
+outstanding longer than a chosen percentile of them (p95 by default), sends the same request
+again. The first response wins and the other request is cancelled. Streams are hedged on the
+first chunk: the stream that produces it first is relayed, the other is closed.
+
+Hedges cost money: a cancelled request may still be served, and billed, by the provider. Spend is
+capped by a hedge budget: every call earns ``max_extra_fraction`` of a hedge, at most
+``HEDGE_BURST`` hedges are saved up, and calls find no credit when it runs out. Prompts over
+``max_prompt_tokens`` are never duplicated. Errors are not hedged; retries belong to the rate
+limiter. Wrap outside `RateLimitedChatCompletionClient` and metering, so duplicates are admitted
+and counted like any other call.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from typing import Any, AsyncGenerator, Deque, Dict, Literal, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from src.models.wrapped_client import WrappedChatCompletionClient
+from src.utils.token_utils import count_message_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PERCENTILE = 0.95  # Outstanding time, as a latency percentile, before a call is hedged
+DEFAULT_MAX_EXTRA_FRACTION = 0.1  # Hedges earned per call
+DEFAULT_WINDOW = 500  # Recent latencies the percentile is taken over
+DEFAULT_MIN_SAMPLES = 20  # Calls observed before hedging starts
+DEFAULT_MIN_DELAY_SECONDS = 0.05  # Never hedge sooner than this
+HEDGE_BURST = 2.0  # Hedges that can be saved up
+_END = object()  # First item of a stream that ended without any
+
+
+class LatencyWindow:
+    """Most recent latencies (seconds) of one kind of call, with percentile lookup."""
+
+    def __init__(self, size: int = DEFAULT_WINDOW) -> None:
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Nearest-rank percentile, or None without samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+class HedgeBudget:
+    """Caps hedges at a fraction of calls: each call deposits `fraction`, each hedge spends one.
+
+    Args:
+        fraction: Hedges earned per call.
+        burst: Most hedges that can be saved up.
+    """
+
+    def __init__(self, fraction: float = DEFAULT_MAX_EXTRA_FRACTION, burst: float = HEDGE_BURST) -> None:
+        self._fraction = fraction
+        self._burst = burst
+        self.credit = burst
+
+    def deposit(self) -> None:
+        self.credit = min(self._burst, self.credit + self._fraction)
+
+    def try_spend(self) -> bool:
+        if self.credit < 1.0:
+            return False
+        self.credit -= 1.0
+        return True
+
+
+class HedgedChatCompletionClient(WrappedChatCompletionClient):
+    """Client wrapper that sends a duplicate request when a call runs longer than recent calls.
+
+    Non-streamed calls and streams keep separate windows (total latency vs. time to the first
+    chunk). A hedged call enters its window with its primary's elapsed time, a lower bound of
+    what the call would have taken unhedged.
+
+    Example:
+
+        .. code-block:: python
+
+            model_client = HedgedChatCompletionClient(OpenAIChatCompletionClient(model="gpt-4o-mini"))
+            ...
+            print(model_client.describe())  # hedge rate, wins, current delays
+
+    Args:
+        wrapped_client: The client to hedge.
+        percentile: Latency percentile a call must exceed before it is hedged.
+        max_extra_fraction: Hedges allowed per call on average (0.1 = at most ~10% extra requests).
+        window: Recent latencies kept per kind of call.
+        min_samples: Latencies needed before hedging starts.
+        min_delay_seconds: Lower bound of the hedge delay.
+        max_prompt_tokens: Largest prompt that is duplicated; None for no limit.
+    """
+
+    def __init__(
+        self,
+        wrapped_client: ChatCompletionClient,
+        *,
+        percentile: float = DEFAULT_PERCENTILE,
+        max_extra_fraction: float = DEFAULT_MAX_EXTRA_FRACTION,
+        window: int = DEFAULT_WINDOW,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        min_delay_seconds: float = DEFAULT_MIN_DELAY_SECONDS,
+        max_prompt_tokens: int | None = None,
+    ) -> None:
+        super().__init__(wrapped_client)
+        self._percentile = percentile
+        self._min_samples = min_samples
+        self._min_delay = min_delay_seconds
+        self._max_prompt_tokens = max_prompt_tokens
+        self.budget = HedgeBudget(max_extra_fraction)
+        self.latencies = {"create": LatencyWindow(window), "first_chunk": LatencyWindow(window)}
+        self.stats: Counter[str] = Counter()  # calls, hedged, hedge_wins, budget_skips, size_skips, failures
+
+    def hedge_delay(self, kind: str) -> float | None:
+        """Seconds a call of `kind` ("create" or "first_chunk") may run before it is hedged; None while learning."""
+        window = self.latencies[kind]
+        if len(window) < self._min_samples:
+            return None
+        return max(self._min_delay, window.percentile(self._percentile) or 0.0)
+
+    def describe(self) -> Dict[str, Any]:
+        """Counters, the share of calls hedged and the current hedge delays."""
+        calls = self.stats["calls"]
+        delays = {kind: self.hedge_delay(kind) for kind in self.latencies}
+        return {
+            **dict(self.stats),
+            "hedge_rate": self.stats["hedged"] / calls if calls else 0.0,
+            "hedge_delay_ms": {kind: delay * 1000.0 for kind, delay in delays.items() if delay is not None},
+            "budget_credit": self.budget.credit,
+        }
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        delay = self._start_call("create", messages)
+        started = time.perf_counter()
+
+        def attempt() -> asyncio.Task[CreateResult]:
+            return asyncio.ensure_future(
+                self._wrapped_client.create(
+                    messages,
+                    tools=tools,
+                    tool_choice=tool_choice,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=cancellation_token,
+                )
+            )
+
+        primary = attempt()
+        attempts = [primary]
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(attempts, timeout=delay)
+                if not done and self._may_hedge():
+                    attempts.append(attempt())
+            pending = set(attempts)
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in attempts:  # The primary first when both finish together
+                    if task not in done:
+                        continue
+                    if task.exception() is None:
+                        self.latencies["create"].add(time.perf_counter() - started)
+                        self.stats["hedge_wins"] += task is not primary
+                        return task.result()
+                    error = error or task.exception()
+            self.stats["failures"] += 1
+            assert error is not None
+            raise error
+        finally:
+            for task in attempts:
+                task.cancel()
+            await asyncio.gather(*attempts, return_exceptions=True)
+
+    async def create_stream(  # type: ignore[override]
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        delay = self._start_call("first_chunk", messages)
+        started = time.perf_counter()
+
+        def attempt() -> AsyncGenerator[Union[str, CreateResult], None]:
+            return self._wrapped_client.create_stream(
+                messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+
+        streams = [attempt()]
+        firsts: Dict[asyncio.Task[Any], AsyncGenerator[Union[str, CreateResult], None]] = {
+            asyncio.ensure_future(_first_item(streams[0])): streams[0]
+        }
+        winner: AsyncGenerator[Union[str, CreateResult], None] | None = None
+        first: Any = _END
+        error: BaseException | None = None
+        try:
+            timeout = delay
+            while winner is None and firsts:
+                done, _ = await asyncio.wait(firsts, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    timeout = None  # One hedge per call
+                    if self._may_hedge():
+                        streams.append(attempt())
+                        firsts[asyncio.ensure_future(_first_item(streams[1]))] = streams[1]
+                    continue
+                for task in sorted(done, key=lambda task: streams.index(firsts[task])):
+                    stream = firsts.pop(task)
+                    if task.exception() is None and winner is None:
+                        winner, first = stream, task.result()
+                    elif task.exception() is not None:
+                        error = error or task.exception()
+                        await stream.aclose()
+                    else:
+                        firsts[task] = stream  # Finished together with the winner: closed below
+        finally:
+            for task in firsts:
+                task.cancel()
+            await asyncio.gather(*firsts, return_exceptions=True)
+            for stream in firsts.values():
+                await stream.aclose()
+            if winner is None:
+                for stream in streams:
+                    await stream.aclose()
+        if winner is None:
+            self.stats["failures"] += 1
+            assert error is not None
+            raise error
+        self.latencies["first_chunk"].add(time.perf_counter() - started)
+        self.stats["hedge_wins"] += winner is not streams[0]
+        try:
+            if first is not _END:
+                yield first
+            async for item in winner:
+                yield item
+        finally:
+            await winner.aclose()
+
+    def _start_call(self, kind: str, messages: Sequence[LLMMessage]) -> float | None:
+        """Count the call and return its hedge delay (None: not hedged)."""
+        self.stats["calls"] += 1
+        self.budget.deposit()
+        delay = self.hedge_delay(kind)
+        if delay is not None and self._max_prompt_tokens is not None:
+            if sum(count_message_tokens(message) for message in messages) > self._max_prompt_tokens:
+                self.stats["size_skips"] += 1
+                return None
+        return delay
+
+    def _may_hedge(self) -> bool:
+        if not self.budget.try_spend():
+            self.stats["budget_skips"] += 1
+            return False
+        self.stats["hedged"] += 1
+        logger.debug(f"Hedging a call outstanding past p{self._percentile * 100:.0f}")
+        return True
+
+
+async def _first_item(stream: AsyncGenerator[Union[str, CreateResult], None]) -> Any:
+    """The first item of `stream`, or _END if it has none."""
+    try:
+        return await stream.__anext__()
+    except StopAsyncIteration:
+        return _END
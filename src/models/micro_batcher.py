@@ -0,0 +1,195 @@
+"""
+Micro-batching of small, independent structured-output calls.
+
+Classifying thousands of short inputs one call at a time pays the full request overhead (network
+round-trip, queueing, prompt framing) per input. `MicroBatcher` collects the requests submitted
+within a short window (or until ``max_batch`` are waiting) and packs them into one model call:
+
+- the inputs go out as a JSON list of ``{"index", "input"}`` items,
+- the call asks for an indexed multi-item schema derived from the caller's output model
+  (``{"results": [{"index": ..., <output fields>}, ...]}``),
+- each validated result is routed back to the caller that submitted its index.
+
+A batch that fails to parse, or results that are missing, duplicated or invalid for some indexes,
+fall back to single calls for the affected inputs, so callers always get a result validated
+against their own model. Errors of the call itself (network, rate limits) are raised to every
+caller in the batch.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import Counter
+from typing import Any, Dict, Generic, List, Sequence, Tuple, Type, TypeVar
+
+from autogen_core.models import ChatCompletionClient, SystemMessage, UserMessage
+from pydantic import BaseModel, Field, ValidationError, create_model
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_MS = 20.0  # How long the first request of a batch waits for company
+DEFAULT_MAX_BATCH = 32  # Inputs per batched call
+BATCH_INSTRUCTIONS = (
+    "You will receive a JSON list of inputs, each with an index. Handle every input independently, as if it "
+    "were the only one, and return exactly one result per input in `results`, with the input's index."
+)
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def batch_output_model(output_type: Type[BaseModel]) -> Type[BaseModel]:
+    """The multi-item schema for `output_type`: ``results`` holding the output fields plus an ``index``."""
+    item_model = create_model(  # type: ignore[call-overload]
+        f"Indexed{output_type.__name__}",
+        __base__=output_type,
+        index=(int, Field(description="Index of the input this result is for")),
+    )
+    return create_model(f"{output_type.__name__}Batch", results=(List[item_model], ...))  # type: ignore[call-overload]
+
+
+class MicroBatcher(Generic[T]):
+    """Packs concurrent small structured-output requests into batched model calls.
+
+    Example:
+
+        .. code-block:: python
+
+            batcher = MicroBatcher(model_client, AgentResponse, "Categorize the input as happy, sad, or neutral.")
+            labels = await asyncio.gather(*(batcher.submit(text) for text in texts))
+
+    Args:
+        model_client: Client used for batched and single calls; it must support structured output.
+        output_type: Pydantic model each caller gets back.
+        instructions: System instructions for handling one input.
+        window_ms: How long a batch stays open after its first request.
+        max_batch: Inputs per call; a full batch is sent without waiting for the window.
+    """
+
+    def __init__(
+        self,
+        model_client: ChatCompletionClient,
+        output_type: Type[T],
+        instructions: str,
+        *,
+        window_ms: float = DEFAULT_WINDOW_MS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self._client = model_client
+        self._output_type = output_type
+        self._batch_type = batch_output_model(output_type)
+        self._instructions = instructions
+        self._window = window_ms / 1000.0
+        self._max_batch = max_batch
+        self._pending: List[Tuple[str, asyncio.Future[T]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.stats: Counter[str] = Counter()  # batches, batched_items, single_calls, fallback_items, parse_failures
+
+    async def submit(self, text: str) -> T:
+        """Queue one input and wait for its validated result."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[T] = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self._max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+        return await future
+
+    async def drain(self) -> None:
+        """Send what is pending now and wait for all calls in progress."""
+        self._flush()
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch, self._pending = self._pending[: self._max_batch], self._pending[self._max_batch :]
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Sequence[Tuple[str, asyncio.Future[T]]]) -> None:
+        live = [(text, future) for text, future in batch if not future.done()]  # Skip callers that gave up
+        if not live:
+            return
+        if len(live) == 1:
+            await self._resolve_single(*live[0])
+            return
+        try:
+            results = await self._call_batch([text for text, _ in live])
+        except Exception as e:
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        missing = []
+        for index, (text, future) in enumerate(live):
+            if index in results:
+                if not future.done():
+                    future.set_result(results[index])
+            else:
+                missing.append((text, future))
+        if missing:
+            self.stats["fallback_items"] += len(missing)
+            logger.debug(f"Batch of {len(live)} fell back to single calls for {len(missing)} inputs")
+            await asyncio.gather(*(self._resolve_single(text, future) for text, future in missing))
+
+    async def _call_batch(self, texts: Sequence[str]) -> Dict[int, T]:
+        """One call for all `texts`; returns the results that parsed, by index (empty on a parse failure)."""
+        self.stats["batches"] += 1
+        self.stats["batched_items"] += len(texts)
+        items = json.dumps([{"index": index, "input": text} for index, text in enumerate(texts)], ensure_ascii=False)
+        result = await self._client.create(
+            [SystemMessage(content=f"{self._instructions}\n\n{BATCH_INSTRUCTIONS}"), UserMessage(content=items, source="user")],
+            json_output=self._batch_type,
+        )
+        try:
+            if not isinstance(result.content, str):
+                raise ValueError(f"expected JSON text, got {type(result.content).__name__}")
+            parsed = self._batch_type.model_validate_json(result.content)
+        except (ValidationError, ValueError) as e:
+            self.stats["parse_failures"] += 1
+            logger.warning(f"Batched output of {len(texts)} inputs did not parse, retrying them singly: {e}")
+            return {}
+        results: Dict[int, T] = {}
+        duplicates = set()
+        for item in parsed.results:  # type: ignore[attr-defined]
+            if item.index in results:
+                duplicates.add(item.index)
+            elif 0 <= item.index < len(texts):
+                results[item.index] = self._output_type.model_validate(item.model_dump(exclude={"index"}))
+        for index in duplicates:  # Ambiguous: redo those inputs singly
+            results.pop(index, None)
+        return results
+
+    async def _resolve_single(self, text: str, future: asyncio.Future[T]) -> None:
+        try:
+            value = await self._call_single(text)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(value)
+
+    async def _call_single(self, text: str) -> T:
+        self.stats["single_calls"] += 1
+        result = await self._client.create(
+            [SystemMessage(content=self._instructions), UserMessage(content=text, source="user")],
+            json_output=self._output_type,
+        )
+        if not isinstance(result.content, str):
+            raise ValueError(f"Expected JSON text from the model, got {type(result.content).__name__}")
+        return self._output_type.model_validate_json(result.content)
+
+    def describe(self) -> Dict[str, Any]:
+        """Counters plus the mean batch size."""
+        batches = self.stats["batches"]
+        return {**dict(self.stats), "mean_batch_size": self.stats["batched_items"] / batches if batches else 0.0}
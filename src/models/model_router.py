@@ -0,0 +1,420 @@
+"""
+Routing ChatCompletionClient that sends each request to a cheap or a strong model by its complexity.
+
+Many turns are trivial (acknowledgements, routing, short summaries) yet go to the same model as
+the hard ones. `ModelRouter` is a drop-in ChatCompletionClient that scores each request locally,
+so agent code does not change:
+
+- `RequestFeatures` / :func:`complexity_score`: conversation length, length of the newest message,
+  tools offered, structured output required (images and capabilities the cheap model lacks always
+  go to the strong model),
+- historical success: requests fall into score buckets; once the cheap model has enough calls in a
+  bucket, its local success rate there (no error, non-empty reply, structured output that parses,
+  required tool calls present) decides the bucket instead of the score threshold. A small share of
+  strong-bound requests explore the cheap model so buckets can be promoted as well as demoted,
+- escalation: a cheap reply that fails the local checks is redone on the strong model before the
+  caller sees it (non-streamed calls, and streams that fail before their first chunk).
+
+Per-route calls, failures, escalations, latency and cost are in :meth:`ModelRouter.report`.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import random
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Literal, Mapping, Optional, Sequence, Tuple, Union
+
+from autogen_core import CancellationToken, Component, ComponentModel, FunctionCall, Image
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, RequestUsage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel, ValidationError
+from typing_extensions import Self
+
+from src.models.usage_accounting import DEFAULT_PRICES
+from src.models.wrapped_client import WrappedChatCompletionClient, client_model_name
+from src.utils.token_utils import DEFAULT_TOKEN_MODEL, count_message_tokens
+
+logger = logging.getLogger(__name__)
+
+CHEAP = "cheap"
+STRONG = "strong"
+LONG_PROMPT_TOKENS = 8000  # Conversation length that scores as fully complex
+LONG_MESSAGE_TOKENS = 1000  # Newest-message length that scores as fully complex
+PROMPT_WEIGHT = 0.25
+MESSAGE_WEIGHT = 0.25
+TOOLS_WEIGHT = 0.25
+STRUCTURED_WEIGHT = 0.15
+SCORE_BUCKETS = 10  # Resolution of the success history
+LATENCY_SAMPLES = 1000  # Latencies kept per route for percentiles
+
+
+@dataclass(frozen=True)
+class RequestFeatures:
+    """What the router knows about a request before sending it."""
+
+    prompt_tokens: int
+    last_message_tokens: int
+    tool_count: int
+    structured_output: bool
+    has_images: bool
+
+    @classmethod
+    def of(
+        cls,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[Tool | ToolSchema],
+        json_output: Optional[bool | type[BaseModel]],
+        model: str = DEFAULT_TOKEN_MODEL,
+    ) -> RequestFeatures:
+        counts = [count_message_tokens(message, model) for message in messages]
+        return cls(
+            prompt_tokens=sum(counts),
+            last_message_tokens=counts[-1] if counts else 0,
+            tool_count=len(tools),
+            structured_output=json_output is not None and json_output is not False,
+            has_images=any(
+                isinstance(message.content, list) and any(isinstance(part, Image) for part in message.content)
+                for message in messages
+            ),
+        )
+
+
+def complexity_score(features: RequestFeatures) -> float:
+    """Score in [0, 1]; higher needs a stronger model. Lengths count logarithmically."""
+    prompt = min(1.0, math.log1p(features.prompt_tokens) / math.log1p(LONG_PROMPT_TOKENS))
+    message = min(1.0, math.log1p(features.last_message_tokens) / math.log1p(LONG_MESSAGE_TOKENS))
+    return (
+        PROMPT_WEIGHT * prompt
+        + MESSAGE_WEIGHT * message
+        + TOOLS_WEIGHT * (features.tool_count > 0)
+        + STRUCTURED_WEIGHT * features.structured_output
+    )
+
+
+def reply_ok(
+    result: CreateResult,
+    json_output: Optional[bool | type[BaseModel]],
+    tool_choice: Tool | Literal["auto", "required", "none"],
+) -> bool:
+    """Local quality check of a reply: non-empty, structured output parses, required tool calls present."""
+    if isinstance(result.content, str):
+        if tool_choice == "required" or not isinstance(tool_choice, str):
+            return False
+        if not result.content.strip():
+            return False
+        if isinstance(json_output, type):
+            try:
+                json_output.model_validate_json(result.content)
+            except ValidationError:
+                return False
+        elif json_output:
+            try:
+                json.loads(result.content)
+            except ValueError:
+                return False
+        return True
+    calls = [call for call in result.content if isinstance(call, FunctionCall)]
+    if not calls:
+        return False
+    try:
+        for call in calls:
+            json.loads(call.arguments or "{}")
+    except ValueError:
+        return False
+    return True
+
+
+@dataclass
+class RouteStats:
+    """Calls, outcomes, latency and cost of one route."""
+
+    calls: int = 0
+    failures: int = 0  # Replies failing the local checks (including errors)
+    escalations: int = 0  # Cheap failures redone on the strong model
+    explored: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        latencies_ms = sorted(latency * 1000.0 for latency in self.latencies)
+        return {
+            "calls": self.calls,
+            "success_rate": 1 - self.failures / self.calls if self.calls else 0.0,
+            "failures": self.failures,
+            "escalations": self.escalations,
+            "explored": self.explored,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost": self.cost,
+            "latency_ms": {
+                "mean": statistics.fmean(latencies_ms),
+                "p50": latencies_ms[len(latencies_ms) // 2],
+                "p99": latencies_ms[min(len(latencies_ms) - 1, int(len(latencies_ms) * 0.99))],
+            }
+            if latencies_ms
+            else {},
+        }
+
+
+def _sum_usage(usages: Iterable[RequestUsage]) -> RequestUsage:
+    total = RequestUsage(prompt_tokens=0, completion_tokens=0)
+    for usage in usages:
+        total = RequestUsage(
+            prompt_tokens=total.prompt_tokens + usage.prompt_tokens,
+            completion_tokens=total.completion_tokens + usage.completion_tokens,
+        )
+    return total
+
+
+class ModelRouterConfig(BaseModel):
+    """The declarative configuration for ModelRouter."""
+
+    cheap_client: ComponentModel
+    strong_client: ComponentModel
+    threshold: float = 0.4
+    min_success: float = 0.9
+    min_samples: int = 20
+    exploration_rate: float = 0.05
+
+
+class ModelRouter(WrappedChatCompletionClient, Component[ModelRouterConfig]):
+    """Sends each request to `cheap_client` or `strong_client` by its local complexity score.
+
+    Capabilities, model info and token counting are the strong client's, so agents configure
+    themselves for the stronger model; requests needing a capability the cheap model lacks (tools,
+    structured output, vision) always go to the strong one.
+
+    Example:
+
+        .. code-block:: python
+
+            router = ModelRouter(
+                cheap_client=OpenAIChatCompletionClient(model="gpt-4o-mini"),
+                strong_client=OpenAIChatCompletionClient(model="gpt-4o"),
+            )
+            agent = AssistantAgent("assistant", model_client=router)  # Agent code is unchanged
+
+    Meter the two clients rather than the router (``ModelRouter(accountant.meter(cheap, label), ...)``)
+    so each call is priced at the model that answered it.
+
+    Args:
+        cheap_client: Fast, inexpensive model for simple requests.
+        strong_client: Capable model for the rest and for escalations.
+        threshold: Score below which requests go to the cheap model while a bucket has no history.
+        min_success: Local success rate the cheap model needs to keep (or win) a score bucket.
+        min_samples: Cheap calls in a bucket before its history overrides the threshold.
+        exploration_rate: Share of strong-bound requests sent to the cheap model to learn.
+        seed: Seed of the exploration sampling.
+    """
+
+    component_config_schema = ModelRouterConfig
+    component_type = "model"
+    component_provider_override = "src.models.model_router.ModelRouter"
+
+    def __init__(
+        self,
+        cheap_client: ChatCompletionClient,
+        strong_client: ChatCompletionClient,
+        *,
+        threshold: float = 0.4,
+        min_success: float = 0.9,
+        min_samples: int = 20,
+        exploration_rate: float = 0.05,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__(strong_client)
+        self._clients = {CHEAP: cheap_client, STRONG: strong_client}
+        self._models = {CHEAP: client_model_name(cheap_client), STRONG: client_model_name(strong_client)}
+        self._threshold = threshold
+        self._min_success = min_success
+        self._min_samples = min_samples
+        self._exploration_rate = exploration_rate
+        self._rng = random.Random(seed)
+        self._token_model = self._models[STRONG] if self._models[STRONG] != "unknown" else DEFAULT_TOKEN_MODEL
+        self.routes: Dict[str, RouteStats] = {CHEAP: RouteStats(), STRONG: RouteStats()}
+        self.history: Dict[int, Counter[str]] = {}  # Score bucket -> cheap "calls" and "successes"
+
+    def choose(self, features: RequestFeatures) -> Tuple[str, bool]:
+        """The route for a request and whether it is an exploration."""
+        cheap_info = self._clients[CHEAP].model_info
+        if (
+            features.has_images and not cheap_info.get("vision", False)
+            or features.tool_count and not cheap_info.get("function_calling", False)
+            or features.structured_output and not cheap_info.get("json_output", False)
+        ):
+            return STRONG, False
+        score = complexity_score(features)
+        outcomes = self.history.get(self._bucket(score))
+        if outcomes is not None and outcomes["calls"] >= self._min_samples:
+            cheap = outcomes["successes"] / outcomes["calls"] >= self._min_success
+        else:
+            cheap = score < self._threshold
+        if cheap:
+            return CHEAP, False
+        if self._rng.random() < self._exploration_rate:
+            return CHEAP, True
+        return STRONG, False
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        features = RequestFeatures.of(messages, tools, json_output, self._token_model)
+        route, explored = self.choose(features)
+        kwargs: Dict[str, Any] = dict(
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        started = time.perf_counter()
+        try:
+            result = await self._clients[route].create(messages, **kwargs)
+        except Exception:
+            self._record(route, features, None, False, time.perf_counter() - started, explored)
+            if route == STRONG:
+                raise
+            result = None
+        else:
+            ok = reply_ok(result, json_output, tool_choice)
+            self._record(route, features, result, ok, time.perf_counter() - started, explored)
+            if ok or route == STRONG:
+                return result
+        self.routes[CHEAP].escalations += 1
+        logger.debug(f"Escalating a failed cheap reply (score {complexity_score(features):.2f}) to the strong model")
+        started = time.perf_counter()
+        result = await self._clients[STRONG].create(messages, **kwargs)
+        self._record(STRONG, features, result, reply_ok(result, json_output, tool_choice), time.perf_counter() - started, False)
+        return result
+
+    async def create_stream(  # type: ignore[override]
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        features = RequestFeatures.of(messages, tools, json_output, self._token_model)
+        route, explored = self.choose(features)
+        started = time.perf_counter()
+        streamed = False
+        try:
+            async for item in self._clients[route].create_stream(
+                messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            ):
+                streamed = True
+                if isinstance(item, CreateResult):
+                    ok = reply_ok(item, json_output, tool_choice)
+                    self._record(route, features, item, ok, time.perf_counter() - started, explored)
+                yield item
+            return
+        except Exception:
+            self._record(route, features, None, False, time.perf_counter() - started, explored)
+            # Output already streamed cannot be taken back; only calls that failed up front are escalated.
+            if route == STRONG or streamed:
+                raise
+        self.routes[CHEAP].escalations += 1
+        started = time.perf_counter()
+        async for item in self._clients[STRONG].create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        ):
+            if isinstance(item, CreateResult):
+                self._record(STRONG, features, item, reply_ok(item, json_output, tool_choice), time.perf_counter() - started, False)
+            yield item
+
+    def report(self) -> Dict[str, Any]:
+        """Per-route metrics, the share of calls each route served and the learned bucket decisions."""
+        calls = sum(stats.calls for stats in self.routes.values())
+        return {
+            "routes": {name: {"model": self._models[name], **stats.summary()} for name, stats in self.routes.items()},
+            "cheap_share": self.routes[CHEAP].calls / calls if calls else 0.0,
+            "cost": sum(stats.cost for stats in self.routes.values()),
+            "buckets": {
+                f"{bucket / SCORE_BUCKETS:.1f}": {"calls": outcomes["calls"], "successes": outcomes["successes"]}
+                for bucket, outcomes in sorted(self.history.items())
+            },
+        }
+
+    async def close(self) -> None:
+        for client in self._clients.values():
+            await client.close()
+
+    def actual_usage(self) -> RequestUsage:
+        return _sum_usage(client.actual_usage() for client in self._clients.values())
+
+    def total_usage(self) -> RequestUsage:
+        return _sum_usage(client.total_usage() for client in self._clients.values())
+
+    def dump_component(self) -> ComponentModel:
+        return ChatCompletionClient.dump_component(self)  # Skip the forwarding to the strong client
+
+    def _bucket(self, score: float) -> int:
+        return min(SCORE_BUCKETS - 1, int(score * SCORE_BUCKETS))
+
+    def _record(
+        self, route: str, features: RequestFeatures, result: CreateResult | None, ok: bool, seconds: float, explored: bool
+    ) -> None:
+        stats = self.routes[route]
+        stats.calls += 1
+        stats.failures += not ok
+        stats.explored += explored
+        stats.latencies.append(seconds)
+        if len(stats.latencies) > LATENCY_SAMPLES:
+            del stats.latencies[0]
+        if result is not None:
+            stats.prompt_tokens += result.usage.prompt_tokens
+            stats.completion_tokens += result.usage.completion_tokens
+            price = DEFAULT_PRICES.get(self._models[route])
+            stats.cost += price.cost(result.usage) if price is not None else 0.0
+        if route == CHEAP:
+            outcomes = self.history.setdefault(self._bucket(complexity_score(features)), Counter())
+            outcomes["calls"] += 1
+            outcomes["successes"] += ok
+
+    def _to_config(self) -> ModelRouterConfig:
+        return ModelRouterConfig(
+            cheap_client=self._clients[CHEAP].dump_component(),
+            strong_client=self._clients[STRONG].dump_component(),
+            threshold=self._threshold,
+            min_success=self._min_success,
+            min_samples=self._min_samples,
+            exploration_rate=self._exploration_rate,
+        )
+
+    @classmethod
+    def _from_config(cls, config: ModelRouterConfig) -> Self:
+        return cls(
+            cheap_client=ChatCompletionClient.load_component(config.cheap_client),
+            strong_client=ChatCompletionClient.load_component(config.strong_client),
+            threshold=config.threshold,
+            min_success=config.min_success,
+            min_samples=config.min_samples,
+            exploration_rate=config.exploration_rate,
+        )
@@ -0,0 +1,417 @@
+"""
+Client-side rate limiting and adaptive concurrency for model calls.
+
+Raising concurrency against a provider ends in 429s, retry storms and latency cliffs. An
+`AdaptiveLimiter` is shared by all clients calling one provider account and admits calls when
+
+- the request- and token-per-minute token buckets (`RateLimits`) have room, so the account's
+  limits are respected before the provider has to reject anything,
+- fewer calls than the current concurrency limit are in flight; the limit adapts AIMD-style:
+  +1 per limit's worth of successful calls while it is binding, halved on a 429, 5xx or timeout,
+  and cut back when smoothed latency rises well above the best latency seen (queueing at the
+  provider),
+- no retry-after pause is pending,
+
+and serves waiting calls strictly by `Priority`, so interactive sessions overtake batch jobs.
+
+`RateLimitedChatCompletionClient` (built with :meth:`AdaptiveLimiter.client`) admits every call
+through the limiter and retries overload errors after the pause the provider asked for. Give the
+wrapped client ``max_retries=0`` so overload errors reach the limiter instead of being retried
+blindly inside the OpenAI SDK.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncGenerator, List, Literal, Mapping, Optional, Sequence, Tuple, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from src.models.wrapped_client import WrappedChatCompletionClient, client_model_name
+from src.utils.token_utils import DEFAULT_TOKEN_MODEL, count_message_tokens
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_MINUTE = 60.0
+DEFAULT_COMPLETION_ESTIMATE = 256  # Completion tokens reserved when a call sets no max_tokens
+DEFAULT_RETRY_AFTER_SECONDS = 1.0  # Pause after an overload error without a retry-after header
+LATENCY_SMOOTHING = 0.2  # EWMA weight of the newest latency sample
+BASELINE_DRIFT = 1.01  # Per-call upward drift of the best-latency baseline, so it can follow slower models
+
+
+class Priority(IntEnum):
+    """Admission priority; lower values are admitted first."""
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+@dataclass(frozen=True)
+class RateLimits:
+    """Provider account limits; None means unlimited.
+
+    Args:
+        requests_per_minute: Request budget.
+        tokens_per_minute: Prompt + completion token budget.
+        burst_seconds: Seconds of budget that may be spent at once.
+    """
+
+    requests_per_minute: float | None = None
+    tokens_per_minute: float | None = None
+    burst_seconds: float = 1.0
+
+
+class TokenBucket:
+    """Refilling budget of `rate` units per second, holding at most `capacity`.
+
+    Amounts above the capacity are admitted when the bucket is full and leave it in debt, so
+    oversized calls are slowed down rather than blocked forever.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._level = capacity
+        self._updated = time.monotonic()
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken."""
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+        return max(0.0, (min(amount, self.capacity) - self._level) / self.rate)
+
+    def take(self, amount: float) -> None:
+        self._level -= amount
+
+    def give(self, amount: float) -> None:
+        """Return unused budget (a call used fewer tokens than reserved)."""
+        self._level = min(self.capacity, self._level + amount)
+
+
+@dataclass
+class Permit:
+    """An admitted call: its reserved tokens, when it was admitted and whether it filled the limit."""
+
+    tokens: int
+    priority: Priority
+    admitted_at: float
+    saturated: bool = False  # The concurrency limit was reached with this call in flight
+    released: bool = False
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    tokens: int = field(compare=False)
+    future: asyncio.Future[Permit] = field(compare=False)
+
+
+class AdaptiveLimiter:
+    """Admission control shared by all clients calling one provider account.
+
+    Example:
+
+        .. code-block:: python
+
+            limiter = AdaptiveLimiter(RateLimits(requests_per_minute=500, tokens_per_minute=200_000))
+            raw_client = OpenAIChatCompletionClient(model="gpt-4o-mini", max_retries=0)
+            chat_client = limiter.client(raw_client)  # Interactive sessions
+            batch_client = limiter.client(raw_client, priority=Priority.BATCH)  # Yields to interactive calls
+
+    Args:
+        limits: Request and token budgets.
+        initial_concurrency: Concurrent calls allowed at start.
+        min_concurrency: Floor of the adaptive limit.
+        max_concurrency: Ceiling of the adaptive limit.
+        backoff_factor: Multiplier applied to the limit on an overload error.
+        latency_tolerance: Cut the limit when smoothed latency exceeds this multiple of the best seen;
+            None to ignore latency.
+        latency_backoff_factor: Multiplier applied to the limit on a latency rise.
+    """
+
+    def __init__(
+        self,
+        limits: RateLimits | None = None,
+        *,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        backoff_factor: float = 0.5,
+        latency_tolerance: float | None = 2.0,
+        latency_backoff_factor: float = 0.8,
+    ) -> None:
+        limits = limits or RateLimits()
+        self._buckets: List[Tuple[str, TokenBucket]] = []
+        if limits.requests_per_minute:
+            rate = limits.requests_per_minute / SECONDS_PER_MINUTE
+            self._buckets.append(("requests", TokenBucket(rate, max(1.0, rate * limits.burst_seconds))))
+        if limits.tokens_per_minute:
+            rate = limits.tokens_per_minute / SECONDS_PER_MINUTE
+            self._buckets.append(("tokens", TokenBucket(rate, rate * limits.burst_seconds)))
+        self.concurrency = float(initial_concurrency)
+        self._min_concurrency = min_concurrency
+        self._max_concurrency = max_concurrency
+        self._backoff_factor = backoff_factor
+        self._latency_tolerance = latency_tolerance
+        self._latency_backoff_factor = latency_backoff_factor
+        self.in_flight = 0
+        self._waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        self._smoothed_latency: float | None = None
+        self._baseline_latency: float | None = None
+        self.stats: Counter[str] = Counter()  # admitted, completed, overloads, decreases, latency_decreases, retries
+
+    def client(self, wrapped_client: ChatCompletionClient, priority: Priority = Priority.INTERACTIVE, **kwargs: Any) -> RateLimitedChatCompletionClient:
+        """Wrap `wrapped_client` so its calls are admitted by this limiter at `priority`."""
+        return RateLimitedChatCompletionClient(wrapped_client, self, priority=priority, **kwargs)
+
+    @property
+    def waiting(self) -> int:
+        return sum(not waiter.future.done() for waiter in self._waiters)
+
+    async def acquire(self, tokens: int, priority: Priority = Priority.INTERACTIVE) -> Permit:
+        """Wait until a call reserving `tokens` may start; release the permit when it ends."""
+        waiter = _Waiter(int(priority), next(self._sequence), tokens, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._waiters, waiter)
+        self._dispatch()
+        try:
+            return await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(waiter.future.result())  # Admitted just as the caller gave up
+            raise
+
+    def release(self, permit: Permit) -> None:
+        """End an admitted call."""
+        if permit.released:
+            return
+        permit.released = True
+        self.in_flight -= 1
+        self._dispatch()
+
+    def on_success(self, permit: Permit, latency: float, tokens: int | None = None) -> None:
+        """Record a completed call: settle its token reservation and adapt the limit."""
+        self.stats["completed"] += 1
+        if tokens is not None:
+            self._settle_tokens(permit.tokens, tokens)
+        if self._latency_rising(latency) and permit.admitted_at >= self._last_decrease:
+            self._decrease(self._latency_backoff_factor)
+            self.stats["latency_decreases"] += 1
+        elif permit.saturated and self.concurrency < self._max_concurrency:
+            # Only grow a limit that is actually binding; calls held back by the buckets say nothing about it.
+            self.concurrency = min(self._max_concurrency, self.concurrency + 1.0 / self.concurrency)
+        self._dispatch()
+
+    def on_overload(self, permit: Permit, retry_after: float | None = None) -> None:
+        """Record a 429, 5xx or timeout: pause admissions and halve the limit (once per episode)."""
+        self.stats["overloads"] += 1
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + (retry_after if retry_after is not None else DEFAULT_RETRY_AFTER_SECONDS))
+        # Calls admitted before the last decrease report the same episode; counting them would collapse the limit.
+        if permit.admitted_at >= self._last_decrease:
+            self._decrease(self._backoff_factor)
+
+    def _decrease(self, factor: float) -> None:
+        self.concurrency = max(float(self._min_concurrency), self.concurrency * factor)
+        self._last_decrease = time.monotonic()
+        self.stats["decreases"] += 1
+        logger.debug(f"Concurrency limit lowered to {self.concurrency:.1f}")
+
+    def _latency_rising(self, latency: float) -> bool:
+        if self._latency_tolerance is None:
+            return False
+        if self._smoothed_latency is None:
+            self._smoothed_latency = latency
+        else:
+            self._smoothed_latency += LATENCY_SMOOTHING * (latency - self._smoothed_latency)
+        if self._baseline_latency is None:
+            self._baseline_latency = self._smoothed_latency
+        self._baseline_latency = min(self._baseline_latency * BASELINE_DRIFT, self._smoothed_latency)
+        return self._smoothed_latency > self._latency_tolerance * self._baseline_latency
+
+    def _settle_tokens(self, reserved: int, used: int) -> None:
+        for name, bucket in self._buckets:
+            if name == "tokens":
+                if used > reserved:
+                    bucket.take(used - reserved)
+                else:
+                    bucket.give(reserved - used)
+
+    def _dispatch(self) -> None:
+        """Admit waiting calls, highest priority first, while limits allow."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        while self._waiters:
+            waiter = self._waiters[0]
+            if waiter.future.done():  # Cancelled while waiting
+                heapq.heappop(self._waiters)
+                continue
+            if self.in_flight >= int(self.concurrency):
+                return  # The next release dispatches again
+            wait = self._paused_until - now
+            for name, bucket in self._buckets:
+                wait = max(wait, bucket.wait_time(1 if name == "requests" else waiter.tokens, now))
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._waiters)
+            for name, bucket in self._buckets:
+                bucket.take(1 if name == "requests" else waiter.tokens)
+            self.in_flight += 1
+            self.stats["admitted"] += 1
+            saturated = self.in_flight >= int(self.concurrency)
+            waiter.future.set_result(Permit(waiter.tokens, Priority(waiter.priority), now, saturated))
+
+
+def overload_retry_after(error: BaseException) -> Tuple[bool, float | None]:
+    """Whether `error` signals provider overload (429, 5xx, timeout) and the pause it asks for, if any."""
+    if type(error).__name__ in ("APITimeoutError", "TimeoutError"):
+        return True, None
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if not isinstance(status, int) or not (status == 429 or status >= 500):
+        return False, None
+    headers = getattr(response, "headers", None) or {}
+    for header, scale in (("retry-after-ms", 1000.0), ("retry-after", 1.0)):
+        try:
+            return True, float(headers[header]) / scale
+        except (KeyError, TypeError, ValueError):
+            continue
+    return True, None
+
+
+class RateLimitedChatCompletionClient(WrappedChatCompletionClient):
+    """Client wrapper that admits every call through an :class:`AdaptiveLimiter`.
+
+    Args:
+        wrapped_client: The client to call (preferably with its own retries disabled).
+        limiter: The limiter shared by all clients of the provider account.
+        priority: Admission priority of this client's calls.
+        max_retries: Retries of a call after overload errors.
+        completion_estimate: Completion tokens reserved per call without max_tokens.
+    """
+
+    def __init__(
+        self,
+        wrapped_client: ChatCompletionClient,
+        limiter: AdaptiveLimiter,
+        priority: Priority = Priority.INTERACTIVE,
+        max_retries: int = 4,
+        completion_estimate: int = DEFAULT_COMPLETION_ESTIMATE,
+    ) -> None:
+        super().__init__(wrapped_client)
+        self._limiter = limiter
+        self._priority = priority
+        self._max_retries = max_retries
+        self._completion_estimate = completion_estimate
+        model = client_model_name(wrapped_client)
+        self._token_model = model if model != "unknown" else DEFAULT_TOKEN_MODEL
+
+    @property
+    def limiter(self) -> AdaptiveLimiter:
+        return self._limiter
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        tokens = self._reserve(messages, extra_create_args)
+        for attempt in itertools.count():
+            permit = await self._limiter.acquire(tokens, self._priority)
+            started = time.perf_counter()
+            try:
+                result = await super().create(
+                    messages,
+                    tools=tools,
+                    tool_choice=tool_choice,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=cancellation_token,
+                )
+            except Exception as e:
+                if not self._retry(permit, e, attempt):
+                    raise
+                continue
+            finally:
+                self._limiter.release(permit)
+            self._limiter.on_success(
+                permit, time.perf_counter() - started, result.usage.prompt_tokens + result.usage.completion_tokens
+            )
+            return result
+        raise AssertionError("unreachable")
+
+    async def create_stream(  # type: ignore[override]
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        tokens = self._reserve(messages, extra_create_args)
+        for attempt in itertools.count():
+            permit = await self._limiter.acquire(tokens, self._priority)
+            started = time.perf_counter()
+            first_item_latency: float | None = None  # Time to first token: the queueing signal for streams
+            try:
+                async for item in super().create_stream(
+                    messages,
+                    tools=tools,
+                    tool_choice=tool_choice,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=cancellation_token,
+                ):
+                    if first_item_latency is None:
+                        first_item_latency = time.perf_counter() - started
+                    if isinstance(item, CreateResult):
+                        self._limiter.on_success(
+                            permit, first_item_latency, item.usage.prompt_tokens + item.usage.completion_tokens
+                        )
+                    yield item
+                return
+            except Exception as e:
+                # Output already yielded cannot be taken back, so only calls that failed up front are retried.
+                if first_item_latency is not None or not self._retry(permit, e, attempt):
+                    raise
+            finally:
+                self._limiter.release(permit)
+
+    def _reserve(self, messages: Sequence[LLMMessage], extra_create_args: Mapping[str, Any]) -> int:
+        completion = extra_create_args.get("max_tokens") or extra_create_args.get("max_completion_tokens")
+        prompt = sum(count_message_tokens(message, self._token_model) for message in messages)
+        return prompt + int(completion or self._completion_estimate)
+
+    def _retry(self, permit: Permit, error: Exception, attempt: int) -> bool:
+        overloaded, retry_after = overload_retry_after(error)
+        if not overloaded:
+            return False
+        self._limiter.on_overload(permit, retry_after)
+        if attempt >= self._max_retries:
+            return False
+        self._limiter.stats["retries"] += 1
+        logger.debug(f"Retrying after overload ({type(error).__name__}), attempt {attempt + 1}")
+        return True
@@ -0,0 +1,315 @@
+"""
+Per-call latency and streaming throughput metrics for model clients.
+
+``Console(output_stats=True)`` prints totals once a run ends; perceived latency is decided earlier
+and elsewhere. `StreamMetricsRecorder` wraps clients (one per agent, like usage metering) and
+records for every call:
+
+- time to first token (TTFT): from the request to the first streamed chunk (the whole call for
+  non-streamed ``create``, which delivers everything at once),
+- inter-chunk gaps as seen by the client (mean, p50, p99, max),
+- generation speed: completion tokens per second after the first token,
+- where the wall time went: waiting on the network for the next chunk vs. running our own code
+  (the agent, Console and other callbacks) between receiving a chunk and asking for the next one.
+
+Calls are grouped per label (agent) and per run: :func:`stream_with_metrics` relays a team's
+``run_stream`` and attaches the run's report, or call :meth:`StreamMetricsRecorder.begin_run`
+yourself. The run tag lives in a context variable, so concurrent runs (separate tasks) each tag
+their own calls. Usage-less streams (no ``include_usage``) count tokens as characters / 4.
+"""
+from __future__ import annotations
+
+import logging
+import statistics
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Dict, List, Literal, Mapping, Optional, Sequence, Union
+
+from autogen_agentchat.base import TaskResult
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from src.models.wrapped_client import WrappedChatCompletionClient, client_model_name
+from src.utils.token_utils import CHARS_PER_TOKEN_ESTIMATE
+
+logger = logging.getLogger(__name__)
+
+MS_PER_SECOND = 1000.0
+
+# Run tag of the calls made in the current context; tasks started by a run (the team's runtime) inherit it
+_current_run: ContextVar[str | None] = ContextVar("stream_metrics_run", default=None)
+
+
+def _percentile(samples: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty sample list."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+@dataclass
+class CallMetrics:
+    """Timings of one model call; seconds unless noted."""
+
+    label: str
+    model: str
+    run: str | None
+    streamed: bool
+    ttft: float = 0.0
+    total: float = 0.0
+    chunks: int = 0
+    completion_tokens: int = 0
+    network_wait: float = 0.0  # Awaiting the next chunk from the wrapped client
+    consumer_time: float = 0.0  # Between handing a chunk on and being asked for the next one
+    gaps: List[float] = field(default_factory=list)  # Between successive chunk arrivals
+    failed: bool = False
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Completion tokens per second of generation (after the first token)."""
+        generation = self.total - self.ttft
+        return self.completion_tokens / generation if generation > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "model": self.model,
+            "streamed": self.streamed,
+            "ttft_ms": self.ttft * MS_PER_SECOND,
+            "total_ms": self.total * MS_PER_SECOND,
+            "chunks": self.chunks,
+            "completion_tokens": self.completion_tokens,
+            "tokens_per_second": self.tokens_per_second,
+            "gap_ms": _gap_summary(self.gaps),
+            "network_wait_ms": self.network_wait * MS_PER_SECOND,
+            "consumer_ms": self.consumer_time * MS_PER_SECOND,
+            "failed": self.failed,
+        }
+
+
+def _gap_summary(gaps: Sequence[float]) -> Dict[str, float]:
+    if not gaps:
+        return {}
+    gaps_ms = [gap * MS_PER_SECOND for gap in gaps]
+    return {
+        "mean": statistics.fmean(gaps_ms),
+        "p50": _percentile(gaps_ms, 0.50),
+        "p99": _percentile(gaps_ms, 0.99),
+        "max": max(gaps_ms),
+    }
+
+
+def summarize_calls(calls: Sequence[CallMetrics]) -> Dict[str, Any]:
+    """Aggregate of several calls: TTFT and generation speed percentiles, time split, chunk gaps."""
+    if not calls:
+        return {"calls": 0}
+    ttft_ms = [call.ttft * MS_PER_SECOND for call in calls]
+    streamed = [call for call in calls if call.streamed and call.chunks > 1]
+    speeds = [call.tokens_per_second for call in streamed]
+    return {
+        "calls": len(calls),
+        "streamed_calls": sum(call.streamed for call in calls),
+        "failed_calls": sum(call.failed for call in calls),
+        "ttft_ms": {"mean": statistics.fmean(ttft_ms), "p50": _percentile(ttft_ms, 0.50), "p99": _percentile(ttft_ms, 0.99)},
+        "tokens_per_second": {"mean": statistics.fmean(speeds), "p50": _percentile(speeds, 0.50)} if speeds else {},
+        "gap_ms": _gap_summary([gap for call in streamed for gap in call.gaps]),
+        "total_ms": sum(call.total for call in calls) * MS_PER_SECOND,
+        "network_wait_ms": sum(call.network_wait for call in calls) * MS_PER_SECOND,
+        "consumer_ms": sum(call.consumer_time for call in calls) * MS_PER_SECOND,
+    }
+
+
+class StreamMetricsRecorder:
+    """Collects :class:`CallMetrics` from the clients it instruments.
+
+    Example:
+
+        .. code-block:: python
+
+            recorder = StreamMetricsRecorder()
+            writer = AssistantAgent("writer", model_client=recorder.instrument(model_client, "writer"), model_client_stream=True)
+            ...
+            await Console(stream_with_metrics(team.run_stream(task=task), recorder, "task-1"))
+            print(recorder.run_report("task-1"))
+
+    Args:
+        max_calls: Calls kept (oldest dropped first); None keeps all.
+    """
+
+    def __init__(self, max_calls: int | None = 10_000) -> None:
+        self._max_calls = max_calls
+        self.calls: List[CallMetrics] = []
+        self.last_run_report: Dict[str, Any] | None = None  # Of the run that ended last; set by stream_with_metrics
+
+    def instrument(self, client: ChatCompletionClient, label: str) -> InstrumentedChatCompletionClient:
+        """Wrap `client` so its calls are recorded under `label` (e.g. the agent's name)."""
+        return InstrumentedChatCompletionClient(client, self, label)
+
+    @property
+    def current_run(self) -> str | None:
+        """Run tag of calls made from the current task."""
+        return _current_run.get()
+
+    def begin_run(self, run: str) -> Token[str | None]:
+        """Tag calls made from the current task, and tasks it starts, with `run` (e.g. a task id).
+
+        Returns:
+            The token to pass to :meth:`end_run`.
+        """
+        return _current_run.set(run)
+
+    def end_run(self, token: Token[str | None]) -> Dict[str, Any]:
+        """Restore the tag that was current before :meth:`begin_run` and return the finished run's report."""
+        run = _current_run.get()
+        # set() rather than reset(): an abandoned stream may be closed from another context
+        _current_run.set(None if token.old_value is Token.MISSING else token.old_value)
+        return self.run_report(run) if run is not None else {"calls": 0}
+
+    def record(self, call: CallMetrics) -> None:
+        self.calls.append(call)
+        if self._max_calls is not None and len(self.calls) > self._max_calls:
+            del self.calls[: len(self.calls) - self._max_calls]
+
+    def run_report(self, run: str) -> Dict[str, Any]:
+        """Metrics of one run: overall and per agent."""
+        return self._report([call for call in self.calls if call.run == run])
+
+    def report(self) -> Dict[str, Any]:
+        """Metrics of every recorded call: overall and per agent."""
+        return self._report(self.calls)
+
+    def _report(self, calls: Sequence[CallMetrics]) -> Dict[str, Any]:
+        by_label: Dict[str, List[CallMetrics]] = {}
+        for call in calls:
+            by_label.setdefault(call.label, []).append(call)
+        return {
+            "total": summarize_calls(calls),
+            "by_label": {label: summarize_calls(label_calls) for label, label_calls in by_label.items()},
+        }
+
+    def clear(self) -> None:
+        self.calls.clear()
+
+
+class InstrumentedChatCompletionClient(WrappedChatCompletionClient):
+    """Client wrapper that records latency and streaming metrics of every call.
+
+    Args:
+        wrapped_client: The client to instrument.
+        recorder: Where the metrics are recorded.
+        label: Who the calls belong to.
+    """
+
+    def __init__(self, wrapped_client: ChatCompletionClient, recorder: StreamMetricsRecorder, label: str) -> None:
+        super().__init__(wrapped_client)
+        self._recorder = recorder
+        self._label = label
+        self._model = client_model_name(wrapped_client)
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        call = CallMetrics(self._label, self._model, self._recorder.current_run, streamed=False)
+        started = time.perf_counter()
+        try:
+            result = await super().create(
+                messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+        except BaseException:
+            call.failed = True
+            raise
+        finally:
+            call.total = call.ttft = call.network_wait = time.perf_counter() - started
+            self._recorder.record(call)
+        call.chunks = 1
+        call.completion_tokens = result.usage.completion_tokens
+        return result
+
+    async def create_stream(  # type: ignore[override]
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        call = CallMetrics(self._label, self._model, self._recorder.current_run, streamed=True)
+        stream = super().create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        started = time.perf_counter()
+        last_arrival: float | None = None
+        streamed_chars = 0
+        try:
+            while True:
+                requested = time.perf_counter()
+                try:
+                    item = await stream.__anext__()
+                except StopAsyncIteration:
+                    call.network_wait += time.perf_counter() - requested
+                    break
+                arrived = time.perf_counter()
+                call.network_wait += arrived - requested
+                if isinstance(item, CreateResult):
+                    call.completion_tokens = item.usage.completion_tokens or streamed_chars // CHARS_PER_TOKEN_ESTIMATE
+                else:
+                    if last_arrival is None:
+                        call.ttft = arrived - started
+                    else:
+                        call.gaps.append(arrived - last_arrival)
+                    last_arrival = arrived
+                    call.chunks += 1
+                    streamed_chars += len(item)
+                yield item
+                call.consumer_time += time.perf_counter() - arrived
+        except GeneratorExit:
+            raise  # The consumer stopped reading early; the call itself did not fail
+        except BaseException:
+            call.failed = True
+            raise
+        finally:
+            call.total = time.perf_counter() - started
+            if last_arrival is None:
+                call.ttft = call.total  # Nothing streamed: the whole call was the wait
+            await stream.aclose()
+            self._recorder.record(call)
+
+
+async def stream_with_metrics(
+    stream: AsyncGenerator[BaseAgentEvent | BaseChatMessage | TaskResult, None],
+    recorder: StreamMetricsRecorder,
+    run: str,
+) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | TaskResult, None]:
+    """Relay a team's ``run_stream`` with its model calls tagged as `run`.
+
+    The run's report is kept in ``recorder.last_run_report`` once the run ends; with concurrent
+    runs, use ``recorder.run_report(run)``.
+    """
+    token = recorder.begin_run(run)
+    try:
+        async for item in stream:
+            yield item
+    finally:
+        recorder.last_run_report = recorder.end_run(token)
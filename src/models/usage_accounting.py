@@ -0,0 +1,347 @@
+"""
+Live token, cost and time accounting across all model clients of a team.
+
+Messages only carry the usage of the agents' own replies; selector calls, orchestrator ledgers,
+summarizers and tool-loop iterations are invisible to the team. `UsageAccountant` sees them all:
+each client is wrapped with :meth:`UsageAccountant.meter` (one wrapper per agent or role, so spend
+is attributed to it), and every completed call is recorded with its tokens, cost and duration.
+
+With a `Budget`, the accountant reports the first exceeded limit (`BudgetTermination` uses it to
+stop a run between turns), and with ``enforce=True`` it is a hard ceiling: each call reserves its
+estimated prompt tokens plus its completion limit (and their cost) when it is admitted, so concurrent
+calls cannot jointly overshoot; the completion limit is passed on as ``max_tokens`` and clamped to
+what is left, and the reservation is settled with the real usage when the call completes. Calls
+that do not fit are refused with BudgetExceededError. Inside a team that error ends the run, so
+prefer `BudgetTermination` alone for a graceful stop. Use one accountant per task for per-task
+ceilings.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Dict, Literal, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, RequestUsage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from src.models.wrapped_client import WrappedChatCompletionClient, client_model_name
+from src.utils.token_utils import count_message_tokens
+
+logger = logging.getLogger(__name__)
+
+TOKENS_PER_MILLION = 1_000_000
+DEFAULT_COMPLETION_RESERVE = 1024  # Completion tokens reserved for a call that sets no max_tokens
+COMPLETION_LIMIT_KEYS = ("max_tokens", "max_completion_tokens")  # create args capping the completion
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """USD per million prompt and completion tokens."""
+
+    prompt: float
+    completion: float
+
+    def cost(self, usage: RequestUsage) -> float:
+        return (usage.prompt_tokens * self.prompt + usage.completion_tokens * self.completion) / TOKENS_PER_MILLION
+
+
+# Published list prices; pass `prices` to UsageAccountant for other models or negotiated rates.
+DEFAULT_PRICES: Dict[str, ModelPrice] = {
+    "gpt-4o-mini": ModelPrice(prompt=0.15, completion=0.60),
+    "gpt-4o": ModelPrice(prompt=2.50, completion=10.00),
+    "gpt-4.1-mini": ModelPrice(prompt=0.40, completion=1.60),
+    "gpt-4.1": ModelPrice(prompt=2.00, completion=8.00),
+}
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Spending limits of one task; None means unlimited."""
+
+    max_tokens: int | None = None
+    max_cost: float | None = None  # USD
+    max_seconds: float | None = None  # Wall clock since the first call
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised by a metered client when an enforced budget is spent."""
+
+
+@dataclass(frozen=True)
+class Reservation:
+    """Tokens and cost set aside for one admitted call until it completes."""
+
+    prompt_tokens: int
+    completion_tokens: int  # The call's completion limit
+    cost: float
+
+    @property
+    def tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+@dataclass
+class UsageLine:
+    """Accumulated usage of one metered client (or one model)."""
+
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    seconds: float = 0.0  # Summed call durations (calls may overlap)
+
+    @property
+    def tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, usage: RequestUsage, cost: float, seconds: float) -> None:
+        self.calls += 1
+        self.prompt_tokens += usage.prompt_tokens
+        self.completion_tokens += usage.completion_tokens
+        self.cost += cost
+        self.seconds += seconds
+
+
+@dataclass
+class UsageAccountant:
+    """Aggregates the usage of every client it meters and checks it against a budget.
+
+    Example:
+
+        .. code-block:: python
+
+            accountant = UsageAccountant(Budget(max_tokens=50_000, max_cost=0.25, max_seconds=300))
+            primary = AssistantAgent("primary", model_client=accountant.meter(model_client, "primary"))
+            critic = AssistantAgent("critic", model_client=accountant.meter(model_client, "critic"))
+            termination = BudgetTermination(accountant) | TextMentionTermination("APPROVE")
+
+    Args:
+        budget: Limits checked by :meth:`exceeded`; unlimited by default.
+        enforce: Make metered clients refuse calls past the budget (raising BudgetExceededError).
+        prices: Price per model name; models without a price count as free.
+    """
+
+    budget: Budget = field(default_factory=Budget)
+    enforce: bool = False
+    prices: Mapping[str, ModelPrice] = field(default_factory=lambda: dict(DEFAULT_PRICES))
+    total: UsageLine = field(default_factory=UsageLine)
+    by_label: Dict[str, UsageLine] = field(default_factory=dict)
+    by_model: Dict[str, UsageLine] = field(default_factory=dict)
+    started_at: float | None = None
+    reserved_tokens: int = 0  # Held by admitted calls still in flight
+    reserved_cost: float = 0.0
+
+    def meter(self, client: ChatCompletionClient, label: str, model: str | None = None) -> MeteredChatCompletionClient:
+        """Wrap `client` so its calls are recorded under `label` (e.g. the agent's name)."""
+        return MeteredChatCompletionClient(client, self, label, model=model)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.started_at if self.started_at is not None else 0.0
+
+    def cost(self, model: str, usage: RequestUsage) -> float:
+        """Price of `usage` on `model` (zero for models without a price)."""
+        price = self.prices.get(model)
+        return price.cost(usage) if price is not None else 0.0
+
+    def record(self, label: str, model: str, usage: RequestUsage, seconds: float) -> None:
+        """Add one completed call."""
+        cost = self.cost(model, usage)
+        self.total.add(usage, cost, seconds)
+        self.by_label.setdefault(label, UsageLine()).add(usage, cost, seconds)
+        self.by_model.setdefault(model, UsageLine()).add(usage, cost, seconds)
+
+    def start(self) -> None:
+        """Start the wall clock (done by the first call if not called explicitly)."""
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+
+    def exceeded(self) -> str | None:
+        """The first limit reached, described, or None while within budget."""
+        budget = self.budget
+        if budget.max_tokens is not None and self.total.tokens >= budget.max_tokens:
+            return f"token budget reached ({self.total.tokens:,}/{budget.max_tokens:,} tokens)"
+        if budget.max_cost is not None and self.total.cost >= budget.max_cost:
+            return f"cost budget reached (${self.total.cost:.4f}/${budget.max_cost:.4f})"
+        if budget.max_seconds is not None and self.elapsed_seconds >= budget.max_seconds:
+            return f"time budget reached ({self.elapsed_seconds:.1f}/{budget.max_seconds:.1f} s)"
+        return None
+
+    def report(self) -> Dict[str, Any]:
+        """Where the budget went: totals, per label and per model."""
+
+        def line(usage: UsageLine) -> Dict[str, Any]:
+            return {
+                "calls": usage.calls,
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "cost": usage.cost,
+                "share_of_tokens": usage.tokens / self.total.tokens if self.total.tokens else 0.0,
+            }
+
+        return {
+            "total": line(self.total),
+            "elapsed_seconds": self.elapsed_seconds,
+            "by_label": {label: line(usage) for label, usage in self.by_label.items()},
+            "by_model": {model: line(usage) for model, usage in self.by_model.items()},
+        }
+
+    def summary(self) -> str:
+        """One-line spend summary, largest spenders first."""
+        spenders = sorted(self.by_label.items(), key=lambda item: -item[1].tokens)
+        shares = ", ".join(
+            f"{label} {usage.tokens:,} tok/{usage.calls} calls" for label, usage in spenders
+        )
+        return (
+            f"{self.total.tokens:,} tokens, ${self.total.cost:.4f}, {self.elapsed_seconds:.1f} s"
+            + (f" ({shares})" if shares else "")
+        )
+
+    def reset(self) -> None:
+        """Start a new task: clear all usage and the clock."""
+        self.total = UsageLine()
+        self.by_label.clear()
+        self.by_model.clear()
+        self.started_at = None
+
+    def admit(self, label: str, model: str, prompt_tokens: int, max_completion_tokens: int) -> Reservation | None:
+        """Reserve a call's tokens and cost against the enforced budget before it is sent.
+
+        Args:
+            label: Who the call is attributed to (used in error messages).
+            model: Model name for pricing.
+            prompt_tokens: Estimated prompt tokens of the call.
+            max_completion_tokens: The completion limit the caller asked for.
+
+        Returns:
+            The reservation, whose completion limit may be clamped to what is left, or None when the
+            budget is not enforced.
+
+        Raises:
+            BudgetExceededError: The budget is spent, or the rest is reserved by calls in flight.
+        """
+        if not self.enforce:
+            return None
+        reason = self.exceeded()
+        if reason is not None:
+            raise BudgetExceededError(f"{label}: {reason}")
+        completion_tokens = min(max_completion_tokens, self._completion_room(model, prompt_tokens))
+        if completion_tokens <= 0:
+            raise BudgetExceededError(f"{label}: not enough budget left for a {prompt_tokens:,}-token prompt")
+        usage = RequestUsage(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        reservation = Reservation(prompt_tokens, completion_tokens, self.cost(model, usage))
+        self.reserved_tokens += reservation.tokens
+        self.reserved_cost += reservation.cost
+        return reservation
+
+    def release(self, reservation: Reservation | None) -> None:
+        """Return a reservation once its call has completed (and been recorded) or failed."""
+        if reservation is None:
+            return
+        self.reserved_tokens -= reservation.tokens
+        self.reserved_cost -= reservation.cost
+
+    def _completion_room(self, model: str, prompt_tokens: int) -> float:
+        """Completion tokens that still fit the token and cost limits after a prompt, net of reservations."""
+        room = math.inf
+        if self.budget.max_tokens is not None:
+            room = self.budget.max_tokens - self.total.tokens - self.reserved_tokens - prompt_tokens
+        price = self.prices.get(model)
+        if self.budget.max_cost is not None and price is not None and price.completion > 0:
+            left = (self.budget.max_cost - self.total.cost - self.reserved_cost) * TOKENS_PER_MILLION
+            room = min(room, math.floor((left - prompt_tokens * price.prompt) / price.completion))
+        return room
+
+
+class MeteredChatCompletionClient(WrappedChatCompletionClient):
+    """Client wrapper that records every call's usage in a :class:`UsageAccountant`.
+
+    Args:
+        wrapped_client: The client to meter.
+        accountant: Where usage is recorded.
+        label: Who the spend is attributed to.
+        model: Model name for pricing; read from the client when omitted.
+    """
+
+    def __init__(
+        self, wrapped_client: ChatCompletionClient, accountant: UsageAccountant, label: str, model: str | None = None
+    ) -> None:
+        super().__init__(wrapped_client)
+        self._accountant = accountant
+        self._label = label
+        self._model = model or client_model_name(wrapped_client)
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        reservation = self._admit(messages, extra_create_args)
+        self._accountant.start()
+        started = time.perf_counter()
+        try:
+            result = await super().create(
+                messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                json_output=json_output,
+                extra_create_args=_limited(extra_create_args, reservation),
+                cancellation_token=cancellation_token,
+            )
+            self._accountant.record(self._label, self._model, result.usage, time.perf_counter() - started)
+        finally:
+            self._accountant.release(reservation)
+        return result
+
+    async def create_stream(  # type: ignore[override]
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        reservation = self._admit(messages, extra_create_args)
+        self._accountant.start()
+        started = time.perf_counter()
+        try:
+            async for item in super().create_stream(
+                messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                json_output=json_output,
+                extra_create_args=_limited(extra_create_args, reservation),
+                cancellation_token=cancellation_token,
+            ):
+                if isinstance(item, CreateResult):
+                    self._accountant.record(self._label, self._model, item.usage, time.perf_counter() - started)
+                yield item
+        finally:
+            self._accountant.release(reservation)
+
+    def _admit(self, messages: Sequence[LLMMessage], extra_create_args: Mapping[str, Any]) -> Reservation | None:
+        """Reserve the call's estimated prompt plus its completion limit (enforced budgets only)."""
+        if not self._accountant.enforce:
+            return None
+        prompt_tokens = sum(count_message_tokens(message, self._model) for message in messages)
+        requested = next((extra_create_args[key] for key in COMPLETION_LIMIT_KEYS if key in extra_create_args), None)
+        return self._accountant.admit(self._label, self._model, prompt_tokens, requested or DEFAULT_COMPLETION_RESERVE)
+
+
+def _limited(extra_create_args: Mapping[str, Any], reservation: Reservation | None) -> Mapping[str, Any]:
+    """Create args with the completion limit set to the reserved completion tokens."""
+    if reservation is None:
+        return extra_create_args
+    key = next((key for key in COMPLETION_LIMIT_KEYS if key in extra_create_args), COMPLETION_LIMIT_KEYS[0])
+    return {**extra_create_args, key: reservation.completion_tokens}
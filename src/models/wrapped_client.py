@@ -0,0 +1,115 @@
+"""
+Base class for ChatCompletionClient wrappers.
+
+A wrapper (metering, routing, rate limiting, ...) usually changes how ``create`` and
+``create_stream`` run and forwards everything else to the wrapped client. `WrappedChatCompletionClient`
+does the forwarding, so subclasses only override the calls they change.
+"""
+from __future__ import annotations
+
+from typing import Any, AsyncGenerator, Literal, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken, ComponentModel
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelCapabilities,  # type: ignore
+    ModelInfo,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+
+def client_model_name(client: ChatCompletionClient) -> str:
+    """Model name a client sends requests for ("unknown" when the client does not expose one)."""
+    create_args = getattr(client, "_create_args", None)
+    if isinstance(create_args, Mapping) and create_args.get("model"):
+        return str(create_args["model"])
+    if isinstance(client, WrappedChatCompletionClient):
+        return client_model_name(client.wrapped_client)
+    return "unknown"
+
+
+class WrappedChatCompletionClient(ChatCompletionClient):
+    """ChatCompletionClient that forwards every call to `wrapped_client`.
+
+    Args:
+        wrapped_client: The client to delegate to.
+    """
+
+    def __init__(self, wrapped_client: ChatCompletionClient) -> None:
+        self._wrapped_client = wrapped_client
+
+    @property
+    def wrapped_client(self) -> ChatCompletionClient:
+        return self._wrapped_client
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        return await self._wrapped_client.create(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        return self._wrapped_client.create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    async def close(self) -> None:
+        await self._wrapped_client.close()
+
+    def actual_usage(self) -> RequestUsage:
+        return self._wrapped_client.actual_usage()
+
+    def total_usage(self) -> RequestUsage:
+        return self._wrapped_client.total_usage()
+
+    def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self._wrapped_client.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self._wrapped_client.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore
+        return self._wrapped_client.capabilities  # type: ignore
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._wrapped_client.model_info
+
+    def dump_component(self) -> ComponentModel:
+        """Serialize as the wrapped client, so agents using a wrapper stay serializable.
+
+        Wrappers that change which model answers should override this.
+        """
+        return self._wrapped_client.dump_component()
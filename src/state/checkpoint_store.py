@@ -0,0 +1,301 @@
+"""
+Compact, delta-based persistence for team and agent state.
+
+`team.save_state()` returns the full nested state, including every message of the shared thread
+and of each agent's model context. Writing that as JSON after every turn costs O(history) bytes
+per turn. `DeltaCheckpointStore` instead:
+
+- stores each message once, content-addressed by a hash of its canonical encoding,
+- replaces messages in the state by references, producing a small "skeleton",
+- writes only new messages plus skeleton edit operations (set / append / delete) per checkpoint,
+- encodes checkpoints with msgpack + zstd when installed, falling back to JSON + zlib.
+
+`load()` rebuilds the full state from the base checkpoint plus all deltas, ready for
+`team.load_state(...)`. `compact()` folds the chain back into a single base checkpoint.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Tuple
+
+try:
+    import msgpack
+    import zstandard
+except ImportError:  # Optional: falls back to JSON + zlib.
+    msgpack = None
+    zstandard = None
+
+REF_KEY = "$ref"  # Marker key of a content-addressed message reference in the skeleton
+CODEC_MSGPACK_ZSTD = 1  # Header byte: msgpack payload compressed with zstd
+CODEC_JSON_ZLIB = 2  # Header byte: UTF-8 JSON payload compressed with zlib
+CHECKPOINT_GLOB = "checkpoint-*.bin"
+COMPRESSION_LEVEL = 3  # Favours speed; checkpoints are written every turn
+
+Operation = List[Any]  # ["set", path, value] | ["append", path, items] | ["del", path]
+
+
+@dataclass(frozen=True)
+class CheckpointInfo:
+    """Statistics of one written checkpoint."""
+
+    index: int
+    path: Path
+    size_bytes: int
+    new_messages: int
+    operations: int
+    seconds: float
+
+
+def _is_message(value: Any) -> bool:
+    """Messages are dicts with a `type` and a `content` (chat messages, events, LLM messages)."""
+    return isinstance(value, dict) and "type" in value and "content" in value
+
+
+def _digest(message: Mapping[str, Any]) -> str:
+    canonical = json.dumps(message, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def encode_payload(payload: Any) -> bytes:
+    """Encode and compress a checkpoint payload with the best available codec."""
+    if msgpack is not None and zstandard is not None:
+        packed = msgpack.packb(payload, default=str, use_bin_type=True)
+        return bytes([CODEC_MSGPACK_ZSTD]) + zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(packed)
+    packed = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    return bytes([CODEC_JSON_ZLIB]) + zlib.compress(packed, COMPRESSION_LEVEL)
+
+
+def decode_payload(data: bytes) -> Any:
+    """Decode a payload written by :func:`encode_payload`."""
+    codec, body = data[0], data[1:]
+    if codec == CODEC_JSON_ZLIB:
+        return json.loads(zlib.decompress(body))
+    if codec == CODEC_MSGPACK_ZSTD:
+        if msgpack is None or zstandard is None:
+            raise RuntimeError("Checkpoint was written with msgpack+zstd; install msgpack and zstandard to read it.")
+        return msgpack.unpackb(zstandard.ZstdDecompressor().decompress(body), raw=False, strict_map_key=False)
+    raise ValueError(f"Unknown checkpoint codec {codec}.")
+
+
+class DeltaCheckpointStore:
+    """Append-only directory of base + delta checkpoints for one team/agent state.
+
+    Each message in a list is compared with the message saved at the same position by the previous
+    checkpoint; only messages that differ (appended, edited or moved ones) are encoded and hashed, so
+    a save after a few appends does not re-hash the history. Messages are kept in memory by reference
+    for that comparison until :meth:`compact` or :meth:`clear`.
+
+    Args:
+        directory: Directory holding this session's checkpoint files (created if missing).
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._messages: Dict[str, Any] = {}  # Saved messages by reference
+        self._skeleton: Any = None
+        self._next_index = 0
+        self._restore_index()
+
+    @property
+    def checkpoint_count(self) -> int:
+        """Number of checkpoint files in the chain."""
+        return len(self._files())
+
+    def save(self, state: Mapping[str, Any]) -> CheckpointInfo:
+        """Write a checkpoint holding only what changed since the previous one.
+
+        Args:
+            state: Full state as returned by ``save_state()``.
+
+        Returns:
+            Size and timing statistics of the written checkpoint.
+        """
+        started = time.perf_counter()
+        new_blobs: Dict[str, Any] = {}
+        skeleton = self._to_skeleton(state, self._skeleton, new_blobs)
+        if self._skeleton is None:
+            payload = {"base": skeleton, "blobs": new_blobs}
+            operation_count = 1
+        else:
+            operations: List[Operation] = []
+            _diff(self._skeleton, skeleton, [], operations)
+            payload = {"ops": operations, "blobs": new_blobs}
+            operation_count = len(operations)
+        path = self._write(payload)
+        self._skeleton = skeleton
+        self._messages.update(copy.deepcopy(new_blobs))
+        return CheckpointInfo(
+            index=self._next_index - 1,
+            path=path,
+            size_bytes=path.stat().st_size,
+            new_messages=len(new_blobs),
+            operations=operation_count,
+            seconds=time.perf_counter() - started,
+        )
+
+    def load(self) -> Dict[str, Any] | None:
+        """Rebuild the latest full state from the base checkpoint and all deltas.
+
+        Returns:
+            The state dict for ``load_state()``, or None when no checkpoint exists.
+        """
+        skeleton, blobs = self._replay()
+        if skeleton is None:
+            return None
+        return _resolve(skeleton, blobs)
+
+    def compact(self) -> CheckpointInfo | None:
+        """Replace the checkpoint chain with one base checkpoint holding only live messages.
+
+        The base is written after the existing chain and only then are the older files deleted,
+        newest first. A crash part-way therefore leaves an intact prefix of the old chain followed by
+        the new base, which still loads because replay restarts at every base.
+        """
+        skeleton, blobs = self._replay()
+        if skeleton is None:
+            return None
+        live_refs: Dict[str, Any] = {}
+        _collect_refs(skeleton, blobs, live_refs)
+        old_files = self._files()
+        started = time.perf_counter()
+        path = self._write({"base": skeleton, "blobs": live_refs})
+        for old_file in reversed(old_files):
+            old_file.unlink()
+        self._skeleton = skeleton
+        self._messages = live_refs
+        return CheckpointInfo(
+            self._next_index - 1, path, path.stat().st_size, len(live_refs), 1, time.perf_counter() - started
+        )
+
+    def clear(self) -> None:
+        """Delete every checkpoint of this store."""
+        for checkpoint_file in self._files():
+            checkpoint_file.unlink()
+        self._messages.clear()
+        self._skeleton = None
+        self._next_index = 0
+
+    def _files(self) -> List[Path]:
+        return sorted(self._directory.glob(CHECKPOINT_GLOB))
+
+    def _write(self, payload: Mapping[str, Any]) -> Path:
+        path = self._directory / f"checkpoint-{self._next_index:08d}.bin"
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(encode_payload(payload))
+        temporary.replace(path)
+        self._next_index += 1
+        return path
+
+    def _replay(self) -> Tuple[Any, Dict[str, Any]]:
+        """Apply every checkpoint in order; returns (skeleton, blobs by ref)."""
+        skeleton: Any = None
+        blobs: Dict[str, Any] = {}
+        for checkpoint_file in self._files():
+            payload = decode_payload(checkpoint_file.read_bytes())
+            blobs.update(payload.get("blobs", {}))
+            if "base" in payload:
+                skeleton = payload["base"]
+            else:
+                for operation in payload["ops"]:
+                    skeleton = _apply(skeleton, operation)
+        return skeleton, blobs
+
+    def _restore_index(self) -> None:
+        """Resume an existing chain so new deltas continue from its latest skeleton."""
+        files = self._files()
+        if not files:
+            return
+        self._skeleton, self._messages = self._replay()
+        self._next_index = int(files[-1].stem.split("-")[1]) + 1
+
+    def _to_skeleton(self, value: Any, previous: Any, new_blobs: Dict[str, Any]) -> Any:
+        """Replace messages by references, collecting messages not stored yet into `new_blobs`."""
+        if isinstance(value, Mapping):
+            previous_map = previous if isinstance(previous, dict) else {}
+            return {key: self._to_skeleton(item, previous_map.get(key), new_blobs) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return self._list_skeleton(list(value), previous if isinstance(previous, list) else [], new_blobs)
+        return value
+
+    def _list_skeleton(self, items: List[Any], previous: List[Any], new_blobs: Dict[str, Any]) -> List[Any]:
+        skeleton = []
+        for position, item in enumerate(items):
+            old = previous[position] if position < len(previous) else None
+            if not _is_message(item):
+                skeleton.append(self._to_skeleton(item, old, new_blobs))
+                continue
+            ref = self._ref(item, old.get(REF_KEY) if isinstance(old, dict) else None)
+            if ref not in self._messages:
+                new_blobs[ref] = item
+            skeleton.append({REF_KEY: ref})
+        return skeleton
+
+    def _ref(self, message: Mapping[str, Any], previous_ref: str | None) -> str:
+        """Reference of `message`; hashed only when it differs from the message saved as `previous_ref`."""
+        if previous_ref is not None and self._messages.get(previous_ref) == message:
+            return previous_ref
+        return _digest(message)
+
+
+def _diff(old: Any, new: Any, path: List[Any], operations: List[Operation]) -> None:
+    """Emit the operations turning skeleton `old` into `new`."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old.keys() - new.keys():
+            operations.append(["del", path + [key]])
+        for key, value in new.items():
+            if key not in old:
+                operations.append(["set", path + [key], value])
+            elif old[key] != value:
+                _diff(old[key], value, path + [key], operations)
+        return
+    if isinstance(old, list) and isinstance(new, list) and len(new) >= len(old) and new[: len(old)] == old:
+        operations.append(["append", path, new[len(old) :]])
+        return
+    operations.append(["set", path, new])
+
+
+def _apply(skeleton: Any, operation: Operation) -> Any:
+    """Apply one diff operation and return the (possibly replaced) root."""
+    kind, path = operation[0], operation[1]
+    if not path:
+        return operation[2] if kind == "set" else skeleton + operation[2]
+    parent = skeleton
+    for key in path[:-1]:
+        parent = parent[key]
+    if kind == "del":
+        del parent[path[-1]]
+    elif kind == "set":
+        parent[path[-1]] = operation[2]
+    else:
+        parent[path[-1]].extend(operation[2])
+    return skeleton
+
+
+def _resolve(value: Any, blobs: Mapping[str, Any]) -> Any:
+    """Expand message references back into message dicts."""
+    if isinstance(value, dict):
+        if REF_KEY in value and len(value) == 1:
+            return blobs[value[REF_KEY]]
+        return {key: _resolve(item, blobs) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, blobs) for item in value]
+    return value
+
+
+def _collect_refs(value: Any, blobs: Mapping[str, Any], live: Dict[str, Any]) -> None:
+    if isinstance(value, dict):
+        if REF_KEY in value and len(value) == 1:
+            live[value[REF_KEY]] = blobs[value[REF_KEY]]
+            return
+        for item in value.values():
+            _collect_refs(item, blobs, live)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_refs(item, blobs, live)
@@ -0,0 +1,176 @@
+"""
+Append-only, memory-mapped message logs with on-demand message views.
+
+Restoring a long history through ``load_state`` validates every message into a pydantic object,
+although only the last few are ever sent to the model again. A `MessageLog` keeps the history on
+disk as length-indexed JSON records; `MappedMessageView` memory-maps a fixed-length prefix of a log
+and decodes a record only when it is indexed, so opening a view costs O(1) time and memory.
+
+Files of a log named ``history.log``:
+
+- ``history.log``: concatenated UTF-8 JSON records,
+- ``history.log.idx``: one little-endian uint64 end offset per record.
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import mmap
+import struct
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Iterator, List, Mapping, Sequence, TypeVar, overload
+
+OFFSET_FORMAT = "<Q"  # Record end offsets in the index file
+OFFSET_SIZE = struct.calcsize(OFFSET_FORMAT)
+INDEX_SUFFIX = ".idx"
+DEFAULT_VIEW_CACHE_SIZE = 64  # Materialized items kept per lazy sequence
+
+T = TypeVar("T")
+
+
+class MessageLog:
+    """An append-only log of JSON records with an offset index for O(1) random access.
+
+    Args:
+        path: Path of the data file; the index is stored next to it with an ``.idx`` suffix.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + INDEX_SUFFIX)
+
+    @property
+    def count(self) -> int:
+        """Number of records currently in the log."""
+        return self.index_path.stat().st_size // OFFSET_SIZE if self.index_path.exists() else 0
+
+    def append(self, records: Sequence[Mapping[str, Any]]) -> int:
+        """Append records and return the new record count."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as data_file, open(self.index_path, "ab") as index_file:
+            offset = data_file.tell()
+            offsets = bytearray()
+            for record in records:
+                encoded = json.dumps(record, separators=(",", ":"), default=str).encode("utf-8")
+                data_file.write(encoded)
+                offset += len(encoded)
+                offsets += struct.pack(OFFSET_FORMAT, offset)
+            data_file.flush()
+            index_file.write(offsets)
+        return self.count
+
+    def view(self, count: int | None = None) -> MappedMessageView:
+        """Memory-map the first `count` records (all current records by default)."""
+        return MappedMessageView(self, self.count if count is None else count)
+
+
+class MappedMessageView(Sequence[Dict[str, Any]]):
+    """Read-only, memory-mapped view of a log prefix; records are decoded when indexed.
+
+    The view's length is fixed at creation, so records appended later are not visible and the view
+    stays consistent with the state that referenced it.
+    """
+
+    def __init__(self, log: MessageLog, count: int) -> None:
+        available = log.count
+        if count > available:
+            raise ValueError(f"{log.path} holds {available} records, {count} requested.")
+        self._count = count
+        self._data: mmap.mmap | None = None
+        self._index: mmap.mmap | None = None
+        if count:
+            with open(log.path, "rb") as data_file, open(log.index_path, "rb") as index_file:
+                self._data = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._index = mmap.mmap(index_file.fileno(), count * OFFSET_SIZE, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, Any]]: ...
+
+    def __getitem__(self, index: int | slice) -> Dict[str, Any] | List[Dict[str, Any]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("message index out of range")
+        assert self._data is not None and self._index is not None
+        end = struct.unpack_from(OFFSET_FORMAT, self._index, index * OFFSET_SIZE)[0]
+        start = struct.unpack_from(OFFSET_FORMAT, self._index, (index - 1) * OFFSET_SIZE)[0] if index else 0
+        return json.loads(self._data[start:end])
+
+    def close(self) -> None:
+        """Release the memory maps."""
+        for mapped in (self._data, self._index):
+            if mapped is not None:
+                mapped.close()
+        self._data = self._index = None
+
+
+class LazySequence(Sequence[T], Generic[T]):
+    """Concatenation of record views whose items are built with `factory` on first access.
+
+    Only accessed items are materialized; the most recently used ``cache_size`` of them are kept.
+
+    Args:
+        views: Record views, in order.
+        factory: Builds an item (e.g. a pydantic message) from a decoded record.
+        cache_size: Number of materialized items to keep.
+    """
+
+    def __init__(
+        self,
+        views: Sequence[Sequence[Dict[str, Any]]],
+        factory: Callable[[Dict[str, Any]], T],
+        cache_size: int = DEFAULT_VIEW_CACHE_SIZE,
+    ) -> None:
+        self._views = list(views)
+        self._factory = factory
+        self._cache_size = cache_size
+        self._cache: OrderedDict[int, T] = OrderedDict()
+        self._ends: List[int] = []
+        total = 0
+        for view in self._views:
+            total += len(view)
+            self._ends.append(total)
+        self.materialized_count = 0
+
+    def __len__(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]: ...
+
+    def __getitem__(self, index: int | slice) -> T | List[T]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("message index out of range")
+        if index in self._cache:
+            self._cache.move_to_end(index)
+            return self._cache[index]
+        item = self._factory(self._record(index))
+        self.materialized_count += 1
+        self._cache[index] = item
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return item
+
+    def __iter__(self) -> Iterator[T]:
+        return (self[i] for i in range(len(self)))
+
+    def _record(self, index: int) -> Dict[str, Any]:
+        view_index = bisect.bisect_right(self._ends, index)
+        start = self._ends[view_index - 1] if view_index else 0
+        return self._views[view_index][index - start]
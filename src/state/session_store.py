@@ -0,0 +1,227 @@
+"""
+Durable parking of human-in-the-loop team sessions between user turns.
+
+A Swarm that hands off to the user normally stays alive in-process while it waits for the reply,
+which may come hours later. `ParkedSessionManager` checkpoints the team state whenever a turn ends
+with a `HandoffMessage` to the user, drops the live team, and rebuilds it from the checkpoint when
+the user's next message arrives. Parked sessions cost disk, not RAM.
+
+This module provides:
+- `FileSessionBackend`: one compressed file per session.
+- `SQLiteSessionBackend`: one row per session in a local SQLite database.
+- `ParkedSessionManager`: runs a session's turn and parks or finishes it afterwards.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncGenerator, Callable, Dict, List, Protocol
+
+from autogen_agentchat.base import TaskResult, Team
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, HandoffMessage
+
+from src.state.checkpoint_store import decode_payload, encode_payload
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_TARGET = "user"  # Handoff target that means "wait for the human"
+SESSION_FILE_SUFFIX = ".session"
+
+
+@dataclass(frozen=True)
+class ParkedSession:
+    """A team waiting for user input: its saved state and the agent to hand back to."""
+
+    session_id: str
+    state: Dict[str, Any]
+    resume_target: str
+    parked_at: float
+
+
+class SessionBackend(Protocol):
+    """Storage for encoded parked sessions, keyed by session id."""
+
+    def put(self, session_id: str, data: bytes) -> None: ...
+
+    def get(self, session_id: str) -> bytes | None: ...
+
+    def delete(self, session_id: str) -> None: ...
+
+    def session_ids(self) -> List[str]: ...
+
+
+class FileSessionBackend:
+    """Stores each parked session as ``<directory>/<session_id>.session``, written atomically.
+
+    Args:
+        directory: Directory for session files (created if missing).
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def put(self, session_id: str, data: bytes) -> None:
+        path = self._path(session_id)
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(data)
+        temporary.replace(path)
+
+    def get(self, session_id: str) -> bytes | None:
+        path = self._path(session_id)
+        return path.read_bytes() if path.exists() else None
+
+    def delete(self, session_id: str) -> None:
+        self._path(session_id).unlink(missing_ok=True)
+
+    def session_ids(self) -> List[str]:
+        return sorted(path.stem for path in self._directory.glob(f"*{SESSION_FILE_SUFFIX}"))
+
+    def _path(self, session_id: str) -> Path:
+        if not session_id or any(char in session_id for char in "/\\") or session_id.startswith("."):
+            raise ValueError(f"Invalid session id {session_id!r}.")
+        return self._directory / f"{session_id}{SESSION_FILE_SUFFIX}"
+
+
+class SQLiteSessionBackend:
+    """Stores parked sessions as rows of a local SQLite database (WAL mode).
+
+    The connection is shared across threads (writes run off the event loop) behind a lock.
+
+    Args:
+        path: Database file path (created if missing).
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS parked_sessions "
+            "(session_id TEXT PRIMARY KEY, data BLOB NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    def put(self, session_id: str, data: bytes) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO parked_sessions (session_id, data, updated_at) VALUES (?, ?, ?)",
+                (session_id, data, time.time()),
+            )
+
+    def get(self, session_id: str) -> bytes | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM parked_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def delete(self, session_id: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM parked_sessions WHERE session_id = ?", (session_id,))
+
+    def session_ids(self) -> List[str]:
+        with self._lock:
+            rows = self._connection.execute("SELECT session_id FROM parked_sessions ORDER BY session_id").fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class ParkedSessionManager:
+    """Run one user turn of a session at a time, parking the team between turns.
+
+    A turn that ends with a ``HandoffMessage`` to ``user_target`` is checkpointed and the live team
+    is released. The next call for the same session rebuilds a team with ``team_factory``, loads
+    the checkpoint and resumes it with a ``HandoffMessage`` from the user to the agent that handed
+    off. Any other ending (e.g. a TERMINATE mention) finishes the session and removes its checkpoint.
+
+    Example:
+
+        .. code-block:: python
+
+            sessions = ParkedSessionManager(build_swarm, SQLiteSessionBackend("sessions.sqlite"))
+            await Console(sessions.run_stream("customer-42", "I need to refund my flight."))
+            # ... hours later, possibly in another process:
+            await Console(sessions.run_stream("customer-42", "My flight is AC 1234."))
+
+    Args:
+        team_factory: Builds a fresh team (same participants and termination) for a session.
+        backend: Where parked sessions are stored.
+        user_target: Handoff target that means "wait for the user".
+    """
+
+    def __init__(
+        self,
+        team_factory: Callable[[], Team],
+        backend: SessionBackend,
+        user_target: str = DEFAULT_USER_TARGET,
+    ) -> None:
+        self._team_factory = team_factory
+        self._backend = backend
+        self._user_target = user_target
+        self._active: Dict[str, Team] = {}
+
+    @property
+    def active_count(self) -> int:
+        """Number of sessions with a live team (i.e. currently running a turn)."""
+        return len(self._active)
+
+    async def is_parked(self, session_id: str) -> bool:
+        """Whether the session is waiting for user input."""
+        return await asyncio.to_thread(self._backend.get, session_id) is not None
+
+    async def parked_session(self, session_id: str) -> ParkedSession | None:
+        """Load a parked session's checkpoint without resuming it."""
+        data = await asyncio.to_thread(self._backend.get, session_id)
+        if data is None:
+            return None
+        record = await asyncio.to_thread(decode_payload, data)
+        return ParkedSession(session_id, record["state"], record["resume_target"], record["parked_at"])
+
+    async def run_stream(
+        self, session_id: str, message: str
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | TaskResult, None]:
+        """Run one turn: start the session with `message` as the task, or resume it with the user's reply.
+
+        Yields the team's messages and final TaskResult, like ``Team.run_stream``.
+        """
+        if session_id in self._active:
+            raise RuntimeError(f"Session {session_id} is already running a turn.")
+        parked = await self.parked_session(session_id)
+        team = self._team_factory()
+        self._active[session_id] = team
+        try:
+            if parked is None:
+                task: str | HandoffMessage = message
+            else:
+                await team.load_state(parked.state)
+                task = HandoffMessage(source=self._user_target, target=parked.resume_target, content=message)
+            async for item in team.run_stream(task=task):
+                if isinstance(item, TaskResult):
+                    await self._park_or_finish(session_id, team, item)
+                yield item
+        finally:
+            del self._active[session_id]
+
+    async def _park_or_finish(self, session_id: str, team: Team, result: TaskResult) -> None:
+        last_message = result.messages[-1] if result.messages else None
+        if isinstance(last_message, HandoffMessage) and last_message.target == self._user_target:
+            record = {
+                "state": dict(await team.save_state()),
+                "resume_target": last_message.source,
+                "parked_at": time.time(),
+            }
+            data = await asyncio.to_thread(encode_payload, record)
+            await asyncio.to_thread(self._backend.put, session_id, data)
+            logger.info(f"Parked session {session_id} ({len(data)} bytes), waiting on {last_message.source}")
+        else:
+            await asyncio.to_thread(self._backend.delete, session_id)
+            logger.info(f"Session {session_id} finished: {result.stop_reason}")
@@ -0,0 +1,187 @@
+"""
+Swarm whose coordinator can hand off to several independent specialists at once.
+
+In a Swarm, a planner that needs two independent analyses hands off to one specialist, waits for the
+handoff back, then hands off to the next one, so research latency is the sum of the specialists'.
+`FanOutSwarm` adds fan-out groups: a handoff whose target is a group name (e.g. "analysts") starts
+every member of the group concurrently. When all members have replied (their replies joined into the
+shared thread in completion order), control returns to the agent that issued the fan-out, which sees
+all the results on its next turn, so latency becomes that of the slowest specialist.
+
+Each member takes exactly one turn per fan-out; a specialist should finish its work (tool calls
+included) and hand back within that turn. The termination condition is checked on all the messages
+of the join at once.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, List, Mapping, Sequence
+
+from autogen_agentchat.base import ChatAgent, Handoff, TerminationCondition
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, HandoffMessage, MessageFactory
+from autogen_agentchat.teams import Swarm
+from typing_extensions import Self
+
+from src.utils.autogen_internals import SwarmConfig, SwarmManagerAdapter
+
+logger = logging.getLogger(__name__)
+
+
+def fan_out_handoff(group: str, members: Sequence[str]) -> Handoff:
+    """The handoff a coordinator uses to start a fan-out group."""
+    return Handoff(
+        target=group,
+        description=f"Hand off to {', '.join(members)} at once; they work in parallel and all report back to you.",
+    )
+
+
+class FanOutSwarmManager(SwarmManagerAdapter):
+    """SwarmGroupChatManager that runs fan-out groups concurrently and joins them back to the coordinator."""
+
+    def __init__(self, *args: Any, fan_out: Mapping[str, Sequence[str]], **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._fan_out = fan_out
+        self._coordinator: str | None = None  # Issuer of the running fan-out
+        self._join_delta: List[BaseAgentEvent | BaseChatMessage] = []  # Messages of the running fan-out
+
+    async def validate_group_state(self, messages: List[BaseChatMessage] | None) -> None:
+        """Swarm's validation, accepting fan-out group names as handoff targets."""
+        if messages:
+            messages = [message for message in messages if not self._targets_group(message)]
+        thread, self._message_thread = self._message_thread, [
+            message for message in self._message_thread if not self._targets_group(message)
+        ]
+        try:
+            await super().validate_group_state(messages)
+        finally:
+            self._message_thread = thread
+
+    async def reset(self) -> None:
+        await super().reset()
+        self._coordinator = None
+        self._join_delta.clear()
+
+    async def update_message_thread(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> None:
+        await super().update_message_thread(messages)
+        if self._coordinator is not None:
+            self._join_delta.extend(messages)
+
+    async def select_speaker(self, thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> List[str] | str:
+        """Return to the coordinator after a join; start all members on a handoff to a group."""
+        if self._coordinator is not None:
+            self.current_speaker, self._coordinator = self._coordinator, None
+            return [self.current_speaker]
+        last_handoff = next((message for message in reversed(thread) if isinstance(message, HandoffMessage)), None)
+        if last_handoff is not None and last_handoff.target in self._fan_out:
+            self._coordinator = last_handoff.source
+            members = list(self._fan_out[last_handoff.target])
+            logger.debug(f"{last_handoff.source} fanned out to {members}")
+            return members
+        return await super().select_speaker(thread)
+
+    async def _apply_termination_condition(
+        self, delta: Sequence[BaseAgentEvent | BaseChatMessage], increment_turn_count: bool = False
+    ) -> bool:
+        # After a join, the condition sees every member's reply, not only the last one's.
+        if self._join_delta:
+            delta, self._join_delta = self._join_delta, []
+        return await super()._apply_termination_condition(delta, increment_turn_count)
+
+    def _targets_group(self, message: BaseChatMessage) -> bool:
+        return isinstance(message, HandoffMessage) and message.target in self._fan_out
+
+
+class FanOutSwarmConfig(SwarmConfig):
+    """The declarative configuration for FanOutSwarm."""
+
+    fan_out: Dict[str, List[str]] = {}
+
+
+class FanOutSwarm(Swarm):
+    """Swarm with fan-out groups of specialists that run concurrently.
+
+    Example:
+
+        .. code-block:: python
+
+            planner = AssistantAgent(
+                "planner",
+                model_client=model_client,
+                handoffs=[fan_out_handoff("analysts", ["financial_analyst", "news_analyst"]), "writer"],
+            )
+            team = FanOutSwarm(
+                [planner, financial_analyst, news_analyst, writer],
+                fan_out={"analysts": ["financial_analyst", "news_analyst"]},
+                termination_condition=TextMentionTermination("TERMINATE"),
+            )
+
+    Args:
+        participants: The participants; the first one is the initial speaker.
+        fan_out: Group name -> participant names started together by a handoff to the group.
+        **kwargs: Forwarded to Swarm (termination_condition, max_turns, ...).
+    """
+
+    component_config_schema = FanOutSwarmConfig
+    component_provider_override = "src.teams.fan_out_swarm.FanOutSwarm"
+
+    def __init__(self, participants: List[ChatAgent], *, fan_out: Mapping[str, Sequence[str]], **kwargs: Any) -> None:
+        super().__init__(participants, **kwargs)
+        names = {participant.name for participant in participants}
+        for group, members in fan_out.items():
+            if group in names:
+                raise ValueError(f"Fan-out group {group} has the same name as a participant.")
+            if not members or not set(members) <= names:
+                raise ValueError(f"Fan-out group {group} must list participants, got {list(members)}.")
+            if len(set(members)) != len(members):
+                raise ValueError(f"Fan-out group {group} lists a participant twice.")
+        self._fan_out = {group: list(members) for group, members in fan_out.items()}
+
+    def _create_group_chat_manager_factory(
+        self,
+        name: str,
+        group_topic_type: str,
+        output_topic_type: str,
+        participant_topic_types: List[str],
+        participant_names: List[str],
+        participant_descriptions: List[str],
+        output_message_queue: Any,
+        termination_condition: TerminationCondition | None,
+        max_turns: int | None,
+        message_factory: MessageFactory,
+    ) -> Callable[[], FanOutSwarmManager]:
+        def _factory() -> FanOutSwarmManager:
+            return FanOutSwarmManager(
+                name,
+                group_topic_type,
+                output_topic_type,
+                participant_topic_types,
+                participant_names,
+                participant_descriptions,
+                output_message_queue,
+                termination_condition,
+                max_turns,
+                message_factory,
+                self._emit_team_events,
+                fan_out=self._fan_out,
+            )
+
+        return _factory
+
+    def _to_config(self) -> FanOutSwarmConfig:
+        return FanOutSwarmConfig(**super()._to_config().model_dump(), fan_out=self._fan_out)
+
+    @classmethod
+    def _from_config(cls, config: FanOutSwarmConfig) -> Self:
+        participants = [ChatAgent.load_component(participant) for participant in config.participants]
+        termination_condition = (
+            TerminationCondition.load_component(config.termination_condition) if config.termination_condition else None
+        )
+        return cls(
+            participants,
+            fan_out=config.fan_out,
+            name=config.name,
+            description=config.description,
+            termination_condition=termination_condition,
+            max_turns=config.max_turns,
+            emit_team_events=config.emit_team_events,
+        )
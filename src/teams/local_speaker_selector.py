@@ -0,0 +1,292 @@
+"""
+Local speaker selection for SelectorGroupChat, learned from the model selector's own choices.
+
+SelectorGroupChat spends a model call on every turn to pick the next speaker. `LocalSpeakerSelector`
+plugs in as its ``selector_func`` and answers locally when it is confident:
+
+1. a keyword router scoring the last message against each agent's name, description and keywords;
+   it only answers when one agent leads clearly (in practice: the message addresses it by name),
+   since description words alone misroute often,
+2. once enough selections are logged, a multinomial naive Bayes classifier over the last message's
+   tokens and speaker, trained online.
+
+When neither is sure (the router has no clear lead, or the classifier's probability is below
+``confidence_threshold``) it returns None and SelectorGroupChat falls back to the model. The
+speaker the model then picks is read from the next turn's thread and logged as a training example,
+so the classifier learns the model's routing and takes over more turns as it goes. A small share of
+confident turns is deferred anyway (``exploration_rate``): without them the classifier would only
+ever see the turns it is unsure about, and they measure how often the local choice agrees with the
+model's.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import random
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Sequence
+
+from autogen_agentchat.base import ChatAgent
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
+
+from src.memory.hybrid_memory import tokenize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIDENCE_THRESHOLD = 0.7  # Minimum probability for a local selection
+DEFAULT_MIN_TRAINING_EXAMPLES = 30  # Logged selections before the classifier replaces the router
+DEFAULT_EXPLORATION_RATE = 0.1  # Share of confident selections still deferred to the model, as audits
+SMOOTHING = 1.0  # Laplace smoothing of the naive Bayes token counts
+ROUTER_NAME_WEIGHT = 3  # Score of a message naming an agent, in profile keywords
+ROUTER_MIN_SCORE = 3  # Score the router's choice needs
+ROUTER_MIN_MARGIN = 3  # Lead over the runner-up the router's choice needs
+
+
+@dataclass(frozen=True)
+class SelectionExample:
+    """One logged selection: what the selector saw and which speaker was chosen."""
+
+    text: str
+    last_source: str
+    candidates: List[str]
+    selected: str
+
+    def features(self) -> List[str]:
+        return selection_features(self.text, self.last_source)
+
+
+def selection_features(text: str, last_source: str) -> List[str]:
+    """Classifier features: the last message's tokens plus who sent it."""
+    return tokenize(text) + [f"from:{last_source}"]
+
+
+class NaiveBayesSpeakerClassifier:
+    """Multinomial naive Bayes over selection features, trainable one example at a time."""
+
+    def __init__(self) -> None:
+        self._label_counts: Counter[str] = Counter()
+        self._feature_counts: Dict[str, Counter[str]] = defaultdict(Counter)
+        self._feature_totals: Counter[str] = Counter()
+        self._vocabulary: set[str] = set()
+
+    @property
+    def example_count(self) -> int:
+        return sum(self._label_counts.values())
+
+    def learn(self, features: Sequence[str], label: str) -> None:
+        self._label_counts[label] += 1
+        self._feature_counts[label].update(features)
+        self._feature_totals[label] += len(features)
+        self._vocabulary.update(features)
+
+    def predict_proba(self, features: Sequence[str], candidates: Sequence[str]) -> Dict[str, float]:
+        """Posterior probability of each candidate (normalised over the candidates)."""
+        total = self.example_count
+        vocabulary_size = len(self._vocabulary) + 1
+        log_scores: Dict[str, float] = {}
+        for label in candidates:
+            score = math.log((self._label_counts[label] + SMOOTHING) / (total + SMOOTHING * len(candidates)))
+            denominator = self._feature_totals[label] + SMOOTHING * vocabulary_size
+            counts = self._feature_counts[label]
+            score += sum(math.log((counts[feature] + SMOOTHING) / denominator) for feature in features)
+            log_scores[label] = score
+        return _normalise(log_scores)
+
+
+class KeywordSpeakerRouter:
+    """Scores candidates by the last message naming them and sharing their profile tokens.
+
+    Args:
+        profiles: Description and keywords per agent name.
+    """
+
+    def __init__(self, profiles: Mapping[str, str]) -> None:
+        self._names = {name: set(tokenize(name)) for name in profiles}
+        self._profiles = {name: set(tokenize(profile)) - self._names[name] for name, profile in profiles.items()}
+
+    def scores(self, text: str, candidates: Sequence[str]) -> Dict[str, int]:
+        tokens = set(tokenize(text))
+        return {
+            name: ROUTER_NAME_WEIGHT * (name in self._names and self._names[name] <= tokens)
+            + len(tokens & self._profiles.get(name, set()))
+            for name in candidates
+        }
+
+    def select(self, text: str, candidates: Sequence[str]) -> str | None:
+        """The clear leader, or None when no candidate leads by ``ROUTER_MIN_MARGIN`` with ``ROUTER_MIN_SCORE``."""
+        ranked = sorted(self.scores(text, candidates).items(), key=lambda item: item[1], reverse=True)
+        if not ranked or ranked[0][1] < ROUTER_MIN_SCORE:
+            return None
+        if len(ranked) > 1 and ranked[0][1] - ranked[1][1] < ROUTER_MIN_MARGIN:
+            return None
+        return ranked[0][0]
+
+
+class LocalSpeakerSelector:
+    """``selector_func`` for SelectorGroupChat that selects locally and defers to the model when unsure.
+
+    Example:
+
+        .. code-block:: python
+
+            selector = LocalSpeakerSelector([planner, web_search, data_analyst], log_path="selections.jsonl")
+            team = SelectorGroupChat([planner, web_search, data_analyst], model_client=client, selector_func=selector)
+            ...
+            print(selector.stats)
+
+    Args:
+        participants: The group chat's participants (names and descriptions feed the router).
+        keywords: Extra routing keywords per agent name.
+        confidence_threshold: Minimum classifier probability for answering locally.
+        min_training_examples: Logged selections needed before the classifier replaces the router.
+        allow_repeated_speaker: Whether the last speaker may be selected again.
+        log_path: JSONL file of selections; loaded for training at start and appended to.
+        exploration_rate: Share of confident selections deferred to the model to keep learning and
+            to audit agreement.
+        seed: Seed of the exploration sampling.
+    """
+
+    def __init__(
+        self,
+        participants: Sequence[ChatAgent],
+        *,
+        keywords: Mapping[str, Sequence[str]] | None = None,
+        confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+        min_training_examples: int = DEFAULT_MIN_TRAINING_EXAMPLES,
+        allow_repeated_speaker: bool = False,
+        log_path: str | Path | None = None,
+        exploration_rate: float = DEFAULT_EXPLORATION_RATE,
+        seed: int | None = None,
+    ) -> None:
+        keywords = keywords or {}
+        self._names = [participant.name for participant in participants]
+        self._router = KeywordSpeakerRouter(
+            {
+                participant.name: " ".join([participant.name, participant.description, *keywords.get(participant.name, [])])
+                for participant in participants
+            }
+        )
+        self._classifier = NaiveBayesSpeakerClassifier()
+        self._confidence_threshold = confidence_threshold
+        self._min_training_examples = min_training_examples
+        self._allow_repeated_speaker = allow_repeated_speaker
+        self._log_path = Path(log_path) if log_path is not None else None
+        self._exploration_rate = exploration_rate
+        self._rng = random.Random(seed)
+        self._deferred: _Deferral | None = None  # Awaiting the model's choice
+        self.stats: Counter[str] = Counter()
+        if self._log_path is not None and self._log_path.exists():
+            for example in load_selection_log(self._log_path):
+                self._classifier.learn(example.features(), example.selected)
+
+    @property
+    def agreement_rate(self) -> float | None:
+        """How often audited local choices matched the model's (None before any audit)."""
+        if not self.stats["audits"]:
+            return None
+        return self.stats["audit_agreements"] / self.stats["audits"]
+
+    def __call__(self, thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> str | None:
+        """Return the next speaker, or None to let the model select."""
+        if self._deferred is not None:
+            chosen = next(
+                (message.source for message in thread[self._deferred.thread_length :] if isinstance(message, BaseChatMessage)),
+                None,
+            )
+            self.record_model_choice(chosen)
+        chat_messages = [message for message in thread if isinstance(message, BaseChatMessage)]
+        if not chat_messages:
+            return None
+        last = chat_messages[-1]
+        candidates = [
+            name for name in self._names if self._allow_repeated_speaker or name != last.source
+        ] or list(self._names)
+        if len(candidates) == 1:
+            self.stats["calls"] += 1
+            self.stats["single_candidate"] += 1
+            return candidates[0]
+        return self.select(last.to_model_text(), last.source, candidates, thread_length=len(thread))
+
+    def select(self, text: str, last_source: str, candidates: Sequence[str], thread_length: int = 0) -> str | None:
+        """Select locally, or defer to the model (None) and wait for :meth:`record_model_choice`."""
+        self.stats["calls"] += 1
+        speaker, stage = self.predict(text, last_source, candidates)
+        if speaker is not None and self._rng.random() >= self._exploration_rate:
+            self.stats[stage] += 1
+            return speaker
+        self.stats["explored" if speaker is not None else "model_fallback"] += 1
+        self._deferred = _Deferral(SelectionExample(text, last_source, list(candidates), ""), speaker, thread_length)
+        logger.debug(f"Deferring speaker selection after {last_source} to the model (local choice: {speaker})")
+        return None
+
+    def record_model_choice(self, speaker: str | None) -> None:
+        """Learn from the speaker the model picked after the last deferral."""
+        deferred, self._deferred = self._deferred, None
+        if deferred is None or speaker not in deferred.example.candidates:
+            return
+        if deferred.local_choice is not None:
+            self.stats["audits"] += 1
+            self.stats["audit_agreements"] += deferred.local_choice == speaker
+        example = deferred.example
+        self.learn(SelectionExample(example.text, example.last_source, example.candidates, speaker))
+
+    def predict(self, text: str, last_source: str, candidates: Sequence[str]) -> tuple[str | None, str]:
+        """Local prediction and which stage made it ("classifier", "router", or "none" when unsure)."""
+        if self._classifier.example_count < self._min_training_examples:
+            speaker = self._router.select(text, candidates)
+            return (speaker, "router") if speaker is not None else (None, "none")
+        probabilities = self._classifier.predict_proba(selection_features(text, last_source), candidates)
+        speaker, probability = max(probabilities.items(), key=lambda item: item[1])
+        if probability >= self._confidence_threshold:
+            return speaker, "classifier"
+        return None, "none"
+
+    def learn(self, example: SelectionExample) -> None:
+        """Train on one selection and append it to the log."""
+        self._classifier.learn(example.features(), example.selected)
+        if self._log_path is not None:
+            self._log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._log_path, "a", encoding="utf-8") as log_file:
+                log_file.write(json.dumps(vars(example)) + "\n")
+
+
+@dataclass
+class _Deferral:
+    example: SelectionExample  # Label filled in once the model has chosen
+    local_choice: str | None  # Set when the deferral is an exploration audit
+    thread_length: int  # Thread length at deferral; the model's choice speaks next
+
+
+def load_selection_log(path: str | Path) -> List[SelectionExample]:
+    """Read a JSONL selection log written by LocalSpeakerSelector."""
+    with open(path, encoding="utf-8") as log_file:
+        return [SelectionExample(**json.loads(line)) for line in log_file if line.strip()]
+
+
+def _normalise(log_scores: Mapping[str, float]) -> Dict[str, float]:
+    """Softmax of log scores."""
+    if not log_scores:
+        return {}
+    peak = max(log_scores.values())
+    weights = {name: math.exp(score - peak) for name, score in log_scores.items()}
+    total = sum(weights.values())
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def selection_accuracy(selector: LocalSpeakerSelector, examples: Sequence[SelectionExample]) -> Dict[str, Any]:
+    """Coverage and agreement with the logged (model) selections, without training on them."""
+    answered = agreed = 0
+    for example in examples:
+        speaker, _ = selector.predict(example.text, example.last_source, example.candidates)
+        if speaker is not None:
+            answered += 1
+            agreed += speaker == example.selected
+    return {
+        "examples": len(examples),
+        "answered_locally": answered,
+        "calls_avoided_rate": answered / len(examples) if examples else 0.0,
+        "accuracy_when_answered": agreed / answered if answered else 0.0,
+    }
@@ -0,0 +1,424 @@
+"""
+GraphFlow with per-node timing, critical-path reporting and an optional bounded scheduler.
+
+`GraphFlow` runs every ready node at once and waits for the whole batch before starting the next
+one, so a node unblocked by a fast sibling waits for the slowest one, and wide graphs flood a shared
+(rate-limited) model client. `ScheduledGraphFlow` is a drop-in replacement that:
+
+- records per-node ready (queued), start and finish times for every run (`GraphRunProfile`),
+- reports the observed critical path against the total work,
+- with ``max_concurrency`` set, dispatches nodes as soon as a slot frees up, at most
+  ``max_concurrency`` at a time, highest remaining-path cost first, and checks the termination
+  condition on every response,
+- mirrors the thread into an `IndexedMessageLog` used by `IndexedMessageFilterAgent` participants.
+
+Remaining-path costs use ``node_costs`` when given, otherwise the mean measured durations of
+previous runs (1.0 per node before any run).
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Sequence
+
+from autogen_agentchat.base import ChatAgent, TerminationCondition
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, MessageFactory
+from autogen_agentchat.teams import DiGraph, GraphFlow
+from autogen_core import MessageContext, event
+from typing_extensions import Self
+
+from src.agents.indexed_filter_agent import IndexedMessageLog, attach_message_log
+from src.utils.autogen_internals import AgentResponse, GraphFlowConfig, GraphFlowManagerAdapter, response_messages
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NODE_COST = 1.0  # Remaining-path weight of a node with no estimate or measurement
+
+
+@dataclass
+class NodeTiming:
+    """One execution of a graph node (cyclic graphs may run a node several times)."""
+
+    node: str
+    ready_at: float
+    triggered_by: List[int] = field(default_factory=list)  # Executions whose outputs made this node ready
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def queue_seconds(self) -> float:
+        """Time between becoming ready and being dispatched."""
+        return (self.started_at or self.ready_at) - self.ready_at
+
+    @property
+    def run_seconds(self) -> float:
+        """Time between dispatch and the node's response."""
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+
+@dataclass
+class GraphRunProfile:
+    """Node timings of one GraphFlow run and the derived critical-path statistics."""
+
+    timings: List[NodeTiming] = field(default_factory=list)
+    max_concurrency: int | None = None
+
+    @property
+    def total_work_seconds(self) -> float:
+        """Sum of node run times (the run time with no parallelism at all)."""
+        return sum(timing.run_seconds for timing in self.timings)
+
+    @property
+    def wall_clock_seconds(self) -> float:
+        """Time from the first node becoming ready to the last node finishing."""
+        finished = [timing.finished_at for timing in self.timings if timing.finished_at is not None]
+        if not finished:
+            return 0.0
+        return max(finished) - min(timing.ready_at for timing in self.timings)
+
+    def critical_path(self) -> tuple[List[str], float]:
+        """Longest chain of executions through their triggering inputs, by summed queue and run time.
+
+        Each execution extends the longest chain among its inputs (for a join, all of its parents),
+        so the path ends at the node that finished last and its length includes the time nodes
+        waited for a free slot.
+        """
+        cost: List[float] = []
+        parents: List[int | None] = []
+        for timing in self.timings:  # Triggering executions always precede the ones they trigger.
+            parent = max(timing.triggered_by, key=cost.__getitem__, default=None)
+            parents.append(parent)
+            upstream = cost[parent] if parent is not None else 0.0
+            cost.append(upstream + timing.queue_seconds + timing.run_seconds)
+        if not cost:
+            return [], 0.0
+        index: int | None = max(range(len(cost)), key=cost.__getitem__)
+        length = cost[index]
+        path: List[str] = []
+        while index is not None:
+            path.append(self.timings[index].node)
+            index = parents[index]
+        return path[::-1], length
+
+    def summary(self) -> Dict[str, Any]:
+        """Report dict: per-node times relative to the run start, critical path vs total work."""
+        path, path_seconds = self.critical_path()
+        origin = min((timing.ready_at for timing in self.timings), default=0.0)
+        work = self.total_work_seconds
+        return {
+            "max_concurrency": self.max_concurrency,
+            "wall_clock_seconds": self.wall_clock_seconds,
+            "total_work_seconds": work,
+            "critical_path": path,
+            "critical_path_seconds": path_seconds,
+            "parallelism": work / path_seconds if path_seconds else 0.0,
+            "nodes": [
+                {
+                    "node": timing.node,
+                    "ready": timing.ready_at - origin,
+                    "start": (timing.started_at or timing.ready_at) - origin,
+                    "finish": (timing.finished_at - origin) if timing.finished_at is not None else None,
+                    "queue_seconds": timing.queue_seconds,
+                    "run_seconds": timing.run_seconds,
+                }
+                for timing in self.timings
+            ],
+        }
+
+    def mean_run_seconds(self) -> Dict[str, float]:
+        """Mean run time per node in this run."""
+        totals: Dict[str, List[float]] = {}
+        for timing in self.timings:
+            if timing.finished_at is not None:
+                totals.setdefault(timing.node, []).append(timing.run_seconds)
+        return {node: sum(runs) / len(runs) for node, runs in totals.items()}
+
+
+def remaining_path_costs(graph: DiGraph, node_costs: Mapping[str, float]) -> Dict[str, float]:
+    """Cost of the longest path from each node to a leaf, including the node itself.
+
+    Back edges of cycles are ignored, so loops count once.
+    """
+    costs: Dict[str, float] = {}
+    on_stack: set[str] = set()
+
+    def visit(node: str) -> float:
+        if node in costs:
+            return costs[node]
+        on_stack.add(node)
+        downstream = [visit(edge.target) for edge in graph.nodes[node].edges if edge.target not in on_stack]
+        on_stack.discard(node)
+        costs[node] = node_costs.get(node, DEFAULT_NODE_COST) + max(downstream, default=0.0)
+        return costs[node]
+
+    for name in graph.nodes:
+        visit(name)
+    return costs
+
+
+class ScheduledGraphFlowManager(GraphFlowManagerAdapter):
+    """GraphFlowManager that profiles node executions and optionally schedules them.
+
+    Without ``max_concurrency``, batches are selected exactly as by GraphFlowManager. With it, the
+    manager also dispatches newly ready nodes while other nodes are still running, so that up to
+    ``max_concurrency`` nodes run at any time, picking the highest remaining-path cost first. The
+    termination condition then sees every response as it arrives (``max_turns`` counts responses);
+    replies of nodes still running when the run stops are kept, and their successors run next time.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        max_concurrency: int | None,
+        priorities: Callable[[], Mapping[str, float]],
+        on_run_start: Callable[[], GraphRunProfile],
+        message_log: IndexedMessageLog | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._message_log = message_log
+        self._max_concurrency = max_concurrency
+        self._priorities = priorities
+        self._on_run_start = on_run_start
+        self._profile = GraphRunProfile(max_concurrency=max_concurrency)
+        self._open: Dict[str, int] = {}  # Node -> index of its ready or running execution
+        self._inputs: Dict[str, List[int]] = {}  # Node -> finished executions whose output it received
+        self._stopped = False  # The run was terminated while nodes were still running
+
+    async def validate_group_state(self, messages: List[BaseChatMessage] | None) -> None:
+        await super().validate_group_state(messages)
+        self._profile = self._on_run_start()
+        self._open = {}
+        self._inputs = {}
+        self._stopped = False
+        self._mark_ready(self.ready_nodes)
+
+    @event
+    async def handle_agent_response(self, message: AgentResponse, ctx: MessageContext) -> None:
+        """With ``max_concurrency``, check termination and refill free slots on every response."""
+        if self._max_concurrency is None:
+            await super().handle_agent_response(message, ctx)
+            return
+        try:
+            delta = response_messages(message)
+            await self.update_message_thread(delta)
+            self.finish_node(message.name)
+            if self._stopped or await self._terminates(delta):
+                self._stopped = True
+                return
+            await self._dispatch(self._max_concurrency - len(self.running_nodes))
+        except Exception as e:
+            await self.signal_error(e)
+            raise
+
+    async def update_message_thread(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> None:
+        if self._message_log is not None:
+            self._message_log.extend(messages)
+        already_ready = set(self.ready_nodes)
+        await super().update_message_thread(messages)
+        reply = messages[-1] if messages else None
+        if not isinstance(reply, BaseChatMessage) or reply.source not in self._graph.nodes:
+            return
+        finished = self._open.pop(reply.source, None)
+        if finished is not None:
+            self._profile.timings[finished].finished_at = time.perf_counter()
+            for edge in self.out_edges(reply.source):
+                if edge.check_condition(reply):
+                    self._inputs.setdefault(edge.target, []).append(finished)
+        self._mark_ready([node for node in self.ready_nodes if node not in already_ready])
+
+    async def select_speaker(self, thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> List[str]:
+        if self._max_concurrency is None:
+            speakers = await super().select_speaker(thread)
+            self._mark_started(speakers)
+        else:
+            speakers = self._take(self._max_concurrency)
+        await self._on_dispatch(speakers)
+        return speakers
+
+    async def reset(self) -> None:
+        await super().reset()
+        if self._message_log is not None:
+            self._message_log.clear()
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        await super().load_state(state)
+        if self._message_log is not None:
+            self._message_log.clear()
+            self._message_log.extend(self._message_thread)
+
+    async def _on_dispatch(self, speakers: List[str]) -> None:
+        """Called with the nodes about to be asked for a reply; a hook for subclasses."""
+
+    async def _terminates(self, delta: Sequence[BaseAgentEvent | BaseChatMessage]) -> bool:
+        """Apply the termination condition to one response; the graph can only be complete once idle."""
+        if self.running_nodes:
+            return await self.apply_team_termination(delta)
+        return await self._apply_termination_condition(delta, increment_turn_count=True)
+
+    async def _dispatch(self, slots: int) -> None:
+        """Request replies from up to `slots` ready nodes without waiting for the running ones."""
+        speakers = self._take(slots)
+        if not speakers:
+            return
+        await self._on_dispatch(speakers)
+        await self.request_replies(speakers)
+
+    def _take(self, slots: int) -> List[str]:
+        """Remove and return up to `slots` ready, idle nodes, highest remaining-path cost first."""
+        if slots <= 0 or not self.ready_nodes:
+            return []
+        priorities = self._priorities()
+        candidates = [node for node in dict.fromkeys(self.ready_nodes) if node not in self.running_nodes]
+        chosen = sorted(candidates, key=lambda node: -priorities.get(node, DEFAULT_NODE_COST))[:slots]
+        for node in chosen:
+            self.take_ready(node)
+        self._mark_started(chosen)
+        return chosen
+
+    def _mark_ready(self, nodes: Sequence[str]) -> None:
+        now = time.perf_counter()
+        for node in nodes:
+            if node not in self._open:
+                self._open[node] = len(self._profile.timings)
+                self._profile.timings.append(NodeTiming(node=node, ready_at=now, triggered_by=self._inputs.pop(node, [])))
+
+    def _mark_started(self, nodes: Sequence[str]) -> None:
+        now = time.perf_counter()
+        for node in nodes:
+            if node not in self._open:
+                self._mark_ready([node])
+            self._profile.timings[self._open[node]].started_at = now
+
+
+class ScheduledGraphFlowConfig(GraphFlowConfig):
+    """The declarative configuration for ScheduledGraphFlow."""
+
+    max_concurrency: int | None = None
+    node_costs: Dict[str, float] | None = None
+
+
+class ScheduledGraphFlow(GraphFlow):
+    """GraphFlow that profiles each run and can bound and prioritise node execution.
+
+    Example:
+
+        .. code-block:: python
+
+            flow = ScheduledGraphFlow(participants=builder.get_participants(), graph=graph, max_concurrency=4)
+            await Console(flow.run_stream(task="..."))
+            print(flow.last_profile.summary())
+
+    Args:
+        participants: The participants of the flow.
+        graph: The execution graph.
+        max_concurrency: Maximum number of nodes running at once; None keeps GraphFlow's batches.
+        node_costs: Estimated cost per node for prioritisation; defaults to measured mean run times.
+        **kwargs: Forwarded to GraphFlow (name, description, termination_condition, max_turns, runtime, ...).
+    """
+
+    component_config_schema = ScheduledGraphFlowConfig
+    component_provider_override = "src.teams.scheduled_graph_flow.ScheduledGraphFlow"
+    manager_class: type[ScheduledGraphFlowManager] = ScheduledGraphFlowManager
+
+    def __init__(
+        self,
+        participants: List[ChatAgent],
+        graph: DiGraph,
+        *,
+        max_concurrency: int | None = None,
+        node_costs: Dict[str, float] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError("max_concurrency must be greater than 0.")
+        super().__init__(participants, graph, **kwargs)
+        self._max_concurrency = max_concurrency
+        self._node_costs = node_costs
+        self._measured_costs: Dict[str, float] = {}
+        self._priority_costs = remaining_path_costs(graph, node_costs or {})
+        self.profiles: List[GraphRunProfile] = []
+        message_log = IndexedMessageLog()  # Only kept when an IndexedMessageFilterAgent uses it
+        self._message_log = message_log if attach_message_log(participants, message_log) else None
+
+    @property
+    def last_profile(self) -> GraphRunProfile | None:
+        """Profile of the most recent run."""
+        return self.profiles[-1] if self.profiles else None
+
+    def _start_profile(self) -> GraphRunProfile:
+        """Fold the previous run's measurements into the priorities and open a new profile."""
+        if self.profiles:
+            self._measured_costs.update(self.profiles[-1].mean_run_seconds())
+            if self._node_costs is None:
+                self._priority_costs = remaining_path_costs(self._graph, self._measured_costs)
+        self.profiles.append(GraphRunProfile(max_concurrency=self._max_concurrency))
+        return self.profiles[-1]
+
+    def _priorities(self) -> Mapping[str, float]:
+        return self._priority_costs
+
+    def _manager_options(self) -> Dict[str, Any]:
+        """Keyword arguments for the manager beyond GraphFlowManager's; extended by subclasses."""
+        return {
+            "max_concurrency": self._max_concurrency,
+            "priorities": self._priorities,
+            "on_run_start": self._start_profile,
+            "message_log": self._message_log,
+        }
+
+    def _create_group_chat_manager_factory(
+        self,
+        name: str,
+        group_topic_type: str,
+        output_topic_type: str,
+        participant_topic_types: List[str],
+        participant_names: List[str],
+        participant_descriptions: List[str],
+        output_message_queue: Any,
+        termination_condition: TerminationCondition | None,
+        max_turns: int | None,
+        message_factory: MessageFactory,
+    ) -> Callable[[], ScheduledGraphFlowManager]:
+        def _factory() -> ScheduledGraphFlowManager:
+            return self.manager_class(
+                name=name,
+                group_topic_type=group_topic_type,
+                output_topic_type=output_topic_type,
+                participant_topic_types=participant_topic_types,
+                participant_names=participant_names,
+                participant_descriptions=participant_descriptions,
+                output_message_queue=output_message_queue,
+                termination_condition=termination_condition,
+                max_turns=max_turns,
+                message_factory=message_factory,
+                graph=self._graph,
+                **self._manager_options(),
+            )
+
+        return _factory
+
+    def _to_config(self) -> ScheduledGraphFlowConfig:
+        return ScheduledGraphFlowConfig(
+            **super()._to_config().model_dump(), max_concurrency=self._max_concurrency, node_costs=self._node_costs
+        )
+
+    @classmethod
+    def _from_config(cls, config: ScheduledGraphFlowConfig) -> Self:
+        participants = [ChatAgent.load_component(participant) for participant in config.participants]
+        termination_condition = (
+            TerminationCondition.load_component(config.termination_condition) if config.termination_condition else None
+        )
+        return cls(
+            participants,
+            graph=config.graph,
+            name=config.name,
+            description=config.description,
+            termination_condition=termination_condition,
+            max_turns=config.max_turns,
+            max_concurrency=config.max_concurrency,
+            node_costs=config.node_costs,
+        )
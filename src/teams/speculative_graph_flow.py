@@ -0,0 +1,230 @@
+"""
+GraphFlow that starts conditional branches before the deciding node has finished.
+
+In a conditional graph (e.g. reviewer -> summary on "APPROVE", reviewer -> generator otherwise) the
+branch only starts after the decider's full reply has been checked against the edge conditions.
+`SpeculativeGraphFlow` predicts the decider's reply from its streamed prefix (predictors are also
+asked at dispatch time with an empty prefix, which `likely_replies` never acts on), evaluates the
+edge conditions on each predicted reply, and starts the implied branch nodes right away through
+`SpeculativeAgent`.
+
+A speculative run is kept only if the branch is taken and its real input equals the predicted one,
+so results are identical to GraphFlow's; losing runs are cancelled as soon as the prefix
+contradicts their prediction or the decider's reply selects other branches. `speculation_report()`
+aggregates hits, latency saved and tokens wasted; `src.benchmarks.speculation_benchmark` measures
+both against plain execution.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from autogen_agentchat.agents import MessageFilterAgent
+from autogen_agentchat.base import ChatAgent
+from autogen_agentchat.messages import (
+    BaseAgentEvent,
+    BaseChatMessage,
+    ModelClientStreamingChunkEvent,
+    TextMessage,
+)
+from autogen_agentchat.teams import DiGraph
+from autogen_core import MessageContext, event
+
+from src.agents.speculative_agent import SpeculationStats, SpeculativeAgent
+from src.teams.scheduled_graph_flow import ScheduledGraphFlow, ScheduledGraphFlowManager
+from src.utils.autogen_internals import GroupChatMessage, filtered_input, wrapped_agent
+
+logger = logging.getLogger(__name__)
+
+InputTransform = Callable[[Sequence[BaseChatMessage]], Sequence[BaseChatMessage]]
+
+DEFAULT_MIN_PREFIX = 3  # Streamed characters before a fixed reply is predicted; "A" could begin anything
+
+
+@dataclass(frozen=True)
+class BranchSpeculation:
+    """How to predict a decider node's reply.
+
+    Args:
+        decider: Name of the node whose reply selects the branch.
+        predict: Maps the decider's reply text so far ("" when it is dispatched, then its streamed
+            prefix) to the full replies considered likely. Each prediction starts the branch it implies.
+    """
+
+    decider: str
+    predict: Callable[[str], Sequence[str]]
+
+
+def likely_replies(*replies: str, min_prefix: int = DEFAULT_MIN_PREFIX) -> Callable[[str], Sequence[str]]:
+    """Predictor for deciders with a few fixed replies (e.g. "APPROVE"): those the streamed prefix starts.
+
+    Nothing is predicted before the decider has streamed `min_prefix` non-blank characters, so a
+    decider that has not said anything yet does not start its branches.
+    """
+
+    def predict(prefix: str) -> Sequence[str]:
+        text = prefix.lstrip()
+        if len(text) < max(min_prefix, 1):
+            return []
+        return [reply for reply in replies if reply.startswith(text)]
+
+    return predict
+
+
+def speculative_target(agent: ChatAgent) -> Tuple[SpeculativeAgent, InputTransform] | None:
+    """The SpeculativeAgent behind a participant and how the participant transforms its input."""
+    if isinstance(agent, SpeculativeAgent):
+        return agent, list
+    inner = wrapped_agent(agent)
+    if isinstance(agent, MessageFilterAgent) and isinstance(inner, SpeculativeAgent):
+        return inner, lambda messages: filtered_input(agent, messages)
+    return None
+
+
+class SpeculativeGraphFlowManager(ScheduledGraphFlowManager):
+    """ScheduledGraphFlowManager that runs predicted branches of decider nodes early."""
+
+    def __init__(
+        self,
+        *args: Any,
+        speculations: Dict[str, BranchSpeculation],
+        targets: Dict[str, Tuple[SpeculativeAgent, InputTransform]],
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._speculations = speculations
+        self._targets = targets
+        self._prefixes: Dict[str, str] = {}  # Decider -> streamed reply text so far
+        self._predicted: Dict[str, str] = {}  # Speculating target -> predicted decider reply
+
+    async def _on_dispatch(self, speakers: List[str]) -> None:
+        await super()._on_dispatch(speakers)
+        for speaker in speakers:
+            if speaker in self._speculations:
+                self._prefixes[speaker] = ""
+                await self._speculate(speaker)
+
+    @event
+    async def handle_group_chat_message(self, message: GroupChatMessage, ctx: MessageContext) -> None:
+        """Relay output as usual, and follow the streamed prefixes of running deciders."""
+        await super().handle_group_chat_message(message, ctx)
+        chunk = message.message
+        if isinstance(chunk, ModelClientStreamingChunkEvent) and chunk.source in self._prefixes:
+            self._prefixes[chunk.source] += chunk.content
+            await self._speculate(chunk.source)
+
+    async def update_message_thread(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> None:
+        decider = messages[-1].source if messages else None
+        await super().update_message_thread(messages)
+        if decider not in self._prefixes:
+            return
+        del self._prefixes[decider]
+        reply = messages[-1]
+        assert isinstance(reply, BaseChatMessage)
+        taken = {edge.target for edge in self.out_edges(decider) if edge.check_condition(reply)}
+        # Branches the real reply did not select are losers; taken ones are validated on their turn.
+        for target in [target for target in self._predicted if target not in taken]:
+            await self._cancel(target)
+
+    async def _speculate(self, decider: str) -> None:
+        """Cancel speculations the prefix contradicts, then start the branches of new predictions."""
+        prefix = self._prefixes[decider]
+        predictions = list(self._speculations[decider].predict(prefix))
+        for target, predicted in list(self._predicted.items()):
+            if target in self._branch_targets(decider) and predicted not in predictions:
+                await self._cancel(target)
+        for predicted in predictions:
+            reply = TextMessage(content=predicted, source=decider)
+            for edge in self.out_edges(decider):
+                if edge.target in self._predicted or edge.target not in self._targets:
+                    continue
+                if not edge.check_condition(reply):
+                    continue
+                agent, transform = self._targets[edge.target]
+                if await agent.speculate(transform(self._pending_input(edge.target) + [reply])):
+                    self._predicted[edge.target] = predicted
+                    logger.debug(f"Speculating {edge.target} on {decider} replying {predicted!r}")
+
+    async def _cancel(self, target: str) -> None:
+        self._predicted.pop(target, None)
+        await self._targets[target][0].cancel_speculation()
+
+    def _branch_targets(self, decider: str) -> set[str]:
+        return {edge.target for edge in self.out_edges(decider)}
+
+    def _pending_input(self, target: str) -> List[BaseChatMessage]:
+        """The chat messages `target` has not seen yet: everything after its last reply."""
+        pending: List[BaseChatMessage] = []
+        for message in reversed(self._message_thread):
+            if message.source == target:
+                break
+            if isinstance(message, BaseChatMessage):
+                pending.append(message)
+        return pending[::-1]
+
+    async def validate_group_state(self, messages: List[BaseChatMessage] | None) -> None:
+        await super().validate_group_state(messages)
+        self._prefixes.clear()
+        self._predicted.clear()
+
+
+class SpeculativeGraphFlow(ScheduledGraphFlow):
+    """ScheduledGraphFlow with opt-in speculative execution of conditional branches.
+
+    Branch nodes to run speculatively must be wrapped in :class:`SpeculativeAgent` (inside a
+    MessageFilterAgent, if they use one). Deciders should stream (``model_client_stream=True``) for
+    prefix-based predictions; without streaming only the dispatch-time prediction is used.
+
+    Example:
+
+        .. code-block:: python
+
+            summary = MessageFilterAgent("summary", wrapped_agent=SpeculativeAgent(summary_core), filter=...)
+            flow = SpeculativeGraphFlow(
+                participants=builder.get_participants(),
+                graph=builder.build(),
+                speculations=[BranchSpeculation("reviewer", likely_replies("APPROVE"))],
+            )
+
+    Args:
+        participants: The participants of the flow.
+        graph: The execution graph.
+        speculations: Which deciders to speculate on and how to predict their replies.
+        **kwargs: Forwarded to ScheduledGraphFlow (max_concurrency, termination_condition, ...).
+    """
+
+    component_provider_override = "src.teams.speculative_graph_flow.SpeculativeGraphFlow"
+    manager_class = SpeculativeGraphFlowManager
+
+    def __init__(
+        self,
+        participants: List[ChatAgent],
+        graph: DiGraph,
+        *,
+        speculations: Sequence[BranchSpeculation] = (),
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(participants, graph, **kwargs)
+        self._branch_speculations = {speculation.decider: speculation for speculation in speculations}
+        self._speculative_targets: Dict[str, Tuple[SpeculativeAgent, InputTransform]] = {}
+        for participant in participants:
+            target = speculative_target(participant)
+            if target is not None:
+                self._speculative_targets[participant.name] = target
+
+    def speculation_report(self) -> Dict[str, Any]:
+        """Speculation outcomes per branch node and in total."""
+        per_node = {name: vars(agent.stats).copy() for name, (agent, _) in self._speculative_targets.items()}
+        total = SpeculationStats()
+        for stats in per_node.values():
+            for key, value in stats.items():
+                setattr(total, key, getattr(total, key) + value)
+        return {"nodes": per_node, "total": vars(total)}
+
+    def _manager_options(self) -> Dict[str, Any]:
+        return {
+            **super()._manager_options(),
+            "speculations": self._branch_speculations,
+            "targets": self._speculative_targets,
+        }
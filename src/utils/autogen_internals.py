@@ -0,0 +1,131 @@
+"""
+The one place that reaches into AutoGen's private modules and attributes.
+
+The scheduled, speculative and fan-out teams subclass AutoGen's group chat managers, and the
+filter-aware wrappers look inside MessageFilterAgent; neither has a public extension point for
+that. Every such access goes through this module, so an AutoGen upgrade only needs checking here
+(plus IndexedMessageFilterAgent's override of ``MessageFilterAgent._apply_filter``, which has to
+live on the subclass).
+It is written against the autogen-agentchat version pinned in requirements.txt and logs a warning
+when a different one is installed.
+
+This module provides:
+- GraphFlowManagerAdapter: GraphFlowManager with accessors for its ready queue, running nodes and edges.
+- SwarmManagerAdapter: SwarmGroupChatManager with an accessor for the current speaker.
+- wrapped_agent / filtered_input: What a MessageFilterAgent (or one of our wrappers) wraps and passes on.
+- response_messages: The messages an agent or team response adds to the group chat thread.
+"""
+from __future__ import annotations
+
+import logging
+from typing import List, Sequence
+
+import autogen_agentchat
+from autogen_agentchat.agents import MessageFilterAgent
+from autogen_agentchat.base import ChatAgent
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, SelectSpeakerEvent
+from autogen_agentchat.teams import DiGraphEdge
+from autogen_agentchat.teams._group_chat._base_group_chat_manager import BaseGroupChatManager
+from autogen_agentchat.teams._group_chat._events import (
+    GroupChatAgentResponse,
+    GroupChatMessage,
+    GroupChatRequestPublish,
+    GroupChatTeamResponse,
+    SerializableException,
+)
+from autogen_agentchat.teams._group_chat._graph._digraph_group_chat import GraphFlowConfig, GraphFlowManager
+from autogen_agentchat.teams._group_chat._swarm_group_chat import SwarmConfig, SwarmGroupChatManager
+from autogen_core import DefaultTopicId
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_AUTOGEN_VERSION = "0.7.5"  # Keep in sync with requirements.txt
+
+if autogen_agentchat.__version__ != SUPPORTED_AUTOGEN_VERSION:
+    logger.warning(
+        f"autogen-agentchat {autogen_agentchat.__version__} is installed, but the custom teams and agents "
+        f"rely on internals of {SUPPORTED_AUTOGEN_VERSION}; check src/utils/autogen_internals.py before upgrading."
+    )
+
+AgentResponse = GroupChatAgentResponse | GroupChatTeamResponse
+
+
+def wrapped_agent(agent: ChatAgent) -> ChatAgent | None:
+    """The agent inside a MessageFilterAgent, or behind a wrapper's ``wrapped_agent`` property."""
+    if isinstance(agent, MessageFilterAgent):
+        return agent._wrapped_agent
+    return getattr(agent, "wrapped_agent", None)
+
+
+def filtered_input(agent: MessageFilterAgent, messages: Sequence[BaseChatMessage]) -> Sequence[BaseChatMessage]:
+    """The messages a MessageFilterAgent passes on to its wrapped agent."""
+    return agent._apply_filter(messages)
+
+
+def response_messages(message: AgentResponse) -> List[BaseAgentEvent | BaseChatMessage]:
+    """The messages a response adds to the thread: inner messages, then the reply (or a team's result)."""
+    if isinstance(message, GroupChatTeamResponse):
+        return list(message.result.messages)
+    return [*(message.response.inner_messages or []), message.response.chat_message]
+
+
+class GraphFlowManagerAdapter(GraphFlowManager):
+    """GraphFlowManager with accessors for the execution state its subclasses schedule from."""
+
+    @property
+    def ready_nodes(self) -> Sequence[str]:
+        """Nodes whose activation conditions are met, in the order they became ready."""
+        return self._ready
+
+    @property
+    def running_nodes(self) -> Sequence[str]:
+        """Nodes asked for a reply that have not responded yet."""
+        return self._active_speakers
+
+    def out_edges(self, node: str) -> Sequence[DiGraphEdge]:
+        """The outgoing edges of `node`."""
+        return self._edges[node]
+
+    def take_ready(self, node: str) -> None:
+        """Remove `node` from the ready queue and re-arm the activation groups that triggered it."""
+        self._ready.remove(node)
+        self._reset_triggered_activation_groups(node)
+
+    def finish_node(self, node: str) -> None:
+        """Mark a running node as having responded."""
+        self._active_speakers.remove(node)
+
+    async def request_replies(self, speakers: Sequence[str]) -> None:
+        """Announce the speakers and ask each for a reply, as the base manager does for a batch."""
+        if self._emit_team_events:
+            select_event = SelectSpeakerEvent(content=list(speakers), source=self._name)
+            await self.publish_message(
+                GroupChatMessage(message=select_event), topic_id=DefaultTopicId(type=self._output_topic_type)
+            )
+            await self._output_message_queue.put(select_event)
+        for speaker in speakers:
+            await self.publish_message(
+                GroupChatRequestPublish(), topic_id=DefaultTopicId(type=self._participant_name_to_topic_type[speaker])
+            )
+            self._active_speakers.append(speaker)
+
+    async def apply_team_termination(self, delta: Sequence[BaseAgentEvent | BaseChatMessage]) -> bool:
+        """Apply the team's termination condition and max_turns, but not GraphFlow's graph-completion stop."""
+        return await BaseGroupChatManager._apply_termination_condition(self, delta, increment_turn_count=True)
+
+    async def signal_error(self, error: Exception) -> None:
+        """End the run with `error`, as the base manager does when handling a response fails."""
+        await self._signal_termination_with_error(SerializableException.from_exception(error))
+
+
+class SwarmManagerAdapter(SwarmGroupChatManager):
+    """SwarmGroupChatManager with an accessor for the agent holding the turn."""
+
+    @property
+    def current_speaker(self) -> str:
+        return self._current_speaker
+
+    @current_speaker.setter
+    def current_speaker(self, name: str) -> None:
+        self._current_speaker = name
+
@@ -0,0 +1,208 @@
+"""
+Token counting helpers shared by memories and model contexts.
+
+This module provides:
+- get_encoding: Cached tiktoken encoding lookup per model name.
+- count_text_tokens: Token count of a plain string for a given model.
+- message_text / count_message_tokens: Token count of an LLM message including per-message overhead.
+- TokenCountCache: LRU cache of per-message counts keyed on content hash and model.
+- RunningTokenTotal: Incrementally maintained token total for a growing/shrinking message list.
+
+`count_message_tokens` goes through a process-wide TokenCountCache, so re-counting an unchanged
+history costs one hash per message instead of a full re-tokenisation.
+
+tiktoken ships with autogen-ext[openai]; if it is missing (or its encoding files cannot be
+downloaded, e.g. offline), counts fall back to a characters-per-token estimate so budgeting
+still works, just less precisely.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Any, Deque, Iterable, Tuple
+
+from autogen_core import FunctionCall, Image
+from autogen_core.models import LLMMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_MODEL = "gpt-4o"  # Model whose tokenizer is used when none is given
+FALLBACK_ENCODING = "cl100k_base"  # Encoding for model names tiktoken does not know
+CHARS_PER_TOKEN_ESTIMATE = 4  # Rough English average, only used without tiktoken
+MESSAGE_OVERHEAD_TOKENS = 4  # Role/name framing tokens the chat format adds per message
+IMAGE_TOKEN_ESTIMATE = 85  # Low-detail image cost in OpenAI chat models
+DEFAULT_CACHE_ENTRIES = 50_000  # Per-message counts kept by the shared TokenCountCache
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str = DEFAULT_TOKEN_MODEL) -> Any | None:
+    """Return the tiktoken encoding for a model, or None when tiktoken is unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        encoding_name = tiktoken.encoding_name_for_model(model)
+    except KeyError:
+        encoding_name = FALLBACK_ENCODING
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:  # Encoding files are fetched on first use and may be unreachable.
+        logger.warning(f"tiktoken encoding unavailable for {model}, estimating token counts: {e}")
+        return None
+
+
+def count_text_tokens(text: str, model: str = DEFAULT_TOKEN_MODEL) -> int:
+    """Count the tokens of `text` as seen by `model`'s tokenizer.
+
+    Args:
+        text: Text to count.
+        model: Model name used to pick the tokenizer.
+
+    Returns:
+        Number of tokens (estimated when tiktoken is not installed).
+    """
+    encoding = get_encoding(model)
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN_ESTIMATE)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def message_text(message: LLMMessage) -> str:
+    """Flatten the text parts of an LLM message (text, function calls, tool results)."""
+    content = message.content
+    if isinstance(content, str):
+        return content
+    parts = []
+    for part in content:
+        if isinstance(part, str):
+            parts.append(part)
+        elif isinstance(part, FunctionCall):
+            parts.append(f"{part.name}({part.arguments})")
+        elif not isinstance(part, Image):
+            parts.append(str(getattr(part, "content", part)))
+    return "\n".join(parts)
+
+
+def count_message_tokens(message: LLMMessage, model: str = DEFAULT_TOKEN_MODEL) -> int:
+    """Approximate the prompt tokens one message contributes to a chat completion request.
+
+    Counts are memoised in the shared :data:`token_count_cache`.
+
+    Args:
+        message: The LLM message.
+        model: Model name used to pick the tokenizer.
+
+    Returns:
+        Text tokens plus per-message framing and a flat estimate per image.
+    """
+    return token_count_cache.count_message(message, model)
+
+
+def _tokenize_message(message: LLMMessage, model: str) -> int:
+    image_count = 0 if isinstance(message.content, str) else sum(isinstance(part, Image) for part in message.content)
+    return count_text_tokens(message_text(message), model) + MESSAGE_OVERHEAD_TOKENS + image_count * IMAGE_TOKEN_ESTIMATE
+
+
+class TokenCountCache:
+    """LRU cache of message token counts keyed on (model, message type, content hash).
+
+    Keys are derived from content rather than object identity, so equal messages rebuilt from
+    saved state or copied between agents share one entry. Hashing is far cheaper than tokenising.
+
+    Args:
+        max_entries: Maximum number of cached counts.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES) -> None:
+        self._max_entries = max_entries
+        self._counts: OrderedDict[Tuple[str, str, str], int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def count_message(self, message: LLMMessage, model: str = DEFAULT_TOKEN_MODEL) -> int:
+        """Return the cached token count of `message`, tokenising it on first sight."""
+        key = (model, message.type, self._digest(message))
+        cached = self._counts.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._counts.move_to_end(key)
+            return cached
+        self.misses += 1
+        count = _tokenize_message(message, model)
+        self._counts[key] = count
+        if len(self._counts) > self._max_entries:
+            self._counts.popitem(last=False)
+        return count
+
+    def clear(self) -> None:
+        """Drop all cached counts and reset statistics."""
+        self._counts.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(message: LLMMessage) -> str:
+        image_count = 0 if isinstance(message.content, str) else sum(isinstance(part, Image) for part in message.content)
+        payload = f"{image_count}\x00{message_text(message)}".encode("utf-8", "surrogatepass")
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+token_count_cache = TokenCountCache()
+"""Process-wide cache used by count_message_tokens; shared by model contexts, terminations and reports."""
+
+
+class RunningTokenTotal:
+    """Token total of an ordered message list, updated incrementally on append and eviction.
+
+    Each message is counted once when appended (via the shared cache); evicting from the front
+    subtracts its remembered count, so maintaining the total costs O(new messages) per turn.
+
+    Args:
+        model: Model name used to pick the tokenizer.
+        messages: Initial messages.
+    """
+
+    def __init__(self, model: str = DEFAULT_TOKEN_MODEL, messages: Iterable[LLMMessage] = ()) -> None:
+        self._model = model
+        self._counts: Deque[int] = deque()
+        self.total = 0
+        self.extend(messages)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def append(self, message: LLMMessage) -> int:
+        """Add a message at the end and return its token count."""
+        count = count_message_tokens(message, self._model)
+        self._counts.append(count)
+        self.total += count
+        return count
+
+    def extend(self, messages: Iterable[LLMMessage]) -> None:
+        """Append several messages."""
+        for message in messages:
+            self.append(message)
+
+    def peek_front(self, index: int = 0) -> int:
+        """Token count of the message at `index` from the front."""
+        return self._counts[index]
+
+    def pop_front(self, count: int = 1) -> int:
+        """Evict `count` messages from the front and return the tokens removed."""
+        removed = 0
+        for _ in range(count):
+            removed += self._counts.popleft()
+        self.total -= removed
+        return removed
+
+    def reset(self, messages: Iterable[LLMMessage] = ()) -> None:
+        """Replace the tracked messages."""
+        self._counts.clear()
+        self.total = 0
+        self.extend(messages)
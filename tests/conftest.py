@@ -0,0 +1,32 @@
+import asyncio
+from typing import Any, Callable, List, Sequence
+
+import pytest
+from autogen_core.models import UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+DEFAULT_CALL_SECONDS = 0.02
+
+
+class SlowReplayClient(ReplayChatCompletionClient):
+    """Replay client whose calls take a while, so concurrent calls overlap."""
+
+    def __init__(self, replies: Sequence[str], seconds: float = DEFAULT_CALL_SECONDS) -> None:
+        super().__init__(list(replies))
+        self.seconds = seconds
+
+    async def create(self, *args: Any, **kwargs: Any) -> Any:
+        await asyncio.sleep(self.seconds)
+        return await super().create(*args, **kwargs)
+
+
+@pytest.fixture
+def slow_client() -> Callable[..., SlowReplayClient]:
+    """Factory for replay clients whose calls take `seconds`."""
+    return SlowReplayClient
+
+
+@pytest.fixture
+def prompt() -> List[UserMessage]:
+    """A short single-message prompt."""
+    return [UserMessage(content="Reply briefly.", source="user")]
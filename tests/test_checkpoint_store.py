@@ -0,0 +1,114 @@
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from src.state import checkpoint_store
+from src.state.checkpoint_store import DeltaCheckpointStore
+
+
+def _message(content: str) -> Dict[str, Any]:
+    return {"type": "TextMessage", "source": "user", "content": content}
+
+
+def _state(*contents: str) -> Dict[str, Any]:
+    messages: List[Dict[str, Any]] = [_message(content) for content in contents]
+    return {"type": "TeamState", "agent_states": {"group_chat_manager": {"message_thread": messages}}}
+
+
+@pytest.mark.parametrize(
+    "second",
+    [
+        ("a", "b", "c", "d"),  # Appended
+        ("a", "X", "c", "d"),  # Middle item edited, then appended
+        ("a", "X", "c"),  # Middle item edited in place
+        ("a", "c", "b", "d"),  # Reordered
+        ("a", "b"),  # Truncated
+    ],
+)
+def test_load_returns_the_latest_saved_state(tmp_path: Path, second: tuple) -> None:
+    # Arrange
+    store = DeltaCheckpointStore(tmp_path)
+    store.save(_state("a", "b", "c"))
+
+    # Act
+    store.save(_state(*second))
+
+    # Assert
+    assert store.load() == _state(*second)
+    assert DeltaCheckpointStore(tmp_path).load() == _state(*second)
+
+
+def test_appended_messages_are_the_only_new_blobs(tmp_path: Path) -> None:
+    # Arrange
+    store = DeltaCheckpointStore(tmp_path)
+    store.save(_state("a", "b", "c"))
+
+    # Act
+    info = store.save(_state("a", "b", "c", "d"))
+
+    # Assert
+    assert info.new_messages == 1
+
+
+@pytest.mark.parametrize("deleted_before_crash", [0, 1, 2])
+def test_crash_during_compaction_leaves_a_loadable_chain(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, deleted_before_crash: int
+) -> None:
+    # Arrange
+    store = DeltaCheckpointStore(tmp_path)
+    for count in range(1, 4):
+        store.save(_state(*"abc"[:count]))
+    unlink = Path.unlink
+    deleted: List[Path] = []
+
+    def crashing_unlink(path: Path, missing_ok: bool = False) -> None:
+        if len(deleted) == deleted_before_crash:
+            raise OSError("simulated crash")
+        deleted.append(path)
+        unlink(path, missing_ok)
+
+    monkeypatch.setattr(Path, "unlink", crashing_unlink)
+
+    # Act
+    with pytest.raises(OSError, match="simulated crash"):
+        store.compact()
+
+    # Assert
+    assert DeltaCheckpointStore(tmp_path).load() == _state("a", "b", "c")
+
+
+def test_compacted_chain_keeps_accepting_deltas(tmp_path: Path) -> None:
+    # Arrange
+    store = DeltaCheckpointStore(tmp_path)
+    store.save(_state("a", "b"))
+    store.save(_state("a", "b", "c"))
+    store.compact()
+
+    # Act
+    store.save(_state("a", "b", "c", "d"))
+
+    # Assert
+    assert store.checkpoint_count == 2
+    assert DeltaCheckpointStore(tmp_path).load() == _state("a", "b", "c", "d")
+
+
+@pytest.mark.parametrize("history, reopen", [(10, False), (200, False), (200, True)])
+def test_save_after_appends_only_hashes_the_new_messages(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, history: int, reopen: bool
+) -> None:
+    # Arrange
+    contents = [f"message {i}" for i in range(history)]
+    store = DeltaCheckpointStore(tmp_path)
+    store.save(_state(*contents))
+    if reopen:
+        store = DeltaCheckpointStore(tmp_path)  # Resumes from the files, as after a restart
+    hashed: List[Dict[str, Any]] = []
+    digest = checkpoint_store._digest
+    monkeypatch.setattr(checkpoint_store, "_digest", lambda message: hashed.append(message) or digest(message))
+
+    # Act
+    store.save(_state(*contents, "new 1", "new 2"))
+
+    # Assert
+    assert [message["content"] for message in hashed] == ["new 1", "new 2"]
@@ -0,0 +1,170 @@
+import asyncio
+import threading
+from typing import Any, Iterator, List, Mapping
+
+import pytest
+from autogen_core.models import ChatCompletionClient, UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from src.benchmarks.stand_in_api import StandInAPI
+from src.models.client_registry import ModelClientRegistry, SharedChatCompletionClient
+
+MODEL = "gpt-4o-mini"
+
+
+class ClosableReplayClient(ReplayChatCompletionClient):
+    """Replay client that records whether it was closed."""
+
+    def __init__(self) -> None:
+        super().__init__(["ok"] * 10)
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class ReplayRegistry(ModelClientRegistry):
+    """Registry that shares replay clients instead of OpenAI clients."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.created: List[ClosableReplayClient] = []
+
+    def _create_client(self, model: str, config: Mapping[str, Any]) -> ChatCompletionClient:
+        self.created.append(ClosableReplayClient())
+        return self.created[-1]
+
+
+@pytest.fixture
+def registry() -> ReplayRegistry:
+    return ReplayRegistry()
+
+
+@pytest.fixture
+def stand_in() -> Iterator[StandInAPI]:
+    """A stand-in API served from its own thread, so it outlives the event loops of a test."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    api = StandInAPI()
+    asyncio.run_coroutine_threadsafe(api.start(), loop).result()
+    yield api
+    asyncio.run_coroutine_threadsafe(api.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_leases_of_one_config_share_a_client_and_are_counted(
+    registry: ReplayRegistry, prompt: List[UserMessage]
+) -> None:
+    # Arrange
+    first, second = registry.get(MODEL), registry.get(MODEL)
+    other = registry.get(MODEL, temperature=0.0)
+
+    # Act
+    await first.create(prompt)
+
+    # Assert
+    assert first.wrapped_client is second.wrapped_client is not other.wrapped_client
+    assert sorted(registry.leases().values()) == [1, 2]
+    assert (registry.stats["created"], registry.stats["reused"]) == (2, 1)
+    assert first.total_usage().completion_tokens > 0 and second.total_usage().completion_tokens == 0
+
+
+@pytest.mark.asyncio
+async def test_closing_a_lease_releases_it_once_and_keeps_the_client_open(
+    registry: ReplayRegistry, prompt: List[UserMessage]
+) -> None:
+    # Arrange
+    first, second = registry.get(MODEL), registry.get(MODEL)
+
+    # Act
+    await first.close()
+    await first.close()
+    result = await second.create(prompt)
+
+    # Assert
+    assert list(registry.leases().values()) == [1]
+    assert result.content == "ok"
+    assert not registry.created[0].closed
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_the_shared_clients(registry: ReplayRegistry) -> None:
+    # Arrange
+    registry.get(MODEL)
+
+    # Act
+    await registry.aclose()
+
+    # Assert
+    assert registry.created[0].closed
+    assert registry.leases() == {}
+
+
+def test_clients_of_a_finished_event_loop_are_dropped_and_closed(registry: ReplayRegistry) -> None:
+    # Arrange
+    async def lease() -> SharedChatCompletionClient:
+        return registry.get(MODEL)
+
+    old_lease = asyncio.run(lease())
+
+    async def lease_and_close() -> SharedChatCompletionClient:
+        new_lease = registry.get(MODEL)
+        await registry.aclose()
+        return new_lease
+
+    # Act
+    new_lease = asyncio.run(lease_and_close())
+
+    # Assert
+    assert old_lease.wrapped_client is registry.created[0] is not new_lease.wrapped_client
+    assert registry.created[0].closed
+    assert (registry.stats["pool_resets"], registry.stats["dropped_closed"]) == (1, 1)
+
+
+def test_clients_of_a_loop_that_is_still_open_are_dropped_but_not_closed(registry: ReplayRegistry) -> None:
+    # Arrange
+    other_loop = asyncio.new_event_loop()
+
+    async def lease() -> SharedChatCompletionClient:
+        return registry.get(MODEL)
+
+    other_loop.run_until_complete(lease())
+
+    # Act
+    asyncio.run(lease())
+    other_loop.close()
+
+    # Assert
+    assert len(registry.created) == 2
+    assert not registry.created[0].closed
+    assert list(registry.leases().values()) == [1]
+
+
+def test_pooled_connections_of_a_finished_loop_do_not_break_the_next_loop(
+    stand_in: StandInAPI, prompt: List[UserMessage]
+) -> None:
+    # Arrange
+    registry = ModelClientRegistry()
+
+    async def call(close_registry: bool) -> str:
+        client = registry.get(MODEL, base_url=stand_in.base_url, api_key="local")
+        result = await client.create(prompt)
+        await client.close()
+        if close_registry:
+            await registry.aclose()
+        return str(result.content)
+
+    asyncio.run(call(close_registry=False))
+    first_pool = registry._http_client
+
+    # Act
+    reply = asyncio.run(call(close_registry=True))
+
+    # Assert
+    assert reply
+    assert first_pool is not None and first_pool.is_closed
+    assert registry.stats["dropped_closed"] == 1
@@ -0,0 +1,111 @@
+from typing import List, Sequence, Tuple
+
+import pytest
+from autogen_agentchat.base import TerminationCondition
+from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
+from autogen_agentchat.messages import ModelClientStreamingChunkEvent, StopMessage, TextMessage
+
+from src.conditions.compiled_termination import compile_termination
+
+Delta = Sequence[Tuple[str, str]]  # (source, content) of each message
+
+
+def _condition() -> TerminationCondition:
+    return (
+        TextMentionTermination("TERMINATE")
+        | TextMentionTermination("APPROVE", sources=["critic"])
+        | TextMentionTermination("REJECT", sources=["critic"])
+        | MaxMessageTermination(6)
+    )
+
+
+def _summary(stop: StopMessage | None) -> Tuple[str, str] | None:
+    return None if stop is None else (stop.content, stop.source)
+
+
+def _chunk(source: str, content: str) -> ModelClientStreamingChunkEvent:
+    return ModelClientStreamingChunkEvent(source=source, content=content)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "deltas",
+    [
+        [[("user", "Write a haiku.")], [("writer", "Leaves fall")], [("critic", "More imagery.")]],
+        [[("user", "Write a haiku.")], [("writer", "Done. TERMINATE")]],
+        [[("writer", "I APPROVE of my own draft")], [("critic", "APPROVE")]],
+        [[("writer", "REJECT?"), ("critic", "REJECT it, or APPROVE and TERMINATE")]],
+        [[("user", "go")], [("writer", "one"), ("critic", "two")], [("writer", "three"), ("critic", "four")]],
+        [[("user", "go")], [("writer", "a"), ("critic", "b"), ("writer", "c"), ("critic", "d"), ("writer", "APPROVE")]],
+    ],
+    ids=["no-stop", "mention", "restricted-source", "several-mentions", "max-messages", "max-with-foreign-mention"],
+)
+async def test_compiled_condition_stops_like_the_or_combination(deltas: List[Delta]) -> None:
+    # Arrange
+    original = _condition()
+    compiled = compile_termination(_condition())
+
+    for delta in deltas:
+        messages = [TextMessage(source=source, content=content) for source, content in delta]
+
+        # Act
+        expected, actual = await original(messages), await compiled(messages)
+
+        # Assert
+        assert _summary(actual) == _summary(expected)
+        assert compiled.terminated == original.terminated
+        if original.terminated:
+            break
+
+
+@pytest.mark.asyncio
+async def test_reset_compiled_condition_stops_again() -> None:
+    # Arrange
+    compiled = compile_termination(_condition())
+    await compiled([TextMessage(source="writer", content="TERMINATE")])
+
+    # Act
+    await compiled.reset()
+    stop = await compiled([TextMessage(source="critic", content="APPROVE")])
+
+    # Assert
+    assert _summary(stop) == ("Text 'APPROVE' mentioned", "TextMentionTermination")
+
+
+@pytest.mark.parametrize(
+    "chunks, expected",
+    [
+        ([("writer", "All done, TERM"), ("writer", "INATE")], "Text 'TERMINATE' mentioned"),
+        ([("critic", "I APP"), ("critic", "ROVE")], "Text 'APPROVE' mentioned"),
+        ([("writer", "I APP"), ("writer", "ROVE")], None),
+        ([("writer", "TERM"), ("critic", "INATE")], None),
+    ],
+    ids=["split", "split-restricted-source", "other-source", "chunks-of-different-sources"],
+)
+def test_stop_word_split_across_streamed_chunks_is_found(
+    chunks: List[Tuple[str, str]], expected: str | None
+) -> None:
+    # Arrange
+    compiled = compile_termination(_condition())
+
+    # Act
+    stops = [compiled.scan_chunk(_chunk(source, content)) for source, content in chunks]
+
+    # Assert
+    assert stops[0] is None
+    assert (stops[-1].content if stops[-1] is not None else None) == expected
+
+
+@pytest.mark.asyncio
+async def test_mention_found_in_a_stream_stops_the_next_evaluation() -> None:
+    # Arrange
+    compiled = compile_termination(_condition())
+    compiled.scan_chunk(_chunk("writer", "TERMIN"))
+    compiled.scan_chunk(_chunk("writer", "ATE"))
+
+    # Act
+    stop = await compiled([TextMessage(source="writer", content="partial reply")])
+
+    # Assert
+    assert _summary(stop) == ("Text 'TERMINATE' mentioned", "TextMentionTermination")
+    assert compiled.terminated
@@ -0,0 +1,68 @@
+import pytest
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.conditions import MaxMessageTermination
+from autogen_agentchat.messages import TextMessage
+from autogen_agentchat.teams import DiGraphBuilder, GraphFlow, RoundRobinGroupChat
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from src.conditions.convergence_termination import ConvergenceTermination, ConvergenceTracker
+
+DRAFT = " ".join(f"idea{i} reduce plastic waste by reusing containers" for i in range(5))
+
+
+@pytest.mark.asyncio
+async def test_changes_survive_the_reset_a_team_makes_when_the_condition_fires() -> None:
+    # Arrange
+    condition = ConvergenceTermination(threshold=0.1, sources=["writer"])
+    writer = AssistantAgent("writer", model_client=ReplayChatCompletionClient([DRAFT] * 4))
+    team = RoundRobinGroupChat([writer], termination_condition=condition | MaxMessageTermination(10))
+
+    # Act
+    await team.run(task="Write ideas.")
+
+    # Assert
+    assert condition.changes == {"writer": [0.0]}
+
+
+@pytest.mark.asyncio
+async def test_changes_are_cleared_when_the_next_run_starts() -> None:
+    # Arrange
+    condition = ConvergenceTermination(threshold=0.1)
+    await condition([TextMessage(content=DRAFT, source="writer"), TextMessage(content=DRAFT, source="writer")])
+    await condition.reset()
+
+    # Act
+    await condition([TextMessage(content="Write ideas.", source="user")])
+
+    # Assert
+    assert condition.changes == {}
+
+
+def _review_flow(second_draft: str, converged: ConvergenceTracker) -> GraphFlow:
+    """generator -> reviewer -> generator loop that leaves to the summary on convergence or approval."""
+    generator = AssistantAgent("generator", model_client=ReplayChatCompletionClient([DRAFT, second_draft, DRAFT]))
+    reviewer = AssistantAgent("reviewer", model_client=ReplayChatCompletionClient(["Add more ideas."] * 3))
+    summary = AssistantAgent("summary", model_client=ReplayChatCompletionClient(["Summary."]))
+    builder = DiGraphBuilder()
+    builder.add_node(generator).add_node(reviewer).add_node(summary)
+    builder.add_edge(generator, reviewer, condition=lambda message: not converged(message))
+    builder.add_edge(generator, summary, condition=converged, activation_condition="any")
+    builder.add_edge(reviewer, summary, condition="APPROVE", activation_condition="any")
+    builder.add_edge(reviewer, generator, condition=lambda message: "APPROVE" not in message.to_model_text())
+    builder.set_entry_point(generator)
+    return GraphFlow(builder.get_participants(), graph=builder.build(), termination_condition=MaxMessageTermination(6))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("second_draft, expected_next", [(DRAFT, "summary"), ("A completely different list " * 5, "reviewer")])
+async def test_tracker_routes_a_converged_draft_to_the_summary(second_draft: str, expected_next: str) -> None:
+    # Arrange
+    flow = _review_flow(second_draft, ConvergenceTracker(threshold=0.1))
+
+    # Act
+    result = await flow.run(task="Brainstorm ways to reduce plastic waste.")
+
+    # Assert
+    sources = [message.source for message in result.messages]
+    assert sources[:4] == ["user", "generator", "reviewer", "generator"]
+    assert sources[4] == expected_next
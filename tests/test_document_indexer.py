@@ -0,0 +1,49 @@
+import logging
+from pathlib import Path
+
+import pytest
+from autogen_core.memory import ListMemory, MemoryContent
+
+from src.memory.document_indexer import SimpleDocumentIndexer
+
+
+class FailingMemory(ListMemory):
+    """Memory whose writes fail, like an unreachable vector store."""
+
+    async def add(self, content: MemoryContent, cancellation_token=None) -> None:
+        raise RuntimeError("store unavailable")
+
+
+@pytest.fixture
+def notes(tmp_path: Path) -> Path:
+    source = tmp_path / "notes.txt"
+    source.write_text("Plastic waste can be reduced by refill stations.", encoding="utf-8")
+    return source
+
+
+@pytest.mark.asyncio
+async def test_unreadable_sources_are_logged_and_skipped(
+    tmp_path: Path, notes: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    # Arrange
+    undecodable = tmp_path / "image.bin"
+    undecodable.write_bytes(b"\xff\xfe\xfa\x00")
+    indexer = SimpleDocumentIndexer(ListMemory(), chunk_size=20)
+    caplog.set_level(logging.ERROR, logger="src.memory.document_indexer")
+
+    # Act
+    chunks = await indexer.index_documents([str(tmp_path / "missing.txt"), str(undecodable), str(notes)])
+
+    # Assert
+    assert chunks == 3
+    assert [record.exc_info is not None for record in caplog.records] == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_memory_errors_are_not_swallowed(notes: Path) -> None:
+    # Arrange
+    indexer = SimpleDocumentIndexer(FailingMemory())
+
+    # Act / Assert
+    with pytest.raises(RuntimeError, match="store unavailable"):
+        await indexer.index_documents([str(notes)])
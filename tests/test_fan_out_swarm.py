@@ -0,0 +1,100 @@
+from typing import Callable, Dict, List, Sequence
+
+import pytest
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.conditions import TextMentionTermination
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, HandoffMessage
+from autogen_core import FunctionCall
+from autogen_core.models import CreateResult, ModelFamily, ModelInfo, RequestUsage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from src.teams.fan_out_swarm import FanOutSwarm, fan_out_handoff
+
+ANALYSTS = ["financial_analyst", "news_analyst"]
+TOOL_MODEL = ModelInfo(
+    vision=False, function_calling=True, json_output=False, family=ModelFamily.UNKNOWN, structured_output=False
+)
+FAN_OUT = CreateResult(
+    finish_reason="function_calls",
+    content=[FunctionCall(id="call-1", name="transfer_to_analysts", arguments="{}")],
+    usage=RequestUsage(prompt_tokens=0, completion_tokens=0),
+    cached=False,
+)
+
+ClientFactory = Callable[..., ReplayChatCompletionClient]
+
+
+def _team(
+    planner_client: ReplayChatCompletionClient,
+    slow_client: ClientFactory,
+    analyst_replies: Dict[str, str],
+    seconds: Dict[str, float],
+    stop_text: str = "TERMINATE",
+) -> FanOutSwarm:
+    planner = AssistantAgent("planner", model_client=planner_client, handoffs=[fan_out_handoff("analysts", ANALYSTS)])
+    analysts = [
+        AssistantAgent(name, model_client=slow_client([analyst_replies[name]], seconds=seconds[name]))
+        for name in ANALYSTS
+    ]
+    return FanOutSwarm(
+        [planner, *analysts], fan_out={"analysts": ANALYSTS}, termination_condition=TextMentionTermination(stop_text)
+    )
+
+
+def _speakers(messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> List[str]:
+    return [message.source for message in messages if isinstance(message, BaseChatMessage)]
+
+
+@pytest.mark.asyncio
+async def test_members_join_in_completion_order_and_control_returns_to_the_coordinator(
+    slow_client: ClientFactory,
+) -> None:
+    # Arrange
+    planner_client = ReplayChatCompletionClient([FAN_OUT, "Report written. TERMINATE"], model_info=TOOL_MODEL)
+    replies = {"financial_analyst": "Revenue grew 12%.", "news_analyst": "Launch was well received."}
+    team = _team(planner_client, slow_client, replies, seconds={"financial_analyst": 0.1, "news_analyst": 0.01})
+
+    # Act
+    result = await team.run(task="Research the company.")
+
+    # Assert
+    assert _speakers(result.messages) == ["user", "planner", "news_analyst", "financial_analyst", "planner"]
+    handoffs = [message for message in result.messages if isinstance(message, HandoffMessage)]
+    assert [(handoff.source, handoff.target) for handoff in handoffs] == [("planner", "analysts")]
+    planner_prompt = str(planner_client.create_calls[-1]["messages"])
+    assert all(reply in planner_prompt for reply in replies.values())
+
+
+@pytest.mark.asyncio
+async def test_termination_sees_every_reply_of_the_join(slow_client: ClientFactory) -> None:
+    # Arrange
+    planner_client = ReplayChatCompletionClient([FAN_OUT, "Should not run."], model_info=TOOL_MODEL)
+    replies = {"financial_analyst": "Numbers are in.", "news_analyst": "Nothing to add. DONE"}
+    team = _team(planner_client, slow_client, replies, {"financial_analyst": 0.05, "news_analyst": 0.0}, "DONE")
+
+    # Act
+    result = await team.run(task="Research the company.")
+
+    # Assert
+    assert _speakers(result.messages)[-2:] == ["news_analyst", "financial_analyst"]
+    assert result.stop_reason is not None and "DONE" in result.stop_reason
+    assert len(planner_client.create_calls) == 1
+
+
+@pytest.mark.parametrize(
+    "fan_out, error",
+    [
+        ({"planner": ANALYSTS}, "same name as a participant"),
+        ({"analysts": ["financial_analyst", "ghost"]}, "must list participants"),
+        ({"analysts": []}, "must list participants"),
+        ({"analysts": ["news_analyst", "news_analyst"]}, "twice"),
+    ],
+)
+def test_invalid_fan_out_groups_are_rejected(fan_out: Dict[str, List[str]], error: str) -> None:
+    # Arrange
+    names = ["planner", *ANALYSTS]
+    participants = [AssistantAgent(name, model_client=ReplayChatCompletionClient([])) for name in names]
+
+    # Act / Assert
+    with pytest.raises(ValueError, match=error):
+        FanOutSwarm(participants, fan_out=fan_out)
@@ -0,0 +1,124 @@
+import asyncio
+from typing import Any, AsyncGenerator, List, Sequence
+
+import pytest
+from autogen_core.models import CreateResult, RequestUsage, UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from src.models.hedged_client import HedgedChatCompletionClient
+
+HEDGE_DELAY_SECONDS = 0.02
+SLOW_SECONDS = 1.0
+
+
+class ScriptedClient(ReplayChatCompletionClient):
+    """Client whose n-th request takes `delays[n]` seconds (or raises it, for an exception).
+
+    Replies name the request that produced them; cancelled and closed requests are recorded.
+    """
+
+    def __init__(self, delays: Sequence[float | Exception]) -> None:
+        super().__init__([])
+        self.delays = list(delays)
+        self.requests = 0
+        self.cancelled: List[int] = []
+        self.closed: List[int] = []
+
+    async def _wait(self) -> int:
+        request = self.requests
+        self.requests += 1
+        delay = self.delays[request]
+        if isinstance(delay, Exception):
+            raise delay
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(request)
+            raise
+        return request
+
+    async def create(self, *args: Any, **kwargs: Any) -> Any:
+        request = await self._wait()
+        usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        return CreateResult(finish_reason="stop", content=f"reply {request}", usage=usage, cached=False)
+
+    async def create_stream(self, *args: Any, **kwargs: Any) -> AsyncGenerator[Any, None]:
+        request = self.requests
+        try:
+            await self._wait()
+            for chunk in ("chunk", f"of {request}"):
+                yield chunk
+        finally:
+            self.closed.append(request)
+
+
+def _hedged(delays: Sequence[float | Exception], **kwargs: Any) -> HedgedChatCompletionClient:
+    client = HedgedChatCompletionClient(
+        ScriptedClient(delays), min_samples=1, min_delay_seconds=HEDGE_DELAY_SECONDS, **kwargs
+    )
+    for window in client.latencies.values():
+        window.add(HEDGE_DELAY_SECONDS)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_hedge_that_answers_first_wins_and_the_straggler_is_cancelled(prompt: List[UserMessage]) -> None:
+    # Arrange
+    client = _hedged([SLOW_SECONDS, 0.0])
+
+    # Act
+    result = await asyncio.wait_for(client.create(prompt), timeout=SLOW_SECONDS / 2)
+
+    # Assert
+    assert result.content == "reply 1"
+    assert client.wrapped_client.cancelled == [0]
+    assert (client.stats["hedged"], client.stats["hedge_wins"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_a_failed_call_is_not_hedged(prompt: List[UserMessage]) -> None:
+    # Arrange
+    client = _hedged([ValueError("bad request"), 0.0])
+
+    # Act
+    with pytest.raises(ValueError, match="bad request"):
+        await client.create(prompt)
+
+    # Assert
+    assert client.wrapped_client.requests == 1
+    assert (client.stats["hedged"], client.stats["failures"]) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_hedging_stops_when_the_budget_runs_out(prompt: List[UserMessage]) -> None:
+    # Arrange
+    straggler = HEDGE_DELAY_SECONDS * 3
+    client = _hedged([straggler, 0.0, straggler, 0.0, straggler], max_extra_fraction=0.0)
+
+    # Act
+    results = [await client.create(prompt) for _ in range(3)]
+
+    # Assert
+    assert [result.content for result in results] == ["reply 1", "reply 3", "reply 4"]
+    assert (client.stats["hedged"], client.stats["budget_skips"]) == (2, 1)
+    assert client.budget.credit == 0.0
+
+
+@pytest.mark.asyncio
+async def test_stream_is_hedged_on_its_first_chunk_and_the_other_stream_is_closed(
+    prompt: List[UserMessage],
+) -> None:
+    # Arrange
+    client = _hedged([SLOW_SECONDS, 0.0])
+
+    # Act
+    chunks = await asyncio.wait_for(_collect(client.create_stream(prompt)), timeout=SLOW_SECONDS / 2)
+
+    # Assert
+    assert chunks == ["chunk", "of 1"]
+    assert sorted(client.wrapped_client.closed) == [0, 1]
+    assert client.stats["hedge_wins"] == 1
+
+
+async def _collect(stream: AsyncGenerator[Any, None]) -> List[Any]:
+    return [item async for item in stream]
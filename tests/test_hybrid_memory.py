@@ -0,0 +1,124 @@
+from typing import Any, Dict, List
+
+import pytest
+import pytest_asyncio
+from autogen_core import CancellationToken
+from autogen_core.memory import ListMemory, MemoryContent, MemoryMimeType, MemoryQueryResult
+
+from src.memory.hybrid_memory import HYBRID_ID_KEY, HybridMemory, reciprocal_rank_fusion, tokenize
+
+
+class FakeVectorMemory(ListMemory):
+    """Vector memory stand-in that returns its items in a fixed order and records query arguments."""
+
+    def __init__(self, ranking: List[str] | None = None) -> None:
+        super().__init__()
+        self.ranking = ranking
+        self.query_kwargs: List[Dict[str, Any]] = []
+
+    async def query(
+        self, query: str | MemoryContent = "", cancellation_token: CancellationToken | None = None, **kwargs: Any
+    ) -> MemoryQueryResult:
+        self.query_kwargs.append(kwargs)
+        items = self.content
+        if self.ranking is not None:
+            ranking = self.ranking
+            items = sorted((item for item in items if item.content in ranking), key=lambda item: ranking.index(item.content))
+        results = [item.model_copy(update={"metadata": {**(item.metadata or {}), "score": 0.9}}) for item in items]
+        return MemoryQueryResult(results=results)
+
+
+def _item(text: str, **metadata: Any) -> MemoryContent:
+    return MemoryContent(content=text, mime_type=MemoryMimeType.TEXT, metadata=metadata or None)
+
+
+@pytest.fixture
+def vector() -> FakeVectorMemory:
+    return FakeVectorMemory(ranking=["Weather forecasts use Celsius", "Call get_stock_data for prices"])
+
+
+@pytest_asyncio.fixture
+async def memory(vector: FakeVectorMemory) -> HybridMemory:
+    hybrid = HybridMemory(vector_memory=vector, k=3)
+    await hybrid.add(_item("Call get_stock_data for prices", source="api.md"))
+    await hybrid.add(_item("Weather forecasts use Celsius", source="prefs.md"))
+    await hybrid.add(_item("Flight AA1234 departs at noon", source="travel.md"))
+    return hybrid
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Call get_stock_data now", ["call", "get_stock_data", "now"]),
+        ("Flight AA1234 on gpt-4o v0.4.1", ["flight", "aa1234", "on", "gpt-4o", "v0.4.1"]),
+    ],
+)
+def test_tokenize_keeps_identifiers_whole(text: str, expected: List[str]) -> None:
+    # Act
+    tokens = tokenize(text)
+
+    # Assert
+    assert tokens == expected
+
+
+def test_reciprocal_rank_fusion_rewards_ids_ranked_by_both_lists() -> None:
+    # Act
+    fused = reciprocal_rank_fusion([["a", "b"], ["b", "c"]], rrf_k=60)
+
+    # Assert
+    assert [doc_id for doc_id, _ in fused] == ["b", "a", "c"]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+
+
+@pytest.mark.asyncio
+async def test_query_fuses_lexical_and_vector_hits(memory: HybridMemory) -> None:
+    # Act
+    result = await memory.query("get_stock_data")
+
+    # Assert
+    retrieval = {str(item.content): item.metadata["retrieval"] for item in result.results}
+    assert retrieval == {"Call get_stock_data for prices": "hybrid", "Weather forecasts use Celsius": "vector"}
+    assert str(result.results[0].content) == "Call get_stock_data for prices"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "metadata_filter, expected_where, expected",
+    [
+        ({"source": "prefs.md"}, {"source": "prefs.md"}, ["Weather forecasts use Celsius"]),
+        ({"source": "api.md"}, {"source": "api.md"}, ["Call get_stock_data for prices"]),
+        ({"source": "api.md", "lang": "en"}, {"$and": [{"source": "api.md"}, {"lang": "en"}]}, []),
+    ],
+)
+async def test_metadata_filter_applies_to_both_retrievers(
+    memory: HybridMemory,
+    vector: FakeVectorMemory,
+    metadata_filter: Dict[str, str],
+    expected_where: Dict[str, Any],
+    expected: List[str],
+) -> None:
+    # Act
+    result = await memory.query("get_stock_data Celsius", metadata_filter=metadata_filter)
+
+    # Assert
+    assert [str(item.content) for item in result.results] == expected  # The fake ignores `where`
+    assert vector.query_kwargs[-1]["where"] == expected_where
+
+
+@pytest.mark.asyncio
+async def test_vector_hits_from_an_earlier_process_are_returned_and_indexed() -> None:
+    # Arrange
+    vector = FakeVectorMemory()
+    await vector.add(_item("Flight AA1234 departs at noon", **{HYBRID_ID_KEY: "persisted-1"}))
+    await vector.add(_item("Weather forecasts use Celsius"))  # Stored without a hybrid id
+    reopened = HybridMemory(vector_memory=vector, k=3)
+
+    # Act
+    result = await reopened.query("AA1234")
+    lexical = reopened.lexical_search("AA1234")
+
+    # Assert
+    assert [item.metadata["retrieval"] for item in result.results] == ["vector", "vector"]
+    assert "score" in result.results[0].metadata and result.results[0].metadata["score"] != 0.9
+    assert [str(item.content) for item in lexical] == ["Flight AA1234 departs at noon"]
+    assert lexical[0].metadata[HYBRID_ID_KEY] == "persisted-1"
@@ -0,0 +1,97 @@
+from typing import Callable, List, Sequence
+
+import pytest
+from autogen_agentchat.agents import AssistantAgent, MessageFilterAgent, MessageFilterConfig, PerSourceFilter
+from autogen_agentchat.messages import BaseChatMessage, TextMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from src.agents.indexed_filter_agent import IndexedMessageFilterAgent, IndexedMessageLog, MessageView
+
+AGENT_NAME = "editor"
+SOURCES = ["user", "writer", "critic", AGENT_NAME, "writer", "critic", "writer", AGENT_NAME, "critic", "writer"]
+
+Window = Callable[[List[BaseChatMessage]], List[BaseChatMessage]]
+
+
+def _without_own(thread: List[BaseChatMessage]) -> List[BaseChatMessage]:
+    return [message for message in thread if message.source != AGENT_NAME]
+
+
+def _recent(thread: List[BaseChatMessage]) -> List[BaseChatMessage]:
+    return _without_own(thread[4:])
+
+
+def _gapped(thread: List[BaseChatMessage]) -> List[BaseChatMessage]:
+    window = _without_own(thread)
+    return window[:3] + window[4:]
+
+
+def _foreign(thread: List[BaseChatMessage]) -> List[BaseChatMessage]:
+    return _without_own(thread) + [TextMessage(source="writer", content="not in the log")]
+
+
+@pytest.fixture
+def thread() -> List[BaseChatMessage]:
+    return [TextMessage(source=source, content=f"{source} #{i}") for i, source in enumerate(SOURCES)]
+
+
+def _agents(
+    filters: Sequence[PerSourceFilter], log: IndexedMessageLog
+) -> tuple[MessageFilterAgent, IndexedMessageFilterAgent]:
+    inner = AssistantAgent("inner", model_client=ReplayChatCompletionClient(["ok"]))
+    config = MessageFilterConfig(per_source=list(filters))
+    return MessageFilterAgent(AGENT_NAME, inner, config), IndexedMessageFilterAgent(AGENT_NAME, inner, config, log)
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        [PerSourceFilter(source="writer", position="last", count=1)],
+        [
+            PerSourceFilter(source="writer", position="last", count=2),
+            PerSourceFilter(source="user", position="last", count=1),
+        ],
+        [PerSourceFilter(source="critic", position="first", count=2), PerSourceFilter(source="writer")],
+        [PerSourceFilter(source=AGENT_NAME), PerSourceFilter(source="critic", position="last", count=5)],
+        [PerSourceFilter(source="nobody", position="last", count=1)],
+    ],
+    ids=["last-1", "last-n-per-source", "first-n-and-all", "own-source", "unknown-source"],
+)
+@pytest.mark.parametrize(
+    "window",
+    [_without_own, _recent, _gapped, _foreign],
+    ids=["whole-thread", "contiguous-suffix", "non-contiguous", "not-in-log"],
+)
+def test_indexed_filter_matches_message_filter_agent(
+    thread: List[BaseChatMessage], filters: Sequence[PerSourceFilter], window: Window
+) -> None:
+    # Arrange
+    log = IndexedMessageLog()
+    log.extend(thread)
+    plain, indexed = _agents(filters, log)
+    messages = window(thread)
+
+    # Act
+    expected = plain._apply_filter(messages)
+    actual = indexed._apply_filter(messages)
+
+    # Assert
+    assert [message.id for message in actual] == [message.id for message in expected]
+
+
+@pytest.mark.parametrize("window", [_gapped, _foreign], ids=["non-contiguous", "not-in-log"])
+def test_input_that_is_not_a_window_of_the_log_falls_back_to_a_scan(
+    thread: List[BaseChatMessage], window: Window
+) -> None:
+    # Arrange
+    log = IndexedMessageLog()
+    log.extend(thread)
+    _, indexed = _agents([PerSourceFilter(source="writer")], log)
+
+    # Act
+    contiguous = indexed._apply_filter(_without_own(thread))
+    scanned = indexed._apply_filter(window(thread))
+
+    # Assert
+    assert isinstance(contiguous, MessageView)
+    assert isinstance(scanned, list)
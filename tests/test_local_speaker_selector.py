@@ -0,0 +1,43 @@
+import pytest
+
+from src.benchmarks.speaker_selection_benchmark import AGENTS, synthetic_log
+from src.teams.local_speaker_selector import LocalSpeakerSelector, selection_accuracy
+
+CANDIDATES = ["WebSearch", "DataAnalyst"]
+
+
+def _router_only() -> LocalSpeakerSelector:
+    return LocalSpeakerSelector(AGENTS, min_training_examples=10**9, exploration_rate=0.0)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("WebSearch: look up the latest gadget prices.", "WebSearch"),
+        ("DataAnalyst: compute the percentage change.", "DataAnalyst"),
+        ("Found 3 articles; prices rose from 2 to 5.", None),  # Description words only: defer
+        ("Summaries of numeric data", None),  # Overlaps both profiles: defer
+    ],
+)
+def test_router_answers_only_with_a_clear_lead(text: str, expected: str | None) -> None:
+    # Arrange
+    selector = _router_only()
+
+    # Act
+    speaker, _ = selector.predict(text, "Planner", CANDIDATES)
+
+    # Assert
+    assert speaker == expected
+
+
+def test_router_local_answers_agree_with_the_model() -> None:
+    # Arrange
+    selector = _router_only()
+    examples = synthetic_log(1000, seed=3)
+
+    # Act
+    report = selection_accuracy(selector, examples)
+
+    # Assert
+    assert report["answered_locally"] > 0
+    assert report["accuracy_when_answered"] >= 0.95
@@ -0,0 +1,56 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+from autogen_core.models import AssistantMessage, LLMMessage, UserMessage
+
+from src.model_context.mapped_history_context import MappedHistoryChatCompletionContext
+
+
+def _messages(count: int, start: int = 0) -> List[LLMMessage]:
+    return [UserMessage(content=f"message {i}", source="user") for i in range(start, start + count)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("saves", [1, 2])
+async def test_saved_state_is_independent_of_the_working_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, saves: int
+) -> None:
+    # Arrange
+    workdir, elsewhere = tmp_path / "work", tmp_path / "elsewhere"
+    workdir.mkdir()
+    elsewhere.mkdir()
+    monkeypatch.chdir(workdir)
+    context = MappedHistoryChatCompletionContext(buffer_size=3, history_dir="history")
+    for save in range(saves):
+        for message in _messages(2, start=2 * save):
+            await context.add_message(message)
+        state = await context.save_state()
+
+    # Act
+    monkeypatch.chdir(elsewhere)
+    restored = MappedHistoryChatCompletionContext(buffer_size=3, history_dir=str(workdir / "history"))
+    await restored.load_state(state)
+    await restored.add_message(AssistantMessage(content="reply", source="agent"))
+    await restored.save_state()
+    messages = await restored.get_messages()
+
+    # Assert
+    assert [message.content for message in messages] == [f"message {2 * saves - 2}", f"message {2 * saves - 1}", "reply"]
+    assert not (elsewhere / "history").exists()
+
+
+@pytest.mark.asyncio
+async def test_segments_name_logs_relative_to_the_history_dir(tmp_path: Path) -> None:
+    # Arrange
+    context = MappedHistoryChatCompletionContext(buffer_size=2, history_dir=str(tmp_path))
+    for message in _messages(3):
+        await context.add_message(message)
+
+    # Act
+    state = await context.save_state()
+
+    # Assert
+    [(name, count)] = state["segments"]
+    assert count == 3
+    assert not Path(name).is_absolute() and (tmp_path / name).exists()
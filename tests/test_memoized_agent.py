@@ -0,0 +1,100 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+from autogen_agentchat.agents import AssistantAgent, MessageFilterAgent, MessageFilterConfig, PerSourceFilter
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import BaseChatMessage, TextMessage
+from autogen_core import CacheStore, CancellationToken, InMemoryStore
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from src.agents.memoized_agent import MemoizedAgent, default_memo_store
+
+REPLIES = ["Summary: sunny.", "Summary: windy."]
+SYSTEM_MESSAGE = "Summarize the weather report."
+
+
+def _writer(
+    system_message: str = SYSTEM_MESSAGE, client: ReplayChatCompletionClient | None = None
+) -> AssistantAgent:
+    model_client = client or ReplayChatCompletionClient(REPLIES)
+    return AssistantAgent("writer", model_client=model_client, system_message=system_message)
+
+
+def _task(text: str = "Report: sunny all day.") -> List[BaseChatMessage]:
+    return [TextMessage(content=text, source="user")]
+
+
+async def _turn(agent: MemoizedAgent, messages: List[BaseChatMessage]) -> Response:
+    return await agent.on_messages(messages, CancellationToken())
+
+
+@pytest.fixture
+def store() -> CacheStore[str]:
+    return InMemoryStore[str]()
+
+
+@pytest.mark.asyncio
+async def test_repeated_turn_is_served_from_the_cache_with_its_state(store: CacheStore[str]) -> None:
+    # Arrange
+    first = MemoizedAgent(_writer(), store)
+    original = await _turn(first, _task())
+    rerun_client = ReplayChatCompletionClient(REPLIES)
+    rerun = MemoizedAgent(_writer(client=rerun_client), store)
+
+    # Act
+    cached = await _turn(rerun, _task())
+
+    # Assert
+    assert cached.chat_message.to_text() == original.chat_message.to_text()
+    assert cached.chat_message.id != original.chat_message.id and cached.chat_message.models_usage is None
+    assert rerun_client.create_calls == []
+    assert await rerun.save_state() == await first.save_state()
+    assert (rerun.stats.hits, rerun.stats.misses) == (1, 0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("change", ["config", "state", "input"])
+async def test_turn_key_changes_with_config_state_and_input(store: CacheStore[str], change: str) -> None:
+    # Arrange
+    await _turn(MemoizedAgent(_writer(), store), _task())
+    rerun = MemoizedAgent(_writer("Summarize in French." if change == "config" else SYSTEM_MESSAGE), store)
+    if change == "state":
+        await rerun.wrapped_agent.on_messages(_task("Earlier report: foggy."), CancellationToken())
+
+    # Act
+    await _turn(rerun, _task("Report: windy." if change == "input" else "Report: sunny all day."))
+
+    # Assert
+    assert (rerun.stats.hits, rerun.stats.misses) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_input_outside_the_filter_does_not_change_the_key(store: CacheStore[str]) -> None:
+    # Arrange
+    def filtered() -> MemoizedAgent:
+        config = MessageFilterConfig(per_source=[PerSourceFilter(source="user", position="last", count=1)])
+        return MemoizedAgent(MessageFilterAgent("writer", _writer(), config), store)
+
+    await _turn(filtered(), _task())
+    rerun = filtered()
+    chatter = TextMessage(content="Unrelated remark.", source="critic")
+
+    # Act
+    await _turn(rerun, [chatter, *_task()])
+
+    # Assert
+    assert rerun.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_default_store_keeps_turns_across_restarts(tmp_path: Path) -> None:
+    # Arrange
+    await _turn(MemoizedAgent(_writer(), default_memo_store(str(tmp_path))), _task())
+    restarted = MemoizedAgent(_writer(), default_memo_store(str(tmp_path)))
+
+    # Act
+    await _turn(restarted, _task())
+
+    # Assert
+    assert restarted.stats.hits == 1
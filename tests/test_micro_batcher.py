@@ -0,0 +1,105 @@
+import asyncio
+import json
+from typing import Dict, List
+
+import pytest
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from pydantic import BaseModel
+
+from src.models.micro_batcher import MicroBatcher
+
+INPUTS = ["great day", "lost my keys", "it is Tuesday"]
+
+
+class Mood(BaseModel):
+    label: str
+
+
+def _batch_reply(*results: tuple[int, str]) -> str:
+    return json.dumps({"results": [{"index": index, "label": label} for index, label in results]})
+
+
+def _single_reply(label: str) -> str:
+    return json.dumps({"label": label})
+
+
+def _batched_inputs(client: ReplayChatCompletionClient, call: int = 0) -> List[str]:
+    return [item["input"] for item in json.loads(client.create_calls[call]["messages"][-1].content)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "batch_reply, retried",
+    [
+        ("not json at all", {0: "happy", 1: "sad", 2: "neutral"}),
+        (_batch_reply((0, "happy"), (2, "neutral")), {1: "sad"}),
+        (_batch_reply((0, "happy"), (1, "sad"), (0, "sad"), (2, "neutral")), {0: "happy"}),
+        (_batch_reply((0, "happy"), (1, "sad"), (7, "neutral")), {2: "neutral"}),
+    ],
+    ids=["unparsable", "missing", "duplicate", "out-of-range"],
+)
+async def test_inputs_without_a_usable_batch_result_fall_back_to_single_calls(
+    batch_reply: str, retried: Dict[int, str]
+) -> None:
+    # Arrange
+    client = ReplayChatCompletionClient([batch_reply] + [_single_reply(label) for label in retried.values()])
+    batcher = MicroBatcher(client, Mood, "Label the mood.", window_ms=10)
+
+    # Act
+    moods = await asyncio.gather(*(batcher.submit(text) for text in INPUTS))
+
+    # Assert
+    assert [mood.label for mood in moods] == ["happy", "sad", "neutral"]
+    assert [call["messages"][-1].content for call in client.create_calls[1:]] == [INPUTS[i] for i in retried]
+    assert (batcher.stats["batches"], batcher.stats["single_calls"]) == (1, len(retried))
+
+
+@pytest.mark.asyncio
+async def test_callers_that_gave_up_before_the_flush_are_left_out_of_the_batch() -> None:
+    # Arrange
+    client = ReplayChatCompletionClient([_batch_reply((0, "happy"), (1, "neutral"))])
+    batcher = MicroBatcher(client, Mood, "Label the mood.", window_ms=10)
+    calls = [asyncio.ensure_future(batcher.submit(text)) for text in INPUTS]
+    await asyncio.sleep(0)
+
+    # Act
+    calls[1].cancel()
+    moods = await asyncio.gather(calls[0], calls[2])
+    await batcher.drain()
+
+    # Assert
+    assert [mood.label for mood in moods] == ["happy", "neutral"]
+    assert _batched_inputs(client) == [INPUTS[0], INPUTS[2]]
+    assert len(client.create_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_left_with_one_caller_is_sent_as_a_single_call() -> None:
+    # Arrange
+    client = ReplayChatCompletionClient([_single_reply("sad")])
+    batcher = MicroBatcher(client, Mood, "Label the mood.", window_ms=10)
+    calls = [asyncio.ensure_future(batcher.submit(text)) for text in INPUTS[:2]]
+    await asyncio.sleep(0)
+
+    # Act
+    calls[0].cancel()
+    mood = await calls[1]
+
+    # Assert
+    assert mood.label == "sad"
+    assert [call["messages"][-1].content for call in client.create_calls] == [INPUTS[1]]
+    assert batcher.stats["batches"] == 0
+
+
+@pytest.mark.asyncio
+async def test_call_errors_reach_every_caller_in_the_batch() -> None:
+    # Arrange
+    client = ReplayChatCompletionClient([])  # Raises on the first call
+    batcher = MicroBatcher(client, Mood, "Label the mood.", window_ms=10)
+
+    # Act
+    results = await asyncio.gather(*(batcher.submit(text) for text in INPUTS), return_exceptions=True)
+
+    # Assert
+    assert all(isinstance(result, ValueError) for result in results)
+    assert batcher.stats["single_calls"] == 0
@@ -0,0 +1,118 @@
+import dataclasses
+from typing import Any, Dict, List
+
+import pytest
+from autogen_core.models import ModelFamily, ModelInfo, UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from pydantic import BaseModel
+
+from src.models.model_router import CHEAP, STRONG, ModelRouter, RequestFeatures
+
+CAPABLE = ModelInfo(
+    vision=True, function_calling=True, json_output=True, family=ModelFamily.UNKNOWN, structured_output=True
+)
+SIMPLE_REQUEST = RequestFeatures(
+    prompt_tokens=10, last_message_tokens=10, tool_count=0, structured_output=False, has_images=False
+)
+
+
+class Verdict(BaseModel):
+    approved: bool
+
+
+def _router(cheap_replies: List[str], strong_replies: List[str], **kwargs: Any) -> ModelRouter:
+    return ModelRouter(
+        ReplayChatCompletionClient(cheap_replies, model_info=CAPABLE),
+        ReplayChatCompletionClient(strong_replies, model_info=CAPABLE),
+        seed=0,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "cheap_replies, json_output",
+    [([""], None), (['{"approved": "maybe"}'], Verdict), ([], None)],
+    ids=["empty", "invalid-structured-output", "error"],
+)
+async def test_failed_cheap_reply_is_redone_on_the_strong_model(
+    prompt: List[UserMessage], cheap_replies: List[str], json_output: type[BaseModel] | None
+) -> None:
+    # Arrange
+    router = _router(cheap_replies, ['{"approved": true}'])
+
+    # Act
+    result = await router.create(prompt, json_output=json_output)
+
+    # Assert
+    assert result.content == '{"approved": true}'
+    assert (router.routes[CHEAP].calls, router.routes[CHEAP].escalations, router.routes[STRONG].calls) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_stream_failing_before_its_first_chunk_is_redone_on_the_strong_model(
+    prompt: List[UserMessage],
+) -> None:
+    # Arrange
+    router = _router([], ["strong reply"])
+
+    # Act
+    items = [item async for item in router.create_stream(prompt)]
+
+    # Assert
+    assert items[-1].content == "strong reply"
+    assert router.routes[CHEAP].escalations == 1
+
+
+@pytest.mark.asyncio
+async def test_bucket_where_the_cheap_model_keeps_failing_is_demoted(prompt: List[UserMessage]) -> None:
+    # Arrange
+    router = _router([""] * 3, ["strong"] * 4, min_samples=3)
+    for _ in range(3):
+        await router.create(prompt)
+
+    # Act
+    result = await router.create(prompt)
+
+    # Assert
+    assert result.content == "strong"
+    assert router.routes[CHEAP].calls == 3
+    assert router.choose(SIMPLE_REQUEST) == (STRONG, False)
+
+
+@pytest.mark.asyncio
+async def test_explored_bucket_where_the_cheap_model_succeeds_is_promoted(prompt: List[UserMessage]) -> None:
+    # Arrange
+    router = _router(["cheap"] * 4, [], threshold=0.0, exploration_rate=1.0, min_samples=3)
+
+    # Act
+    replies = [(await router.create(prompt)).content for _ in range(4)]
+
+    # Assert
+    assert replies == ["cheap"] * 4
+    assert (router.routes[CHEAP].calls, router.routes[CHEAP].explored) == (4, 3)
+    assert router.choose(SIMPLE_REQUEST) == (CHEAP, False)
+
+
+@pytest.mark.parametrize(
+    "capability, request_needs",
+    [
+        ("function_calling", {"tool_count": 1}),
+        ("json_output", {"structured_output": True}),
+        ("vision", {"has_images": True}),
+    ],
+)
+def test_requests_needing_a_capability_the_cheap_model_lacks_go_to_the_strong_model(
+    capability: str, request_needs: Dict[str, Any]
+) -> None:
+    # Arrange
+    cheap = ReplayChatCompletionClient([], model_info=ModelInfo(**{**CAPABLE, capability: False}))
+    router = ModelRouter(cheap, ReplayChatCompletionClient([], model_info=CAPABLE), threshold=1.0, exploration_rate=1.0)
+    features = dataclasses.replace(SIMPLE_REQUEST, **request_needs)
+
+    # Act
+    route = router.choose(features)
+
+    # Assert
+    assert route == (STRONG, False)
+    assert router.choose(SIMPLE_REQUEST) == (CHEAP, False)
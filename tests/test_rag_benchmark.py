@@ -0,0 +1,55 @@
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from src.benchmarks.metrics import latency_summary
+from src.benchmarks.rag_benchmark import benchmark_backend, run_suite
+from src.benchmarks.synthetic_corpus import generate_corpus
+
+
+@pytest.mark.parametrize(
+    "samples, expected",
+    [
+        ([], {}),
+        ([2.0], {"mean_ms": 2.0, "p50_ms": 2.0, "p99_ms": 2.0}),
+        ([1.0, 2.0, 3.0, 10.0], {"mean_ms": 4.0, "p50_ms": 2.0, "p99_ms": 10.0}),
+    ],
+)
+def test_latency_summary_handles_any_number_of_samples(samples: List[float], expected: Dict[str, float]) -> None:
+    # Act
+    summary = latency_summary(samples)
+
+    # Assert
+    assert summary == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("files", [{}, {"a.txt": "shared words", "b.txt": "shared words"}])  # No labelled queries
+async def test_corpus_without_queries_is_reported_without_recall(tmp_path: Path, files: Dict[str, str]) -> None:
+    # Arrange
+    for name, text in files.items():
+        (tmp_path / name).write_text(text, encoding="utf-8")
+
+    # Act
+    report = await run_suite(["list_memory", "ranked_list_memory"], 0, str(tmp_path), k=3, chunk_size=1500)
+
+    # Assert
+    for backend in report["backends"].values():
+        assert backend["ingestion"]["docs"] == len(files)
+        assert backend["query"]["queries"] == 0
+        assert "recall_at_k" not in backend["query"] and "mean_ms" not in backend["query"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend, ranked", [("list_memory", False), ("ranked_list_memory", True)])
+async def test_recall_is_only_reported_for_ranked_backends(backend: str, ranked: bool) -> None:
+    # Arrange
+    documents, queries = generate_corpus(10)
+
+    # Act
+    report = await benchmark_backend(backend, documents, queries, k=3, chunk_size=1500)
+
+    # Assert
+    assert report["query"]["ranked"] is ranked
+    assert ("recall_at_k" in report["query"]) is ranked
@@ -0,0 +1,64 @@
+from typing import List
+
+import pytest
+from autogen_core.memory import ListMemory, MemoryContent, MemoryMimeType
+from autogen_core.model_context import BufferedChatCompletionContext
+from autogen_core.models import UserMessage
+
+from src.memory.ranked_list_memory import RankedListMemory
+from src.utils.token_utils import count_text_tokens
+
+
+def _item(text: str, pinned: bool = False) -> MemoryContent:
+    metadata = {"pinned": True} if pinned else {"type": "preference"}
+    return MemoryContent(content=text, mime_type=MemoryMimeType.TEXT, metadata=metadata)
+
+
+async def _injected(memory: ListMemory, query: str) -> str:
+    """Run update_context for `query` and return the injected system message text."""
+    context = BufferedChatCompletionContext(buffer_size=10)
+    await context.add_message(UserMessage(content=query, source="user"))
+    await memory.update_context(context)
+    messages = await context.get_messages()
+    return str(messages[-1].content) if len(messages) > 1 else ""
+
+
+@pytest.fixture
+def pinned() -> List[MemoryContent]:
+    return [
+        _item("Always answer in British English and keep every reply under two hundred words.", pinned=True),
+        _item("Never recommend products that are not certified plastic-free by an independent body.", pinned=True),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_tokens", [20, 60, 300])
+async def test_pinned_items_are_injected_even_over_budget(pinned: List[MemoryContent], max_tokens: int) -> None:
+    # Arrange
+    memory = RankedListMemory(memory_contents=[*pinned, _item("The user is vegetarian.")], max_tokens=max_tokens)
+
+    # Act
+    injected = await _injected(memory, "Suggest a vegetarian lunch.")
+
+    # Assert
+    assert "1. Always answer in British English" in injected
+    assert "2. Never recommend products" in injected
+    assert ("3. The user is vegetarian." in injected) is (max_tokens == 300)
+
+
+@pytest.mark.asyncio
+async def test_token_accounting_matches_the_rendered_lists() -> None:
+    # Arrange
+    contents: List[MemoryContent] = [_item(f"Preference {i}: the user likes topic {i}.") for i in range(12)]
+    contents.append(_item("The user likes hiking in the Alps."))
+    memory = RankedListMemory(memory_contents=contents, max_tokens=40)
+    query = "Plan hiking in the Alps."
+
+    # Act
+    injected = await _injected(memory, query)
+    full = await _injected(ListMemory(memory_contents=contents), query)
+
+    # Assert
+    assert injected.splitlines()[2].startswith("1. The user likes hiking")
+    assert memory.last_tokens_used == count_text_tokens(injected)
+    assert memory.last_tokens_used + memory.last_tokens_saved == pytest.approx(count_text_tokens(full), rel=0.05)
@@ -0,0 +1,157 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, List, Sequence
+
+import pytest
+from autogen_core.models import UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from src.models.rate_limited_client import AdaptiveLimiter, Priority
+
+RETRY_AFTER_MS = 50
+
+
+class OverloadError(Exception):
+    """Provider error shaped like the OpenAI SDK's APIStatusError."""
+
+    def __init__(self, status_code: int, retry_after_ms: int | None = None) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        headers = {} if retry_after_ms is None else {"retry-after-ms": str(retry_after_ms)}
+        self.response = SimpleNamespace(status_code=status_code, headers=headers)
+
+
+class FlakyClient(ReplayChatCompletionClient):
+    """Replay client that raises `errors` on its first calls and takes `seconds` per call."""
+
+    def __init__(self, replies: Sequence[str], errors: Sequence[Exception] = (), seconds: float = 0.0) -> None:
+        super().__init__(list(replies))
+        self.errors = list(errors)
+        self.seconds = seconds
+        self.attempts = 0
+
+    async def create(self, *args: Any, **kwargs: Any) -> Any:
+        self.attempts += 1
+        await asyncio.sleep(self.seconds)
+        if self.errors:
+            raise self.errors.pop(0)
+        return await super().create(*args, **kwargs)
+
+
+def _prompt(text: str) -> List[UserMessage]:
+    return [UserMessage(content=text, source="user")]
+
+
+@pytest.fixture
+def limiter() -> AdaptiveLimiter:
+    return AdaptiveLimiter(initial_concurrency=4, max_concurrency=4, latency_tolerance=None)
+
+
+@pytest.mark.asyncio
+async def test_overload_pauses_for_the_retry_after_and_retries(limiter: AdaptiveLimiter) -> None:
+    # Arrange
+    raw = FlakyClient(["ok"], errors=[OverloadError(429, retry_after_ms=RETRY_AFTER_MS)])
+    client = limiter.client(raw)
+    started = time.monotonic()
+
+    # Act
+    result = await client.create(_prompt("hello"))
+
+    # Assert
+    assert result.content == "ok"
+    assert time.monotonic() - started >= RETRY_AFTER_MS / 1000
+    assert raw.attempts == 2
+    assert (limiter.stats["overloads"], limiter.stats["retries"], limiter.in_flight) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [OverloadError(400), ValueError("bad request")])
+async def test_errors_other_than_overload_are_not_retried(limiter: AdaptiveLimiter, error: Exception) -> None:
+    # Arrange
+    raw = FlakyClient(["ok"], errors=[error])
+
+    # Act
+    with pytest.raises(type(error)):
+        await limiter.client(raw).create(_prompt("hello"))
+
+    # Assert
+    assert raw.attempts == 1
+    assert (limiter.stats["overloads"], limiter.in_flight, limiter.concurrency) == (0, 0, 4)
+
+
+@pytest.mark.asyncio
+async def test_waiting_interactive_calls_are_admitted_before_batch_calls() -> None:
+    # Arrange
+    limiter = AdaptiveLimiter(initial_concurrency=1, max_concurrency=1, latency_tolerance=None)
+    raw = FlakyClient(["first", "second", "third"])
+    batch, interactive = limiter.client(raw, priority=Priority.BATCH), limiter.client(raw)
+    held = await limiter.acquire(1)
+    batch_call = asyncio.ensure_future(batch.create(_prompt("batch")))
+    await asyncio.sleep(0)
+    interactive_call = asyncio.ensure_future(interactive.create(_prompt("interactive")))
+    await asyncio.sleep(0)
+
+    # Act
+    limiter.release(held)
+    await asyncio.gather(batch_call, interactive_call)
+
+    # Assert
+    assert [call["messages"][0].content for call in raw.create_calls] == ["interactive", "batch"]
+
+
+@pytest.mark.asyncio
+async def test_overload_halves_the_limit_and_busy_successes_raise_it_back_to_the_ceiling(
+    limiter: AdaptiveLimiter,
+) -> None:
+    # Arrange
+    raw = FlakyClient(["ok"] * 40, errors=[OverloadError(503)], seconds=0.01)
+    client = limiter.client(raw, max_retries=0)
+    with pytest.raises(OverloadError):
+        await client.create(_prompt("overloaded"))
+    lowered = limiter.concurrency
+
+    # Act
+    await asyncio.gather(*(client.create(_prompt(f"call {i}")) for i in range(40)))
+
+    # Assert
+    assert lowered == 2
+    assert limiter.concurrency == 4
+    assert limiter.stats["decreases"] == 1
+
+
+@pytest.mark.asyncio
+async def test_overloads_from_one_episode_lower_the_limit_once(limiter: AdaptiveLimiter) -> None:
+    # Arrange
+    permits = [await limiter.acquire(1) for _ in range(3)]
+
+    # Act
+    for permit in permits:
+        limiter.on_overload(permit, retry_after=0.0)
+
+    # Assert
+    assert limiter.concurrency == 2
+    assert limiter.stats["overloads"] == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("admitted", [True, False])
+async def test_cancelled_calls_give_back_their_slot(
+    limiter: AdaptiveLimiter, slow_client: Callable[..., ReplayChatCompletionClient], admitted: bool
+) -> None:
+    # Arrange
+    limiter.concurrency = 1
+    held = None if admitted else await limiter.acquire(1)
+    call = asyncio.ensure_future(limiter.client(slow_client(["late"], seconds=1.0)).create(_prompt("slow")))
+    await asyncio.sleep(0.01)
+
+    # Act
+    call.cancel()
+    await asyncio.gather(call, return_exceptions=True)
+    if held is not None:
+        limiter.release(held)
+    result = await asyncio.wait_for(limiter.client(FlakyClient(["ok"])).create(_prompt("next")), timeout=1.0)
+
+    # Assert
+    assert result.content == "ok"
+    assert (limiter.in_flight, limiter.waiting) == (0, 0)
@@ -0,0 +1,186 @@
+import re
+from typing import Any, Dict, List
+
+import pytest
+from autogen_core.memory import MemoryContent, MemoryMimeType
+from redis.exceptions import ResponseError
+
+from src.memory.redis_bulk_memory import PipelinedRedisMemory, PipelinedRedisMemoryConfig
+
+TAG_CLAUSE = re.compile(r"@(\w+):\{((?:\\.|[^}])*)\}")
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self._redis = redis
+        self._writes: List[tuple[str, Dict[str, Any]]] = []
+
+    def hset(self, key: str, mapping: Dict[str, Any]) -> None:
+        self._writes.append((key, mapping))
+
+    async def execute(self) -> None:
+        self._redis.round_trips += 1
+        self._redis.hashes.update(self._writes)
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio.Redis with the Query Engine for PipelinedRedisMemory (RESP2 replies)."""
+
+    def __init__(self) -> None:
+        self.hashes: Dict[str, Dict[str, Any]] = {}
+        self.schema: List[str] | None = None
+        self.round_trips = 0
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def execute_command(self, command: str, *args: Any) -> Any:
+        self.round_trips += 1
+        if command == "FT.INFO" and self.schema is None:
+            raise ResponseError("Unknown index name")
+        if command == "FT.CREATE":
+            self.schema = list(args)
+        elif command == "FT.DROPINDEX":
+            self.schema = None
+            self.hashes.clear()
+        elif command == "FT.SEARCH":
+            return self._search(args[1], args)
+        return "OK"
+
+    def _search(self, expression: str, args: tuple[Any, ...]) -> List[Any]:
+        assert self.schema is not None
+        fields = {self.schema[i + 1]: self.schema[i - 1] for i, part in enumerate(self.schema) if part == "AS"}
+        wanted = {fields[name]: re.sub(r"\\(.)", r"\1", value) for name, value in TAG_CLAUSE.findall(expression)}
+        matches = [
+            (key, mapping)
+            for key, mapping in self.hashes.items()
+            if all(mapping.get(field) == value for field, value in wanted.items())
+        ]
+        matches.sort(key=lambda match: match[1]["created_at"], reverse=True)
+        limit = int(args[args.index("LIMIT") + 2])
+        start = args.index("RETURN") + 2
+        returned = args[start : start + int(args[start - 1])]
+        reply: List[Any] = [len(matches)]
+        for key, mapping in matches[:limit]:
+            values = [part for name in returned for part in (name.encode(), str(mapping[name]).encode())]
+            reply += [key.encode(), values]
+        return reply
+
+    async def aclose(self) -> None:
+        pass
+
+
+def _item(text: str, **metadata: Any) -> MemoryContent:
+    return MemoryContent(content=text, mime_type=MemoryMimeType.TEXT, metadata=metadata)
+
+
+@pytest.fixture
+def redis() -> FakeRedis:
+    return FakeRedis()
+
+
+@pytest.fixture
+def memory(redis: FakeRedis) -> PipelinedRedisMemory:
+    bulk = PipelinedRedisMemory(PipelinedRedisMemoryConfig(write_batch_size=4, top_k=3))
+    bulk._client = redis  # type: ignore[assignment]
+    return bulk
+
+
+@pytest.mark.asyncio
+async def test_add_many_writes_one_pipeline_per_batch(memory: PipelinedRedisMemory, redis: FakeRedis) -> None:
+    # Arrange
+    items = [_item(f"fact {i}", category="facts") for i in range(10)]
+    await memory.get_all()  # Creates the index
+    redis.round_trips = 0
+
+    # Act
+    written = await memory.add_many(items)
+
+    # Assert
+    assert written == 10
+    assert redis.round_trips == 3
+    assert len(redis.hashes) == 10
+
+
+@pytest.mark.asyncio
+async def test_get_all_returns_everything_newest_first(memory: PipelinedRedisMemory) -> None:
+    # Arrange
+    await memory.add_many([_item(f"fact {i}") for i in range(6)])
+    await memory.add(MemoryContent(content={"units": "metric"}, mime_type=MemoryMimeType.JSON))
+
+    # Act
+    result = await memory.get_all()
+
+    # Assert
+    assert [item.content for item in result.results] == [{"units": "metric"}] + [f"fact {i}" for i in range(5, -1, -1)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "metadata_filter, expected",
+    [
+        ({"category": "preferences"}, ["Use metric units", "Prefers tea"]),
+        ({"category": "preferences", "type": "units"}, ["Use metric units"]),
+        ({"type": "units/si"}, ["Kelvin for science"]),
+        ({"category": "unknown"}, []),
+    ],
+)
+async def test_metadata_filter_selects_on_the_server(
+    memory: PipelinedRedisMemory, redis: FakeRedis, metadata_filter: Dict[str, str], expected: List[str]
+) -> None:
+    # Arrange
+    await memory.add_many(
+        [
+            _item("Prefers tea", category="preferences", type="drinks"),
+            _item("Kelvin for science", category="facts", type="units/si"),
+            _item("Use metric units", category="preferences", type="units"),
+        ]
+    )
+    redis.round_trips = 0
+
+    # Act
+    result = await memory.get_all(metadata_filter)
+
+    # Assert
+    assert [item.content for item in result.results] == expected
+    assert redis.round_trips == 1
+
+
+@pytest.mark.asyncio
+async def test_query_without_an_embedder_returns_the_latest_top_k(memory: PipelinedRedisMemory) -> None:
+    # Arrange
+    await memory.add_many([_item(f"fact {i}", category="facts") for i in range(5)])
+
+    # Act
+    result = await memory.query("anything", metadata_filter={"category": "facts"})
+
+    # Assert
+    assert [item.content for item in result.results] == ["fact 4", "fact 3", "fact 2"]
+
+
+@pytest.mark.asyncio
+async def test_filtering_on_a_key_that_is_not_indexed_is_refused(memory: PipelinedRedisMemory) -> None:
+    # Act / Assert
+    with pytest.raises(ValueError, match="not indexed"):
+        await memory.get_all({"author": "me"})
+
+
+@pytest.mark.asyncio
+async def test_add_many_embeds_in_batches_and_indexes_the_vector_size(redis: FakeRedis) -> None:
+    # Arrange
+    batches: List[List[str]] = []
+
+    async def embed(texts: List[str]) -> List[List[float]]:
+        batches.append(texts)
+        return [[1.0, 0.0, 0.5] for _ in texts]
+
+    memory = PipelinedRedisMemory(PipelinedRedisMemoryConfig(embedding_batch_size=2), embedder=embed)
+    memory._client = redis  # type: ignore[assignment]
+
+    # Act
+    await memory.add_many([_item(f"fact {i}") for i in range(5)])
+
+    # Assert
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert redis.schema is not None and redis.schema[redis.schema.index("DIM") + 1] == "3"
+    assert all(len(mapping["embedding"]) == 3 * 4 for mapping in redis.hashes.values())
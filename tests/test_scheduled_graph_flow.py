@@ -0,0 +1,82 @@
+import asyncio
+from typing import Dict, Sequence
+
+import pytest
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.conditions import TextMentionTermination
+from autogen_agentchat.messages import BaseChatMessage, TextMessage
+from autogen_agentchat.teams import DiGraphBuilder
+from autogen_core import CancellationToken
+
+from src.teams.scheduled_graph_flow import ScheduledGraphFlow
+
+
+class SleepAgent(BaseChatAgent):
+    """Graph node that sleeps, then replies with a fixed text."""
+
+    def __init__(self, name: str, seconds: float, reply: str = "done") -> None:
+        super().__init__(name, description=f"Sleeps {seconds}s")
+        self._seconds = seconds
+        self._reply = reply
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (TextMessage,)
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        await asyncio.sleep(self._seconds)
+        return Response(chat_message=TextMessage(content=self._reply, source=self.name))
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        pass
+
+
+def _fork_join(seconds: Dict[str, float], replies: Dict[str, str] | None = None) -> DiGraphBuilder:
+    """start -> every branch in `seconds` -> join."""
+    replies = replies or {}
+    builder = DiGraphBuilder()
+    start, join = SleepAgent("start", 0.0), SleepAgent("join", 0.0)
+    builder.add_node(start).add_node(join)
+    for name, duration in seconds.items():
+        branch = SleepAgent(name, duration, replies.get(name, "done"))
+        builder.add_node(branch).add_edge(start, branch).add_edge(branch, join)
+    return builder
+
+
+@pytest.mark.asyncio
+async def test_termination_is_checked_while_other_nodes_are_still_running() -> None:
+    # Arrange
+    builder = _fork_join({"fast": 0.01, "slow": 0.3}, replies={"fast": "STOP"})
+    flow = ScheduledGraphFlow(
+        builder.get_participants(),
+        graph=builder.build(),
+        max_concurrency=2,
+        termination_condition=TextMentionTermination("STOP"),
+    )
+
+    # Act
+    result = await flow.run(task="Go.")
+    resumed = await flow.run()
+
+    # Assert
+    assert "STOP" in (result.stop_reason or "")
+    assert [message.source for message in result.messages] == ["user", "start", "fast"]
+    assert [message.source for message in resumed.messages] == ["join"]  # The slow reply was kept
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_concurrency", [None, 1, 2])
+async def test_critical_path_ends_at_the_join_and_includes_queue_time(max_concurrency: int | None) -> None:
+    # Arrange
+    builder = _fork_join({"a": 0.03, "b": 0.03})
+    flow = ScheduledGraphFlow(builder.get_participants(), graph=builder.build(), max_concurrency=max_concurrency)
+
+    # Act
+    await flow.run(task="Go.")
+
+    # Assert
+    assert flow.last_profile is not None
+    path, seconds = flow.last_profile.critical_path()
+    assert path[0] == "start" and path[-1] == "join" and len(path) == 3
+    assert seconds == pytest.approx(flow.last_profile.wall_clock_seconds, abs=0.01)
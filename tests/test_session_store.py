@@ -0,0 +1,125 @@
+import threading
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.base import TaskResult
+from autogen_agentchat.conditions import HandoffTermination, TextMentionTermination
+from autogen_agentchat.messages import HandoffMessage
+from autogen_agentchat.teams import Swarm
+from autogen_core import FunctionCall
+from autogen_core.models import CreateResult, ModelFamily, ModelInfo, RequestUsage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from src.state.session_store import (
+    FileSessionBackend,
+    ParkedSessionManager,
+    SessionBackend,
+    SQLiteSessionBackend,
+)
+
+HANDOFF_TO_USER = CreateResult(
+    finish_reason="function_calls",
+    content=[FunctionCall(id="call-1", name="transfer_to_user", arguments="{}")],
+    usage=RequestUsage(prompt_tokens=0, completion_tokens=0),
+    cached=False,
+)
+TOOL_MODEL = ModelInfo(
+    vision=False, function_calling=True, json_output=False, family=ModelFamily.UNKNOWN, structured_output=False
+)
+
+
+class RecordingBackend(FileSessionBackend):
+    """File backend that records which threads read it."""
+
+    def __init__(self, directory: Path) -> None:
+        super().__init__(directory)
+        self.reader_threads: List[int] = []
+
+    def get(self, session_id: str) -> bytes | None:
+        self.reader_threads.append(threading.get_ident())
+        return super().get(session_id)
+
+
+def _client(*replies: str | CreateResult) -> ReplayChatCompletionClient:
+    return ReplayChatCompletionClient(list(replies), model_info=TOOL_MODEL)
+
+
+def _team_factory(client: ReplayChatCompletionClient) -> Callable[[], Swarm]:
+    def build() -> Swarm:
+        agent = AssistantAgent("travel_agent", model_client=client, handoffs=["user"])
+        termination = HandoffTermination(target="user") | TextMentionTermination("TERMINATE")
+        return Swarm([agent], termination_condition=termination)
+
+    return build
+
+
+async def _run_turn(sessions: ParkedSessionManager, session_id: str, message: str) -> TaskResult:
+    items = [item async for item in sessions.run_stream(session_id, message)]
+    return items[-1]
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def backend(request: pytest.FixtureRequest, tmp_path: Path) -> SessionBackend:
+    if request.param == "file":
+        return FileSessionBackend(tmp_path / "sessions")
+    sqlite_backend = SQLiteSessionBackend(tmp_path / "sessions.sqlite")
+    request.addfinalizer(sqlite_backend.close)
+    return sqlite_backend
+
+
+@pytest.mark.asyncio
+async def test_handoff_to_the_user_parks_the_session_and_releases_the_team(backend: SessionBackend) -> None:
+    # Arrange
+    sessions = ParkedSessionManager(_team_factory(_client(HANDOFF_TO_USER)), backend)
+
+    # Act
+    result = await _run_turn(sessions, "customer-42", "I need to refund my flight.")
+    parked = await sessions.parked_session("customer-42")
+
+    # Assert
+    assert isinstance(result.messages[-1], HandoffMessage)
+    assert await sessions.is_parked("customer-42")
+    assert sessions.active_count == 0
+    assert parked is not None and parked.resume_target == "travel_agent"
+    assert backend.session_ids() == ["customer-42"]
+
+
+@pytest.mark.asyncio
+async def test_reply_resumes_the_parked_team_and_finishing_removes_the_checkpoint(backend: SessionBackend) -> None:
+    # Arrange
+    client = _client(HANDOFF_TO_USER, "Flight AC 1234 refunded. TERMINATE")
+    await _run_turn(ParkedSessionManager(_team_factory(client), backend), "customer-42", "I need a refund.")
+    restarted = ParkedSessionManager(_team_factory(client), backend)  # As if in another process
+
+    # Act
+    result = await _run_turn(restarted, "customer-42", "My flight is AC 1234.")
+
+    # Assert
+    resumed_with = result.messages[0]
+    assert isinstance(resumed_with, HandoffMessage)
+    assert (resumed_with.source, resumed_with.target, resumed_with.content) == (
+        "user",
+        "travel_agent",
+        "My flight is AC 1234.",
+    )
+    assert "TERMINATE" in str(result.messages[-1].content)
+    assert not await restarted.is_parked("customer-42")
+    assert backend.session_ids() == []
+
+
+@pytest.mark.asyncio
+async def test_parked_sessions_are_read_off_the_event_loop(tmp_path: Path) -> None:
+    # Arrange
+    backend = RecordingBackend(tmp_path)
+    sessions = ParkedSessionManager(_team_factory(_client(HANDOFF_TO_USER)), backend)
+
+    # Act
+    await _run_turn(sessions, "customer-42", "I need to refund my flight.")
+    await sessions.is_parked("customer-42")
+    await sessions.parked_session("customer-42")
+
+    # Assert
+    assert len(backend.reader_threads) == 3
+    assert threading.get_ident() not in backend.reader_threads
@@ -0,0 +1,54 @@
+import argparse
+from typing import Any, Dict, List
+
+import pytest
+
+from src.benchmarks.speculation_benchmark import APPROVAL, CHATTY_APPROVAL, REJECTION, build_flow
+from src.teams.speculative_graph_flow import likely_replies
+
+TIMINGS = argparse.Namespace(first_chunk_ms=20.0, chunk_ms=5.0, summary_ms=10.0, summary_tokens=100, node_ms=1.0)
+
+
+@pytest.mark.parametrize(
+    "prefix, expected",
+    [
+        ("", []),  # Decider just dispatched
+        ("   ", []),
+        ("AP", []),  # Too short to tell
+        ("APP", ["APPROVE"]),
+        ("  APPRO", ["APPROVE"]),
+        ("Please", []),
+        ("APPROVE - nice", []),  # Longer than the predicted reply
+    ],
+)
+def test_likely_replies_need_a_matching_non_empty_prefix(prefix: str, expected: List[str]) -> None:
+    # Arrange
+    predict = likely_replies("APPROVE")
+
+    # Act
+    predicted = predict(prefix)
+
+    # Assert
+    assert list(predicted) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "reply, expected",
+    [
+        (REJECTION, {"started": 0, "hits": 0, "tokens_wasted": 0}),
+        (APPROVAL, {"started": 1, "hits": 1, "tokens_wasted": 0}),
+        (CHATTY_APPROVAL, {"started": 1, "hits": 0}),
+    ],
+)
+async def test_summary_only_speculates_once_the_reviewer_streams_an_approval(reply: str, expected: Dict[str, Any]) -> None:
+    # Arrange
+    flow = build_flow([reply], speculate=True, args=TIMINGS)
+
+    # Act
+    result = await flow.run(task="Draft a product description.")
+
+    # Assert
+    stats = flow.speculation_report()["total"]
+    assert {key: stats[key] for key in expected} == expected
+    assert result.messages[-1].source == ("reviser" if reply == REJECTION else "summary")
@@ -0,0 +1,66 @@
+import asyncio
+from typing import Callable
+
+import pytest
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.teams import RoundRobinGroupChat
+from autogen_core.models import UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from src.models.stream_metrics import StreamMetricsRecorder, stream_with_metrics
+
+
+@pytest.fixture
+def recorder() -> StreamMetricsRecorder:
+    return StreamMetricsRecorder()
+
+
+def _team(
+    recorder: StreamMetricsRecorder, client: ReplayChatCompletionClient, name: str, turns: int
+) -> RoundRobinGroupChat:
+    instrumented = recorder.instrument(client, name)
+    return RoundRobinGroupChat([AssistantAgent(name, model_client=instrumented)], max_turns=turns)
+
+
+async def _drain(recorder: StreamMetricsRecorder, team: RoundRobinGroupChat, run: str) -> None:
+    async for _ in stream_with_metrics(team.run_stream(task="Go."), recorder, run):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_tag_their_own_calls(
+    recorder: StreamMetricsRecorder, slow_client: Callable[..., ReplayChatCompletionClient]
+) -> None:
+    # Arrange
+    first = _team(recorder, slow_client(["first reply"] * 2, seconds=0.01), "first", turns=2)
+    second = _team(recorder, slow_client(["second reply"] * 3, seconds=0.01), "second", turns=3)
+
+    # Act
+    await asyncio.gather(_drain(recorder, first, "run-a"), _drain(recorder, second, "run-b"))
+
+    # Assert
+    assert list(recorder.run_report("run-a")["by_label"]) == ["first"]
+    assert recorder.run_report("run-a")["total"]["calls"] == 2
+    assert list(recorder.run_report("run-b")["by_label"]) == ["second"]
+    assert recorder.run_report("run-b")["total"]["calls"] == 3
+    assert recorder.current_run is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunks_read", [1, 2, None])  # None reads the whole stream
+async def test_stopping_a_stream_early_is_not_a_failure(recorder: StreamMetricsRecorder, chunks_read: int | None) -> None:
+    # Arrange
+    client = recorder.instrument(ReplayChatCompletionClient(["one two three four"]), "agent")
+    stream = client.create_stream([UserMessage(content="Count.", source="user")])
+
+    # Act
+    read = 0
+    async for _ in stream:
+        read += 1
+        if read == chunks_read:
+            break
+    await stream.aclose()
+
+    # Assert
+    assert len(recorder.calls) == 1
+    assert recorder.calls[0].failed is False
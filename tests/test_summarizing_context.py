@@ -0,0 +1,74 @@
+from typing import List
+
+import pytest
+from autogen_core import FunctionCall
+from autogen_core.models import (
+    AssistantMessage,
+    FunctionExecutionResult,
+    FunctionExecutionResultMessage,
+    LLMMessage,
+    UserMessage,
+)
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from src.model_context.summarizing_context import SummarizingChatCompletionContext
+
+LONG_TEXT = "The draft needs another pass on tone and structure. " * 20
+
+
+def _user(text: str = LONG_TEXT) -> UserMessage:
+    return UserMessage(content=text, source="user")
+
+
+def _call(*call_ids: str) -> AssistantMessage:
+    """A call whose arguments are long enough that folding has to reach it."""
+    arguments = f'{{"query": "{LONG_TEXT}"}}'
+    return AssistantMessage(
+        content=[FunctionCall(id=call_id, arguments=arguments, name="lookup") for call_id in call_ids], source="agent"
+    )
+
+
+def _result(call_id: str) -> FunctionExecutionResultMessage:
+    result = FunctionExecutionResult(content="found", call_id=call_id, name="lookup", is_error=False)
+    return FunctionExecutionResultMessage(content=[result])
+
+
+def _calls_precede_results(messages: List[LLMMessage]) -> bool:
+    called = set()
+    for message in messages:
+        if isinstance(message, AssistantMessage) and isinstance(message.content, list):
+            called.update(call.id for call in message.content)
+        if isinstance(message, FunctionExecutionResultMessage):
+            if any(result.call_id not in called for result in message.content):
+                return False
+    return True
+
+
+@pytest.fixture
+def context() -> SummarizingChatCompletionContext:
+    summarizer = ReplayChatCompletionClient(["Earlier turns discussed the draft."])
+    return SummarizingChatCompletionContext(summarizer, token_budget=400, summary_max_tokens=100)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "history",
+    [
+        [_user(), _call("1"), _result("1")],  # Only results follow the boundary
+        [_user(), _call("1", "2"), _result("1"), _result("2")],
+        [_user(), _call("1"), _result("1"), _user("Thanks.")],
+    ],
+)
+async def test_folding_never_separates_tool_results_from_their_call(
+    context: SummarizingChatCompletionContext, history: List[LLMMessage]
+) -> None:
+    # Arrange
+    for message in [_user("Write a product description."), *history]:
+        await context.add_message(message)
+
+    # Act
+    messages = await context.get_messages()
+
+    # Assert
+    assert context.folded_count > 0
+    assert _calls_precede_results(messages)
@@ -0,0 +1,121 @@
+from typing import Iterator, List
+
+import pytest
+from autogen_core.models import AssistantMessage, LLMMessage, SystemMessage, UserMessage
+
+from src.utils import token_utils
+from src.utils.token_utils import RunningTokenTotal, TokenCountCache, token_count_cache
+
+TEXT = "The weather in Paris is sunny today."
+
+
+@pytest.fixture
+def tokenized(monkeypatch: pytest.MonkeyPatch) -> List[LLMMessage]:
+    """Messages actually tokenised (cache misses), in order."""
+    calls: List[LLMMessage] = []
+    tokenize = token_utils._tokenize_message
+
+    def recording_tokenize(message: LLMMessage, model: str) -> int:
+        calls.append(message)
+        return tokenize(message, model)
+
+    monkeypatch.setattr(token_utils, "_tokenize_message", recording_tokenize)
+    return calls
+
+
+@pytest.fixture
+def shared_cache() -> Iterator[TokenCountCache]:
+    token_count_cache.clear()
+    yield token_count_cache
+    token_count_cache.clear()
+
+
+def test_equal_messages_rebuilt_from_state_hit_the_cache(tokenized: List[LLMMessage]) -> None:
+    # Arrange
+    cache = TokenCountCache()
+    first = cache.count_message(UserMessage(content=TEXT, source="user"))
+
+    # Act
+    second = cache.count_message(UserMessage(content=TEXT, source="another_agent"))
+
+    # Assert
+    assert second == first
+    assert (cache.hits, cache.misses, len(tokenized)) == (1, 1, 1)
+
+
+@pytest.mark.parametrize(
+    "changed, model",
+    [
+        (UserMessage(content=TEXT + " Windy later.", source="user"), "gpt-4o"),
+        (UserMessage(content=TEXT, source="user"), "gpt-3.5-turbo"),
+        (AssistantMessage(content=TEXT, source="assistant"), "gpt-4o"),
+        (SystemMessage(content=TEXT), "gpt-4o"),
+    ],
+    ids=["content", "model", "assistant-type", "system-type"],
+)
+def test_changed_content_model_or_type_is_counted_again(
+    tokenized: List[LLMMessage], changed: LLMMessage, model: str
+) -> None:
+    # Arrange
+    cache = TokenCountCache()
+    cache.count_message(UserMessage(content=TEXT, source="user"), "gpt-4o")
+
+    # Act
+    cache.count_message(changed, model)
+
+    # Assert
+    assert (cache.hits, cache.misses, len(cache)) == (0, 2, 2)
+    assert tokenized[-1] is changed
+
+
+def test_least_recently_used_count_is_evicted_first() -> None:
+    # Arrange
+    cache = TokenCountCache(max_entries=2)
+    first, second, third = (UserMessage(content=f"message {i}", source="user") for i in range(3))
+    cache.count_message(first)
+    cache.count_message(second)
+    cache.count_message(first)  # Now the most recently used
+
+    # Act
+    cache.count_message(third)
+    cache.count_message(first)
+    cache.count_message(second)
+
+    # Assert
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_clear_drops_counts_and_statistics() -> None:
+    # Arrange
+    cache = TokenCountCache()
+    cache.count_message(UserMessage(content=TEXT, source="user"))
+    cache.count_message(UserMessage(content=TEXT, source="user"))
+
+    # Act
+    cache.clear()
+
+    # Assert
+    assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
+
+
+def test_running_total_follows_appends_evictions_and_resets(
+    shared_cache: TokenCountCache, tokenized: List[LLMMessage]
+) -> None:
+    # Arrange
+    messages = [UserMessage(content=f"turn {i}: " + "word " * i, source="user") for i in range(6)]
+    counts = [TokenCountCache().count_message(message) for message in messages]
+    tokenized.clear()
+    running = RunningTokenTotal(messages=messages[:4])
+
+    # Act
+    running.extend(messages[4:])
+    removed = running.pop_front(2)
+    running_after_pop = running.total
+    running.reset(messages[2:])
+
+    # Assert
+    assert removed == counts[0] + counts[1]
+    assert running_after_pop == running.total == sum(counts[2:])
+    assert len(running) == 4 and running.peek_front() == counts[2]
+    assert len(tokenized) == len(messages)  # The reset re-counts from the cache
+    assert shared_cache.hits == 4
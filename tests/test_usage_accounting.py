@@ -0,0 +1,87 @@
+import asyncio
+from typing import Callable, List
+
+import pytest
+from autogen_core.models import UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from src.models.usage_accounting import Budget, BudgetExceededError, UsageAccountant
+
+MODEL = "gpt-4o-mini"
+
+ClientFactory = Callable[..., ReplayChatCompletionClient]
+
+
+@pytest.fixture
+def enforced() -> UsageAccountant:
+    return UsageAccountant(Budget(max_tokens=1000), enforce=True)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_tokens", [100, 400])
+async def test_concurrent_calls_cannot_reserve_more_than_the_budget(
+    enforced: UsageAccountant, slow_client: ClientFactory, prompt: List[UserMessage], max_tokens: int
+) -> None:
+    # Arrange
+    client = slow_client(["ok"] * 5)
+    metered = enforced.meter(client, "agent", model=MODEL)
+
+    # Act
+    await asyncio.gather(
+        *(metered.create(prompt, extra_create_args={"max_tokens": max_tokens}) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    # Assert
+    limits = [call["extra_create_args"]["max_tokens"] for call in client.create_calls]
+    assert sum(limits) + enforced.total.prompt_tokens <= enforced.budget.max_tokens
+    assert enforced.reserved_tokens == 0
+    assert enforced.reserved_cost == pytest.approx(0.0)
+
+
+@pytest.mark.asyncio
+async def test_call_whose_prompt_does_not_fit_is_refused_before_it_is_sent(slow_client: ClientFactory) -> None:
+    # Arrange
+    accountant = UsageAccountant(Budget(max_tokens=5), enforce=True)
+    client = slow_client(["ok"])
+    metered = accountant.meter(client, "agent", model=MODEL)
+    long_prompt = [UserMessage(content="Summarize the whole conversation so far in detail.", source="user")]
+
+    # Act
+    with pytest.raises(BudgetExceededError):
+        await metered.create(long_prompt)
+
+    # Assert
+    assert client.create_calls == []
+    assert accountant.reserved_tokens == 0
+
+
+@pytest.mark.asyncio
+async def test_streamed_call_settles_its_reservation_with_the_real_usage(
+    enforced: UsageAccountant, prompt: List[UserMessage]
+) -> None:
+    # Arrange
+    metered = enforced.meter(ReplayChatCompletionClient(["a short reply"]), "agent", model=MODEL)
+
+    # Act
+    items = [item async for item in metered.create_stream(prompt)]
+
+    # Assert
+    assert items
+    assert enforced.total.calls == 1
+    assert enforced.reserved_tokens == 0
+
+
+@pytest.mark.asyncio
+async def test_unenforced_budget_leaves_create_args_alone(prompt: List[UserMessage]) -> None:
+    # Arrange
+    accountant = UsageAccountant(Budget(max_tokens=5))
+    client = ReplayChatCompletionClient(["ok"])
+    metered = accountant.meter(client, "agent", model=MODEL)
+
+    # Act
+    await metered.create(prompt)
+
+    # Assert
+    assert client.create_calls[0]["extra_create_args"] == {}
+    assert accountant.total.calls == 1
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from typing import List
+
+import pytest
+from autogen_core.memory import ListMemory, MemoryContent, MemoryMimeType
+
+from src.memory.write_behind_memory import WriteBehindError, WriteBehindMemory
+
+WRITE_SECONDS = 0.05
+
+
+class SlowListMemory(ListMemory):
+    """ListMemory whose writes take a while, like a network-backed memory."""
+
+    async def add(self, content: MemoryContent, cancellation_token=None) -> None:
+        await asyncio.sleep(WRITE_SECONDS)
+        await super().add(content, cancellation_token)
+
+
+class FlakyMemory(ListMemory):
+    """ListMemory whose first `failures` writes raise `error`, like a backend that is briefly down."""
+
+    def __init__(self, failures: int, error: Exception) -> None:
+        super().__init__()
+        self.failures = failures
+        self.error = error
+        self.closed = False
+
+    async def add(self, content: MemoryContent, cancellation_token=None) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        await super().add(content, cancellation_token)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FlakyBulkMemory(FlakyMemory):
+    """FlakyMemory with a batched write, like PipelinedRedisMemory."""
+
+    async def add_many(self, contents: List[MemoryContent]) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        for content in contents:
+            await ListMemory.add(self, content)
+
+
+def _item(text: str, **metadata: str) -> MemoryContent:
+    return MemoryContent(content=text, mime_type=MemoryMimeType.TEXT, metadata=metadata or None)
+
+
+def _texts(items: List[MemoryContent]) -> List[str]:
+    return [str(item.content) for item in items]
+
+
+@pytest.fixture
+def store() -> SlowListMemory:
+    return SlowListMemory()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("wait_seconds", [0.0, 0.02, WRITE_SECONDS * 1.5])
+async def test_clear_discards_items_in_every_stage_of_persistence(store: SlowListMemory, wait_seconds: float) -> None:
+    # Arrange
+    memory = WriteBehindMemory(store, batch_window=0.01)
+    await memory.add(_item("Meal recipe must be vegan"))
+    await asyncio.sleep(wait_seconds)  # Queued, being collected into a batch, or being written
+
+    # Act
+    await memory.clear()
+    await memory.close()
+
+    # Assert
+    assert _texts(store.content) == []
+
+
+@pytest.mark.asyncio
+async def test_query_returns_pending_items_regardless_of_query_text(store: SlowListMemory) -> None:
+    # Arrange
+    memory = WriteBehindMemory(store)
+    await memory.add(_item("Meal recipe must be vegan", category="preferences", type="dietary"))
+
+    # Act
+    result = await memory.query("What are my dietary preferences?")
+    await memory.close()
+
+    # Assert
+    assert _texts(result.results) == ["Meal recipe must be vegan"]
+
+
+@pytest.mark.asyncio
+async def test_query_does_not_duplicate_items_persisted_but_still_pending(store: SlowListMemory) -> None:
+    # Arrange
+    memory = WriteBehindMemory(store, batch_window=0.01)
+    await memory.add(_item("first"))
+    await memory.add(_item("second"))  # Same batch, written after "first"
+    await asyncio.sleep(0.01 + WRITE_SECONDS * 1.5)  # "first" is written, the batch is not done yet
+
+    # Act
+    result = await memory.query("")
+    await memory.close()
+
+    # Assert
+    assert sorted(_texts(result.results)) == ["first", "second"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("memory_type", [FlakyMemory, FlakyBulkMemory])
+async def test_failed_writes_stay_pending_and_are_retried_by_the_next_flush(
+    memory_type: type[FlakyMemory], caplog: pytest.LogCaptureFixture
+) -> None:
+    # Arrange
+    caplog.set_level(logging.ERROR, logger="src.memory.write_behind_memory")
+    store = memory_type(failures=1, error=ConnectionError("backend down"))
+    memory = WriteBehindMemory(store, batch_window=0.0)
+    await memory.add(_item("Meal recipe must be vegan"))
+
+    # Act
+    with pytest.raises(WriteBehindError) as raised:
+        await memory.flush()
+    pending = await memory.query("")
+    await memory.flush()
+
+    # Assert
+    assert isinstance(raised.value.__cause__, ConnectionError)
+    assert [record.exc_info is not None for record in caplog.records] == [True]
+    assert _texts(pending.results) == ["Meal recipe must be vegan"]
+    assert _texts(store.content) == ["Meal recipe must be vegan"]
+    assert (memory.pending_count, memory.failed_count, memory.persisted_count) == (0, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_unexpected_write_errors_surface_from_flush_and_keep_the_items() -> None:
+    # Arrange
+    store = FlakyMemory(failures=1, error=ValueError("bad payload"))
+    memory = WriteBehindMemory(store, batch_window=0.0)
+    await memory.add(_item("first"))
+
+    # Act
+    with pytest.raises(WriteBehindError) as raised:
+        await memory.flush()
+    await memory.flush()
+
+    # Assert
+    assert isinstance(raised.value.__cause__, ValueError)
+    assert _texts(store.content) == ["first"]
+
+
+@pytest.mark.asyncio
+async def test_close_raises_when_memories_are_lost_but_still_closes_the_store() -> None:
+    # Arrange
+    store = FlakyMemory(failures=10, error=TimeoutError("backend timed out"))
+    memory = WriteBehindMemory(store, batch_window=0.0)
+    await memory.add(_item("first"))
+
+    # Act
+    with pytest.raises(WriteBehindError, match="1 memories could not be persisted"):
+        await memory.close()
+
+    # Assert
+    assert store.closed
+    assert store.content == []